@@ -10,13 +10,18 @@ module from recur_scan.features to prepare the input data.
 
 # %%
 import argparse
+import csv
+import gc
 import json
+import operator
 import os
+import sys
 import traceback
 from collections import defaultdict
 from typing import Any
 
 import joblib
+import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
 import optuna
@@ -24,6 +29,7 @@ import pandas as pd
 import shap
 import xgboost as xgb
 from loguru import logger
+from sklearn import set_config
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.feature_extraction import DictVectorizer
 from sklearn.feature_selection import RFECV
@@ -33,13 +39,21 @@ from tqdm import tqdm
 from xgboost.callback import EarlyStopping
 
 from recur_scan.features import get_features
+from recur_scan.features_felix import get_transaction_recency
 from recur_scan.transactions import (
+    Transaction,
     group_transactions,
     read_labeled_transactions,
     write_labeled_transactions,
     write_transactions,
 )
 
+# plots are only shown when the script is run as a notebook; otherwise they are just saved to out_dir
+# with the non-interactive Agg backend, which doesn't need a display or start a GUI event loop
+show_plots = "ipykernel" in sys.modules
+if not show_plots:
+    matplotlib.use("Agg")
+
 # %%
 # configure the script
 
@@ -50,6 +64,7 @@ do_hyperparameter_optimization = False  # set to False to use the default hyperp
 search_type = "bayesian"  # "grid", "random", or "bayesian"
 n_hpo_iters = 250  # number of hyperparameter optimization iterations
 n_jobs = -1  # number of jobs to run in parallel (set to 1 if your laptop gets too hot)
+device = "cpu"  # device to train xgboost models on: "cpu" or "cuda"
 recall_weight = 1.5  # weight for recall in custom scorer (higher values favor recall over precision)
 
 in_path = "training data"
@@ -106,6 +121,13 @@ parser.add_argument(
     default=n_jobs,
     help="Number of jobs to run in parallel (-1 for all available cores).",
 )
+parser.add_argument(
+    "--device",
+    type=str,
+    default=device,
+    choices=["cpu", "cuda"],
+    help="Device to train XGBoost models on: 'cpu' or 'cuda' (GPU).",
+)
 args = parser.parse_args()
 in_path = args.input
 use_precomputed_features = args.use_precomputed_features
@@ -116,10 +138,20 @@ search_type = args.search_type
 recall_weight = args.recall_weight
 n_hpo_iters = args.n_hpo_iters
 n_jobs = args.n_jobs
+device = args.device
+
+# fall back to the CPU if this xgboost build can't train on the GPU
+if device == "cuda" and not xgb.build_info().get("USE_CUDA", False):
+    logger.warning("XGBoost was built without CUDA support, training on the CPU instead")
+    device = "cpu"
 
 # Create output directory if it doesn't exist
 os.makedirs(out_dir, exist_ok=True)
 
+# the feature matrix is built once, so skip scikit-learn's finiteness checks on every fit, predict and score
+# inside the cross-validation and hyperparameter optimization loops
+set_config(assume_finite=True)
+
 # %%
 # define some functions
 
@@ -136,14 +168,16 @@ def weighted_precision_recall_score(y_true: np.ndarray | list, y_pred: np.ndarra
     Returns:
         Weighted average of precision and recall
     """
-    # Convert to numpy arrays if they're lists
-    if isinstance(y_true, list):
-        y_true = np.array(y_true)
-    if isinstance(y_pred, list):
-        y_pred = np.array(y_pred)
-
-    recall = recall_score(y_true, y_pred)
-    precision = precision_score(y_true, y_pred)
+    # Count true positives, false positives and false negatives in one pass over boolean arrays
+    # (much cheaper than calling precision_score and recall_score inside every fold and trial)
+    y_true = np.asarray(y_true, dtype=bool)
+    y_pred = np.asarray(y_pred, dtype=bool)
+    tp = int(np.count_nonzero(y_true & y_pred))
+    fp = int(np.count_nonzero(y_pred)) - tp
+    fn = int(np.count_nonzero(y_true)) - tp
+
+    precision = tp / (tp + fp) if tp + fp > 0 else 0.0
+    recall = tp / (tp + fn) if tp + fn > 0 else 0.0
     # Calculate weighted average favoring recall
     return float((recall_weight * recall + precision) / (recall_weight + 1))
 
@@ -163,25 +197,72 @@ def weighted_sklearn_metric(y_true: np.ndarray, y_pred_proba: np.ndarray) -> flo
     # For binary classification problems, XGBoost passes probability of positive class
     if len(y_pred_proba.shape) > 1 and y_pred_proba.shape[1] > 1:
         # Multi-class case, take the highest probability
-        y_binary = np.argmax(y_pred_proba, axis=1)
+        y_binary = np.argmax(y_pred_proba, axis=1) > 0
     else:
         # Binary case
-        y_binary = (y_pred_proba > 0.5).astype(int)
-
-    # Handle edge cases with all predictions of one class
-    if len(np.unique(y_binary)) == 1:
-        if y_binary[0] == 1:  # All positives
-            precision_value = np.mean(y_true)  # TP / (TP + FP)
-            recall_value = 1.0  # TP / (TP + FN)
-        else:  # All negatives
-            precision_value = 0.0
-            recall_value = 0.0
-    else:
-        precision_value = precision_score(y_true, y_binary)
-        recall_value = recall_score(y_true, y_binary)
+        y_binary = y_pred_proba > 0.5
 
     # Calculate weighted score (higher is better)
-    return float((recall_weight * recall_value + precision_value) / (recall_weight + 1))
+    return weighted_precision_recall_score(y_true, y_binary)
+
+
+# Custom XGBoost evaluation metric for the native xgb.train API
+def weighted_xgb_metric(y_pred_proba: np.ndarray, dmatrix: xgb.DMatrix) -> tuple[str, float]:
+    """
+    Custom evaluation metric for XGBoost that weights recall more than precision (for the native API).
+
+    Args:
+        y_pred_proba: Predicted probabilities for the positive class
+        dmatrix: DMatrix holding the true labels
+
+    Returns:
+        Tuple of the metric name and the weighted score (higher is better)
+    """
+    return "weighted", weighted_sklearn_metric(dmatrix.get_label(), y_pred_proba)
+
+
+# Feature generation task: one call per (user_id, name) group
+def get_group_features(group: list[Transaction]) -> list[dict[str, float | int | bool]]:
+    """
+    Get the features for every transaction in a group.
+
+    Args:
+        group: All transactions of one user with one vendor
+
+    Returns:
+        The features of each transaction, in the same order as the group
+    """
+    # every feature only looks at the group and the transaction's date and amount, so duplicate
+    # transactions (same date and amount) share one get_features call; the exception is
+    # transaction_recency_felix, which finds the transaction by id and is recomputed for each duplicate
+    group_features = []
+    cache: dict[tuple[str, float], dict[str, float | int | bool]] = {}
+    for transaction in group:
+        key = (transaction.date, transaction.amount)
+        if key in cache:
+            row = dict(cache[key])
+            row["transaction_recency_felix"] = get_transaction_recency(transaction, group.copy())
+        else:
+            # some feature functions sort the transaction list in place, so every call gets its own copy
+            # (just like it did when every transaction was pickled with its own group list)
+            row = cache[key] = get_features(transaction, group.copy())
+        group_features.append(row)
+    return group_features
+
+
+def fit_model(model: Any, features: np.ndarray, labels: np.ndarray) -> Any:
+    """
+    Fit a model, so it can be run as a joblib task.
+
+    Args:
+        model: The unfitted model
+        features: Training features
+        labels: Training labels
+
+    Returns:
+        The fitted model
+    """
+    return model.fit(features, labels)
 
 
 # %%
@@ -200,7 +281,13 @@ logger.info(f"Read {len(transactions)} transactions with {len(y)} labels")
 grouped_transactions = group_transactions(transactions)
 logger.info(f"Grouped {len(transactions)} transactions into {len(grouped_transactions)} groups")
 
-user_ids = [transaction.user_id for transaction in transactions]
+# encode the user ids as int32 group codes once, so the group splitters work on integers instead of
+# hashing the same strings in every split (codes follow the sorted ids, so the splits don't change)
+user_ids = np.unique([transaction.user_id for transaction in transactions], return_inverse=True)[1].astype(np.int32)
+
+# numpy copy of the labels, so folds can be selected with an index array
+# instead of rebuilding a python list for every fold of every trial
+y_arr = np.asarray(y, dtype=np.int8)
 
 # %%
 # get features
@@ -208,22 +295,41 @@ user_ids = [transaction.user_id for transaction in transactions]
 logger.info("Getting features")
 
 if use_precomputed_features:
-    # read the precomputed features
-    features = pd.read_csv(precomputed_features_path).to_dict(orient="records")
-    logger.info(f"Read {len(features)} precomputed features: {len(features[0])} features per transaction")
+    # read the precomputed features straight into a float matrix instead of going through a list of dicts;
+    # sort the columns so they line up with the (alphabetical) order the dict vectorizer uses at predict time
+    features_df = pd.read_csv(precomputed_features_path)
+    features_df = features_df[sorted(features_df.columns)]
+    logger.info(f"Read {len(features_df)} precomputed features: {features_df.shape[1]} features per transaction")
 else:
     # feature generation is parallelized using joblib
-    # Use backend that works better with shared memory
+    # each task computes the features for a whole group, so the group list is pickled once and unpickled
+    # once per group instead of once per transaction; the rows are put back in transaction order
+    # before they are written to the csv file
+    # (the work of a group grows with the square of its size, so the largest groups are dispatched first;
+    # otherwise a large group that is dispatched last keeps one worker busy while the others sit idle)
     try:
-        with joblib.parallel_backend("loky", n_jobs=n_jobs):
-            features = joblib.Parallel(
-                verbose=1,
-            )(
-                joblib.delayed(get_features)(transaction, grouped_transactions[(transaction.user_id, transaction.name)])
-                for transaction in tqdm(transactions, desc="Processing transactions")
-            )
-        # save the features to a csv file
-        pd.DataFrame(features).to_csv(precomputed_features_path, index=False)
+        position = {transaction.id: i for i, transaction in enumerate(transactions)}
+        features: list[dict[str, float | int | bool]] = [{} for _ in transactions]
+        groups = sorted(grouped_transactions.values(), key=len, reverse=True)
+        with joblib.Parallel(n_jobs=n_jobs, backend="loky", return_as="generator", verbose=1) as parallel:
+            for group, rows in zip(
+                groups,
+                tqdm(
+                    parallel(joblib.delayed(get_group_features)(group) for group in groups),
+                    total=len(groups),
+                    desc="Processing groups",
+                ),
+                strict=True,
+            ):
+                for transaction, row in zip(group, rows, strict=True):
+                    features[position[transaction.id]] = row
+        # every row has the same keys, so pull the values out with one itemgetter
+        # instead of letting csv.DictWriter check and look up every key of every row
+        fieldnames = list(features[0])
+        with open(precomputed_features_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerows(map(operator.itemgetter(*fieldnames), features))
         logger.info(f"Generated {len(features)} features")
     except Exception:
         import traceback
@@ -245,10 +351,21 @@ else:
 
 # %%
 # convert all features to a matrix for machine learning
-dict_vectorizer = DictVectorizer(sparse=False)
-X = dict_vectorizer.fit_transform(features)
+# (float32 is plenty for these counts and ratios, and it halves the memory every fold and tree pass reads;
+# xgboost and random forests convert to float32 internally anyway, so the models don't change)
+dict_vectorizer = DictVectorizer(sparse=False, dtype=np.float32)
+if use_precomputed_features:
+    # fit the vectorizer on the column names alone so it can still be saved for 40_predict.py
+    dict_vectorizer.fit([dict.fromkeys(features_df.columns, 0.0)])
+    X = features_df.to_numpy(dtype=np.float32)
+    del features_df
+else:
+    X = dict_vectorizer.fit_transform(features)
+    # the list of feature dicts is by far the largest object in the process and isn't needed anymore
+    del features
+    gc.collect()
 feature_names = dict_vectorizer.get_feature_names_out()  # Get feature names from the vectorizer
-logger.info(f"Converted {len(features)} features into a {X.shape} matrix")
+logger.info(f"Converted {X.shape[0]} features into a {X.shape} matrix")
 
 
 # %%
@@ -269,6 +386,36 @@ if do_hyperparameter_optimization:
     # Create custom scorer
     custom_scorer = make_scorer(weighted_precision_recall_score)
 
+    # Split the data into cross-validation folds once so that every trial shares the same index table
+    # instead of regrouping the users; each fold also holds an inner split of its training rows
+    # into (train, validation) for early stopping
+    cv_splits = []
+    if search_type == "bayesian":
+        cv = GroupKFold(n_splits=n_cv_folds)
+        gss = GroupShuffleSplit(n_splits=1, test_size=0.2, random_state=42)
+        for train_idx, test_idx in cv.split(X_hpo, y_arr, groups=user_ids):
+            inner_train_idx, inner_val_idx = next(gss.split(train_idx, groups=user_ids[train_idx]))
+            cv_splits.append((
+                train_idx.astype(np.int32),
+                test_idx.astype(np.int32),
+                train_idx[inner_train_idx].astype(np.int32),
+                train_idx[inner_val_idx].astype(np.int32),
+            ))
+
+    # For XGBoost, build the quantized matrices for each fold once up front
+    # so that every trial reuses them instead of re-binning the same data
+    fold_dmatrices = []
+    if search_type == "bayesian" and model_type == "xgb":
+        for _, test_idx, inner_train_idx, inner_val_idx in cv_splits:
+            dtrain = xgb.QuantileDMatrix(X_hpo[inner_train_idx], label=y_arr[inner_train_idx])
+            dval = xgb.QuantileDMatrix(X_hpo[inner_val_idx], label=y_arr[inner_val_idx], ref=dtrain)
+            dtest = xgb.QuantileDMatrix(X_hpo[test_idx], ref=dtrain)
+            fold_dmatrices.append((dtrain, dval, dtest, y_arr[test_idx]))
+    elif search_type == "bayesian":
+        # For random forests, copy each fold's rows into the same preallocated buffers in every trial
+        X_train_buf = np.empty((max(len(split[0]) for split in cv_splits), X_hpo.shape[1]), dtype=X_hpo.dtype)
+        X_test_buf = np.empty((max(len(split[1]) for split in cv_splits), X_hpo.shape[1]), dtype=X_hpo.dtype)
+
     # Define Optuna optimization function
     def objective(trial: optuna.Trial) -> float:  # type: ignore[misc]
         """
@@ -308,23 +455,20 @@ if do_hyperparameter_optimization:
                 "gamma": trial.suggest_float("gamma", 0.2, 1.0, log=True),  # Higher min split gain
             }
 
-        # Perform cross-validation
-        cv = GroupKFold(n_splits=n_cv_folds)
         scores = []
 
-        for train_idx, test_idx in cv.split(X_hpo, y, groups=user_ids):
-            X_train, X_test = X_hpo[train_idx], X_hpo[test_idx]
-            y_train = np.array([y[i] for i in train_idx])
-            y_test = np.array([y[i] for i in test_idx])
-
-            if model_type == "xgb":
-                # For XGBoost, create validation set for early stopping
-                gss = GroupShuffleSplit(n_splits=1, test_size=0.2, random_state=42)
-                train_idx2, val_idx = next(gss.split(X_train, y_train, groups=[user_ids[i] for i in train_idx]))
-                X_train_final, X_val = X_train[train_idx2], X_train[val_idx]
-                y_train_final = np.array([y_train[i] for i in train_idx2])
-                y_val = np.array([y_train[i] for i in val_idx])
-
+        if model_type == "xgb":
+            # translate the scikit-learn style parameters to the native API
+            xgb_params = {
+                "objective": "binary:logistic",
+                "tree_method": "hist",
+                "device": device,
+                "disable_default_eval_metric": True,
+                "seed": 42,
+                "nthread": n_jobs,
+                **{k: v for k, v in params.items() if k != "n_estimators"},
+            }
+            for fold, (dtrain, dval, dtest, y_test) in enumerate(fold_dmatrices):
                 # Create early stopping callback explicitly set to maximize our metric
                 early_stopping = EarlyStopping(
                     rounds=50,
@@ -333,30 +477,44 @@ if do_hyperparameter_optimization:
                     maximize=True,  # Important: we want to maximize our weighted metric
                     data_name="validation_0",
                 )
-
-                # Create and train model with early stopping
-                model = xgb.XGBClassifier(
-                    random_state=42,
-                    n_jobs=n_jobs,
-                    eval_metric=weighted_sklearn_metric,  # Use our custom sklearn-compatible metric
-                    callbacks=[early_stopping],  # Use callback instead of early_stopping_rounds
-                    **params,
-                )
-                model.fit(
-                    X_train_final,
-                    y_train_final,
-                    eval_set=[(X_val, y_val)],
-                    verbose=False,
+                booster = xgb.train(
+                    xgb_params,
+                    dtrain,
+                    num_boost_round=params["n_estimators"],
+                    evals=[(dval, "validation_0")],
+                    custom_metric=weighted_xgb_metric,  # Use our custom native metric
+                    callbacks=[early_stopping],
+                    verbose_eval=False,
                 )
-            else:
+
+                # Make predictions and calculate custom score
+                y_pred = (booster.predict(dtest) > 0.5).astype(int)
+                scores.append(weighted_precision_recall_score(y_test, y_pred))
+
+                # Stop uncompetitive trials early based on the running mean score
+                trial.report(float(np.mean(scores)), step=fold)
+                if trial.should_prune():
+                    raise optuna.TrialPruned()
+        else:
+            # Perform cross-validation
+            for fold, (train_idx, test_idx, _, _) in enumerate(cv_splits):
+                X_train = np.take(X_hpo, train_idx, axis=0, out=X_train_buf[: len(train_idx)])
+                X_test = np.take(X_hpo, test_idx, axis=0, out=X_test_buf[: len(test_idx)])
+                y_train, y_test = y_arr[train_idx], y_arr[test_idx]
+
                 # For RF, just train on full training set
                 model = RandomForestClassifier(random_state=42, n_jobs=n_jobs, **params)
                 model.fit(X_train, y_train)
 
-            # Make predictions and calculate custom score
-            y_pred = model.predict(X_test)
-            score = weighted_precision_recall_score(y_test, y_pred)
-            scores.append(score)
+                # Make predictions and calculate custom score
+                y_pred = model.predict(X_test)
+                score = weighted_precision_recall_score(y_test, y_pred)
+                scores.append(score)
+
+                # Stop uncompetitive trials early based on the running mean score
+                trial.report(float(np.mean(scores)), step=fold)
+                if trial.should_prune():
+                    raise optuna.TrialPruned()
 
         # Return mean score across folds
         return float(np.mean(scores))
@@ -364,7 +522,11 @@ if do_hyperparameter_optimization:
     # Set up Optuna study
     if search_type == "bayesian":
         logger.info(f"Starting Bayesian optimization with Optuna for {model_type} model")
-        study = optuna.create_study(direction="maximize")
+        # Prune trials after each cross-validation fold, treating the folds as the resource
+        study = optuna.create_study(
+            direction="maximize",
+            pruner=optuna.pruners.HyperbandPruner(min_resource=1, max_resource=n_cv_folds),
+        )
         study.optimize(objective, n_trials=n_hpo_iters, show_progress_bar=True)
 
         # Get best parameters
@@ -405,7 +567,9 @@ if do_hyperparameter_optimization:
         if model_type == "rf":
             model = RandomForestClassifier(random_state=42, n_jobs=n_jobs)
         elif model_type == "xgb":
-            model = xgb.XGBClassifier(random_state=42, n_jobs=n_jobs, early_stopping_rounds=50)
+            model = xgb.XGBClassifier(
+                random_state=42, tree_method="hist", device=device, n_jobs=n_jobs, early_stopping_rounds=50
+            )
 
         # Set up cross-validation
         cv = GroupKFold(n_splits=n_cv_folds)
@@ -419,7 +583,7 @@ if do_hyperparameter_optimization:
             )
 
         logger.info(f"Searching for best hyperparameters for {model_type} with {search_type} search")
-        search.fit(X_hpo, y, groups=user_ids)
+        search.fit(X_hpo, y_arr, groups=user_ids)
         logger.info(f"Best weighted score: {search.best_score_}")
 
         print("Best Hyperparameters:")
@@ -467,15 +631,14 @@ print(X_m.shape)
 logger.info(f"Training the {model_type} model with {best_params}")
 if model_type == "rf":
     model = RandomForestClassifier(random_state=42, **best_params, n_jobs=n_jobs)
-    model.fit(X_m, y)
+    model.fit(X_m, y_arr)
 elif model_type == "xgb":
     # For the final XGBoost model, use early stopping with a validation set
     # Create a validation set using GroupShuffleSplit to respect user_id boundaries
     gss = GroupShuffleSplit(n_splits=1, test_size=0.2, random_state=42)
-    train_idx, val_idx = next(gss.split(X_m, y, groups=user_ids))
+    train_idx, val_idx = next(gss.split(X_m, y_arr, groups=user_ids))
     X_train_final, X_val = X_m[train_idx], X_m[val_idx]
-    y_train_final = np.array([y[i] for i in train_idx])
-    y_val = np.array([y[i] for i in val_idx])
+    y_train_final, y_val = y_arr[train_idx], y_arr[val_idx]
 
     # Create early stopping callback explicitly set to maximize our metric
     early_stopping = EarlyStopping(
@@ -489,6 +652,8 @@ elif model_type == "xgb":
     # Create XGBoost model with early stopping
     model = xgb.XGBClassifier(
         random_state=42,
+        tree_method="hist",
+        device=device,
         eval_metric=weighted_sklearn_metric,  # Use our custom sklearn-compatible metric
         callbacks=[early_stopping],  # Use callback instead of early_stopping_rounds
         **best_params,
@@ -507,29 +672,32 @@ elif model_type == "xgb":
         best_params["n_estimators"] = model.best_iteration
 
 # %%
-# train the full model with the best hyperparameters
+# keep the early-stopped model instead of training it again from scratch on the full data set
 
-model = xgb.XGBClassifier(random_state=42, **best_params, n_jobs=n_jobs)
-model.fit(X, y)
-logger.info(f"Ttrain full model with {model.n_estimators} estimators")
+if model_type == "xgb":
+    # the booster was cut back to its best iteration; drop the training-only metric and callbacks
+    # so the saved model can be loaded without the functions defined in this script
+    model.set_params(eval_metric=None, callbacks=None)
+    logger.info(f"Keeping the early-stopped model with {model.get_booster().num_boosted_rounds()} estimators")
 
 # %%
 # review feature importances
 
 importances = model.feature_importances_
 
-# sort the importances
-sorted_importances = sorted(zip(importances, feature_names, strict=True), key=lambda x: x[0], reverse=True)
+# sort the importances (stable, so ties keep the feature order)
+order = np.argsort(-importances, kind="stable")
 
 # print the features and their importances
-for importance, feature in sorted_importances:
-    print(f"{feature}: {importance}")
+for i in order:
+    print(f"{feature_names[i]}: {importances[i]}")
 
 # %%
 # save the model using joblib
 
 logger.info(f"Saving the {model_type} model to {out_dir}")
-joblib.dump(model, os.path.join(out_dir, "model.joblib"))
+# (uncompressed, so 40_predict.py can memory-map its arrays instead of reading them into memory)
+joblib.dump(model, os.path.join(out_dir, "model.joblib"), compress=0, protocol=5)
 # save the dict vectorizer as well
 joblib.dump(dict_vectorizer, os.path.join(out_dir, "dict_vectorizer.joblib"))
 # save the best params to a json file
@@ -573,7 +741,7 @@ print(f"     {cm[1][0]:<20} {cm[1][1]}")
 # %%
 # get the misclassified transactions
 
-misclassified = [transactions[i] for i, yp in enumerate(y_pred) if yp != y[i]]
+misclassified = [transactions[i] for i in np.flatnonzero(y_pred != y_arr)]
 logger.info(f"Found {len(misclassified)} misclassified transactions (bias error)")
 
 # save the misclassified transactions to a csv file in the output directory
@@ -593,86 +761,84 @@ print(X_cv.shape)
 
 # %%
 
-# n_estimators = 240
-# best_params["n_estimators"] = n_estimators
-
-for n_estimators in range(210, 220, 10):
-    best_params["n_estimators"] = n_estimators
-    cv = GroupKFold(n_splits=n_cv_folds)
-
-    misclassified = []
-    false_positives = set()
-    false_negatives = set()
-    precisions = []
-    recalls = []
-    f1s = []
-    weighted_scores = []
-
-    logger.info(f"Starting cross-validation with {n_cv_folds} folds and {best_params}")
-    for fold, (train_idx, val_idx) in enumerate(cv.split(X_cv, y, groups=user_ids)):
-        logger.info(f"Fold {fold + 1} of {n_cv_folds}")
-        # Get training and validation data
-        X_train, X_val = X_cv[train_idx], X_cv[val_idx]
-        y_train, y_val = np.array(y)[train_idx], np.array(y)[val_idx]
-        transactions_val = [transactions[i] for i in val_idx]  # Keep the original transaction instances for this fold
-
-        # Train the model
-        if model_type == "rf":
-            model = RandomForestClassifier(random_state=42, **best_params, n_jobs=n_jobs)
-            model.fit(X_train, y_train)
+# evaluate with a fixed number of boosting rounds
+n_estimators = 210
+best_params["n_estimators"] = n_estimators
+cv = GroupKFold(n_splits=n_cv_folds)
 
-        elif model_type == "xgb":
-            # No need for early stopping during cross-validation evaluation
-            # We've already determined the optimal n_estimators in the model training phase
-            model = xgb.XGBClassifier(
-                random_state=42,
-                n_jobs=n_jobs,
-                **best_params,  # This already contains the optimized n_estimators
-            )
-            model.fit(X_train, y_train)
-
-        # Make predictions
-        y_pred = model.predict(X_val)
-
-        # Find misclassified instances
-        misclassified_fold = [transactions_val[i] for i in range(len(y_val)) if y_val[i] != y_pred[i]]
-        misclassified.extend(misclassified_fold)
-
-        # track false positives and false negatives
-        false_positives.update([
-            transactions_val[i] for i in range(len(y_val)) if y_val[i] != y_pred[i] and y_val[i] == 0
-        ])
-        false_negatives.update([
-            transactions_val[i] for i in range(len(y_val)) if y_val[i] != y_pred[i] and y_val[i] == 1
-        ])
-
-        # Calculate and report scores
-        precision = precision_score(y_val, y_pred)
-        recall = recall_score(y_val, y_pred)
-        f1 = f1_score(y_val, y_pred)
-        weighted_score = weighted_precision_recall_score(y_val, y_pred)
-
-        precisions.append(precision)
-        recalls.append(recall)
-        f1s.append(f1)
-        weighted_scores.append(weighted_score)
-
-        print(
-            f"Fold {fold + 1} Precision: {precision:.2f}, Recall: {recall:.2f}, F1: {f1:.2f}, "
-            f"Weighted: {weighted_score:.2f}"
+misclassified = []
+# flag false positives and false negatives in boolean masks over all transactions
+# (indexed by position in transactions) instead of hashing Transaction objects into sets
+false_positives = np.zeros(len(transactions), dtype=bool)
+false_negatives = np.zeros(len(transactions), dtype=bool)
+precisions = []
+recalls = []
+f1s = []
+weighted_scores = []
+
+logger.info(f"Starting cross-validation with {n_cv_folds} folds and {best_params}")
+for fold, (train_idx, val_idx) in enumerate(cv.split(X_cv, y_arr, groups=user_ids)):
+    logger.info(f"Fold {fold + 1} of {n_cv_folds}")
+    # Get training and validation data
+    X_train, X_val = X_cv[train_idx], X_cv[val_idx]
+    y_train, y_val = y_arr[train_idx], y_arr[val_idx]
+
+    # Train the model
+    if model_type == "rf":
+        model = RandomForestClassifier(random_state=42, **best_params, n_jobs=n_jobs)
+        model.fit(X_train, y_train)
+
+    elif model_type == "xgb":
+        # No need for early stopping during cross-validation evaluation
+        # We've already determined the optimal n_estimators in the model training phase
+        model = xgb.XGBClassifier(
+            random_state=42,
+            tree_method="hist",
+            device=device,
+            n_jobs=n_jobs,
+            **best_params,  # This already contains the optimized n_estimators
         )
-        print(f"Misclassified Instances in Fold {fold + 1}: {len(misclassified_fold)}")
-
-    # print the average precision, recall, and f1 score for all folds
-    print(f"Model type: {model_type}")
-    print(f"n_estimators: {n_estimators}")
-    print(f"\nAverage Metrics Across {n_cv_folds} Folds:")
-    print(f"Precision: {sum(precisions) / len(precisions):.3f}")
-    print(f"Recall: {sum(recalls) / len(recalls):.3f}")
-    print(f"F1 Score: {sum(f1s) / len(f1s):.3f}")
-    print(f"Weighted Score (recall x{recall_weight}): {sum(weighted_scores) / len(weighted_scores):.3f}")
-    print(f"False positives: {len(false_positives)}")
-    print(f"False negatives: {len(false_negatives)}")
+        model.fit(X_train, y_train)
+
+    # Make predictions
+    y_pred = model.predict(X_val)
+
+    # Find misclassified instances
+    wrong = y_pred != y_val
+    misclassified_fold = [transactions[i] for i in val_idx[wrong]]
+    misclassified.extend(misclassified_fold)
+
+    # track false positives and false negatives
+    false_positives[val_idx[wrong & (y_val == 0)]] = True
+    false_negatives[val_idx[wrong & (y_val == 1)]] = True
+
+    # Calculate and report scores
+    precision = precision_score(y_val, y_pred)
+    recall = recall_score(y_val, y_pred)
+    f1 = f1_score(y_val, y_pred)
+    weighted_score = weighted_precision_recall_score(y_val, y_pred)
+
+    precisions.append(precision)
+    recalls.append(recall)
+    f1s.append(f1)
+    weighted_scores.append(weighted_score)
+
+    print(
+        f"Fold {fold + 1} Precision: {precision:.2f}, Recall: {recall:.2f}, F1: {f1:.2f}, "
+        f"Weighted: {weighted_score:.2f}"
+    )
+    print(f"Misclassified Instances in Fold {fold + 1}: {len(misclassified_fold)}")
+
+# print the average precision, recall, and f1 score for all folds
+print(f"Model type: {model_type}")
+print(f"n_estimators: {n_estimators}")
+print(f"\nAverage Metrics Across {n_cv_folds} Folds:")
+print(f"Precision: {sum(precisions) / len(precisions):.3f}")
+print(f"Recall: {sum(recalls) / len(recalls):.3f}")
+print(f"F1 Score: {sum(f1s) / len(f1s):.3f}")
+print(f"Weighted Score (recall x{recall_weight}): {sum(weighted_scores) / len(weighted_scores):.3f}")
+print(f"False positives: {np.count_nonzero(false_positives)}")
+print(f"False negatives: {np.count_nonzero(false_negatives)}")
 
 # %%
 # save the misclassified transactions to a csv file in the output directory
@@ -695,15 +861,15 @@ for name, count in sorted(misclassified_by_name.items(), key=lambda x: x[1], rev
 # print the false positives and false negatives by name
 print("\nFalse positives by name:")
 false_positives_by_name: dict[str, int] = defaultdict(int)
-for transaction in false_positives:
-    false_positives_by_name[transaction.name] += 1
+for i in np.flatnonzero(false_positives):
+    false_positives_by_name[transactions[i].name] += 1
 for name, count in sorted(false_positives_by_name.items(), key=lambda x: x[1], reverse=True):
     print(f"{name}: {count}")
 
 print("\nFalse negatives by name:")
 false_negatives_by_name: dict[str, int] = defaultdict(int)
-for transaction in false_negatives:
-    false_negatives_by_name[transaction.name] += 1
+for i in np.flatnonzero(false_negatives):
+    false_negatives_by_name[transactions[i].name] += 1
 for name, count in sorted(false_negatives_by_name.items(), key=lambda x: x[1], reverse=True):
     print(f"{name}: {count}")
 
@@ -718,20 +884,25 @@ misclassified_name_to_user_ids = defaultdict(set)
 for transaction in misclassified:
     misclassified_name_to_user_ids[transaction.name].add(transaction.user_id)
 
+# the positions of the transactions for each user_id and name, in file order
+# (the masks are indexed by position, and transaction ids can have gaps)
+positions_by_group: dict[tuple[str, str], list[int]] = defaultdict(list)
+for i, transaction in enumerate(transactions):
+    positions_by_group[(transaction.user_id, transaction.name)].append(i)
+
 transactions_to_review = []
 labels = []
 # loop through the names in reverse order of misclassified transactions
 for name, _ in sorted(misclassified_by_name.items(), key=lambda x: x[1], reverse=True):
     for user_id in misclassified_name_to_user_ids[name]:
-        for transaction in transactions:
-            if transaction.name == name and transaction.user_id == user_id:
-                transactions_to_review.append(transaction)
-                label = ""
-                if transaction in false_positives:
-                    label = "fp"
-                elif transaction in false_negatives:
-                    label = "fn"
-                labels.append(label)
+        for i in positions_by_group[(user_id, name)]:
+            transactions_to_review.append(transactions[i])
+            label = ""
+            if false_positives[i]:
+                label = "fp"
+            elif false_negatives[i]:
+                label = "fn"
+            labels.append(label)
 
 # save the transactions to a csv file
 logger.info(
@@ -744,17 +915,38 @@ write_labeled_transactions(os.path.join(out_dir, "transactions_to_review.csv"),
 # analyze the features using SHAP
 # this step takes a LONG time and is optional
 
-# create a tree explainer
-# explainer = shap.TreeExplainer(model)
-# Faster approximation using PermutationExplainer
-X_sample = X[:10000]  # type: ignore
-explainer = shap.TreeExplainer(model)
-
-logger.info("Calculating SHAP values")
-shap_values = explainer.shap_values(X_sample)
+# sample up to 10000 transactions stratified by label (30% recurring, when there are enough of them)
+# so that both classes show up in the summary, instead of the first rows of the file
+rng = np.random.default_rng(42)
+n_sample = min(10000, len(y_arr))
+pos_idx, neg_idx = np.flatnonzero(y_arr == 1), np.flatnonzero(y_arr == 0)
+n_pos = min(len(pos_idx), max(int(0.3 * n_sample), n_sample - len(neg_idx)))
+sample_idx = np.sort(
+    np.concatenate([
+        rng.choice(pos_idx, n_pos, replace=False),
+        rng.choice(neg_idx, n_sample - n_pos, replace=False),
+    ])
+)
+X_sample = X[sample_idx]
+
+# use approximate (Saabas-style) contributions; they are much cheaper than exact tree SHAP
+# and good enough for a summary plot
+logger.info(f"Calculating SHAP values for {n_pos} recurring and {n_sample - n_pos} non-recurring transactions")
+if model_type == "xgb":
+    # xgboost computes the contributions natively; the last column holds the bias term
+    contribs = model.get_booster().predict(xgb.DMatrix(X_sample), pred_contribs=True, approx_contribs=True)
+    shap_values = contribs[:, :-1]
+else:
+    # create a tree explainer
+    explainer = shap.TreeExplainer(model)
+    shap_values = explainer.shap_values(X_sample, approximate=True, check_additivity=False)
 
 # Plot SHAP summary
-shap.summary_plot(shap_values, X_sample, feature_names=feature_names)
+shap.summary_plot(shap_values, X_sample, feature_names=feature_names, show=False)
+plt.savefig(os.path.join(out_dir, "shap_summary.png"), bbox_inches="tight")
+if show_plots:
+    plt.show()
+plt.close()
 
 # %%
 #
@@ -765,88 +957,147 @@ print("Best params:", best_params)
 if model_type == "rf":
     model = RandomForestClassifier(random_state=42, **best_params, n_jobs=n_jobs)
 elif model_type == "xgb":
-    model = xgb.XGBClassifier(random_state=42, **best_params, n_jobs=n_jobs)
+    model = xgb.XGBClassifier(random_state=42, tree_method="hist", device=device, **best_params, n_jobs=n_jobs)
 custom_scorer = make_scorer(weighted_precision_recall_score)
 
 # First split data into train/test sets respecting user grouping
 logger.info("Splitting data into train/test sets respecting user grouping")
 gss = GroupShuffleSplit(n_splits=1, test_size=0.3, random_state=42)
-train_idx, test_idx = next(gss.split(X, y, groups=user_ids))
+train_idx, test_idx = next(gss.split(X, y_arr, groups=user_ids))
 
 X_train, X_test = X[train_idx], X[test_idx]
-y_train = np.array([y[i] for i in train_idx])
-y_test = np.array([y[i] for i in test_idx])
-user_ids_train = [user_ids[i] for i in train_idx]
+y_train, y_test = y_arr[train_idx], y_arr[test_idx]
+user_ids_train = user_ids[train_idx]
+
+# Recursive feature elimination runs in two passes to keep the number of model fits down:
+# a coarse pass drops a quarter of the features per round to find roughly how many features to keep,
+# then a fine pass steps through the features that survived the last two coarse rounds,
+# from one coarse step above the coarse optimum down to one coarse step below it
+coarse_step_pct = 0.25
+fine_step_pct = 0.02
+min_features_to_select = 50
+cv = GroupKFold(n_splits=n_cv_folds)
+
+logger.info(f"Performing coarse recursive feature elimination with step {coarse_step_pct:.0%}")
+rfecv_coarse = RFECV(
+    estimator=model,
+    step=coarse_step_pct,
+    cv=cv,
+    scoring=custom_scorer,  # Using our custom scorer that weights recall more than precision
+    min_features_to_select=min_features_to_select,
+    n_jobs=n_jobs,
+    importance_getter="feature_importances_",
+)
+rfecv_coarse.fit(X_train, y_train, groups=user_ids_train)
+logger.info(f"Coarse optimal number of features: {rfecv_coarse.n_features_}")
 
-# Calculate step size as percentage of features (more efficient)
-step_pct = 0.005
-step_size = max(1, int(step_pct * X.shape[1]))  # 1% of features per step
+# ranking 1 is the coarse optimum, ranking 2 the features eliminated in the round that reached it
+candidate_features = np.flatnonzero(rfecv_coarse.ranking_ <= 2)
+coarse_step_size = max(1, int(coarse_step_pct * X.shape[1]))
+step_size = max(1, int(fine_step_pct * X.shape[1]))
 
 # RFECV performs recursive feature elimination with cross-validation
 # to find the optimal number of features
-logger.info(f"Performing recursive feature elimination with step size {step_size}")
-cv = GroupKFold(n_splits=n_cv_folds)
+logger.info(
+    f"Performing recursive feature elimination on {len(candidate_features)} features with step size {step_size}"
+)
 rfecv = RFECV(
     estimator=model,
     step=step_size,
     cv=cv,
     scoring=custom_scorer,  # Using our custom scorer that weights recall more than precision
-    min_features_to_select=50,  # Minimum number of features to select
+    min_features_to_select=max(min_features_to_select, rfecv_coarse.n_features_ - coarse_step_size),
     n_jobs=n_jobs,
+    importance_getter="feature_importances_",
 )
 
 # Fit the RFECV on training data only
-rfecv.fit(X_train, y_train, groups=user_ids_train)
+rfecv.fit(X_train[:, candidate_features], y_train, groups=user_ids_train)
 logger.info(f"Optimal number of features: {rfecv.n_features_}")
 
-# Get the selected features
-selected_features = [i for i, selected in enumerate(rfecv.support_) if selected]
-selected_feature_names = [feature_names[i] for i in selected_features]
+# Get the selected features (as a boolean mask over the columns of X)
+selected_mask = np.zeros(X.shape[1], dtype=bool)
+selected_mask[candidate_features[rfecv.support_]] = True
+selected_feature_names = feature_names[selected_mask].tolist()
 print(f"Selected {len(selected_feature_names)} features")
 
 # Get the eliminated features
-eliminated_features = [feature_names[i] for i in range(len(feature_names)) if i not in selected_features]
+eliminated_features = feature_names[~selected_mask].tolist()
 print(f"Eliminated {len(eliminated_features)} features")
 
 # Save selected features to a text file
 selected_features_path = os.path.join(out_dir, "selected_features.txt")
 with open(selected_features_path, "w") as f:
-    for feature in selected_feature_names:
-        f.write(f"{feature}\n")
+    f.writelines(f"{feature}\n" for feature in selected_feature_names)
 logger.info(f"Saved {len(selected_feature_names)} selected features to {selected_features_path}")
 
 # Save eliminated features to a text file
 eliminated_features_path = os.path.join(out_dir, "eliminated_features.txt")
 with open(eliminated_features_path, "w") as f:
-    for feature in eliminated_features:
-        f.write(f"{feature}\n")
+    f.writelines(f"{feature}\n" for feature in eliminated_features)
 logger.info(f"Saved {len(eliminated_features)} eliminated features to {eliminated_features_path}")
 
 # %%
 # plot the RFECV results
 
 # Plot the CV scores vs number of features
-plt.figure(figsize=(10, 6))
-plt.plot(range(1, len(rfecv.cv_results_["mean_test_score"]) + 1), rfecv.cv_results_["mean_test_score"], "o-")
-plt.xlabel(f"Number of features (multiply by {step_size})")
-plt.ylabel("Cross-validation accuracy")
-plt.title("Accuracy vs. Number of Features")
-plt.grid(True)
-plt.savefig(os.path.join(out_dir, "feature_selection_curve.png"))
-plt.show()
+fig, ax = plt.subplots(figsize=(10, 6))
+ax.plot(rfecv.cv_results_["n_features"], rfecv.cv_results_["mean_test_score"], "o-")
+ax.set_xlabel("Number of features")
+ax.set_ylabel("Cross-validation accuracy")
+ax.set_title("Accuracy vs. Number of Features")
+ax.grid(True)
+fig.savefig(os.path.join(out_dir, "feature_selection_curve.png"))
+if show_plots:
+    plt.show()
+plt.close(fig)
 
 # %%
 # Train models with selected features using the already created train/test split
 
-X_train_selected = X_train[:, selected_features]  # type: ignore
-X_test_selected = X_test[:, selected_features]  # type: ignore
-
-logger.info("Training model with selected features")
+# X is a dense ndarray, so select the columns with the boolean mask instead of a python list of indices
+X_train_selected = X_train[:, selected_mask]
+X_test_selected = X_test[:, selected_mask]
+
+# The all-features model is cached on disk, keyed on everything it is trained from, so reruns on the same data
+# and parameters skip its fit (rfecv.estimator_ is only fit on the selected features, so it can't be reused)
+model_all_path = os.path.join(out_dir, "model_all.joblib")
+model_all_key = joblib.hash((model_type, device, sorted(best_params.items()), X_train, y_train))
+cached_model_all = joblib.load(model_all_path) if os.path.exists(model_all_path) else None
+if cached_model_all is not None and cached_model_all["key"] != model_all_key:
+    cached_model_all = None
+fit_model_all = cached_model_all is None
+
+# When both models need to be trained, they are fit concurrently with half of the jobs each,
+# since a single forest or booster doesn't keep scaling with the number of threads
+n_jobs_per_model = max(1, joblib.effective_n_jobs(n_jobs) // 2) if fit_model_all else n_jobs
 if model_type == "rf":
-    model_selected = RandomForestClassifier(random_state=42, **best_params, n_jobs=n_jobs)
+    model_selected = RandomForestClassifier(random_state=42, **best_params, n_jobs=n_jobs_per_model)
+    model_all = RandomForestClassifier(random_state=42, **best_params, n_jobs=n_jobs_per_model)
 elif model_type == "xgb":
-    model_selected = xgb.XGBClassifier(random_state=42, **best_params, n_jobs=n_jobs)
-model_selected.fit(X_train_selected, y_train)
+    model_selected = xgb.XGBClassifier(
+        random_state=42, tree_method="hist", device=device, **best_params, n_jobs=n_jobs_per_model
+    )
+    model_all = xgb.XGBClassifier(
+        random_state=42, tree_method="hist", device=device, **best_params, n_jobs=n_jobs_per_model
+    )
+models_to_fit = [(model_selected, X_train_selected)]
+if cached_model_all is None:
+    logger.info("Training models with selected features and with all features")
+    models_to_fit.append((model_all, X_train))
+else:
+    logger.info(f"Training model with selected features, reusing the model with all features from {model_all_path}")
+    model_all = cached_model_all["model"]
+del cached_model_all
+
+fitted_models = joblib.Parallel(n_jobs=len(models_to_fit), backend="loky")(
+    joblib.delayed(fit_model)(estimator, X_fit, y_train) for estimator, X_fit in models_to_fit
+)
+model_selected = fitted_models[0]
+if fit_model_all:
+    model_all = fitted_models[1]
+    joblib.dump({"key": model_all_key, "model": model_all}, model_all_path, compress=3)
+del fitted_models, models_to_fit
 
 # Evaluate model with selected features
 y_pred_selected = model_selected.predict(X_test_selected)
@@ -862,12 +1113,6 @@ print(f"Weighted Score (recall x{recall_weight}): {weighted_score:.3f}")
 
 # %%
 # Compare with model using all features
-logger.info("Training model with all features")
-if model_type == "rf":
-    model_all = RandomForestClassifier(random_state=42, **best_params, n_jobs=n_jobs)
-elif model_type == "xgb":
-    model_all = xgb.XGBClassifier(random_state=42, **best_params, n_jobs=n_jobs)
-model_all.fit(X_train, y_train)
 y_pred_all = model_all.predict(X_test)
 precision_all = precision_score(y_test, y_pred_all)
 recall_all = recall_score(y_test, y_pred_all)
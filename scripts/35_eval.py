@@ -13,6 +13,37 @@ import numpy as np
 import pandas as pd
 
 
+def _recurring_stats(key_name: str, keys: np.ndarray, codes: np.ndarray, recurring: pd.Series) -> pd.DataFrame:
+    """
+    Count the transactions and the recurring transactions for each key.
+
+    Args:
+        key_name: Name of the key column in the result
+        keys: The distinct keys, in sorted order
+        codes: The index into keys of each transaction (-1 for a missing key)
+        recurring: The recurring label of each transaction
+
+    Returns:
+        DataFrame with the keys, their total and recurring counts and their recurring percentages
+    """
+    # count and sum the labels per key with bincount instead of a hash groupby
+    # (transactions with a missing key are dropped, like groupby drops them, and missing labels are skipped)
+    has_key = codes >= 0
+    codes = codes[has_key]
+    labeled = recurring.notna().to_numpy()[has_key]
+    labels = recurring.fillna(0).to_numpy(np.float64)[has_key]
+    total_count = np.bincount(codes, weights=labeled, minlength=len(keys)).astype(np.int64)
+    recurring_count = np.bincount(codes, weights=labels, minlength=len(keys))
+    if pd.api.types.is_integer_dtype(recurring.dtype):
+        recurring_count = recurring_count.astype(np.int64)
+
+    stats = pd.DataFrame({key_name: keys, "total_count": total_count, "recurring_count": recurring_count})
+
+    # Calculate the percentage of recurring transactions
+    stats["recurring_pct"] = stats["recurring_count"] / stats["total_count"]
+    return stats
+
+
 def find_highly_recurring_names(df: pd.DataFrame, threshold: float = 0.9) -> pd.DataFrame:
     """
     Find transaction names where at least threshold% of transactions are marked recurring.
@@ -25,17 +56,8 @@ def find_highly_recurring_names(df: pd.DataFrame, threshold: float = 0.9) -> pd.
         DataFrame with names and their recurring percentages
     """
     # Group by name and calculate percentage of recurring transactions
-    name_stats = (
-        df.groupby("name")
-        .agg(
-            total_count=("recurring", "count"),
-            recurring_count=("recurring", "sum"),
-        )
-        .reset_index()
-    )
-
-    # Calculate the percentage of recurring transactions
-    name_stats["recurring_pct"] = name_stats["recurring_count"] / name_stats["total_count"]
+    codes, names = pd.factorize(df["name"], sort=True)
+    name_stats = _recurring_stats("name", np.asarray(names), codes, df["recurring"])
 
     # Filter for names with at least threshold% recurring transactions
     highly_recurring = name_stats[name_stats["recurring_pct"] >= threshold]
@@ -59,20 +81,15 @@ def find_highly_recurring_amounts(df: pd.DataFrame, threshold: float = 0.5, min_
         DataFrame with amounts and their recurring percentages
     """
     # Round amounts to 2 decimal places to handle floating point precision issues
-    df["amount_rounded"] = np.round(df["amount"], 2)
+    amounts = np.round(df["amount"].to_numpy(np.float64), 2)
 
     # Group by amount and calculate percentage of recurring transactions
-    amount_stats = (
-        df.groupby("amount_rounded")
-        .agg(
-            total_count=("recurring", "count"),
-            recurring_count=("recurring", "sum"),
-        )
-        .reset_index()
-    )
-
-    # Calculate the percentage of recurring transactions
-    amount_stats["recurring_pct"] = amount_stats["recurring_count"] / amount_stats["total_count"]
+    # (missing amounts get the code -1, so they are dropped like groupby drops them)
+    has_amount = ~np.isnan(amounts)
+    keys, amount_codes = np.unique(amounts[has_amount], return_inverse=True)
+    codes = np.full(len(amounts), -1, dtype=np.int64)
+    codes[has_amount] = amount_codes
+    amount_stats = _recurring_stats("amount_rounded", keys, codes, df["recurring"])
 
     # Filter for amounts with at least threshold% recurring transactions and minimum count
     highly_recurring = amount_stats[
@@ -91,7 +108,13 @@ if __name__ == "__main__":
     out_dir.mkdir(exist_ok=True)
 
     # Read the CSV file
-    df = pd.read_csv(csv_path)
+    # (only the columns the analysis uses, with an explicit schema instead of inferred dtypes;
+    # names are read as a categorical, so they are stored once and grouped by their integer codes)
+    df = pd.read_csv(
+        csv_path,
+        usecols=["name", "amount", "recurring"],
+        dtype={"name": "category", "amount": "float64", "recurring": "Int8"},
+    )
     print(f"Read {len(df)} transactions from {csv_path}")
 
     # Find names with at least 90% recurring transactions
@@ -101,8 +124,20 @@ if __name__ == "__main__":
     print(f"\nFound {len(highly_recurring_names)} transaction names with ≥90% recurring transactions")
 
     print("\nTop recurring transaction names:")
-    for _, row in highly_recurring_names.head(20).iterrows():
-        print(f"{row['name']}: {row['recurring_pct']:.1%} ({row['recurring_count']}/{row['total_count']})")
+    # build the lines with column-wise string ops instead of materializing a Series per row with iterrows
+    top_names = highly_recurring_names.head(20)
+    name_lines = (
+        top_names["name"].astype(str)
+        + ": "
+        + top_names["recurring_pct"].map("{:.1%}".format)
+        + " ("
+        + top_names["recurring_count"].astype(str)
+        + "/"
+        + top_names["total_count"].astype(str)
+        + ")"
+    )
+    for line in name_lines:
+        print(line)
 
     # Save to CSV for further analysis
     names_file = out_dir / "highly_recurring_names.csv"
@@ -116,10 +151,20 @@ if __name__ == "__main__":
     print(f"\nFound {len(highly_recurring_amounts)} tx amounts with ≥50% recurring txs (min 10 occurrences)")
 
     print("\nTop recurring transaction amounts:")
-    for _, row in highly_recurring_amounts.head(20).iterrows():
-        print(
-            f"${row['amount_rounded']:.2f}: {row['recurring_pct']:.1%} ({row['recurring_count']}/{row['total_count']})"
-        )
+    top_amounts = highly_recurring_amounts.head(20)
+    amount_lines = (
+        "$"
+        + top_amounts["amount_rounded"].map("{:.2f}".format)
+        + ": "
+        + top_amounts["recurring_pct"].map("{:.1%}".format)
+        + " ("
+        + top_amounts["recurring_count"].astype(str)
+        + "/"
+        + top_amounts["total_count"].astype(str)
+        + ")"
+    )
+    for line in amount_lines:
+        print(line)
 
     # Save to CSV for further analysis
     amounts_file = out_dir / "highly_recurring_amounts.csv"
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+Find features that duplicate each other in the precomputed features written by 30_train.py
+"""
+
+# %%
+import argparse
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+# %%
+# configure the script
+
+precomputed_features_path = "precomputed features"
+threshold = 0.99  # report pairs of features whose absolute correlation is at least this
+
+# %%
+# parse script arguments from command line
+parser = argparse.ArgumentParser(description="Find duplicate and highly correlated features.")
+parser.add_argument("--f", help="ignore; used by ipykernel_launcher")
+parser.add_argument(
+    "--precomputed_features",
+    type=str,
+    default=precomputed_features_path,
+    help="Path to the precomputed features CSV file.",
+)
+parser.add_argument(
+    "--threshold", type=float, default=threshold, help="Minimum absolute Pearson correlation to report."
+)
+args = parser.parse_args()
+
+precomputed_features_path = args.precomputed_features
+threshold = args.threshold
+
+# %%
+# read the features
+features_df = pd.read_csv(precomputed_features_path)
+names = list(features_df.columns)
+X = features_df.to_numpy(np.float64)
+logger.info(f"Read {X.shape[0]} rows of {X.shape[1]} features from {precomputed_features_path}")
+
+# %%
+# features with exactly the same values on every row
+# (on a sample this can be a coincidence, e.g. features that are all zero; check the code before merging them)
+columns_by_values: dict[bytes, list[str]] = {}
+for name, column in zip(names, X.T, strict=True):
+    columns_by_values.setdefault(column.tobytes(), []).append(name)
+identical = [columns for columns in columns_by_values.values() if len(columns) > 1]
+logger.info(f"Found {len(identical)} sets of identical features")
+for columns in identical:
+    print(", ".join(columns))
+
+# %%
+# pairs of (non-constant) features whose values are highly correlated
+varying = X.std(axis=0) > 0
+varying_names = [name for name, is_varying in zip(names, varying, strict=True) if is_varying]
+# (np.corrcoef only returns a matrix for at least two features)
+if varying.sum() >= 2:
+    corr = np.corrcoef(X[:, varying], rowvar=False)
+    rows, cols = np.nonzero(np.triu(np.abs(corr) >= threshold, k=1))
+    logger.info(f"Found {len(rows)} pairs of features with an absolute correlation of at least {threshold}")
+    for i, j in sorted(zip(rows, cols, strict=True), key=lambda pair: -abs(corr[pair])):
+        print(f"{varying_names[i]}, {varying_names[j]}: {corr[i, j]:.4f}")
+else:
+    logger.info(f"Found {varying.sum()} non-constant features, so there are no pairs to correlate")
+
+# %%
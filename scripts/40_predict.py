@@ -5,20 +5,25 @@ Load a model and make predictions on transaction files
 
 # %%
 import argparse
-import gc
+import csv
 import glob
+import hashlib
 import os
+from dataclasses import astuple, fields
 
 import joblib
+import numpy as np
 from loguru import logger
 from tqdm import tqdm
 
+import recur_scan
 from recur_scan.features import get_features
+from recur_scan.features_felix import get_transaction_recency
 from recur_scan.transactions import (
+    Transaction,
     group_transactions,
     read_earnin_test_transactions,
     read_test_transactions,
-    write_transactions,
 )
 
 # %%
@@ -30,6 +35,10 @@ model_dir = "training output"  # directory containing model.joblib and dict_vect
 in_dir = "test data"
 out_dir = "test output"
 n_jobs = -1  # number of jobs to run in parallel
+batch_size = 100000  # number of transactions to generate features for and predict at a time
+use_cache = True  # cache the grouped transactions and the features of each input file in out_dir/.cache
+cache_version = 2  # bump when the pickled layout of Transaction changes, e.g. 2: Transaction uses __slots__
+only_used_features = True  # only keep the features the model splits on in the feature rows
 
 # %%
 # parse script arguments from command line
@@ -39,38 +48,208 @@ parser.add_argument("--model_dir", type=str, default=model_dir, help="Directory
 parser.add_argument("--input", type=str, default=in_dir, help="Path to the input directory containing CSV files.")
 parser.add_argument("--output", type=str, default=out_dir, help="Path to the output directory.")
 parser.add_argument("--jobs", type=int, default=n_jobs, help="Number of jobs to run in parallel.")
+parser.add_argument(
+    "--batch_size",
+    type=int,
+    default=batch_size,
+    help="Number of transactions to predict at a time (larger batches use more memory but fewer predict calls).",
+)
+parser.add_argument(
+    "--no-cache",
+    dest="use_cache",
+    action="store_false",
+    default=use_cache,
+    help="Don't read or write the cached grouped transactions and features.",
+)
+parser.add_argument(
+    "--all-features",
+    dest="only_used_features",
+    action="store_false",
+    default=only_used_features,
+    help="Keep every feature in the feature rows, not only the features the model uses.",
+)
 args = parser.parse_args()
 
 model_dir = args.model_dir
 in_dir = args.input
 out_dir = args.output
 n_jobs = args.jobs
+batch_size = args.batch_size
+use_cache = args.use_cache
+only_used_features = args.only_used_features
 
 # Create output directory if it doesn't exist
 os.makedirs(out_dir, exist_ok=True)
+cache_dir = os.path.join(out_dir, ".cache")
+if use_cache:
+    os.makedirs(cache_dir, exist_ok=True)
 
 # %%
-# Load the trained model
-model_path = os.path.join(model_dir, "model.joblib")
-logger.info(f"Loading model from {model_path}")
-model = joblib.load(model_path)
-logger.info("Model loaded successfully")
+# define some functions
 
-# Load the vectorizer from the model directory
-dict_vectorizer_path = os.path.join(model_dir, "dict_vectorizer.joblib")
-logger.info(f"Loading vectorizer from {dict_vectorizer_path}")
-dict_vectorizer = joblib.load(dict_vectorizer_path)
-logger.info("Vectorizer loaded successfully")
 
-# %%
-# Process each CSV file in the input directory
-csv_files = glob.glob(os.path.join(in_dir, "*.csv"))
-logger.info(f"Found {len(csv_files)} CSV files to process")
+def get_chunk_features(
+    chunk: list[Transaction],
+    chunk_group_ids: list[int],
+    groups: dict[int, list[Transaction]],
+    feature_names: list[str],
+) -> np.ndarray:
+    """
+    Get the features for a chunk of transactions.
+
+    Args:
+        chunk: The transactions to get features for
+        chunk_group_ids: The id of each transaction's group
+        groups: The groups of the transactions in the chunk, by group id
+        feature_names: The names of the features to get, in the order of the columns to return
+
+    Returns:
+        A float32 matrix of the features of each transaction, in the same order as the chunk
+        (features get_features doesn't return are 0, like the vectorizer fills them in)
+    """
+    # the rows are written into one fixed-schema matrix instead of being returned as dicts,
+    # so the worker sends back len(feature_names) floats per transaction instead of a dict of names and values
+    enabled = frozenset(feature_names)
+    chunk_features = np.zeros((len(chunk), len(feature_names)), dtype=np.float32)
+    recency_column = feature_names.index("transaction_recency_felix") if "transaction_recency_felix" in enabled else -1
+
+    # every feature only looks at the group and the transaction's date and amount, so duplicate
+    # transactions (same user, name, date and amount) share one get_features call, like they do in 30_train.py;
+    # the exception is transaction_recency_felix, which finds the transaction by id and is recomputed
+    cache: dict[tuple[int, str, float], int] = {}
+    for i, (transaction, group_id) in enumerate(zip(chunk, chunk_group_ids, strict=True)):
+        group = groups[group_id]
+        key = (group_id, transaction.date, transaction.amount)
+        if key in cache:
+            chunk_features[i] = chunk_features[cache[key]]
+            if recency_column >= 0:
+                chunk_features[i, recency_column] = get_transaction_recency(transaction, group.copy())
+        else:
+            # some feature functions sort the transaction list in place, so every call gets its own copy
+            row = get_features(transaction, group.copy(), enabled)
+            chunk_features[i] = [row.get(name, 0) for name in feature_names]
+            cache[key] = i
+    return chunk_features
+
+
+def generate_batch_features(
+    batch_key: str,
+    feature_code_version: str,
+    feature_names: list[str],
+    batch: list[Transaction],
+    batch_group_ids: list[int],
+    groups: dict[int, list[Transaction]],
+    n_jobs: int,
+) -> np.ndarray:
+    """
+    Generate the features for a batch of transactions in parallel.
+
+    Args:
+        batch_key: The input file (by name, size and modification time) and the position of the batch in it
+        feature_code_version: The version of the feature code, see get_feature_code_version
+        feature_names: The names of the features to get, in the order of the columns to return
+        batch: The transactions to get features for
+        batch_group_ids: The id of each transaction's group
+        groups: The groups of the transactions, by group id
+        n_jobs: Number of jobs to generate features with
+
+    Returns:
+        A float32 matrix of the features of each transaction, in the same order as the batch
+    """
+    logger.info(f"Generating features for batch {batch_key} with feature code {feature_code_version[:12]}")
+    # each worker gets a few large chunks of transactions plus only the groups those transactions need,
+    # instead of one task (and one pickled group list) per transaction;
+    # the chunks are sharded by group (user_id and name), so a group's transactions stay in one worker,
+    # which computes the group's group-level features once, and the rows are put back in batch order
+    order = sorted(range(len(batch)), key=batch_group_ids.__getitem__)
+    chunk_size = -(-len(batch) // (joblib.effective_n_jobs(n_jobs) * 4))
+    chunks = [order[i : i + chunk_size] for i in range(0, len(batch), chunk_size)]
+    # the work of a transaction grows with the size of its group, so the chunks with the most work
+    # are dispatched first, and the workers finish at about the same time instead of waiting on the last one
+    chunks.sort(key=lambda chunk: sum(len(groups[batch_group_ids[i]]) for i in chunk), reverse=True)
+    batch_features = np.empty((len(batch), len(feature_names)), dtype=np.float32)
+    with joblib.Parallel(
+        n_jobs=n_jobs, backend="loky", batch_size=1, pre_dispatch="2*n_jobs", return_as="generator", verbose=1
+    ) as parallel:
+        for chunk, chunk_features in zip(
+            chunks,
+            tqdm(
+                parallel(
+                    joblib.delayed(get_chunk_features)(
+                        [batch[i] for i in chunk],
+                        [batch_group_ids[i] for i in chunk],
+                        {batch_group_ids[i]: groups[batch_group_ids[i]] for i in chunk},
+                        feature_names,
+                    )
+                    for chunk in chunks
+                ),
+                total=len(chunks),
+                desc=f"Processing batch {batch_key}",
+            ),
+            strict=True,
+        ):
+            batch_features[chunk] = chunk_features
+    return batch_features
+
+
+def get_feature_code_version() -> str:
+    """
+    Get a hash of the source of the recur_scan package, which changes whenever a feature does.
+
+    Returns:
+        The hex digest of the package's source files
+    """
+    digest = hashlib.sha1(usedforsecurity=False)
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(recur_scan.__file__), "*.py"))):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def process_file(csv_file: str, model_path: str, dict_vectorizer_path: str, n_jobs: int) -> None:
+    """
+    Predict which transactions in a CSV file are recurring and write them to out_dir.
 
-for csv_file in csv_files:
+    Args:
+        csv_file: Path to the CSV file
+        model_path: Path to the trained model
+        dict_vectorizer_path: Path to the vectorizer the model was trained with
+        n_jobs: Number of jobs to generate features with
+    """
     file_name = os.path.basename(csv_file)
     logger.info(f"Processing {file_name}")
 
+    # Load the trained model
+    logger.info(f"Loading model from {model_path}")
+    # the model's arrays are memory-mapped read-only instead of copied into memory, so their pages are shared
+    # through the page cache between runs and processes (models saved compressed are still loaded normally)
+    model = joblib.load(model_path, mmap_mode="r")
+
+    # Load the vectorizer from the model directory
+    logger.info(f"Loading vectorizer from {dict_vectorizer_path}")
+    dict_vectorizer = joblib.load(dict_vectorizer_path)
+
+    # The features are put straight into the columns of the vectorizer (the columns the model was trained on),
+    # and only the features the model splits on are computed: the others are left 0, like the vectorizer fills in
+    # missing features, which a tree ensemble that never splits on them ignores
+    # (models without feature importances, or trained on a subset of the vectorizer's columns, get every feature)
+    feature_names: list[str] = list(dict_vectorizer.feature_names_)
+    importances = getattr(model, "feature_importances_", None)
+    used_columns = np.arange(len(feature_names))
+    if only_used_features and importances is not None and len(importances) == len(feature_names):
+        used_columns = np.flatnonzero(np.asarray(importances) > 0)
+        logger.info(f"The model uses {len(used_columns)} of {len(feature_names)} features")
+    used_feature_names = [feature_names[j] for j in used_columns]
+
+    # The features of a batch only depend on the input file, the feature code and the features the model uses,
+    # so they are cached on disk under a key of those, and rerunning on the same file (e.g. with another model that
+    # uses the same features) loads them instead of generating them again; the transactions and groups
+    # are left out of the key, because the file's cache key already identifies them
+    memory = joblib.Memory(cache_dir if use_cache else None, verbose=0)
+    cached_generate_batch_features = memory.cache(
+        generate_batch_features, ignore=["batch", "batch_group_ids", "groups", "n_jobs"]
+    )
+
     # Read transactions from the CSV file using the new function for test data
     if read_earnin_transaction:
         transactions = read_earnin_test_transactions(csv_file)
@@ -79,60 +258,107 @@ for csv_file in csv_files:
     logger.info(f"Read {len(transactions)} transactions from {file_name}")
 
     # Group transactions by user_id and name
-    grouped_transactions = group_transactions(transactions)
+    # (the groups only depend on the input file, so they are cached under a key of its size and modification time,
+    # and of the version of the pickled Transaction layout, so caches written by older versions aren't loaded)
+    cache_key = (
+        f"{file_name}_{os.path.getsize(csv_file)}_{int(os.path.getmtime(csv_file))}_{read_earnin_transaction}"
+        f"_v{cache_version}"
+    )
+    cache_path = os.path.join(cache_dir, f"groups_{cache_key}.joblib")
+    if use_cache and os.path.exists(cache_path):
+        grouped_transactions = joblib.load(cache_path)
+        logger.info(f"Loaded grouped transactions from {cache_path}")
+    else:
+        grouped_transactions = group_transactions(transactions)
+        if use_cache:
+            joblib.dump(grouped_transactions, cache_path, compress=0, protocol=5)
     logger.info(f"Grouped {len(transactions)} transactions into {len(grouped_transactions)} groups")
 
+    # Number the groups and look up each transaction's group id once, so the feature tasks index the groups
+    # by int instead of building and hashing a (user_id, name) tuple per transaction
+    group_index = {key: group_id for group_id, key in enumerate(grouped_transactions)}
+    groups = dict(enumerate(grouped_transactions.values()))
+    group_ids = [group_index[(transaction.user_id, transaction.name)] for transaction in transactions]
+    del group_index
+
     # Generate features, vectorize, and predict in batches to avoid memory issues
     logger.info("Generating features")
-    # Split transactions into sublists of up to 100000 transactions
-    batch_size = 100000
+    # Split transactions into sublists of up to batch_size transactions
     transaction_batches = [transactions[i : i + batch_size] for i in range(0, len(transactions), batch_size)]
+    group_id_batches = [group_ids[i : i + batch_size] for i in range(0, len(group_ids), batch_size)]
     logger.info(f"Split {len(transactions)} transactions into {len(transaction_batches)} batches")
 
-    all_predictions = []
-    total_processed = 0
+    # Write the predictions of each batch to the output file as soon as they are made,
+    # so memory use doesn't grow with the size of the file
+    out_file = os.path.join(out_dir, file_name)
+    with open(out_file, "w", newline="") as out_f:
+        writer = csv.writer(out_f)
+        if transactions:
+            writer.writerow([field.name for field in fields(Transaction)] + ["recurring"])
+
+        total_processed = 0
+        positive_count = 0
 
-    for batch_idx, batch in enumerate(transaction_batches):
-        logger.info(f"Processing batch {batch_idx + 1}/{len(transaction_batches)} with {len(batch)} transactions")
+        for batch_idx, (batch, batch_group_ids) in enumerate(zip(transaction_batches, group_id_batches, strict=True)):
+            logger.info(f"Processing batch {batch_idx + 1}/{len(transaction_batches)} with {len(batch)} transactions")
 
-        # Generate features for this batch
-        with joblib.parallel_backend("loky", n_jobs=n_jobs):
-            batch_features = joblib.Parallel(verbose=1)(
-                joblib.delayed(get_features)(transaction, grouped_transactions[(transaction.user_id, transaction.name)])
-                for transaction in tqdm(batch, desc=f"Processing batch {batch_idx + 1} of {file_name}")
+            # Generate features for this batch
+            batch_features = cached_generate_batch_features(
+                f"{cache_key}_{batch_size}_{batch_idx}",
+                feature_code_version,
+                used_feature_names,
+                batch,
+                batch_group_ids,
+                groups,
+                n_jobs,
             )
-        logger.info(f"Generated features for batch {batch_idx + 1}")
+            logger.info(f"Generated features for batch {batch_idx + 1}")
 
-        # Transform batch features to matrix and release memory
-        X_batch = dict_vectorizer.transform(batch_features)
-        batch_features = None  # Release memory
-        gc.collect()  # Force garbage collection
-        logger.info(f"Vectorized batch {batch_idx + 1}")
+            # Put the batch features into the model's columns and release memory
+            # (as a C-contiguous float32 matrix, like the training matrix, which halves the bytes the trees read
+            # and lets the model predict on it in place)
+            if len(used_columns) == len(feature_names):
+                X_batch = batch_features
+            else:
+                X_batch = np.zeros((len(batch), len(feature_names)), dtype=np.float32)
+                X_batch[:, used_columns] = batch_features
+            del batch_features  # Release memory (freed by refcounting, a full gc.collect() only stalls the loop)
+            logger.info(f"Vectorized batch {batch_idx + 1}")
 
-        # Make predictions on batch
-        y_pred_batch = model.predict(X_batch)
-        X_batch = None  # Release memory
-        gc.collect()  # Force garbage collection
+            # Make predictions on batch
+            y_pred_batch = model.predict(X_batch)
+            del X_batch  # Release memory
 
-        # Save predictions
-        all_predictions.extend(y_pred_batch)
-        total_processed += len(y_pred_batch)
-        logger.info(f"Made {len(y_pred_batch)} predictions for batch {batch_idx + 1}, {total_processed} total")
+            # Save predictions
+            writer.writerows((*astuple(transaction), y) for transaction, y in zip(batch, y_pred_batch, strict=True))
+            total_processed += len(y_pred_batch)
+            positive_count += int(y_pred_batch.sum())
+            logger.info(f"Made {len(y_pred_batch)} predictions for batch {batch_idx + 1}, {total_processed} total")
 
-    # Combine all batch predictions
-    y_pred = all_predictions
-    logger.info(f"Made {len(y_pred)} predictions total")
+    logger.info(f"Made {total_processed} predictions total")
 
     # Count positive predictions
-    positive_count = sum(y_pred)
-    pct = positive_count / len(y_pred) * 100
-    logger.info(f"Predicted {positive_count} recurring transactions out of {len(y_pred)} ({pct:.2f}%)")
-
-    # Save predictions to output directory
-    out_file = os.path.join(out_dir, file_name)
-    write_transactions(out_file, transactions, y_pred)
+    pct = positive_count / total_processed * 100
+    logger.info(f"Predicted {positive_count} recurring transactions out of {total_processed} ({pct:.2f}%)")
     logger.info(f"Saved predictions to {out_file}")
 
+
+# %%
+# Process each CSV file in the input directory
+feature_code_version = get_feature_code_version()
+model_path = os.path.join(model_dir, "model.joblib")
+dict_vectorizer_path = os.path.join(model_dir, "dict_vectorizer.joblib")
+csv_files = glob.glob(os.path.join(in_dir, "*.csv"))
+logger.info(f"Found {len(csv_files)} CSV files to process")
+
+# The files are independent, so they are processed in parallel, with the jobs split between them
+# (each file loads the model itself, memory-mapped, instead of having it pickled to its worker)
+n_file_jobs = max(1, min(len(csv_files), joblib.effective_n_jobs(n_jobs)))
+n_jobs_per_file = max(1, joblib.effective_n_jobs(n_jobs) // n_file_jobs)
+joblib.Parallel(n_jobs=n_file_jobs, backend="loky")(
+    joblib.delayed(process_file)(csv_file, model_path, dict_vectorizer_path, n_jobs_per_file) for csv_file in csv_files
+)
+
 logger.info("All files processed successfully")
 
 # %%
@@ -1,11 +1,13 @@
 import warnings
-from collections import defaultdict
+from datetime import date
+from functools import cache, lru_cache
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any
 
 import numpy as np
 
 from recur_scan.features_adedotun import (
     amount_variability_score as amount_variability_score_adedotun,
-    compute_recurring_inputs_at as compute_recurring_inputs_adedotun,
     get_contains_common_nonrecurring_keywords_at as get_contains_common_nonrecurring_keywords_adedotun,
     get_days_since_last_occurrence_at as get_days_since_last_occurrence_adedotun,
     get_interval_histogram as get_interval_histogram_adedotun,
@@ -21,6 +23,8 @@ from recur_scan.features_adedotun import (
     is_recurring_allowance_at as is_recurring_allowance_adedotun,
     is_recurring_based_on_99 as is_recurring_based_on_99_adedotun,
     is_recurring_core_at as is_recurring_core_adedotun,
+    normalize_vendor_name_at as normalize_vendor_name_adedotun,
+    preprocess_transactions_at as preprocess_transactions_adedotun,
 )
 from recur_scan.features_adeyinka import (
     get_amount_consistency_score as get_amount_consistency_score_adeyinka,
@@ -88,12 +92,9 @@ from recur_scan.features_dallanq import (
     fraction_mode_interval as fraction_mode_interval_dallanq,
     fraction_same_day_of_month as fraction_same_day_of_month_dallanq,
     get_ends_in_99 as get_ends_in_99_dallanq,
-    get_n_transactions_days_apart as get_n_transactions_days_apart_dallanq,
-    get_n_transactions_days_apart_same_amount as get_n_transactions_days_apart_same_amount_dallanq,
+    get_n_transactions_days_apart_counts as get_n_transactions_days_apart_counts_dallanq,
     get_n_transactions_same_amount as get_n_transactions_same_amount_dallanq,
-    get_n_transactions_same_day as get_n_transactions_same_day_dallanq,
-    get_pct_transactions_days_apart as get_pct_transactions_days_apart_dallanq,
-    get_pct_transactions_days_apart_same_amount as get_pct_transactions_days_apart_same_amount_dallanq,
+    get_n_transactions_same_day_counts as get_n_transactions_same_day_counts_dallanq,
     get_transaction_z_score as get_transaction_z_score_dallanq,
     is_amazon_prime as is_amazon_prime_dallanq,
     is_amazon_prime_video as is_amazon_prime_video_dallanq,
@@ -111,14 +112,12 @@ from recur_scan.features_dallanq import (
     monthly_tolerance as monthly_tolerance_dallanq,
     n_consecutive_months_same_amount as n_consecutive_months_same_amount_dallanq,
     n_monthly_same_amount as n_monthly_same_amount_dallanq,
-    n_same_day_same_amount as n_same_day_same_amount_dallanq,
     n_small_transactions as n_small_transactions_dallanq,
     n_small_transactions_not_this_amount as n_small_transactions_not_this_amount_dallanq,
     next_interval_dev_from_mean as next_interval_dev_from_mean_dallanq,
     next_interval_dev_from_mode as next_interval_dev_from_mode_dallanq,
     pct_consecutive_months_same_amount as pct_consecutive_months_same_amount_dallanq,
     pct_monthly_same_amount as pct_monthly_same_amount_dallanq,
-    pct_same_day_same_amount as pct_same_day_same_amount_dallanq,
     pct_small_transactions as pct_small_transactions_dallanq,
     pct_small_transactions_not_this_amount as pct_small_transactions_not_this_amount_dallanq,
     position_in_span as position_in_span_dallanq,
@@ -193,8 +192,6 @@ from recur_scan.features_felix import (
     get_day as get_day_felix,
     get_dispersion_transaction_amount as get_dispersion_transaction_amount_felix,
     get_likelihood_of_recurrence as get_likelihood_of_recurrence_felix,
-    get_max_transaction_amount as get_max_transaction_amount_felix,
-    get_min_transaction_amount as get_min_transaction_amount_felix,
     get_month as get_month_felix,
     get_transaction_intervals as get_transaction_intervals_felix,
     get_transaction_recency as get_transaction_recency_felix,
@@ -256,7 +253,6 @@ from recur_scan.features_happy import (
     get_weekly_pattern_score as get_weekly_pattern_score_happy,
 )
 from recur_scan.features_laurels import (
-    _aggregate_transactions as _aggregate_transactions_laurels,
     _calculate_intervals as _calculate_intervals_laurels,
     _calculate_statistics as _calculate_statistics_laurels,
     date_irregularity_dominance as date_irregularity_dominance_laurels,
@@ -309,7 +305,6 @@ from recur_scan.features_praise import (
     get_interval_variance_coefficient as get_interval_variance_coefficient_praise,
     get_interval_variance_ratio as get_interval_variance_ratio_praise,
     get_max_transaction_amount as get_max_transaction_amount_praise,
-    get_median_amount as get_median_amount_praise,
     get_min_transaction_amount as get_min_transaction_amount_praise,
     get_normalized_recency as get_normalized_recency_praise,
     get_recurrence_score_by_amount as get_recurrence_score_by_amount_praise,
@@ -355,8 +350,6 @@ from recur_scan.features_samuel import (
 from recur_scan.features_segun import (
     amazon_prime_day_proximity as amazon_prime_day_proximity_segun,
     get_average_transaction_interval as get_average_transaction_interval_segun,
-    get_max_transaction_amount as get_max_transaction_amount_segun,
-    get_min_transaction_amount as get_min_transaction_amount_segun,
     get_total_transaction_amount as get_total_transaction_amount_segun,
     get_transaction_amount_percentage as get_transaction_amount_percentage_segun,
     get_transaction_frequency_per_month as get_transaction_frequency_per_month_segun,
@@ -395,332 +388,532 @@ from recur_scan.features_victor import (
     recurring_day_of_month as recurring_day_of_month_victor,
 )
 from recur_scan.features_yoloye import (
-    get_early_fortnightly as get_early_fortnightly_yoloye,
-    get_early_monthly as get_early_monthly_yoloye,
-    get_early_quarterly as get_early_quarterly_yoloye,
+    get_early_cadence_counts as get_early_cadence_counts_yoloye,
 )
 from recur_scan.transactions import Transaction
 from recur_scan.utils import parse_date
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 # Turn NumPy floating-point warnings into exceptions
 np.seterr(divide="raise", invalid="raise")
 # Turn all RuntimeWarnings into errors
 warnings.filterwarnings("error", category=RuntimeWarning)
 
 
-def get_features(transaction: Transaction, all_transactions: list[Transaction]) -> dict[str, float | int | bool]:
-    """Get the features for a transaction"""
-    """Extract all features for a transaction by calling individual feature functions.
-    This prepares a dictionary of features for model training.
+# the features whose functions sort all_transactions in place, which get_features computes even when they are disabled
+_IN_PLACE_FEATURES = frozenset({"get_subscription_score_frank"})
+
+
+@lru_cache(maxsize=1024)
+def _get_group_features(group: tuple[Transaction, ...]) -> dict[str, float | int | bool]:
+    """Get the features that depend only on the transaction's group, not on the transaction itself.
+
+    get_features is called once for every transaction of a group with the same group, so these features are
+    computed once per group and looked up for the rest of its transactions.
 
     Args:
-        transaction (Transaction): The transaction to extract features for.
-        all_transactions (List[Transaction]): List of all transactions for context.
+        group (tuple[Transaction, ...]): The transactions of the group.
 
     Returns:
         Dict[str, Union[float, int]]: Dictionary mapping feature names to their computed values.
     """
-    # Compute groups and amount counts internally
-    groups = _aggregate_transactions_laurels(all_transactions)
-    amount_counts: defaultdict[float, int] = defaultdict(int)
-    for t in all_transactions:
-        amount_counts[t.amount] += 1
+    # some feature functions sort the transaction list in place, so they get a list of their own
+    all_transactions = list(group)
+    histogram = get_interval_histogram_tife(all_transactions)
+    # Praise's, Felix's and Segun's max and min amounts only differ in how they handle an empty group,
+    # which a transaction's group never is, so each is computed once and reported under all three names
+    max_amount = get_max_transaction_amount_praise(all_transactions)
+    min_amount = get_min_transaction_amount_praise(all_transactions)
+    # get_features reaches Felix's interval features after Frank's subscription score has sorted its list by date
+    # (stably, and the later sorts are by date too), so they are computed here on the group in that order
+    felix_intervals = get_transaction_intervals_felix(sorted(all_transactions, key=lambda t: parse_date(t.date)))
+
+    return {
+        "count_transactions_dallanq": count_transactions_dallanq(all_transactions),
+        "regularity_score_dallanq": regularity_score_dallanq(all_transactions),
+        "transaction_span_days_dallanq": transaction_span_days_dallanq(all_transactions),
+        "monthly_tolerance_dallanq": monthly_tolerance_dallanq(all_transactions),
+        "quarterly_tolerance_dallanq": quarterly_tolerance_dallanq(all_transactions),
+        "weekly_tolerance_dallanq": weekly_tolerance_dallanq(all_transactions),
+        "biweekly_tolerance_dallanq": biweekly_tolerance_dallanq(all_transactions),
+        "span_months_dallanq": span_months_dallanq(all_transactions),
+        "fraction_active_months_dallanq": fraction_active_months_dallanq(all_transactions),
+        "avg_txn_per_month_dallanq": avg_txn_per_month_dallanq(all_transactions),
+        "modal_amount_dallanq": modal_amount_dallanq(all_transactions),
+        "fraction_modal_amount_dallanq": fraction_modal_amount_dallanq(all_transactions),
+        "mode_interval_dallanq": mode_interval_dallanq(all_transactions),
+        "fraction_mode_interval_dallanq": fraction_mode_interval_dallanq(all_transactions),
+        "modal_day_of_month_dallanq": modal_day_of_month_dallanq(all_transactions),
+        "n_small_transactions_dallanq": n_small_transactions_dallanq(all_transactions, 20),
+        "pct_small_transactions_dallanq": pct_small_transactions_dallanq(all_transactions, 20),
+        "amount_stability_score_frank": amount_stability_score_frank(all_transactions),
+        "weekly_spendings_frank": weekly_spending_cycle_frank(all_transactions),
+        "vendor_recurrence_trend_frank": vendor_recurrence_trend_frank(all_transactions),
+        "transaction_per_week_frank": transactions_per_week_frank(all_transactions),
+        "transaction_per_month_frank": transactions_per_month_frank(all_transactions),
+        "irregular_interval_score_frank": irregular_interval_score_frank(all_transactions),
+        "amount_coefficient_of_variation_frank": amount_coefficient_of_variation_frank(all_transactions),
+        "recurring_confidence_frank": recurring_confidence_frank(all_transactions),
+        "amount_variability_ratio_frank": amount_variability_ratio_frank(all_transactions),
+        "robust_interval_iqr_frank": robust_interval_iqr_frank(all_transactions),
+        "transaction_frequency_frank": transaction_frequency_frank(all_transactions),
+        "most_common_interval_frank": most_common_interval_frank(all_transactions),
+        "enhanced_amt_iqr_frank": enhanced_amt_iqr_frank(all_transactions),
+        "get_amount_consistency_frank": get_amount_consistency_frank(all_transactions),
+        "coefficient_of_variation_intervals_frank": coefficient_of_variation_intervals_frank(all_transactions),
+        "calculate_cycle_consistency_frank": calculate_cycle_consistency_frank(all_transactions),
+        "date_irregularity_score_frank": date_irregularity_score_frank(all_transactions),
+        "amount_variability_score_frank": amount_variability_score_frank(all_transactions),
+        "is_non_recurring_frank": is_non_recurring_frank(all_transactions),
+        "temporal_pattern_stability_score_frank": temporal_pattern_stability_score_frank(all_transactions),
+        "vendor_reliability_score_frank": vendor_reliability_score_frank(all_transactions),
+        "is_business_day_aligned_frank": is_business_day_aligned_frank(all_transactions),
+        "detect_multi_tier_subscription_frank": detect_multi_tier_subscription_frank(all_transactions),
+        "detect_annual_price_adjustment_frank": detect_annual_price_adjustment_frank(all_transactions),
+        "detect_pay_period_alignment_frank": detect_pay_period_alignment_frank(all_transactions),
+        "is_cleo_ai_cash_advance_like_frank": is_cleo_ai_cash_advance_like_frank(all_transactions),
+        "is_apple_subscription_like_frank": is_apple_subscription_like_frank(all_transactions),
+        "is_amazon_prime_like_subscription_frank": is_amazon_prime_like_subscription_frank(all_transactions),
+        "is_utilities_or_insurance_like_frank": is_utilities_or_insurance_like_frank(all_transactions),
+        "is_always_recurring_vendor_frank": is_always_recurring_vendor_frank(all_transactions),
+        "day_of_month_consistency_christopher": get_day_of_month_consistency_christopher(all_transactions),
+        "coefficient_of_variation_christopher": get_coefficient_of_variation_christopher(all_transactions),
+        "median_interval_christopher": get_median_interval_christopher(all_transactions),
+        "max_transaction_amount_praise": max_amount,
+        "min_transaction_amount_praise": min_amount,
+        "max_transaction_amount_felix": max_amount,
+        "min_transaction_amount_felix": min_amount,
+        "amount_variability_ratio_elliot": amount_variability_ratio_elliot(all_transactions),
+        "most_common_interval_elliot": most_common_interval(all_transactions),
+        "amount_similarity_elliot": amount_similarity_elliot(all_transactions),
+        "interval_consistency_tife": get_interval_consistency_tife(all_transactions),
+        "interval_mode_tife": get_interval_mode_tife(all_transactions),
+        "normalized_interval_consistency_tife": get_normalized_interval_consistency_tife(all_transactions),
+        "amount_stability_score_tife": get_amount_stability_score_tife(all_transactions),
+        "dominant_interval_strength_tife": get_dominant_interval_strength_tife(all_transactions),
+        "transaction_density_tife": get_transaction_density_tife(all_transactions),
+        "biweekly_interval_tife": histogram["biweekly"],
+        "monthly_interval_tife": histogram["monthly"],
+        "interval_cluster_strength_tife": get_interval_cluster_strength_tife(all_transactions),
+        "day_of_month_consistency_tife": get_day_of_month_consistency_tife(all_transactions),
+        "long_term_recurrence_tife": get_long_term_recurrence_tife(all_transactions),
+        "total_transaction_amount_segun": get_total_transaction_amount_segun(all_transactions),
+        "max_transaction_amount_segun": max_amount,
+        "min_transaction_amount_segun": min_amount,
+        "unique_transaction_amount_count_segun": get_unique_transaction_amount_count_segun(all_transactions),
+        "average_transaction_interval_segun": get_average_transaction_interval_segun(all_transactions),
+        "transaction_frequency_per_month_segun": get_transaction_frequency_per_month_segun(all_transactions),
+        "is_recurring_day_segun": is_recurring_day_segun(all_transactions),
+        "interval_variability_victor": interval_variability_victor(all_transactions),
+        "amount_cluster_count_victor": amount_cluster_count_victor(all_transactions, tolerance=0.05),
+        "recurring_day_of_month_victor": recurring_day_of_month_victor(all_transactions),
+        "near_interval_ratio_victor": near_interval_ratio_victor(all_transactions, tolerance=5),
+        "amount_stability_index_victor": amount_stability_index_victor(all_transactions, tolerance=0.1),
+        "amount_change_trend_naomi": get_amount_change_trend_naomi(all_transactions),
+        **felix_intervals,
+    }
+
+
+@lru_cache(maxsize=1024)
+def _preprocess_transactions_adedotun(group: tuple[Transaction, ...]) -> dict:
+    """Bucket the transactions of a group by vendor and parse their dates, for Adedotun's features.
+
+    The result is shared by every transaction of the group, so the feature functions must only read it.
+
+    Args:
+        group (tuple[Transaction, ...]): The transactions of the group.
+
+    Returns:
+        dict: The transactions by vendor and by user and vendor, and the parsed date of each transaction.
+    """
+    return preprocess_transactions_adedotun(list(group))
+
+
+@lru_cache(maxsize=1024)
+def _get_merchant_context_laurels(
+    group: tuple[Transaction, ...], user_id: str, merchant_name: str
+) -> tuple[tuple[Transaction, ...], tuple[date, ...], dict[str, float], dict[str, float]]:
+    """Get the inputs of Laurels' features, which are the same for every transaction of a user and merchant.
 
-    # Extract user ID and merchant name from the transaction
-    user_id, merchant_name = transaction.user_id, transaction.name
-    # Get transactions for this user and merchant
-    merchant_trans = groups.get(user_id, {}).get(merchant_name, [])
-    # Sort transactions by date for chronological analysis
-    merchant_trans.sort(key=lambda x: x.date)
+    Args:
+        group (tuple[Transaction, ...]): The transactions of the group.
+        user_id (str): The user id of the transaction.
+        merchant_name (str): The name of the transaction.
 
-    # Parse all dates for this merchant's transactions once
-    parsed_dates = []
-    for trans in merchant_trans:
-        date = parse_date(trans.date)
-        if date is not None:
-            parsed_dates.append(date)
+    Returns:
+        The merchant's transactions sorted by date, their parsed dates, and their interval and amount statistics.
+    """
+    # the group is usually the user's and merchant's transactions already, so this is one pass over it
+    merchant_trans = sorted(
+        (t for t in group if t.user_id == user_id and t.name == merchant_name), key=attrgetter("date")
+    )
+
+    # Parse each distinct date of this merchant's transactions once (they are sorted, so the dates are too)
+    dates_by_str = {date_str: parse_date(date_str) for date_str in {trans.date for trans in merchant_trans}}
+    parsed_dates = [dates_by_str[trans.date] for trans in merchant_trans]
 
     # Calculate intervals and amounts for statistical analysis
     intervals = _calculate_intervals_laurels(parsed_dates)
     amounts = [trans.amount for trans in merchant_trans]
-    interval_stats = _calculate_statistics_laurels([float(i) for i in intervals])
+    interval_stats = _calculate_statistics_laurels(intervals)
     amount_stats = _calculate_statistics_laurels(amounts)
+    return tuple(merchant_trans), tuple(parsed_dates), interval_stats, amount_stats
 
-    histogram = get_interval_histogram_tife(all_transactions)
 
-    vendor_txns, user_vendor_txns, preprocessed = compute_recurring_inputs_adedotun(transaction, all_transactions)
+def get_features(
+    transaction: Transaction, all_transactions: list[Transaction], enabled: frozenset[str] | None = None
+) -> dict[str, float | int | bool]:
+    """Get the features for a transaction"""
+    """Extract all features for a transaction by calling individual feature functions.
+    This prepares a dictionary of features for model training.
+
+    Args:
+        transaction (Transaction): The transaction to extract features for.
+        all_transactions (List[Transaction]): List of all transactions for context.
+        enabled (frozenset[str] | None): The names of the features to compute, or None to compute all of them.
+            Disabled features are skipped, not just left out of the result.
+
+    Returns:
+        Dict[str, Union[float, int]]: Dictionary mapping feature names to their computed values.
+    """
+    group = tuple(all_transactions)
+    # the values that several features share are computed the first time an enabled feature needs them,
+    # on the transactions in their original order (some features run after all_transactions has been sorted)
+    transactions_in_order = list(group)
+
+    # Get this user's and merchant's transactions, sorted by date, and their interval and amount statistics
+    merchant_context = _get_merchant_context_laurels(group, transaction.user_id, transaction.name)
+    # the feature functions get lists of their own, so the cached context can't be changed through them
+    merchant_trans = list(merchant_context[0])
+    parsed_dates = list(merchant_context[1])
+    interval_stats = dict(merchant_context[2])
+    amount_stats = dict(merchant_context[3])
+
+    group_features = cache(lambda: _get_group_features(group))
+
+    # the group is bucketed by vendor and its dates are parsed once, and each transaction only looks up its buckets
+    preprocessed = _preprocess_transactions_adedotun(group)
+    normalized_name = normalize_vendor_name_adedotun(transaction.name)
+    vendor_txns = preprocessed["by_vendor"].get(normalized_name, [])
+    user_vendor_txns = preprocessed["by_user_vendor"].get((transaction.user_id, normalized_name), [])
     date_obj = preprocessed["date_objects"][transaction]
     total_txns = len(vendor_txns)
 
-    sequence_features = detect_sequence_patterns_emmanuel_eze(transaction, all_transactions)
+    sequence_features = cache(lambda: detect_sequence_patterns_emmanuel_eze(transaction, transactions_in_order))
 
-    return {
+    # features that several authors implemented identically are computed once and reported under each name
+    median_amount_same_name = cache(
+        lambda: float(get_median_amount_same_name_ebenezer(transaction, transactions_in_order))
+    )
+    is_always_recurring_adedotun = cache(lambda: get_is_always_recurring_adedotun(transaction))
+
+    # Dallanq's days-apart counts for several (n_days_apart, n_days_off) take the day differences only once
+    n_same_amount_dallanq = cache(lambda: get_n_transactions_same_amount_dallanq(transaction, transactions_in_order))
+    days_apart_counts = cache(
+        lambda: get_n_transactions_days_apart_counts_dallanq(
+            transaction, transactions_in_order, [(14, 0), (14, 1), (7, 0), (7, 1)]
+        )
+    )
+    same_amount_days_apart_counts = cache(
+        lambda: get_n_transactions_days_apart_counts_dallanq(
+            transaction, transactions_in_order, [(14, 2), (28, 2), (28, 4)], same_amount=True
+        )
+    )
+    # and so do its same-day-of-month counts for several n_days_off
+    same_day_counts = cache(
+        lambda: get_n_transactions_same_day_counts_dallanq(transaction, transactions_in_order, [1, 2])
+    )
+    same_amount_same_day_counts = cache(
+        lambda: get_n_transactions_same_day_counts_dallanq(
+            transaction, transactions_in_order, [1, 3, 5], same_amount=True
+        )
+    )
+    # Yoloye's early-cadence counts are taken together as well
+    early_counts_yoloye = cache(lambda: get_early_cadence_counts_yoloye(transaction, transactions_in_order))
+
+    # each feature is computed by a function of no arguments, so a disabled feature is never computed;
+    # an entry keyed by a tuple of names computes those features together and returns them as a dict
+    feature_functions: dict[str | tuple[str, ...], Callable[[], Any]] = {
         # DallanQ's features
-        "n_transactions_same_amount_dallanq": get_n_transactions_same_amount_dallanq(transaction, all_transactions),
+        "n_transactions_same_amount_dallanq": n_same_amount_dallanq,
         # "percent_transactions_same_amount_dallanq": get_percent_transactions_same_amount_dallanq(
         #     transaction, all_transactions
         # ),
-        "ends_in_99_dallanq": get_ends_in_99_dallanq(transaction),
-        "amount_dallanq": transaction.amount,
+        "ends_in_99_dallanq": lambda: get_ends_in_99_dallanq(transaction),
+        "amount_dallanq": lambda: transaction.amount,
         # "same_day_exact_dallanq": get_n_transactions_same_day_dallanq(transaction, all_transactions, 0),
         # "pct_transactions_same_day_dallanq": get_pct_transactions_same_day_dallanq(transaction, all_transactions, 0),
-        "same_day_off_by_1_dallanq": get_n_transactions_same_day_dallanq(transaction, all_transactions, 1),
-        "same_day_off_by_2_dallanq": get_n_transactions_same_day_dallanq(transaction, all_transactions, 2),
-        "14_days_apart_exact_dallanq": get_n_transactions_days_apart_dallanq(transaction, all_transactions, 14, 0),
-        "pct_14_days_apart_exact_dallanq": get_pct_transactions_days_apart_dallanq(
-            transaction, all_transactions, 14, 0
-        ),
+        "same_day_off_by_1_dallanq": lambda: same_day_counts()[1],
+        "same_day_off_by_2_dallanq": lambda: same_day_counts()[2],
+        "14_days_apart_exact_dallanq": lambda: days_apart_counts()[14, 0],
+        "pct_14_days_apart_exact_dallanq": lambda: days_apart_counts()[14, 0] / len(all_transactions),
         # "14_days_apart_off_by_1_dallanq": get_n_transactions_days_apart_dallanq(transaction, all_transactions, 14, 1),
-        "pct_14_days_apart_off_by_1_dallanq": get_pct_transactions_days_apart_dallanq(
-            transaction, all_transactions, 14, 1
-        ),
-        "7_days_apart_exact_dallanq": get_n_transactions_days_apart_dallanq(transaction, all_transactions, 7, 0),
-        "pct_7_days_apart_exact_dallanq": get_pct_transactions_days_apart_dallanq(transaction, all_transactions, 7, 0),
-        "7_days_apart_off_by_1_dallanq": get_n_transactions_days_apart_dallanq(transaction, all_transactions, 7, 1),
-        "pct_7_days_apart_off_by_1_dallanq": get_pct_transactions_days_apart_dallanq(
-            transaction, all_transactions, 7, 1
-        ),
+        "pct_14_days_apart_off_by_1_dallanq": lambda: days_apart_counts()[14, 1] / len(all_transactions),
+        "7_days_apart_exact_dallanq": lambda: days_apart_counts()[7, 0],
+        "pct_7_days_apart_exact_dallanq": lambda: days_apart_counts()[7, 0] / len(all_transactions),
+        "7_days_apart_off_by_1_dallanq": lambda: days_apart_counts()[7, 1],
+        "pct_7_days_apart_off_by_1_dallanq": lambda: days_apart_counts()[7, 1] / len(all_transactions),
         # "is_insurance_dallanq": get_is_insurance_dallanq(transaction),
         # "is_utility_dallanq": get_is_utility_dallanq(transaction),
         # "is_phone_dallanq": get_is_phone_dallanq(transaction),
         # "is_always_recurring_dallanq": get_is_always_recurring_dallanq(transaction),
         # "z_score_dallanq": get_transaction_z_score_dallanq(transaction, all_transactions),
-        "abs_z_score_dallanq": abs(get_transaction_z_score_dallanq(transaction, all_transactions)),
-        "count_transactions_dallanq": count_transactions_dallanq(all_transactions),
-        "days_since_last_dallanq": days_since_last_dallanq(transaction, all_transactions),
-        "days_until_next_dallanq": days_until_next_dallanq(transaction, all_transactions),
+        "abs_z_score_dallanq": lambda: abs(get_transaction_z_score_dallanq(transaction, all_transactions)),
+        "count_transactions_dallanq": lambda: group_features()["count_transactions_dallanq"],
+        "days_since_last_dallanq": lambda: days_since_last_dallanq(transaction, all_transactions),
+        "days_until_next_dallanq": lambda: days_until_next_dallanq(transaction, all_transactions),
         # "mean_days_between_dallanq": mean_days_between_dallanq(all_transactions),
         # "std_days_between_dallanq": std_days_between_dallanq(all_transactions),
-        "regularity_score_dallanq": regularity_score_dallanq(all_transactions),
-        "transaction_span_days_dallanq": transaction_span_days_dallanq(all_transactions),
+        "regularity_score_dallanq": lambda: group_features()["regularity_score_dallanq"],
+        "transaction_span_days_dallanq": lambda: group_features()["transaction_span_days_dallanq"],
         # "count_last_n_days_dallanq": count_last_n_days_dallanq(transaction, all_transactions),
         # "count_last_28_days_dallanq": count_last_28_days_dallanq(transaction, all_transactions),
-        "count_last_35_days_dallanq": count_last_35_days_dallanq(transaction, all_transactions),
-        "count_last_90_days_dallanq": count_last_90_days_dallanq(transaction, all_transactions),
+        "count_last_35_days_dallanq": lambda: count_last_35_days_dallanq(transaction, all_transactions),
+        "count_last_90_days_dallanq": lambda: count_last_90_days_dallanq(transaction, all_transactions),
         # "mean_amount_dallanq": mean_amount_dallanq(all_transactions),
         # "std_amount_dallanq": std_amount_dallanq(all_transactions),
-        "amount_diff_from_mean_dallanq": amount_diff_from_mean_dallanq(transaction, all_transactions),
-        "relative_amount_diff_dallanq": relative_amount_diff_dallanq(transaction, all_transactions),
-        "day_of_week_dallanq": day_of_week_dallanq(transaction),
+        "amount_diff_from_mean_dallanq": lambda: amount_diff_from_mean_dallanq(transaction, all_transactions),
+        "relative_amount_diff_dallanq": lambda: relative_amount_diff_dallanq(transaction, all_transactions),
+        "day_of_week_dallanq": lambda: day_of_week_dallanq(transaction),
         # "is_weekend_dallanq": is_weekend_dallanq(transaction),
-        "day_of_month_dallanq": day_of_month_dallanq(transaction),
-        "month_of_year_dallanq": month_of_year_dallanq(transaction),
+        "day_of_month_dallanq": lambda: day_of_month_dallanq(transaction),
+        "month_of_year_dallanq": lambda: month_of_year_dallanq(transaction),
         # "same_day_of_month_count_dallanq": same_day_of_month_count_dallanq(transaction, all_transactions),
-        "fraction_same_day_of_month_dallanq": fraction_same_day_of_month_dallanq(transaction, all_transactions),
-        "monthly_tolerance_dallanq": monthly_tolerance_dallanq(all_transactions),
-        "quarterly_tolerance_dallanq": quarterly_tolerance_dallanq(all_transactions),
-        "weekly_tolerance_dallanq": weekly_tolerance_dallanq(all_transactions),
-        "biweekly_tolerance_dallanq": biweekly_tolerance_dallanq(all_transactions),
-        "span_months_dallanq": span_months_dallanq(all_transactions),
+        "fraction_same_day_of_month_dallanq": lambda: fraction_same_day_of_month_dallanq(transaction, all_transactions),
+        "monthly_tolerance_dallanq": lambda: group_features()["monthly_tolerance_dallanq"],
+        "quarterly_tolerance_dallanq": lambda: group_features()["quarterly_tolerance_dallanq"],
+        "weekly_tolerance_dallanq": lambda: group_features()["weekly_tolerance_dallanq"],
+        "biweekly_tolerance_dallanq": lambda: group_features()["biweekly_tolerance_dallanq"],
+        "span_months_dallanq": lambda: group_features()["span_months_dallanq"],
         # "total_span_months_dallanq": total_span_months_dallanq(all_transactions),
-        "fraction_active_months_dallanq": fraction_active_months_dallanq(all_transactions),
-        "avg_txn_per_month_dallanq": avg_txn_per_month_dallanq(all_transactions),
-        "modal_amount_dallanq": modal_amount_dallanq(all_transactions),
-        "fraction_modal_amount_dallanq": fraction_modal_amount_dallanq(all_transactions),
+        "fraction_active_months_dallanq": lambda: group_features()["fraction_active_months_dallanq"],
+        "avg_txn_per_month_dallanq": lambda: group_features()["avg_txn_per_month_dallanq"],
+        "modal_amount_dallanq": lambda: group_features()["modal_amount_dallanq"],
+        "fraction_modal_amount_dallanq": lambda: group_features()["fraction_modal_amount_dallanq"],
         # "amount_matches_modal_dallanq": amount_matches_modal_dallanq(transaction, all_transactions),
-        "mode_interval_dallanq": mode_interval_dallanq(all_transactions),
-        "fraction_mode_interval_dallanq": fraction_mode_interval_dallanq(all_transactions),
-        "prev_interval_dev_from_mean_dallanq": prev_interval_dev_from_mean_dallanq(transaction, all_transactions),
-        "next_interval_dev_from_mean_dallanq": next_interval_dev_from_mean_dallanq(transaction, all_transactions),
-        "prev_interval_dev_from_mode_dallanq": prev_interval_dev_from_mode_dallanq(transaction, all_transactions),
-        "next_interval_dev_from_mode_dallanq": next_interval_dev_from_mode_dallanq(transaction, all_transactions),
+        "mode_interval_dallanq": lambda: group_features()["mode_interval_dallanq"],
+        "fraction_mode_interval_dallanq": lambda: group_features()["fraction_mode_interval_dallanq"],
+        "prev_interval_dev_from_mean_dallanq": lambda: prev_interval_dev_from_mean_dallanq(
+            transaction, all_transactions
+        ),
+        "next_interval_dev_from_mean_dallanq": lambda: next_interval_dev_from_mean_dallanq(
+            transaction, all_transactions
+        ),
+        "prev_interval_dev_from_mode_dallanq": lambda: prev_interval_dev_from_mode_dallanq(
+            transaction, all_transactions
+        ),
+        "next_interval_dev_from_mode_dallanq": lambda: next_interval_dev_from_mode_dallanq(
+            transaction, all_transactions
+        ),
         # "prev_within_monthly_tol_dallanq": prev_within_monthly_tol_dallanq(transaction, all_transactions),
         # "next_within_monthly_tol_dallanq": next_within_monthly_tol_dallanq(transaction, all_transactions),
-        "modal_day_of_month_dallanq": modal_day_of_month_dallanq(all_transactions),
-        "dom_diff_from_modal_dallanq": dom_diff_from_modal_dallanq(transaction, all_transactions),
+        "modal_day_of_month_dallanq": lambda: group_features()["modal_day_of_month_dallanq"],
+        "dom_diff_from_modal_dallanq": lambda: dom_diff_from_modal_dallanq(transaction, all_transactions),
         # "is_modal_dom_dallanq": is_modal_dom_dallanq(transaction, all_transactions),
-        "amount_diff_from_modal_dallanq": amount_diff_from_modal_dallanq(transaction, all_transactions),
-        "rel_amount_diff_from_modal_dallanq": rel_amount_diff_from_modal_dallanq(transaction, all_transactions),
-        "amount_frequency_rank_dallanq": amount_frequency_rank_dallanq(transaction, all_transactions),
-        "amount_freq_fraction_dallanq": amount_freq_fraction_dallanq(transaction, all_transactions),
-        "txns_in_same_month_dallanq": txns_in_same_month_dallanq(transaction, all_transactions),
-        "frac_txns_in_same_month_dallanq": frac_txns_in_same_month_dallanq(transaction, all_transactions),
-        "days_since_group_start_dallanq": days_since_group_start_dallanq(transaction, all_transactions),
-        "position_in_span_dallanq": position_in_span_dallanq(transaction, all_transactions),
-        "is_amazon_prime_dallanq": is_amazon_prime_dallanq(transaction),
-        "is_amazon_prime_video_dallanq": is_amazon_prime_video_dallanq(transaction),
-        "is_apple_dallanq": is_apple_dallanq(transaction),
+        "amount_diff_from_modal_dallanq": lambda: amount_diff_from_modal_dallanq(transaction, all_transactions),
+        "rel_amount_diff_from_modal_dallanq": lambda: rel_amount_diff_from_modal_dallanq(transaction, all_transactions),
+        "amount_frequency_rank_dallanq": lambda: amount_frequency_rank_dallanq(transaction, all_transactions),
+        "amount_freq_fraction_dallanq": lambda: amount_freq_fraction_dallanq(transaction, all_transactions),
+        "txns_in_same_month_dallanq": lambda: txns_in_same_month_dallanq(transaction, all_transactions),
+        "frac_txns_in_same_month_dallanq": lambda: frac_txns_in_same_month_dallanq(transaction, all_transactions),
+        "days_since_group_start_dallanq": lambda: days_since_group_start_dallanq(transaction, all_transactions),
+        "position_in_span_dallanq": lambda: position_in_span_dallanq(transaction, all_transactions),
+        "is_amazon_prime_dallanq": lambda: is_amazon_prime_dallanq(transaction),
+        "is_amazon_prime_video_dallanq": lambda: is_amazon_prime_video_dallanq(transaction),
+        "is_apple_dallanq": lambda: is_apple_dallanq(transaction),
         # "is_loan_company_dallanq": is_loan_company_dallanq(transaction),
-        "is_pay_in_four_company_dallanq": is_pay_in_four_company_dallanq(transaction),
-        "is_cash_advance_company_dallanq": is_cash_advance_company_dallanq(transaction),
+        "is_pay_in_four_company_dallanq": lambda: is_pay_in_four_company_dallanq(transaction),
+        "is_cash_advance_company_dallanq": lambda: is_cash_advance_company_dallanq(transaction),
         # "is_phone_company_dallanq": is_phone_company_dallanq(transaction),
-        "is_subscription_company_dallanq": is_subscription_company_dallanq(transaction),
-        "is_usually_subscription_company_dallanq": is_usually_subscription_company_dallanq(transaction),
-        "is_utility_company_dallanq": is_utility_company_dallanq(transaction),
+        "is_subscription_company_dallanq": lambda: is_subscription_company_dallanq(transaction),
+        "is_usually_subscription_company_dallanq": lambda: is_usually_subscription_company_dallanq(transaction),
+        "is_utility_company_dallanq": lambda: is_utility_company_dallanq(transaction),
         # "is_insurance_company_dallanq": is_insurance_company_dallanq(transaction),
         # "is_carwash_company_dallanq": is_carwash_company_dallanq(transaction),
         # "is_rental_company_dallanq": is_rental_company_dallanq(transaction),
         # "ends_in_00_dallanq": ends_in_00_dallanq(transaction),
-        "is_likely_subscription_amount_dallanq": is_likely_subscription_amount_dallanq(transaction),
-        "n_small_transactions_dallanq": n_small_transactions_dallanq(all_transactions, 20),
-        "pct_small_transactions_dallanq": pct_small_transactions_dallanq(all_transactions, 20),
-        "n_small_transactions_not_this_amount_dallanq": n_small_transactions_not_this_amount_dallanq(
+        "is_likely_subscription_amount_dallanq": lambda: is_likely_subscription_amount_dallanq(transaction),
+        "n_small_transactions_dallanq": lambda: group_features()["n_small_transactions_dallanq"],
+        "pct_small_transactions_dallanq": lambda: group_features()["pct_small_transactions_dallanq"],
+        "n_small_transactions_not_this_amount_dallanq": lambda: n_small_transactions_not_this_amount_dallanq(
             transaction, all_transactions, 20
         ),
-        "pct_small_transactions_not_this_amount_dallanq": pct_small_transactions_not_this_amount_dallanq(
+        "pct_small_transactions_not_this_amount_dallanq": lambda: pct_small_transactions_not_this_amount_dallanq(
             transaction, all_transactions, 20
         ),
-        "n_monthly_same_amount_dallanq": n_monthly_same_amount_dallanq(transaction, all_transactions),
-        "pct_monthly_same_amount_dallanq": pct_monthly_same_amount_dallanq(transaction, all_transactions),
-        "n_consecutive_months_same_amount_dallanq": n_consecutive_months_same_amount_dallanq(
+        "n_monthly_same_amount_dallanq": lambda: n_monthly_same_amount_dallanq(transaction, all_transactions),
+        "pct_monthly_same_amount_dallanq": lambda: pct_monthly_same_amount_dallanq(transaction, all_transactions),
+        "n_consecutive_months_same_amount_dallanq": lambda: n_consecutive_months_same_amount_dallanq(
             transaction, all_transactions
         ),
-        "pct_consecutive_months_same_amount_dallanq": pct_consecutive_months_same_amount_dallanq(
+        "pct_consecutive_months_same_amount_dallanq": lambda: pct_consecutive_months_same_amount_dallanq(
             transaction, all_transactions
         ),
-        "n_same_day_same_amount_1_dallanq": n_same_day_same_amount_dallanq(transaction, all_transactions, 1),
-        "n_same_day_same_amount_3_dallanq": n_same_day_same_amount_dallanq(transaction, all_transactions, 3),
-        "n_same_day_same_amount_5_dallanq": n_same_day_same_amount_dallanq(transaction, all_transactions, 5),
+        "n_same_day_same_amount_1_dallanq": lambda: same_amount_same_day_counts()[1],
+        "n_same_day_same_amount_3_dallanq": lambda: same_amount_same_day_counts()[3],
+        "n_same_day_same_amount_5_dallanq": lambda: same_amount_same_day_counts()[5],
         # "pct_same_day_same_amount_1_dallanq": pct_same_day_same_amount_dallanq(transaction, all_transactions, 1),
-        "pct_same_day_same_amount_3_dallanq": pct_same_day_same_amount_dallanq(transaction, all_transactions, 3),
-        "pct_same_day_same_amount_5_dallanq": pct_same_day_same_amount_dallanq(transaction, all_transactions, 5),
-        "n_days_apart_same_amount_14_2_dallanq": get_n_transactions_days_apart_same_amount_dallanq(
-            transaction, all_transactions, 14, 2
-        ),
-        "pct_days_apart_same_amount_14_2_dallanq": get_pct_transactions_days_apart_same_amount_dallanq(
-            transaction, all_transactions, 14, 2
+        "pct_same_day_same_amount_3_dallanq": lambda: same_amount_same_day_counts()[3] / n_same_amount_dallanq(),
+        "pct_same_day_same_amount_5_dallanq": lambda: same_amount_same_day_counts()[5] / n_same_amount_dallanq(),
+        "n_days_apart_same_amount_14_2_dallanq": lambda: same_amount_days_apart_counts()[14, 2],
+        "pct_days_apart_same_amount_14_2_dallanq": lambda: (
+            same_amount_days_apart_counts()[14, 2] / n_same_amount_dallanq()
         ),
         # "n_days_apart_same_amount_28_2_dallanq": get_n_transactions_days_apart_same_amount_dallanq(
         #     transaction, all_transactions, 28, 2
         # ),
-        "pct_days_apart_same_amount_28_2_dallanq": get_pct_transactions_days_apart_same_amount_dallanq(
-            transaction, all_transactions, 28, 2
+        "pct_days_apart_same_amount_28_2_dallanq": lambda: (
+            same_amount_days_apart_counts()[28, 2] / n_same_amount_dallanq()
         ),
         # "n_days_apart_same_amount_28_4_dallanq": get_n_transactions_days_apart_same_amount_dallanq(
         #     transaction, all_transactions, 28, 4
         # ),
-        "pct_days_apart_same_amount_28_4_dallanq": get_pct_transactions_days_apart_same_amount_dallanq(
-            transaction, all_transactions, 28, 4
+        "pct_days_apart_same_amount_28_4_dallanq": lambda: (
+            same_amount_days_apart_counts()[28, 4] / n_same_amount_dallanq()
         ),
         # Frank's features
         # "likely_same_amount_frank": amount_similarity_frank(transaction, all_transactions),
-        "normalized_days_difference_frank": normalized_days_difference_frank(transaction, all_transactions),
-        "amount_stability_score_frank": amount_stability_score_frank(all_transactions),
-        "amount_z_score_frank": amount_z_score_frank(transaction, all_transactions),
-        "weekly_spendings_frank": weekly_spending_cycle_frank(all_transactions),
-        "vendor_recurrence_trend_frank": vendor_recurrence_trend_frank(all_transactions),
-        "seasonal_spending_cycle_frank": seasonal_spending_cycle_frank(transaction, all_transactions),
+        "normalized_days_difference_frank": lambda: normalized_days_difference_frank(transaction, all_transactions),
+        "amount_stability_score_frank": lambda: group_features()["amount_stability_score_frank"],
+        "amount_z_score_frank": lambda: amount_z_score_frank(transaction, all_transactions),
+        "weekly_spendings_frank": lambda: group_features()["weekly_spendings_frank"],
+        "vendor_recurrence_trend_frank": lambda: group_features()["vendor_recurrence_trend_frank"],
+        "seasonal_spending_cycle_frank": lambda: seasonal_spending_cycle_frank(transaction, all_transactions),
         # "recurrence_interval_variance_frank": recurrence_interval_variance_frank(all_transactions),
-        "transaction_per_week_frank": transactions_per_week_frank(all_transactions),
-        "transaction_per_month_frank": transactions_per_month_frank(all_transactions),
-        "irregular_interval_score_frank": irregular_interval_score_frank(all_transactions),
+        "transaction_per_week_frank": lambda: group_features()["transaction_per_week_frank"],
+        "transaction_per_month_frank": lambda: group_features()["transaction_per_month_frank"],
+        "irregular_interval_score_frank": lambda: group_features()["irregular_interval_score_frank"],
         # "inconsistent_amount_score_frank": inconsistent_amount_score_frank(all_transactions),
         # "non_recurring_score_frank": non_recurring_score_frank(all_transactions),
-        "amount_ratio_frank": get_same_amount_ratio_frank(transaction, all_transactions),
-        "amount_coefficient_of_variation_frank": amount_coefficient_of_variation_frank(all_transactions),
+        "amount_ratio_frank": lambda: get_same_amount_ratio_frank(transaction, all_transactions),
+        "amount_coefficient_of_variation_frank": lambda: group_features()["amount_coefficient_of_variation_frank"],
         # "proportional_timing_deviation_frank": proportional_timing_deviation_frank(transaction, all_transactions),
-        "recurring_confidence_frank": recurring_confidence_frank(all_transactions),
+        "recurring_confidence_frank": lambda: group_features()["recurring_confidence_frank"],
         # "matches_common_cycle_frank": matches_common_cycle_frank(all_transactions),
-        "amount_variability_ratio_frank": amount_variability_ratio_frank(all_transactions),
-        "robust_interval_iqr_frank": robust_interval_iqr_frank(all_transactions),
+        "amount_variability_ratio_frank": lambda: group_features()["amount_variability_ratio_frank"],
+        "robust_interval_iqr_frank": lambda: group_features()["robust_interval_iqr_frank"],
         # "robust_interval_median_frank": robust_interval_median_frank(all_transactions),
-        "transaction_frequency_frank": transaction_frequency_frank(all_transactions),
-        "most_common_interval_frank": most_common_interval_frank(all_transactions),
-        "enhanced_amt_iqr_frank": enhanced_amt_iqr_frank(all_transactions),
+        "transaction_frequency_frank": lambda: group_features()["transaction_frequency_frank"],
+        "most_common_interval_frank": lambda: group_features()["most_common_interval_frank"],
+        "enhanced_amt_iqr_frank": lambda: group_features()["enhanced_amt_iqr_frank"],
         # "enhanced_days_since_last_frank": enhanced_days_since_last_frank(transaction, all_transactions),
-        "enhanced_n_similar_last_n_days_frank": enhanced_n_similar_last_n_days_frank(transaction, all_transactions),
-        "get_subscription_score_frank": get_subscription_score_frank(all_transactions),
-        "get_amount_consistency_frank": get_amount_consistency_frank(all_transactions),
-        "coefficient_of_variation_intervals_frank": coefficient_of_variation_intervals_frank(all_transactions),
-        "calculate_cycle_consistency_frank": calculate_cycle_consistency_frank(all_transactions),
-        "date_irregularity_score_frank": date_irregularity_score_frank(all_transactions),
-        "amount_variability_score_frank": amount_variability_score_frank(all_transactions),
-        "is_recurring_company_frank": is_recurring_company_frank(transaction.name),
-        "is_utility_company_frank": is_utility_company_frank(transaction.name),
-        "recurring_score_frank": recurring_score_frank(transaction.name),
-        "is_non_recurring_frank": is_non_recurring_frank(all_transactions),
-        "temporal_pattern_stability_score_frank": temporal_pattern_stability_score_frank(all_transactions),
-        "vendor_reliability_score_frank": vendor_reliability_score_frank(all_transactions),
-        "amount_progression_pattern_frank": amount_progression_pattern_frank(transaction, all_transactions),
-        "payment_schedule_change_detector_frank": payment_schedule_change_detector_frank(transaction, all_transactions),
+        "enhanced_n_similar_last_n_days_frank": lambda: enhanced_n_similar_last_n_days_frank(
+            transaction, all_transactions
+        ),
+        # (get_subscription_score_frank sorts all_transactions by date in place, and the features after it rely on
+        # that order, so it is still called here instead of being computed once per group, even when it is disabled)
+        "get_subscription_score_frank": lambda: get_subscription_score_frank(all_transactions),
+        "get_amount_consistency_frank": lambda: group_features()["get_amount_consistency_frank"],
+        "coefficient_of_variation_intervals_frank": lambda: group_features()[
+            "coefficient_of_variation_intervals_frank"
+        ],
+        "calculate_cycle_consistency_frank": lambda: group_features()["calculate_cycle_consistency_frank"],
+        "date_irregularity_score_frank": lambda: group_features()["date_irregularity_score_frank"],
+        "amount_variability_score_frank": lambda: group_features()["amount_variability_score_frank"],
+        "is_recurring_company_frank": lambda: is_recurring_company_frank(transaction.name),
+        "is_utility_company_frank": lambda: is_utility_company_frank(transaction.name),
+        "recurring_score_frank": lambda: recurring_score_frank(transaction.name),
+        "is_non_recurring_frank": lambda: group_features()["is_non_recurring_frank"],
+        "temporal_pattern_stability_score_frank": lambda: group_features()["temporal_pattern_stability_score_frank"],
+        "vendor_reliability_score_frank": lambda: group_features()["vendor_reliability_score_frank"],
+        "amount_progression_pattern_frank": lambda: amount_progression_pattern_frank(transaction, all_transactions),
+        "payment_schedule_change_detector_frank": lambda: payment_schedule_change_detector_frank(
+            transaction, all_transactions
+        ),
         # "detect_vendor_name_variations_frank": detect_vendor_name_variations_frank(transaction, all_transactions),
         # "detect_variable_subscription_frank": detect_variable_subscription_frank(all_transactions),
-        "is_business_day_aligned_frank": is_business_day_aligned_frank(all_transactions),
-        "detect_multi_tier_subscription_frank": detect_multi_tier_subscription_frank(all_transactions),
-        "detect_annual_price_adjustment_frank": detect_annual_price_adjustment_frank(all_transactions),
-        "detect_pay_period_alignment_frank": detect_pay_period_alignment_frank(all_transactions),
+        "is_business_day_aligned_frank": lambda: group_features()["is_business_day_aligned_frank"],
+        "detect_multi_tier_subscription_frank": lambda: group_features()["detect_multi_tier_subscription_frank"],
+        "detect_annual_price_adjustment_frank": lambda: group_features()["detect_annual_price_adjustment_frank"],
+        "detect_pay_period_alignment_frank": lambda: group_features()["detect_pay_period_alignment_frank"],
         # "is_earnin_tip_subscription_frank": is_earnin_tip_subscription_frank(all_transactions),
-        "is_cleo_ai_cash_advance_like_frank": is_cleo_ai_cash_advance_like_frank(all_transactions),
+        "is_cleo_ai_cash_advance_like_frank": lambda: group_features()["is_cleo_ai_cash_advance_like_frank"],
         # "is_apple_irregular_purchase_frank": is_apple_irregular_purchase_frank(all_transactions),
-        "is_apple_subscription_like_frank": is_apple_subscription_like_frank(all_transactions),
-        "is_amazon_prime_like_subscription_frank": is_amazon_prime_like_subscription_frank(all_transactions),
+        "is_apple_subscription_like_frank": lambda: group_features()["is_apple_subscription_like_frank"],
+        "is_amazon_prime_like_subscription_frank": lambda: group_features()["is_amazon_prime_like_subscription_frank"],
         # "is_amazon_retail_irregular_frank": is_amazon_retail_irregular_frank(all_transactions),
         # "fixed_amount_fuzzy_interval_subscription_frank": fixed_amount_fuzzy_interval_subscription_frank(
         #     all_transactions
         # ),
-        "is_utilities_or_insurance_like_frank": is_utilities_or_insurance_like_frank(all_transactions),
-        "is_always_recurring_vendor_frank": is_always_recurring_vendor_frank(all_transactions),
+        "is_utilities_or_insurance_like_frank": lambda: group_features()["is_utilities_or_insurance_like_frank"],
+        "is_always_recurring_vendor_frank": lambda: group_features()["is_always_recurring_vendor_frank"],
         # "is_brigit_repayment_like_frank": is_brigit_repayment_like_frank(all_transactions),
         # "is_brigit_subscription_like_frank": is_brigit_subscription_like_frank(all_transactions),
         # Christopher's features
         # "n_transactions_same_name_christopher": len(all_transactions),
-        "n_transactions_same_amount_christopher": get_n_transactions_same_amount_christopher(
+        "n_transactions_same_amount_christopher": lambda: get_n_transactions_same_amount_christopher(
             transaction, all_transactions
         ),
-        "percent_transactions_same_amount_christopher": get_percent_transactions_same_amount_christopher(
+        "percent_transactions_same_amount_christopher": lambda: get_percent_transactions_same_amount_christopher(
             transaction, all_transactions
         ),
         # "transaction_frequency_christopher": get_transaction_frequency_christopher(all_transactions),
         # "transaction_std_amount_christopher": get_transaction_std_amount_christopher(all_transactions),
         # "follows_regular_interval_christopher": follows_regular_interval_christopher(all_transactions),
         # "skipped_months_christopher": detect_skipped_months_christopher(all_transactions),
-        "day_of_month_consistency_christopher": get_day_of_month_consistency_christopher(all_transactions),
-        "coefficient_of_variation_christopher": get_coefficient_of_variation_christopher(all_transactions),
-        "median_interval_christopher": get_median_interval_christopher(all_transactions),
-        "is_known_recurring_company_christopher": is_known_recurring_company_christopher(transaction.name),
-        "is_known_fixed_subscription_christopher": is_known_fixed_subscription_christopher(transaction),
+        "day_of_month_consistency_christopher": lambda: group_features()["day_of_month_consistency_christopher"],
+        "coefficient_of_variation_christopher": lambda: group_features()["coefficient_of_variation_christopher"],
+        "median_interval_christopher": lambda: group_features()["median_interval_christopher"],
+        "is_known_recurring_company_christopher": lambda: is_known_recurring_company_christopher(transaction.name),
+        "is_known_fixed_subscription_christopher": lambda: is_known_fixed_subscription_christopher(transaction),
         # "is_regular_interval_christopher": is_regular_interval_christopher(transaction, all_transactions),
-        "amount_deviation_christopher": amount_deviation_christopher(transaction, all_transactions),
+        "amount_deviation_christopher": lambda: amount_deviation_christopher(transaction, all_transactions),
         # "amount_consistency_christopher": amount_consistency_christopher(transaction, all_transactions),
         # "transaction_frequency_christopher2": transaction_frequency_christopher(transaction, all_transactions),
         # "day_of_month_consistency_christopher2": day_of_month_consistency_christopher(transaction, all_transactions),
         # Laurels' features
-        "identical_transaction_ratio_laurels": identical_transaction_ratio_feature_laurels(
+        "identical_transaction_ratio_laurels": lambda: identical_transaction_ratio_feature_laurels(
             transaction, all_transactions, merchant_trans
         ),
         # "is_monthly_recurring_laurels": is_monthly_recurring_feature_laurels(merchant_trans),
-        "recurrence_likelihood_laurels": recurrence_likelihood_feature_laurels(
+        "recurrence_likelihood_laurels": lambda: recurrence_likelihood_feature_laurels(
             merchant_trans, interval_stats, amount_stats
         ),
         # "is_varying_amount_recurring_laurels": is_varying_amount_recurring_feature_laurels(
         #     interval_stats, amount_stats
         # ),
-        "day_consistency_score_laurels": day_consistency_score_feature_laurels(merchant_trans),
+        "day_consistency_score_laurels": lambda: day_consistency_score_feature_laurels(merchant_trans),
         # "is_near_periodic_interval_laurels": is_near_periodic_interval_feature_laurels(interval_stats),
         # "merchant_amount_std_laurels": merchant_amount_std_feature_laurels(amount_stats),
         # "merchant_interval_std_laurels": merchant_interval_std_feature_laurels(interval_stats),
-        "merchant_interval_mean_laurels": merchant_interval_mean_feature_laurels(interval_stats),
-        "time_since_last_transaction_same_merchant_laurels": time_since_last_transaction_same_merchant_feature_laurels(
-            parsed_dates
+        "merchant_interval_mean_laurels": lambda: merchant_interval_mean_feature_laurels(interval_stats),
+        "time_since_last_transaction_same_merchant_laurels": lambda: (
+            time_since_last_transaction_same_merchant_feature_laurels(parsed_dates)
         ),
         # "is_deposit_laurels": is_deposit_feature_laurels(transaction, merchant_trans),
         # "day_of_week_laurels": day_of_week_feature_laurels(transaction),
         # "transaction_month_laurels": transaction_month_feature_laurels(transaction),
-        "rolling_amount_mean_laurels": rolling_amount_mean_feature_laurels(merchant_trans),
+        "rolling_amount_mean_laurels": lambda: rolling_amount_mean_feature_laurels(merchant_trans),
         # "low_amount_variation_laurels": low_amount_variation_feature_laurels(amount_stats),
         # "is_single_transaction_laurels": is_single_transaction_feature_laurels(merchant_trans),
-        "interval_variability_laurels": interval_variability_feature_laurels(interval_stats),
-        "merchant_amount_frequency_laurels": merchant_amount_frequency_feature_laurels(merchant_trans),
-        "non_recurring_irregularity_score_laurels": non_recurring_irregularity_score_laurels(
+        "interval_variability_laurels": lambda: interval_variability_feature_laurels(interval_stats),
+        "merchant_amount_frequency_laurels": lambda: merchant_amount_frequency_feature_laurels(merchant_trans),
+        "non_recurring_irregularity_score_laurels": lambda: non_recurring_irregularity_score_laurels(
             merchant_trans, interval_stats, amount_stats
         ),
-        "transaction_pattern_complexity_laurels": transaction_pattern_complexity_laurels(
+        "transaction_pattern_complexity_laurels": lambda: transaction_pattern_complexity_laurels(
             merchant_trans, interval_stats
         ),
-        "date_irregularity_dominance_laurels": date_irregularity_dominance_laurels(
+        "date_irregularity_dominance_laurels": lambda: date_irregularity_dominance_laurels(
             merchant_trans, interval_stats, amount_stats
         ),
         # Emmanuel Ezechukwu (2)'s features
-        **get_recurrence_patterns_emmanuel2(transaction, all_transactions),
-        **get_recurring_consistency_score_emmanuel2(transaction, all_transactions),
-        "is_recurring_emmanuel2": int(validate_recurring_transaction_emmanuel2(transaction)),
+        ("recurrence_score_emmanuel2",): lambda: get_recurrence_patterns_emmanuel2(transaction, all_transactions),
+        ("recurring_consistency_score_emmanuel2",): lambda: get_recurring_consistency_score_emmanuel2(
+            transaction, all_transactions
+        ),
+        "is_recurring_emmanuel2": lambda: int(validate_recurring_transaction_emmanuel2(transaction)),
         # "subscription_tier_emmanuel2": classify_subscription_tier_emmanuel2(transaction),
-        **get_amount_features_emmanuel2(transaction, all_transactions),
-        **get_user_behavior_features_emmanuel2(transaction, all_transactions),
+        ("amount_fluctuation_emmanuel2",): lambda: get_amount_features_emmanuel2(transaction, all_transactions),
+        ("user_total_spent_emmanuel2",): lambda: get_user_behavior_features_emmanuel2(transaction, all_transactions),
         # **get_refund_features_emmanuel2(transaction, all_transactions),
-        **get_monthly_spending_trend_emmanuel2(transaction, all_transactions),
+        ("monthly_spending_trend_emmanuel2",): lambda: get_monthly_spending_trend_emmanuel2(
+            transaction, all_transactions
+        ),
         # Nnanna's features
-        "time_interval_between_transactions_nnanna": get_time_interval_between_transactions_nnanna(
+        "time_interval_between_transactions_nnanna": lambda: get_time_interval_between_transactions_nnanna(
             transaction, all_transactions
         ),
         # "mobile_company_nnanna": get_mobile_transaction_nnanna(transaction),
@@ -728,7 +921,7 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         # "transaction_amount_dispersion_nnanna": get_dispersion_transaction_amount_nnanna(
         #     transaction, all_transactions
         # ),
-        "mad_transaction_amount_nnanna": get_mad_transaction_amount_nnanna(transaction, all_transactions),
+        "mad_transaction_amount_nnanna": lambda: get_mad_transaction_amount_nnanna(transaction, all_transactions),
         # "coefficient_of_variation_nnanna": get_coefficient_of_variation_nnanna(transaction, all_transactions),
         # "transaction_interval_consistency_nnanna": get_transaction_interval_consistency_nnanna(
         #     transaction, all_transactions
@@ -745,11 +938,13 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         # ),
         # "avg_amount_same_name_ebenezer": get_avg_amount_same_name_ebenezer(transaction, all_transactions),
         # "std_amount_same_name_ebenezer": get_std_amount_same_name_ebenezer(transaction, all_transactions),
-        "n_transactions_same_month_ebenezer": get_n_transactions_same_month_ebenezer(transaction, all_transactions),
-        "percent_transactions_same_month_ebenezer": get_percent_transactions_same_month_ebenezer(
+        "n_transactions_same_month_ebenezer": lambda: get_n_transactions_same_month_ebenezer(
+            transaction, all_transactions
+        ),
+        "percent_transactions_same_month_ebenezer": lambda: get_percent_transactions_same_month_ebenezer(
             transaction, all_transactions
         ),
-        "avg_amount_same_month_ebenezer": get_avg_amount_same_month_ebenezer(transaction, all_transactions),
+        "avg_amount_same_month_ebenezer": lambda: get_avg_amount_same_month_ebenezer(transaction, all_transactions),
         # "std_amount_same_month_ebenezer": get_std_amount_same_month_ebenezer(transaction, all_transactions),
         # "n_transactions_same_user_id_ebenezer": get_n_transactions_same_user_id_ebenezer(
         #     transaction, all_transactions
@@ -757,24 +952,28 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         # "percent_transactions_same_user_id_ebenezer": get_percent_transactions_same_user_id_ebenezer(
         #     transaction, all_transactions
         # ),
-        "percent_transactions_same_day_of_week_ebenezer": get_percent_transactions_same_day_of_week_ebenezer(
+        "percent_transactions_same_day_of_week_ebenezer": lambda: get_percent_transactions_same_day_of_week_ebenezer(
             transaction, all_transactions
         ),
-        "avg_amount_same_day_of_week_ebenezer": get_avg_amount_same_day_of_week_ebenezer(transaction, all_transactions),
-        "std_amount_same_day_of_week_ebenezer": get_std_amount_same_day_of_week_ebenezer(transaction, all_transactions),
-        "n_transactions_within_amount_range_ebenezer": get_n_transactions_within_amount_range_ebenezer(
+        "avg_amount_same_day_of_week_ebenezer": lambda: get_avg_amount_same_day_of_week_ebenezer(
             transaction, all_transactions
         ),
-        "percent_transactions_within_amount_range_ebenezer": get_percent_transactions_within_amount_range_ebenezer(
+        "std_amount_same_day_of_week_ebenezer": lambda: get_std_amount_same_day_of_week_ebenezer(
             transaction, all_transactions
         ),
+        "n_transactions_within_amount_range_ebenezer": lambda: get_n_transactions_within_amount_range_ebenezer(
+            transaction, all_transactions
+        ),
+        "percent_transactions_within_amount_range_ebenezer": lambda: (
+            get_percent_transactions_within_amount_range_ebenezer(transaction, all_transactions)
+        ),
         # "avg_time_between_transactions_ebenezer": float(
         #     get_avg_time_between_transactions_ebenezer(transaction, all_transactions)
         # ),
         # "is_recurring_ebenezer": float(get_is_recurring_ebenezer(transaction, all_transactions)),
-        "median_amount_same_name_ebenezer": float(get_median_amount_same_name_ebenezer(transaction, all_transactions)),
+        "median_amount_same_name_ebenezer": median_amount_same_name,
         # "amount_range_same_name_ebenezer": float(get_amount_range_same_name_ebenezer(transaction, all_transactions)),
-        "day_of_week_ebenezer": float(get_day_of_week_ebenezer(transaction)),
+        "day_of_week_ebenezer": lambda: float(get_day_of_week_ebenezer(transaction)),
         # "is_weekend_ebenezer": float(get_is_weekend_ebenezer(transaction)),
         # "user_avg_transaction_amount_ebenezer": float(
         #     get_user_avg_transaction_amount_ebenezer(transaction, all_transactions)
@@ -783,30 +982,32 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         #     get_user_transaction_frequency_ebenezer(transaction, all_transactions)
         # ),
         # "amount_variance_ebenezer": float(get_amount_variance_ebenezer(transaction, all_transactions)),
-        "amount_consistency_ebenezer": float(get_amount_consistency_ebenezer(transaction, all_transactions)),
+        "amount_consistency_ebenezer": lambda: float(get_amount_consistency_ebenezer(transaction, all_transactions)),
         # "is_monthly_ebenezer": float(get_is_monthly_ebenezer(transaction, all_transactions)),
         # "is_weekly_ebenezer": float(get_is_weekly_ebenezer(transaction, all_transactions)),
-        "keyword_match_ebenezer": float(get_keyword_match_ebenezer(transaction)),
+        "keyword_match_ebenezer": lambda: float(get_keyword_match_ebenezer(transaction)),
         # Praise's features
         # "is_recurring_merchant_praise": is_recurring_merchant_praise(transaction),
-        "avg_days_between_same_merchant_amount_praise": get_avg_days_between_same_merchant_amount_praise(
+        "avg_days_between_same_merchant_amount_praise": lambda: get_avg_days_between_same_merchant_amount_praise(
             transaction, all_transactions
         ),
         # "average_transaction_amount_praise": get_average_transaction_amount_praise(all_transactions),
-        "max_transaction_amount_praise": get_max_transaction_amount_praise(all_transactions),
-        "min_transaction_amount_praise": get_min_transaction_amount_praise(all_transactions),
+        "max_transaction_amount_praise": lambda: group_features()["max_transaction_amount_praise"],
+        "min_transaction_amount_praise": lambda: group_features()["min_transaction_amount_praise"],
         # "most_frequent_names_praise": len(get_most_frequent_names_praise(all_transactions)),
-        "is_recurring_praise": is_recurring_praise(transaction, all_transactions),
-        "amount_ends_in_99_praise": amount_ends_in_99_praise(transaction),
-        "amount_ends_in_00_praise": amount_ends_in_00_praise(transaction),
+        "is_recurring_praise": lambda: is_recurring_praise(transaction, all_transactions),
+        "amount_ends_in_99_praise": lambda: amount_ends_in_99_praise(transaction),
+        "amount_ends_in_00_praise": lambda: amount_ends_in_00_praise(transaction),
         # "n_transactions_same_merchant_amount_praise": get_n_transactions_same_merchant_amount_praise(
         #     transaction, all_transactions
         # ),
         # "percent_transactions_same_merchant_amount_praise": get_percent_transactions_same_merchant_amount_praise(
         #     transaction, all_transactions
         # ),
-        "interval_variance_coefficient_praise": get_interval_variance_coefficient_praise(transaction, all_transactions),
-        "stddev_days_between_same_merchant_amount_praise": get_stddev_days_between_same_merchant_amount_praise(
+        "interval_variance_coefficient_praise": lambda: get_interval_variance_coefficient_praise(
+            transaction, all_transactions
+        ),
+        "stddev_days_between_same_merchant_amount_praise": lambda: get_stddev_days_between_same_merchant_amount_praise(
             transaction, all_transactions
         ),
         # "days_since_last_same_merchant_amount_praise": get_days_since_last_same_merchant_amount_praise(
@@ -815,7 +1016,7 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         # "is_expected_transaction_date_praise": is_expected_transaction_date_praise(transaction, all_transactions),
         # "has_incrementing_numbers_praise": has_incrementing_numbers_praise(transaction, all_transactions),
         # "has_consistent_reference_codes_praise": has_consistent_reference_codes_praise(transaction, all_transactions),
-        "markovian_probability_praise": calculate_markovian_probability_praise(transaction, all_transactions),
+        "markovian_probability_praise": lambda: calculate_markovian_probability_praise(transaction, all_transactions),
         # "streaks_praise": calculate_streaks_praise(transaction, all_transactions),
         # "ewma_interval_deviation_praise": get_ewma_interval_deviation_praise(transaction, all_transactions),
         # "hurst_exponent_praise": get_hurst_exponent_praise(transaction, all_transactions),
@@ -823,9 +1024,11 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         # "is_recurring_through_past_transactions_praise": is_recurring_through_past_transactions_praise(
         #     transaction, all_transactions
         # ),
-        "get_amount_zscore_praise": get_amount_zscore_praise(transaction, all_transactions),
+        "get_amount_zscore_praise": lambda: get_amount_zscore_praise(transaction, all_transactions),
         # "is_amount_outlier_praise": is_amount_outlier_praise(transaction, all_transactions),
-        "get_stddev_amount_same_merchant_praise": get_stddev_amount_same_merchant_praise(transaction, all_transactions),
+        "get_stddev_amount_same_merchant_praise": lambda: get_stddev_amount_same_merchant_praise(
+            transaction, all_transactions
+        ),
         # "get_avg_days_between_same_merchant_praise": get_avg_days_between_same_merchant_praise(
         #     transaction, all_transactions
         # ),
@@ -834,20 +1037,22 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         # "get_days_since_first_transaction_praise": get_days_since_first_transaction_praise(
         #     transaction, all_transactions
         # ),
-        "get_amount_coefficient_of_variation_praise": get_amount_coefficient_of_variation_praise(
+        "get_amount_coefficient_of_variation_praise": lambda: get_amount_coefficient_of_variation_praise(
             transaction, all_transactions
         ),
         # "get_unique_merchants_count_praise": get_unique_merchants_count_praise(transaction, all_transactions),
-        "get_amount_quantile_praise": get_amount_quantile_praise(transaction, all_transactions),
+        "get_amount_quantile_praise": lambda: get_amount_quantile_praise(transaction, all_transactions),
         # "is_consistent_weekday_pattern_praise": is_consistent_weekday_pattern_praise(transaction, all_transactions),
-        "get_recurrence_score_by_amount_praise": get_recurrence_score_by_amount_praise(transaction, all_transactions),
-        "compare_recent_to_historical_average_praise": compare_recent_to_historical_average_praise(
+        "get_recurrence_score_by_amount_praise": lambda: get_recurrence_score_by_amount_praise(
+            transaction, all_transactions
+        ),
+        "compare_recent_to_historical_average_praise": lambda: compare_recent_to_historical_average_praise(
             transaction, all_transactions
         ),
         # "get_days_since_last_transaction_praise": get_days_since_last_transaction_praise(
         #     transaction, all_transactions
         # ),
-        "get_normalized_recency_praise": get_normalized_recency_praise(transaction, all_transactions),
+        "get_normalized_recency_praise": lambda: get_normalized_recency_praise(transaction, all_transactions),
         # "get_transaction_recency_score_praise": get_transaction_recency_score_praise(transaction, all_transactions),
         # "get_n_transactions_last_30_days_praise": get_n_transactions_last_30_days_praise(
         #     transaction, all_transactions
@@ -863,7 +1068,7 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         # "afterpay_future_same_amount_exists_praise": afterpay_future_same_amount_exists_praise(
         #     transaction, all_transactions
         # ),
-        "afterpay_recurrence_score_praise": afterpay_recurrence_score_praise(transaction, all_transactions),
+        "afterpay_recurrence_score_praise": lambda: afterpay_recurrence_score_praise(transaction, all_transactions),
         # "is_moneylion_common_amount_praise": is_moneylion_common_amount_praise(transaction, all_transactions),
         # "moneylion_days_since_last_same_amount_praise": moneylion_days_since_last_same_amount_praise(
         #     transaction, all_transactions
@@ -874,23 +1079,25 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         # "apple_total_same_amount_past_6m_praise": apple_total_same_amount_past_6m_praise(
         #     transaction, all_transactions
         # ),
-        "apple_std_dev_amounts_praise": apple_std_dev_amounts_praise(transaction, all_transactions),
+        "apple_std_dev_amounts_praise": lambda: apple_std_dev_amounts_praise(transaction, all_transactions),
         # "apple_is_low_value_txn_praise": apple_is_low_value_txn_praise(transaction),
-        "apple_days_since_first_seen_amount_praise": apple_days_since_first_seen_amount_praise(
+        "apple_days_since_first_seen_amount_praise": lambda: apple_days_since_first_seen_amount_praise(
             transaction, all_transactions
         ),
-        "get_rolling_mean_amount_praise": get_rolling_mean_amount_praise(transaction, all_transactions),
-        "get_interval_variance_ratio_praise": get_interval_variance_ratio_praise(transaction, all_transactions),
+        "get_rolling_mean_amount_praise": lambda: get_rolling_mean_amount_praise(transaction, all_transactions),
+        "get_interval_variance_ratio_praise": lambda: get_interval_variance_ratio_praise(transaction, all_transactions),
         # "get_day_of_month_consistency_praise": get_day_of_month_consistency_praise(transaction, all_transactions),
-        "get_seasonality_score_praise": get_seasonality_score_praise(transaction, all_transactions),
-        "get_amount_drift_slope_praise": get_amount_drift_slope_praise(transaction, all_transactions),
+        "get_seasonality_score_praise": lambda: get_seasonality_score_praise(transaction, all_transactions),
+        "get_amount_drift_slope_praise": lambda: get_amount_drift_slope_praise(transaction, all_transactions),
         # "get_burstiness_ratio_praise": get_burstiness_ratio_praise(transaction, all_transactions),
-        "get_serial_autocorrelation_praise": get_serial_autocorrelation_praise(transaction, all_transactions),
-        "get_weekday_concentration_praise": get_weekday_concentration_praise(transaction, all_transactions),
-        "get_interval_consistency_ratio_praise": get_interval_consistency_ratio_praise(transaction, all_transactions),
-        "get_median_amount_praise": get_median_amount_praise(transaction, all_transactions),
-        "get_amount_mad_praise": get_amount_mad_praise(transaction, all_transactions),
-        "get_amount_iqr_praise": get_amount_iqr_praise(transaction, all_transactions),
+        "get_serial_autocorrelation_praise": lambda: get_serial_autocorrelation_praise(transaction, all_transactions),
+        "get_weekday_concentration_praise": lambda: get_weekday_concentration_praise(transaction, all_transactions),
+        "get_interval_consistency_ratio_praise": lambda: get_interval_consistency_ratio_praise(
+            transaction, all_transactions
+        ),
+        "get_median_amount_praise": median_amount_same_name,
+        "get_amount_mad_praise": lambda: get_amount_mad_praise(transaction, all_transactions),
+        "get_amount_iqr_praise": lambda: get_amount_iqr_praise(transaction, all_transactions),
         # "get_ratio_transactions_last_30_days_praise": get_ratio_transactions_last_30_days_praise(
         #     transaction, all_transactions
         # ),
@@ -901,106 +1108,120 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         # "percent_transactions_same_amount_emmanuel1": get_percent_transactions_same_amount_emmanuel1(
         #     transaction, all_transactions
         # ),
-        "has_recurring_keyword_emmanuel1": get_has_recurring_keyword_emmanuel1(transaction),
-        "is_always_recurring_emmanuel1": int(get_is_always_recurring_emmanuel1(transaction)),
+        "has_recurring_keyword_emmanuel1": lambda: get_has_recurring_keyword_emmanuel1(transaction),
+        "is_always_recurring_emmanuel1": lambda: int(get_is_always_recurring_emmanuel1(transaction)),
         # "n_transactions_30_days_apart_emmanuel1": get_n_transactions_days_apart_emmanuel1(
         #     transaction, all_transactions, 30, 2
         # ),
         # "is_convenience_store_emmanuel1": get_is_convenience_store_emmanuel1(transaction),
         # "is_insurance_emmanuel1": int(get_is_insurance_emmanuel1(transaction)),
         # "is_utility_emmanuel1": int(get_is_utility_emmanuel1(transaction)),
-        "is_phone_emmanuel1": int(get_is_phone_emmanuel1(transaction)),
-        "n_transactions_days_apart_30_emmanuel1": get_n_transactions_days_apart_emmanuel1(
+        "is_phone_emmanuel1": lambda: int(get_is_phone_emmanuel1(transaction)),
+        "n_transactions_days_apart_30_emmanuel1": lambda: get_n_transactions_days_apart_emmanuel1(
             transaction, all_transactions, 30, 3
         ),
-        "pct_transactions_days_apart_30_emmanuel1": get_pct_transactions_days_apart_emmanuel1(
+        "pct_transactions_days_apart_30_emmanuel1": lambda: get_pct_transactions_days_apart_emmanuel1(
             transaction, all_transactions, 30, 3
         ),
-        "amount_range_consistency_emmanuel1": get_amount_range_consistency_emmanuel1(transaction, all_transactions),
-        "recurring_period_score_emmanuel1": get_recurring_period_score_emmanuel1(transaction, all_transactions),
+        "amount_range_consistency_emmanuel1": lambda: get_amount_range_consistency_emmanuel1(
+            transaction, all_transactions
+        ),
+        "recurring_period_score_emmanuel1": lambda: get_recurring_period_score_emmanuel1(transaction, all_transactions),
         # Asimi's features
-        **get_amount_features_asimi(transaction),
+        ("is_amount_rounded_asimi", "amount_category_asimi"): lambda: get_amount_features_asimi(transaction),
         # **get_user_recurring_vendor_count_asimi(transaction, all_transactions),
         # **get_user_transaction_frequency_asimi(transaction, all_transactions),
         # **get_vendor_amount_std_asimi(transaction, all_transactions),
         # **get_vendor_recurring_user_count_asimi(transaction, all_transactions),
         # **get_vendor_transaction_frequency_asimi(transaction, all_transactions),
         # **get_user_vendor_transaction_count_asimi(transaction, all_transactions),
-        **get_user_vendor_recurrence_rate_asimi(transaction, all_transactions),
+        ("user_vendor_recurrence_rate_asimi",): lambda: get_user_vendor_recurrence_rate_asimi(
+            transaction, all_transactions
+        ),
         # **get_user_vendor_interaction_count_asimi(transaction, all_transactions),
-        **get_amount_category_asimi(transaction),
-        **get_temporal_consistency_features_asimi(transaction, all_transactions),
-        **get_vendor_recurrence_profile_asimi(transaction, all_transactions),
+        ("amount_category_asimi",): lambda: get_amount_category_asimi(transaction),
+        ("temporal_consistency_score_asimi",): lambda: get_temporal_consistency_features_asimi(
+            transaction, all_transactions
+        ),
+        ("vendor_recurrence_consistency_asimi",): lambda: get_vendor_recurrence_profile_asimi(
+            transaction, all_transactions
+        ),
         # **get_user_vendor_relationship_features_asimi(transaction, all_transactions),
-        "is_recurring_asimi": is_valid_recurring_transaction_asimi(transaction),
-        **get_user_specific_features_asimi(transaction, all_transactions),
-        "amount_frequency_score_asimi": get_amount_frequency_score_asimi(transaction, all_transactions),
-        "has_99_cent_pricing_asimi": has_99_cent_pricing_asimi(transaction),
-        "interval_precision_asimi": get_interval_precision_asimi(transaction, all_transactions),
-        "is_apple_subscription_amount_asimi": is_apple_subscription_amount_asimi(transaction.amount),
-        "is_annual_subscription_asimi": is_annual_subscription_asimi(transaction, all_transactions),
+        "is_recurring_asimi": lambda: is_valid_recurring_transaction_asimi(transaction),
+        ("user_recurring_transaction_count_asimi", "user_recurring_transaction_rate_asimi"): lambda: (
+            get_user_specific_features_asimi(transaction, all_transactions)
+        ),
+        "amount_frequency_score_asimi": lambda: get_amount_frequency_score_asimi(transaction, all_transactions),
+        "has_99_cent_pricing_asimi": lambda: has_99_cent_pricing_asimi(transaction),
+        "interval_precision_asimi": lambda: get_interval_precision_asimi(transaction, all_transactions),
+        "is_apple_subscription_amount_asimi": lambda: is_apple_subscription_amount_asimi(transaction.amount),
+        "is_annual_subscription_asimi": lambda: is_annual_subscription_asimi(transaction, all_transactions),
         # "apple_subscription_asimi": is_apple_subscription_asimi(transaction, all_transactions),
         # "afterpay_installment_asimi": is_afterpay_installment_asimi(transaction, all_transactions),
-        "is_afterpay_one_time_asimi": is_afterpay_one_time_asimi(transaction, all_transactions),
-        "temporal_consistency_asimi": get_amount_temporal_consistency_asimi(transaction, all_transactions),
-        "recurrence_streak_asimi": get_recurrence_streak_asimi(transaction, all_transactions),
+        "is_afterpay_one_time_asimi": lambda: is_afterpay_one_time_asimi(transaction, all_transactions),
+        "temporal_consistency_asimi": lambda: get_amount_temporal_consistency_asimi(transaction, all_transactions),
+        "recurrence_streak_asimi": lambda: get_recurrence_streak_asimi(transaction, all_transactions),
         # "burst_score_asimi": get_burst_score_asimi(transaction, all_transactions),
-        "series_duration_asimi": get_series_duration_asimi(transaction, all_transactions),
+        "series_duration_asimi": lambda: get_series_duration_asimi(transaction, all_transactions),
         # "amount_quantum_asimi": get_amount_quantum_asimi(transaction, all_transactions),
         # "apple_interval_score_asimi": get_apple_interval_score_asimi(transaction, all_transactions),
-        "is_common_subscription_asimi": is_common_subscription_asimi(transaction),
-        "is_common_subscription_amount_asimi": is_common_subscription_amount_asimi(transaction.amount),
+        "is_common_subscription_asimi": lambda: is_common_subscription_asimi(transaction),
+        "is_common_subscription_amount_asimi": lambda: is_common_subscription_amount_asimi(transaction.amount),
         # "loan_repayment_score_asimi": get_loan_repayment_score_asimi(transaction, all_transactions),
         # Samuel's features
         # "transaction_frequency_samuel": get_transaction_frequency_samuel(transaction, all_transactions),
         # "amount_std_dev_samuel": get_amount_std_dev_samuel(transaction, all_transactions),
         # "median_transaction_amount_samuel": get_median_transaction_amount_samuel(transaction, all_transactions),
         # "is_weekend_transaction_samuel": get_is_weekend_transaction_samuel(transaction),
-        "is_always_recurring_samuel": get_is_always_recurring_samuel(transaction),
+        "is_always_recurring_samuel": lambda: get_is_always_recurring_samuel(transaction),
         # "transaction_day_samuel": get_transaction_day_samuel(transaction),
         # "transaction_weekday_samuel": get_transaction_weekday_samuel(transaction),
         # "transaction_month_samuel": get_transaction_month_samuel(transaction),
-        "transaction_year_samuel": get_transaction_year_samuel(transaction),
+        "transaction_year_samuel": lambda: get_transaction_year_samuel(transaction),
         # "is_first_half_month_samuel": get_is_first_half_month_samuel(transaction),
         # "is_month_end_samuel": get_is_month_end_samuel(transaction),
         # "amount_above_mean_samuel": get_amount_above_mean_samuel(transaction, all_transactions),
         # "amount_equal_previous_samuel": get_amount_equal_previous_samuel(transaction, all_transactions),
-        "name_token_count_samuel": get_name_token_count_samuel(transaction),
+        "name_token_count_samuel": lambda: get_name_token_count_samuel(transaction),
         # "has_digits_in_name_samuel": get_has_digits_in_name_samuel(transaction),
-        "average_days_between_transactions_samuel": get_average_days_between_transactions_samuel(
+        "average_days_between_transactions_samuel": lambda: get_average_days_between_transactions_samuel(
             transaction, all_transactions
         ),
-        "transaction_count_last_90_days_samuel": get_transaction_count_last_90_days_samuel(
+        "transaction_count_last_90_days_samuel": lambda: get_transaction_count_last_90_days_samuel(
             transaction, all_transactions
         ),
         # "is_last_day_of_week_samuel": get_is_last_day_of_week_samuel(transaction),
         # "amount_round_samuel": get_amount_round_samuel(transaction),
-        "amount_decimal_places_samuel": get_amount_decimal_places_samuel(transaction),
+        "amount_decimal_places_samuel": lambda: get_amount_decimal_places_samuel(transaction),
         # "contains_subscription_keywords_samuel": get_contains_subscription_keywords_samuel(transaction),
         # "is_fixed_amount_samuel": get_is_fixed_amount_samuel(transaction, all_transactions),
-        "name_length_samuel": get_name_length_samuel(transaction),
-        "most_common_amount_samuel": get_most_common_amount_samuel(transaction, all_transactions),
+        "name_length_samuel": lambda: get_name_length_samuel(transaction),
+        "most_common_amount_samuel": lambda: get_most_common_amount_samuel(transaction, all_transactions),
         # "amount_difference_from_mode_samuel": get_amount_difference_from_mode_samuel(transaction, all_transactions),
         # "transaction_date_is_first_samuel": get_transaction_date_is_first_samuel(transaction, all_transactions),
         # "transaction_date_is_last_samuel": get_transaction_date_is_last_samuel(transaction, all_transactions),
         # "transaction_name_word_frequency_samuel": get_transaction_name_word_frequency_samuel(
         #     transaction, all_transactions
         # ),
-        "transaction_amount_percentile_samuel": get_transaction_amount_percentile_samuel(transaction, all_transactions),
+        "transaction_amount_percentile_samuel": lambda: get_transaction_amount_percentile_samuel(
+            transaction, all_transactions
+        ),
         # "transaction_name_is_upper_samuel": get_transaction_name_is_upper_samuel(transaction),
-        "transaction_name_is_title_case_samuel": get_transaction_name_is_title_case_samuel(transaction),
+        "transaction_name_is_title_case_samuel": lambda: get_transaction_name_is_title_case_samuel(transaction),
         # "days_since_last_transaction_samuel": get_days_since_last_transaction_samuel(transaction, all_transactions),
-        "days_until_next_transaction_samuel": get_days_until_next_transaction_samuel(transaction, all_transactions),
+        "days_until_next_transaction_samuel": lambda: get_days_until_next_transaction_samuel(
+            transaction, all_transactions
+        ),
         # Precious's features
         # "amount_ends_in_00_precious": amount_ends_in_00_precious(transaction),
-        "is_recurring_merchant_precious": is_recurring_merchant_precious(transaction),
+        "is_recurring_merchant_precious": lambda: is_recurring_merchant_precious(transaction),
         # "n_transactions_same_merchant_amount_precious": get_n_transactions_same_merchant_amount_precious(
         #     transaction, all_transactions
         # ),
         # "percent_transactions_same_merchant_amount_precious": get_percent_transactions_same_merchant_amount_precious(
         #     transaction, all_transactions
         # ),
-        "avg_days_between_same_merchant_amount_precious": get_avg_days_between_same_merchant_amount_precious(
+        "avg_days_between_same_merchant_amount_precious": lambda: get_avg_days_between_same_merchant_amount_precious(
             transaction, all_transactions
         ),
         # "stddev_days_between_same_merchant_amount_precious": get_stddev_days_between_same_merchant_amount_precious(
@@ -1010,23 +1231,51 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         #     transaction, all_transactions
         # ),
         # "recurring_frequency_precious": get_recurring_frequency_precious(transaction, all_transactions),
-        "is_subscription_amount_precious": is_subscription_amount_precious(transaction),
-        **get_additional_features_precious(transaction, all_transactions),
-        **get_amount_variation_features_precious(transaction, all_transactions),
-        **get_new_features_precious(transaction, all_transactions),
+        "is_subscription_amount_precious": lambda: is_subscription_amount_precious(transaction),
+        (
+            "day_of_week_precious",
+            "day_of_month_precious",
+            "days_since_first_occurrence_precious",
+            "min_days_between_precious",
+            "max_days_between_precious",
+            "merchant_recent_count_precious",
+            "relative_amount_difference_precious",
+        ): lambda: get_additional_features_precious(transaction, all_transactions),
+        ("relative_amount_diff_precious",): lambda: get_amount_variation_features_precious(
+            transaction, all_transactions
+        ),
+        (
+            "amount_precious",
+            "rolling_mean_amount_precious",
+            "day_of_month_precious",
+            "days_since_last_precious",
+            "relative_amount_diff_precious",
+            "interval_variance_ratio_precious",
+            "dom_consistency_precious",
+            "seasonality_score_precious",
+            "amount_drift_precious",
+            "serial_autocorrelation_precious",
+            "sin_doy_precious",
+            "cos_doy_precious",
+            "weekday_concentration_precious",
+            "interval_consistency_ratio_precious",
+            "median_interval_precious",
+            "mad_interval_precious",
+            "median_amount_precious",
+        ): lambda: get_new_features_precious(transaction, all_transactions),
         # Happy's features
-        "get_n_transactions_same_description_happy": get_n_transactions_same_description_happy(
+        "get_n_transactions_same_description_happy": lambda: get_n_transactions_same_description_happy(
             transaction, all_transactions
         ),
         # "get_percent_transactions_same_description_happy": get_percent_transactions_same_description_happy(
         #     transaction, all_transactions
         # ),
-        "get_transaction_same_frequency_happy": get_transaction_frequency_happy(transaction, all_transactions),
-        "get_day_of_month_consistency_happy": get_day_of_month_consistency_happy(transaction, all_transactions),
-        "amount_consistency_happy": get_amount_consistency_happy(transaction, all_transactions),
+        "get_transaction_same_frequency_happy": lambda: get_transaction_frequency_happy(transaction, all_transactions),
+        "get_day_of_month_consistency_happy": lambda: get_day_of_month_consistency_happy(transaction, all_transactions),
+        "amount_consistency_happy": lambda: get_amount_consistency_happy(transaction, all_transactions),
         # "amount_variance_happy": get_amount_variance_happy(transaction, all_transactions),
-        "monthly_pattern_score_happy": get_monthly_pattern_score_happy(transaction, all_transactions),
-        "weekly_pattern_score_happy": get_weekly_pattern_score_happy(transaction, all_transactions),
+        "monthly_pattern_score_happy": lambda: get_monthly_pattern_score_happy(transaction, all_transactions),
+        "weekly_pattern_score_happy": lambda: get_weekly_pattern_score_happy(transaction, all_transactions),
         # "biweekly_pattern_score_happy": get_biweekly_pattern_score_happy(transaction, all_transactions),
         # "quarterly_pattern_score_happy": get_quarterly_pattern_score_happy(transaction, all_transactions),
         # "yearly_pattern_score_happy": get_yearly_pattern_score_happy(transaction, all_transactions),
@@ -1034,31 +1283,31 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         # "contains_subscription_keywords_happy": contains_subscription_keywords_happy(transaction),
         # "same_category_ratio_happy": get_same_category_ratio_happy(transaction, all_transactions),
         # "merchant_consistency_happy": get_merchant_consistency_happy(transaction, all_transactions),
-        "recurring_score_happy": get_recurring_score_happy(transaction, all_transactions),
+        "recurring_score_happy": lambda: get_recurring_score_happy(transaction, all_transactions),
         # Osasere's features
         # "has_min_recurrence_period_osasere": has_min_recurrence_period_osasere(transaction, all_transactions),
-        "day_of_month_consistency_osasere": get_day_of_month_consistency_osasere(transaction, all_transactions),
-        "day_of_month_variability_osasere": get_day_of_month_variability_osasere(transaction, all_transactions),
-        "recurrence_confidence_osasere": get_recurrence_confidence_osasere(transaction, all_transactions),
-        "median_period_days_osasere": get_median_period_osasere(transaction, all_transactions),
+        "day_of_month_consistency_osasere": lambda: get_day_of_month_consistency_osasere(transaction, all_transactions),
+        "day_of_month_variability_osasere": lambda: get_day_of_month_variability_osasere(transaction, all_transactions),
+        "recurrence_confidence_osasere": lambda: get_recurrence_confidence_osasere(transaction, all_transactions),
+        "median_period_days_osasere": lambda: get_median_period_osasere(transaction, all_transactions),
         # "is_weekday_consistent_osasere": is_weekday_consistent_osasere(transaction, all_transactions),
         # "is_AT&T_osasere": get_fixed_recurring_osasere("AT&T", transaction),
-        "is_water_utility_osasere": get_fixed_recurring_osasere("Water", transaction),
-        "is_installment_payment_osasere": detect_installment_payments_osasere(transaction, all_transactions),
+        "is_water_utility_osasere": lambda: get_fixed_recurring_osasere("Water", transaction),
+        "is_installment_payment_osasere": lambda: detect_installment_payments_osasere(transaction, all_transactions),
         # "is_financial_service_fee_osasere": detect_financial_service_fees_osasere(transaction, all_transactions),
         # "is_housing_payment_osasere": detect_housing_payments_osasere(transaction, all_transactions),
         # "is_streaming_service_osasere": detect_streaming_services_osasere(transaction),
-        "is_insurance_payment_osasere": detect_insurance_payments_osasere(transaction),
-        "is_recurring_merchant_osasere": is_likely_recurring_by_merchant_osasere(transaction),
+        "is_insurance_payment_osasere": lambda: detect_insurance_payments_osasere(transaction),
+        "is_recurring_merchant_osasere": lambda: is_likely_recurring_by_merchant_osasere(transaction),
         # "has_consistent_amount_osasere": has_consistent_amount_osasere(transaction, all_transactions),
         # "has_regular_interval_osasere": has_regular_interval_osasere(transaction, all_transactions),
         # Felix's features
         # "n_transactions_same_vendor_felix": get_n_transactions_same_vendor_felix(transaction, all_transactions),
-        "max_transaction_amount_felix": get_max_transaction_amount_felix(all_transactions),
-        "min_transaction_amount_felix": get_min_transaction_amount_felix(all_transactions),
+        "max_transaction_amount_felix": lambda: group_features()["max_transaction_amount_felix"],
+        "min_transaction_amount_felix": lambda: group_features()["min_transaction_amount_felix"],
         # "is_phone_felix": get_is_phone_felix(transaction),
-        "month_felix": get_month_felix(transaction),
-        "day_felix": get_day_felix(transaction),
+        "month_felix": lambda: get_month_felix(transaction),
+        "day_felix": lambda: get_day_felix(transaction),
         # "year_felix": get_year_felix(transaction),
         # "is_insurance_felix": get_is_insurance_felix(transaction),
         # "is_utility_felix": get_is_utility_felix(transaction),
@@ -1070,28 +1319,34 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         # "transactions_interval_stability_felix": get_transactions_interval_stability_felix(
         #     transaction, all_transactions
         # ),
-        "average_transaction_amount_felix": get_average_transaction_amount_felix(transaction, all_transactions),
-        "dispersion_transaction_amount_felix": get_dispersion_transaction_amount_felix(transaction, all_transactions),
+        "average_transaction_amount_felix": lambda: get_average_transaction_amount_felix(transaction, all_transactions),
+        "dispersion_transaction_amount_felix": lambda: get_dispersion_transaction_amount_felix(
+            transaction, all_transactions
+        ),
         # "transaction_rate_felix": get_transaction_rate_felix(transaction, all_transactions),
-        **get_transaction_intervals_felix(all_transactions),
+        "avg_days_between_transactions_felix": lambda: group_features()["avg_days_between_transactions_felix"],
+        "monthly_recurrence_felix": lambda: group_features()["monthly_recurrence_felix"],
+        "same_amount_felix": lambda: group_features()["same_amount_felix"],
         # "is_amazon_prime_felix": get_is_amazon_prime_felix(transaction),
         # "vendor_transaction_frequency_felix": get_vendor_transaction_frequency_felix(transaction, all_transactions),
         # "vendor_transaction_recurring_felix": get_vendor_transaction_recurring_felix(transaction, all_transactions),
-        "likelihood_of_recurrence_felix": get_likelihood_of_recurrence_felix(transaction, all_transactions),
-        "transaction_recency_felix": get_transaction_recency_felix(transaction, all_transactions),
+        "likelihood_of_recurrence_felix": lambda: get_likelihood_of_recurrence_felix(transaction, all_transactions),
+        "transaction_recency_felix": lambda: get_transaction_recency_felix(transaction, all_transactions),
         # "is_att_transaction_felix": get_is_att_transaction_felix(transaction),
         # Adeyinka's features
         # "avg_days_between_transactions_adeyinka": get_average_days_between_transactions_adeyinka(
         #     transaction, all_transactions
         # ),
-        "time_regularity_score_adeyinka": get_time_regularity_score_adeyinka(transaction, all_transactions),
+        "time_regularity_score_adeyinka": lambda: get_time_regularity_score_adeyinka(transaction, all_transactions),
         # "is_always_recurring_adeyinka": get_is_always_recurring_adeyinka(transaction),
         # "transaction_amount_variance_adeyinka": get_transaction_amount_variance_adeyinka(
         #     transaction, all_transactions
         # ),
-        "outlier_score_adeyinka": get_outlier_score_adeyinka(transaction, all_transactions),
-        "recurring_confidence_score_adeyinka": get_recurring_confidence_score_adeyinka(transaction, all_transactions),
-        "subscription_keyword_score_adeyinka": get_subscription_keyword_score_adeyinka(transaction),
+        "outlier_score_adeyinka": lambda: get_outlier_score_adeyinka(transaction, all_transactions),
+        "recurring_confidence_score_adeyinka": lambda: get_recurring_confidence_score_adeyinka(
+            transaction, all_transactions
+        ),
+        "subscription_keyword_score_adeyinka": lambda: get_subscription_keyword_score_adeyinka(transaction),
         # "same_amount_vendor_transactions_adeyinka": get_same_amount_vendor_transactions_adeyinka(
         #     transaction, all_transactions
         # ),
@@ -1105,18 +1360,22 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         # ),
         # "7_days_apart_exact_adeyinka": get_n_transactions_days_apart_adeyinka(transaction, all_transactions, 7, 0),
         # "7_days_apart_off_by_1_adeyinka": get_n_transactions_days_apart_adeyinka(transaction, all_transactions, 7, 1),
-        "amount_consistency_score_adeyinka": get_amount_consistency_score_adeyinka(transaction, all_transactions),
-        "day_of_month_consistency_adeyinka": get_day_of_month_consistency_adeyinka(transaction, all_transactions),
+        "amount_consistency_score_adeyinka": lambda: get_amount_consistency_score_adeyinka(
+            transaction, all_transactions
+        ),
+        "day_of_month_consistency_adeyinka": lambda: get_day_of_month_consistency_adeyinka(
+            transaction, all_transactions
+        ),
         # "bnpl_service_adeyinka": is_bnpl_service_adeyinka(transaction),
         # "recent_transaction_frequency_adeyinka": get_recent_transaction_frequency_adeyinka(
         #     transaction, all_transactions
         # ),
-        "phone_bill_indicator_adeyinka": get_phone_bill_indicator_adeyinka(transaction),
+        "phone_bill_indicator_adeyinka": lambda: get_phone_bill_indicator_adeyinka(transaction),
         # Elliot's features
-        "is_utility_elliot": is_utility_bill_elliot(transaction),
-        "is_always_recurring_elliot": get_is_always_recurring_elliot(transaction),
+        "is_utility_elliot": lambda: is_utility_bill_elliot(transaction),
+        "is_always_recurring_elliot": lambda: get_is_always_recurring_elliot(transaction),
         # "is_auto_pay_elliot": is_auto_pay_elliot(transaction),
-        "is_membership_elliot": is_membership_elliot(transaction),
+        "is_membership_elliot": lambda: is_membership_elliot(transaction),
         # "is_near_same_amount_elliot": get_is_near_same_amount_elliot(transaction, all_transactions),
         # "is_recurring_based_on_99_elliot": is_recurring_based_on_99_elliot(transaction, all_transactions),
         # "transaction_similarity_elliot": get_transaction_similarity_elliot(transaction, all_transactions),
@@ -1132,62 +1391,72 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         #     {"name": transaction.name, "date": transaction.date, "amount": transaction.amount},
         #     [{"name": t.name, "date": t.date, "amount": t.amount} for t in all_transactions],
         # ),
-        "amount_variability_ratio_elliot": amount_variability_ratio_elliot(all_transactions),
-        "most_common_interval_elliot": most_common_interval(all_transactions),
-        "amount_similarity_elliot": amount_similarity_elliot(all_transactions),
+        "amount_variability_ratio_elliot": lambda: group_features()["amount_variability_ratio_elliot"],
+        "most_common_interval_elliot": lambda: group_features()["most_common_interval_elliot"],
+        "amount_similarity_elliot": lambda: group_features()["amount_similarity_elliot"],
         # Freedom's features
         # "day_of_week_freedom": get_day_of_week_freedom(transaction),
-        "days_until_next_transaction_freedom": get_days_until_next_transaction_freedom(transaction, all_transactions),
-        "periodicity_confidence_30d_freedom": get_periodicity_confidence_freedom(transaction, all_transactions, 30),
-        "periodicity_confidence_7d_freedom": get_periodicity_confidence_freedom(transaction, all_transactions, 7),
+        "days_until_next_transaction_freedom": lambda: get_days_until_next_transaction_freedom(
+            transaction, all_transactions
+        ),
+        "periodicity_confidence_30d_freedom": lambda: get_periodicity_confidence_freedom(
+            transaction, all_transactions, 30
+        ),
+        "periodicity_confidence_7d_freedom": lambda: get_periodicity_confidence_freedom(
+            transaction, all_transactions, 7
+        ),
         # "recurrence_streak_freedom": get_recurrence_streak_freedom(transaction, all_transactions),
         # Tife's features
         # "transaction_frequency_tife": get_transaction_frequency_tife(all_transactions),
-        "interval_consistency_tife": get_interval_consistency_tife(all_transactions),
+        "interval_consistency_tife": lambda: group_features()["interval_consistency_tife"],
         # "amount_variability_tife": get_amount_variability_tife(all_transactions),
         # "amount_range_tife": get_amount_range_tife(all_transactions),
         # "transaction_count_tife": get_transaction_count_tife(all_transactions),
-        "interval_mode_tife": get_interval_mode_tife(all_transactions),
-        "normalized_interval_consistency_tife": get_normalized_interval_consistency_tife(all_transactions),
+        "interval_mode_tife": lambda: group_features()["interval_mode_tife"],
+        "normalized_interval_consistency_tife": lambda: group_features()["normalized_interval_consistency_tife"],
         # "days_since_last_same_amount_tife": get_days_since_last_same_amount_tife(transaction, all_transactions),
-        "amount_relative_change_tife": get_amount_relative_change_tife(transaction, all_transactions),
+        "amount_relative_change_tife": lambda: get_amount_relative_change_tife(transaction, all_transactions),
         # "merchant_name_frequency_tife": get_merchant_name_frequency_tife(transaction, all_transactions),
-        "amount_stability_score_tife": get_amount_stability_score_tife(all_transactions),
-        "dominant_interval_strength_tife": get_dominant_interval_strength_tife(all_transactions),
+        "amount_stability_score_tife": lambda: group_features()["amount_stability_score_tife"],
+        "dominant_interval_strength_tife": lambda: group_features()["dominant_interval_strength_tife"],
         # "near_amount_consistency_tife": get_near_amount_consistency_tife(transaction, all_transactions),
         # "merchant_amount_signature_tife": get_merchant_amount_signature_tife(transaction, all_transactions),
-        "amount_cluster_count_tife": get_amount_cluster_count_tife(transaction, all_transactions),
-        "transaction_density_tife": get_transaction_density_tife(all_transactions),
-        "biweekly_interval_tife": histogram["biweekly"],
-        "monthly_interval_tife": histogram["monthly"],
-        "amount_similarity_ratio_tife": get_amount_similarity_ratio_tife(transaction, all_transactions),
-        "interval_cluster_strength_tife": get_interval_cluster_strength_tife(all_transactions),
-        "merchant_recurrence_score_tife": get_merchant_recurrence_score_tife(transaction, all_transactions),
-        "day_of_month_consistency_tife": get_day_of_month_consistency_tife(all_transactions),
-        "long_term_recurrence_tife": get_long_term_recurrence_tife(all_transactions),
-        "transaction_interval_tife": get_transaction_interval_tife(transaction, all_transactions),
-        "amount_deviation_tife": get_amount_deviation_tife(transaction, all_transactions),
-        "vendor_transaction_frequency_tife": get_vendor_transaction_frequency_tife(transaction, all_transactions),
+        "amount_cluster_count_tife": lambda: get_amount_cluster_count_tife(transaction, all_transactions),
+        "transaction_density_tife": lambda: group_features()["transaction_density_tife"],
+        "biweekly_interval_tife": lambda: group_features()["biweekly_interval_tife"],
+        "monthly_interval_tife": lambda: group_features()["monthly_interval_tife"],
+        "amount_similarity_ratio_tife": lambda: get_amount_similarity_ratio_tife(transaction, all_transactions),
+        "interval_cluster_strength_tife": lambda: group_features()["interval_cluster_strength_tife"],
+        "merchant_recurrence_score_tife": lambda: get_merchant_recurrence_score_tife(transaction, all_transactions),
+        "day_of_month_consistency_tife": lambda: group_features()["day_of_month_consistency_tife"],
+        "long_term_recurrence_tife": lambda: group_features()["long_term_recurrence_tife"],
+        "transaction_interval_tife": lambda: get_transaction_interval_tife(transaction, all_transactions),
+        "amount_deviation_tife": lambda: get_amount_deviation_tife(transaction, all_transactions),
+        "vendor_transaction_frequency_tife": lambda: get_vendor_transaction_frequency_tife(
+            transaction, all_transactions
+        ),
         # "user_spending_profile_tife": get_user_spending_profile_tife(transaction, all_transactions),
-        "duplicate_transaction_indicator_tife": get_duplicate_transaction_indicator_tife(transaction, all_transactions),
+        "duplicate_transaction_indicator_tife": lambda: get_duplicate_transaction_indicator_tife(
+            transaction, all_transactions
+        ),
         # "merchant_recurrence_consistency_tife": get_merchant_recurrence_consistency_tife(
         #     transaction, all_transactions
         # ),
-        "vendor_category_tife": get_vendor_category_tife(transaction),
+        "vendor_category_tife": lambda: get_vendor_category_tife(transaction),
         # "transaction_amount_bin_tife": get_transaction_amount_bin_tife(transaction),
         # Bassey's features
         # "is_subscription_bassey": get_is_subscription_bassey(transaction),
         # "is_streaming_service_bassey": get_is_streaming_service_bassey(transaction),
-        "is_gym_membership_bassey": get_is_gym_membership_bassey(transaction),
+        "is_gym_membership_bassey": lambda: get_is_gym_membership_bassey(transaction),
         # "is_recurring_apple_bassey": get_is_recurring_apple_bassey(transaction, all_transactions),
         # "is_weekly_recurring_apple_bassey": get_is_weekly_recurring_apple_bassey(transaction, all_transactions),
         # "is_high_value_transaction_bassey": get_is_high_value_transaction_bassey(transaction),
         # "is_frequent_merchant_bassey": get_is_frequent_merchant_bassey(transaction, all_transactions),
         # "is_weekend_transaction_bassey": get_is_weekend_transaction_bassey(transaction),
-        "monthly_spending_average_bassey": get_monthly_spending_average_bassey(transaction, all_transactions),
+        "monthly_spending_average_bassey": lambda: get_monthly_spending_average_bassey(transaction, all_transactions),
         # "is_merchant_recurring_bassey": get_is_merchant_recurring_bassey(transaction, all_transactions),
         # "days_since_last_transaction_bassey": get_days_since_last_transaction_bassey(transaction, all_transactions),
-        "is_same_day_multiple_transactions_bassey": get_is_same_day_multiple_transactions_bassey(
+        "is_same_day_multiple_transactions_bassey": lambda: get_is_same_day_multiple_transactions_bassey(
             transaction, all_transactions
         ),
         # Raphael's features
@@ -1211,7 +1480,7 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         # "pct_7_days_apart_off_by_1_raphael": get_pct_transactions_days_apart_raphael(
         #     transaction, all_transactions, 7, 1
         # ),
-        "is_common_subscription_amount_raphael": get_is_common_subscription_amount_raphael(transaction),
+        "is_common_subscription_amount_raphael": lambda: get_is_common_subscription_amount_raphael(transaction),
         # "occurs_same_week_raphael": get_occurs_same_week_raphael(transaction, all_transactions),
         # "is_similar_name_raphael": get_is_similar_name_raphael(transaction, all_transactions),
         # "is_fixed_interval_raphael": get_is_fixed_interval_raphael(transaction, all_transactions),
@@ -1224,19 +1493,23 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         # "description_pattern_raphael": get_description_pattern_raphael(transaction),
         # "is_weekend_transaction_raphael": get_is_weekend_transaction_raphael(transaction),
         # "n_days_apart_30_raphael": get_n_transactions_days_apart_raphael(transaction, all_transactions, 30, 2),
-        "pct_days_apart_30_raphael": get_pct_transactions_days_apart_raphael(transaction, all_transactions, 30, 2),
-        "merchant_fingerprint_raphael": get_merchant_fingerprint_raphael(transaction, all_transactions),
-        "recurring_confidence_raphael": get_recurring_confidence_raphael(transaction, all_transactions),
-        "transaction_trust_raphael": get_transaction_trust_score_raphael(transaction, all_transactions),
-        "amount_mad_raphael": get_amount_mad_raphael(transaction, all_transactions),
-        "amount_roundness_raphael": get_amount_roundness_raphael(transaction),
+        "pct_days_apart_30_raphael": lambda: get_pct_transactions_days_apart_raphael(
+            transaction, all_transactions, 30, 2
+        ),
+        "merchant_fingerprint_raphael": lambda: get_merchant_fingerprint_raphael(transaction, all_transactions),
+        "recurring_confidence_raphael": lambda: get_recurring_confidence_raphael(transaction, all_transactions),
+        "transaction_trust_raphael": lambda: get_transaction_trust_score_raphael(transaction, all_transactions),
+        "amount_mad_raphael": lambda: get_amount_mad_raphael(transaction, all_transactions),
+        "amount_roundness_raphael": lambda: get_amount_roundness_raphael(transaction),
         # "vendor_risk_keywords_raphael": get_vendor_risk_keywords_raphael(transaction.name),
         # "vendor_trust_score_raphael": get_vendor_trust_score_raphael(
         #     transaction.name, {"Apple", "AT&T"}, {"AfterPay", "CreditNinja"}
         # ),
         # "is_recurring_charge_raphael": get_is_recurring_charge_raphael(transaction.name, transaction.user_id, {}),
         # "is_apple_subscription_service_raphael": is_apple_subscription_service_raphael(transaction.name),
-        "apple_transaction_amount_profile_raphael": apple_transaction_amount_profile_raphael(transaction.amount),
+        "apple_transaction_amount_profile_raphael": lambda: apple_transaction_amount_profile_raphael(
+            transaction.amount
+        ),
         # Ernest's features
         # "is_weekly_ernest": get_is_weekly_ernest(transaction, all_transactions),
         # "is_monthly_ernest": get_is_monthly_ernest(transaction, all_transactions),
@@ -1254,139 +1527,156 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         # "is_high_frequency_vendor_ernest": get_is_high_frequency_vendor_ernest(transaction, all_transactions),
         # "is_same_day_of_month_ernest": get_is_same_day_of_month_ernest(transaction, all_transactions),
         # "is_quarterly_ernest": get_is_quarterly_ernest(transaction, all_transactions),
-        "average_transaction_amount_ernest": get_average_transaction_amount_ernest(transaction, all_transactions),
-        "is_subscription_based_ernest": get_is_subscription_based_ernest(transaction),
+        "average_transaction_amount_ernest": lambda: get_average_transaction_amount_ernest(
+            transaction, all_transactions
+        ),
+        "is_subscription_based_ernest": lambda: get_is_subscription_based_ernest(transaction),
         # "amount_consistency_score_ernest": get_amount_consistency_score_ernest(transaction, all_transactions),
-        "median_days_between_ernest": get_median_days_between_ernest(transaction, all_transactions),
-        "is_known_recurring_ernest": get_is_known_recurring_ernest(transaction),
+        "median_days_between_ernest": lambda: get_median_days_between_ernest(transaction, all_transactions),
+        "is_known_recurring_ernest": lambda: get_is_known_recurring_ernest(transaction),
         # Efehi's features
         # "transaction_time_of_month_efehi": get_transaction_time_of_month_efehi(transaction),
         # "transaction_amount_stability_efehi": get_transaction_amount_stability_efehi(transaction, all_transactions),
         # "time_between_transactions_efehi": get_time_between_transactions_efehi(transaction, all_transactions),
         # "transaction_frequency_efehi": get_transaction_frequency_efehi(transaction, all_transactions),
         # "n_same_name_transactions_efehi": get_n_same_name_transactions_efehi(transaction, all_transactions),
-        "irregular_periodicity_efehi": get_irregular_periodicity_efehi(transaction, all_transactions),
-        "irregular_periodicity_with_tolerance_efehi": get_irregular_periodicity_with_tolerance_efehi(
+        "irregular_periodicity_efehi": lambda: get_irregular_periodicity_efehi(transaction, all_transactions),
+        "irregular_periodicity_with_tolerance_efehi": lambda: get_irregular_periodicity_with_tolerance_efehi(
             transaction, all_transactions
         ),
         # "user_transaction_frequency_efehi": get_user_transaction_frequency_efehi(
         #     transaction.user_id, all_transactions
         # ),
         # "vendor_recurring_ratio_efehi": get_vendor_recurring_ratio_efehi(transaction, all_transactions),
-        "vendor_recurrence_consistency_efehi": get_vendor_recurrence_consistency_efehi(transaction, all_transactions),
-        "vendor_category_score_efehi": get_vendor_category_score_efehi(transaction),
+        "vendor_recurrence_consistency_efehi": lambda: get_vendor_recurrence_consistency_efehi(
+            transaction, all_transactions
+        ),
+        "vendor_category_score_efehi": lambda: get_vendor_category_score_efehi(transaction),
         # "rolling_amount_deviation_efehi": rolling_amount_deviation_efehi(transaction, all_transactions),
         # Adedotun's features
         # "percent_transactions_same_amount_tolerant_at_adedotun":
         #     get_percent_transactions_same_amount_tolerant_adedotun(transaction, vendor_txns),
-        "is_always_recurring_at_adedotun": get_is_always_recurring_adedotun(transaction),
-        "is_communication_or_energy_at_adedotun": get_is_communication_or_energy_adedotun(transaction),
+        "is_always_recurring_at_adedotun": is_always_recurring_adedotun,
+        "is_communication_or_energy_at_adedotun": lambda: get_is_communication_or_energy_adedotun(transaction),
         # "is_recurring_monthly_at_adedotun": is_recurring_core_adedotun(
         #     transaction, vendor_txns, preprocessed, 30, 4, 2
         # ),
-        "is_recurring_weekly_at_adedotun": is_recurring_core_adedotun(transaction, vendor_txns, preprocessed, 7, 2, 2),
-        "is_recurring_user_vendor_at_adedotun": is_recurring_core_adedotun(
+        "is_recurring_weekly_at_adedotun": lambda: is_recurring_core_adedotun(
+            transaction, vendor_txns, preprocessed, 7, 2, 2
+        ),
+        "is_recurring_user_vendor_at_adedotun": lambda: is_recurring_core_adedotun(
             transaction, user_vendor_txns, preprocessed, 30, 4, 2
         ),
-        "day_consistency_adedotun": sum(
-            1 for t in vendor_txns if abs(date_obj.day - preprocessed["date_objects"][t].day) <= 2
-        )
-        / total_txns
-        if total_txns
-        else 0.0,
-        "amount_stability_adedotun": (sum((t.amount - transaction.amount) ** 2 for t in vendor_txns) / total_txns)
-        ** 0.5
-        / transaction.amount
-        if total_txns and transaction.amount
-        else 0.0,
-        "is_recurring_allowance_at_adedotun": is_recurring_allowance_adedotun(transaction, all_transactions, 30, 2, 2),
-        "is_known_recurring_adedotun": get_is_always_recurring_adedotun(transaction),
-        "is_one_time_vendor_adedotun": get_is_one_time_vendor_adedotun(transaction),
+        "day_consistency_adedotun": lambda: (
+            sum(1 for t in vendor_txns if abs(date_obj.day - preprocessed["date_objects"][t].day) <= 2) / total_txns
+            if total_txns
+            else 0.0
+        ),
+        "amount_stability_adedotun": lambda: (
+            (sum((t.amount - transaction.amount) ** 2 for t in vendor_txns) / total_txns) ** 0.5 / transaction.amount
+            if total_txns and transaction.amount
+            else 0.0
+        ),
+        "is_recurring_allowance_at_adedotun": lambda: is_recurring_allowance_adedotun(
+            transaction, all_transactions, 30, 2, 2
+        ),
+        "is_known_recurring_adedotun": is_always_recurring_adedotun,
+        "is_one_time_vendor_adedotun": lambda: get_is_one_time_vendor_adedotun(transaction),
         # "is_utility_adedotun": get_is_utility_adedotun(transaction),
         # "is_insurance_adedotun": get_is_insurance_adedotun(transaction),
-        "is_phone_adedotun": get_is_phone_adedotun(transaction),
-        "vendor_name_length_adedotun": len(transaction.name),
-        "vendor_name_entropy_adedotun": get_vendor_name_entropy_adedotun(transaction),
+        "is_phone_adedotun": lambda: get_is_phone_adedotun(transaction),
+        "vendor_name_length_adedotun": lambda: len(transaction.name),
+        "vendor_name_entropy_adedotun": lambda: get_vendor_name_entropy_adedotun(transaction),
         # "vendor_occurrence_count_adedotun": get_vendor_occurrence_count_adedotun(transaction, all_transactions),
         # "user_vendor_occurrence_count_adedotun": get_user_vendor_occurrence_count_adedotun(
         #     transaction, all_transactions
         # ),
-        "days_since_last_occurrence_adedotun": get_days_since_last_occurrence_adedotun(transaction, all_transactions),
+        "days_since_last_occurrence_adedotun": lambda: get_days_since_last_occurrence_adedotun(
+            transaction, all_transactions
+        ),
         # "same_amount_count_adedotun": get_same_amount_count_adedotun(transaction, all_transactions),
         # "similar_amount_count_adedotun": get_similar_amount_count_adedotun(transaction, all_transactions),
         # "amount_uniqueness_score_adedotun": get_amount_uniqueness_score_adedotun(transaction, all_transactions),
         # "is_weekend_adedotun": get_is_weekend_adedotun(transaction),
         # "is_month_end_adedotun": get_is_month_end_adedotun(transaction),
-        "is_recurring_allowance_adedotun": is_recurring_allowance_adedotun(transaction, all_transactions),
+        "is_recurring_allowance_adedotun": lambda: is_recurring_allowance_adedotun(transaction, all_transactions),
         # "is_entertainment_adedotun": get_is_entertainment_adedotun(transaction),
         # "is_food_dining_adedotun": get_is_food_dining_adedotun(transaction),
         # "is_gambling_adedotun": get_is_gambling_adedotun(transaction),
         # "is_gaming_adedotun": get_is_gaming_adedotun(transaction),
         # "is_retail_adedotun": get_is_retail_adedotun(transaction),
         # "is_travel_adedotun": get_is_travel_adedotun(transaction),
-        "has_nonrecurring_keywords_adedotun": get_contains_common_nonrecurring_keywords_adedotun(transaction),
-        "is_recurring_based_on_99_at_adedotun": is_recurring_based_on_99_adedotun(transaction, all_transactions),
-        "get_interval_variance_coefficient_refine_adedotun": get_interval_variance_coefficient_adedotun(
+        "has_nonrecurring_keywords_adedotun": lambda: get_contains_common_nonrecurring_keywords_adedotun(transaction),
+        "is_recurring_based_on_99_at_adedotun": lambda: is_recurring_based_on_99_adedotun(
+            transaction, all_transactions
+        ),
+        "get_interval_variance_coefficient_refine_adedotun": lambda: get_interval_variance_coefficient_adedotun(
             transaction, all_transactions
         ),
-        "amount_variability_score_refine_adedotun": amount_variability_score_adedotun(
+        "amount_variability_score_refine_adedotun": lambda: amount_variability_score_adedotun(
             all_transactions, transaction.name
         ),
-        "is_known_recurring_company_refine_adedotun": is_known_recurring_company_adedotun(
+        "is_known_recurring_company_refine_adedotun": lambda: is_known_recurring_company_adedotun(
             transaction, all_transactions
         ),
         # "is_price_trendin_refine_adedotun": is_price_trending_adedotun(transaction, all_transactions),
-        "get_percent_transactions_same_amount_adedotun": get_percent_transactions_same_amount_adedotun(
+        "get_percent_transactions_same_amount_adedotun": lambda: get_percent_transactions_same_amount_adedotun(
             transaction, all_transactions, transaction.name
         ),
-        "get_n_transactions_same_amount_adedotun": get_n_transactions_same_amount_adedotun(
+        "get_n_transactions_same_amount_adedotun": lambda: get_n_transactions_same_amount_adedotun(
             transaction, all_transactions, transaction.name
         ),
-        "get_interval_histogram_refine_adedotun": get_interval_histogram_adedotun(transaction, all_transactions),
+        "get_interval_histogram_refine_adedotun": lambda: get_interval_histogram_adedotun(
+            transaction, all_transactions
+        ),
         # Segun's features
-        "total_transaction_amount_segun": get_total_transaction_amount_segun(all_transactions),
+        "total_transaction_amount_segun": lambda: group_features()["total_transaction_amount_segun"],
         # "average_transaction_amount_segun": get_average_transaction_amount_segun(all_transactions),
-        "max_transaction_amount_segun": get_max_transaction_amount_segun(all_transactions),
-        "min_transaction_amount_segun": get_min_transaction_amount_segun(all_transactions),
+        "max_transaction_amount_segun": lambda: group_features()["max_transaction_amount_segun"],
+        "min_transaction_amount_segun": lambda: group_features()["min_transaction_amount_segun"],
         # "transaction_amount_std_segun": get_transaction_amount_std_segun(all_transactions),
         # "transaction_amount_median_segun": get_transaction_amount_median_segun(all_transactions),
         # "transaction_amount_range_segun": get_transaction_amount_range_segun(all_transactions),
-        "unique_transaction_amount_count_segun": get_unique_transaction_amount_count_segun(all_transactions),
+        "unique_transaction_amount_count_segun": lambda: group_features()["unique_transaction_amount_count_segun"],
         # "transaction_amount_frequency_segun": get_transaction_amount_frequency_segun(transaction, all_transactions),
         # "transaction_day_of_week_segun": get_transaction_day_of_week_segun(transaction),
         # "transaction_time_of_day_segun": get_transaction_time_of_day_segun(transaction),
-        "average_transaction_interval_segun": get_average_transaction_interval_segun(all_transactions),
+        "average_transaction_interval_segun": lambda: group_features()["average_transaction_interval_segun"],
         # "transaction_interval_std_segun": get_transaction_interval_std_segun(all_transactions),
-        "transaction_amount_percentage_segun": get_transaction_amount_percentage_segun(transaction, all_transactions),
+        "transaction_amount_percentage_segun": lambda: get_transaction_amount_percentage_segun(
+            transaction, all_transactions
+        ),
         # "transaction_recency_segun": get_transaction_recency_segun(transaction, all_transactions),
-        "transaction_frequency_per_month_segun": get_transaction_frequency_per_month_segun(all_transactions),
+        "transaction_frequency_per_month_segun": lambda: group_features()["transaction_frequency_per_month_segun"],
         # "transaction_is_weekend_segun": get_transaction_is_weekend_segun(transaction),
-        "amazon_prime_day_proximity_segun": amazon_prime_day_proximity_segun(transaction),
+        "amazon_prime_day_proximity_segun": lambda: amazon_prime_day_proximity_segun(transaction),
         # "transaction_day_of_month_segun": transaction_day_of_month_segun(transaction),
-        "is_recurring_day_segun": is_recurring_day_segun(all_transactions),
-        "transaction_amount_similarity_segun": transaction_amount_similarity_segun(transaction, all_transactions),
-        "markovian_probability_segun": markovian_probability_segun(transaction, all_transactions),
+        "is_recurring_day_segun": lambda: group_features()["is_recurring_day_segun"],
+        "transaction_amount_similarity_segun": lambda: transaction_amount_similarity_segun(
+            transaction, all_transactions
+        ),
+        "markovian_probability_segun": lambda: markovian_probability_segun(transaction, all_transactions),
         # "transaction_streak_segun": calculate_streak_segun(all_transactions),
         # Victor's features
         # "avg_days_between_victor": get_avg_days_between_victor(all_transactions),
-        "interval_variability_victor": interval_variability_victor(all_transactions),
-        "amount_cluster_count_victor": amount_cluster_count_victor(all_transactions, tolerance=0.05),
-        "recurring_day_of_month_victor": recurring_day_of_month_victor(all_transactions),
-        "near_interval_ratio_victor": near_interval_ratio_victor(all_transactions, tolerance=5),
-        "amount_stability_index_victor": amount_stability_index_victor(all_transactions, tolerance=0.1),
+        "interval_variability_victor": lambda: group_features()["interval_variability_victor"],
+        "amount_cluster_count_victor": lambda: group_features()["amount_cluster_count_victor"],
+        "recurring_day_of_month_victor": lambda: group_features()["recurring_day_of_month_victor"],
+        "near_interval_ratio_victor": lambda: group_features()["near_interval_ratio_victor"],
+        "amount_stability_index_victor": lambda: group_features()["amount_stability_index_victor"],
         # "sequence_length_victor": sequence_length_victor(all_transactions),
         # "count_same_amount_monthly_victor": get_count_same_amount_monthly_victor(all_transactions, transaction),
-        "is_small_fixed_amount_victor": is_small_fixed_amount_victor(transaction),
+        "is_small_fixed_amount_victor": lambda: is_small_fixed_amount_victor(transaction),
         # "days_since_last_same_amount_victor": get_days_since_last_same_amount_victor(all_transactions, transaction),
         # Emmanuel Eze's features
         # "is_recurring_emmanuel_eze": get_is_recurring_emmanuel_eze(transaction, all_transactions),
-        "recurring_transaction_confidence_emmanuel_eze": get_recurring_transaction_confidence_emmanuel_eze(
+        "recurring_transaction_confidence_emmanuel_eze": lambda: get_recurring_transaction_confidence_emmanuel_eze(
             transaction, all_transactions
         ),
-        "sequence_confidence_emmanuel_eze": sequence_features["sequence_confidence"],
+        "sequence_confidence_emmanuel_eze": lambda: sequence_features()["sequence_confidence"],
         # "is_sequence_weekly_emmanuel_eze": 1.0 if sequence_features["sequence_pattern"] == "weekly" else 0.0,
         # "is_sequence_monthly_emmanuel_eze": 1.0 if sequence_features["sequence_pattern"] == "monthly" else 0.0,
-        "sequence_length_emmanuel_eze": sequence_features["sequence_length"],
+        "sequence_length_emmanuel_eze": lambda: sequence_features()["sequence_length"],
         # Naomi's features
         # "is_monthly_recurring_naomi": float(get_is_monthly_recurring_naomi(transaction, all_transactions)),
         # "is_similar_amount_naomi": float(get_is_similar_amount_naomi(transaction, all_transactions)),
@@ -1397,13 +1687,13 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         # "subscription_keyword_score_naomi": get_subscription_keyword_score_naomi(transaction),
         # "recurring_confidence_score_naomi": get_recurring_confidence_score_naomi(transaction, all_transactions),
         # "time_regularity_score_naomi": get_time_regularity_score_naomi(transaction, all_transactions),
-        "outlier_score_naomi": get_outlier_score_naomi(transaction, all_transactions),
+        "outlier_score_naomi": lambda: get_outlier_score_naomi(transaction, all_transactions),
         # "days_since_last_naomi": days_since_last_naomi(transaction, all_transactions),
-        "amount_change_trend_naomi": get_amount_change_trend_naomi(all_transactions),
+        "amount_change_trend_naomi": lambda: group_features()["amount_change_trend_naomi"],
         # "txns_last_30_days_naomi": get_txns_last_30_days_naomi(transaction, all_transactions),
         # "avg_amount_same_name_naomi": get_avg_amount_same_name_naomi(transaction, all_transactions),
         # "empower_twice_monthly_count_naomi": get_empower_twice_monthly_count_naomi(all_transactions),
-        "merchant_recurrence_score_naomi": get_merchant_recurrence_score_naomi(transaction, all_transactions),
+        "merchant_recurrence_score_naomi": lambda: get_merchant_recurrence_score_naomi(transaction, all_transactions),
         # Yoloye's features
         # "delayed_weekly_yoloye": get_delayed_weekly_yoloye(transaction, all_transactions),
         # "delayed_fortnightly_yoloye": get_delayed_fortnightly_yoloye(transaction, all_transactions),
@@ -1412,9 +1702,9 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         # "delayed_semi_annual_yoloye": get_delayed_semi_annual_yoloye(transaction, all_transactions),
         # "delayed_annual_yoloye": get_delayed_annual_yoloye(transaction, all_transactions),
         # "early_weekly_yoloye": get_early_weekly_yoloye(transaction, all_transactions),
-        "early_fortnightly_yoloye": get_early_fortnightly_yoloye(transaction, all_transactions),
-        "early_monthly_yoloye": get_early_monthly_yoloye(transaction, all_transactions),
-        "early_quarterly_yoloye": get_early_quarterly_yoloye(transaction, all_transactions),
+        "early_fortnightly_yoloye": lambda: early_counts_yoloye()["fortnightly"],
+        "early_monthly_yoloye": lambda: early_counts_yoloye()["monthly"],
+        "early_quarterly_yoloye": lambda: early_counts_yoloye()["quarterly"],
         # "early_semi_annual_yoloye": get_early_semi_annual_yoloye(transaction, all_transactions),
         # "early_annual_yoloye": get_early_annual_yoloye(transaction, all_transactions),
         # Gideon's features
@@ -1422,3 +1712,15 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         #     transaction, all_transactions
         # ),
     }
+    # the functions are called in order, and the ones that sort all_transactions in place are always called,
+    # so every enabled feature sees the transactions in the same order as when all the features are computed
+    features: dict[str, float | int | bool] = {}
+    for names, compute in feature_functions.items():
+        if isinstance(names, str):
+            if enabled is None or names in enabled or names in _IN_PLACE_FEATURES:
+                features[names] = compute()
+        elif enabled is None or not enabled.isdisjoint(names):
+            features.update(compute())
+    if enabled is not None:
+        features = {name: value for name, value in features.items() if name in enabled}
+    return features
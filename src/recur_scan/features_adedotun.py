@@ -2,10 +2,12 @@ import re
 import statistics
 from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
 
 from fuzzywuzzy import fuzz
 
 from recur_scan.transactions import Transaction
+from recur_scan.utils import count_in_ranges, group_memoize, parse_datetime
 
 INSURANCE_PATTERN = re.compile(r"\b(insurance|insur|insuranc)\b", re.IGNORECASE)
 UTILITY_PATTERN = re.compile(r"\b(utility|utilit|energy)\b", re.IGNORECASE)
@@ -40,6 +42,50 @@ ALWAYS_RECURRING_VENDORS_AT = frozenset([
     "disney+",
 ])
 
+# Curated keyword list (avoid generic terms)
+KNOWN_RECURRING_KEYWORDS = (
+    "amazon prime",
+    "ancestry",
+    "at&t",
+    "canva",
+    "comcast",
+    "cox",
+    "cricket wireless",
+    "disney+",
+    "geico",
+    "google storage",
+    "hulu",
+    "hbo max",
+    "national grid",
+    "netflix",
+    "peacock",
+    "spotify",
+    "sezzle",
+    "spectrum",
+    "verizon",
+    "walmart+",
+    "wix",
+    "youtube",
+)
+
+
+@lru_cache(maxsize=4096)
+def _clean_vendor_name(name: str) -> str:
+    """Lowercase a vendor name and strip its punctuation (cached, since a group repeats the same name)."""
+    return re.sub(r"[^\w\s]", "", name.lower()).strip()
+
+
+@lru_cache(maxsize=8192)
+def _vendor_similarity(vendor1: str, vendor2: str) -> int:
+    """Fuzzy token sort ratio of two vendor names, computed once per pair of names."""
+    return int(fuzz.token_sort_ratio(vendor1, vendor2))
+
+
+@lru_cache(maxsize=4096)
+def _is_known_recurring_keyword(vendor: str) -> bool:
+    """Check if a cleaned vendor name fuzzy matches one of KNOWN_RECURRING_KEYWORDS."""
+    return any(_vendor_similarity(vendor, keyword) > 85 for keyword in KNOWN_RECURRING_KEYWORDS)
+
 
 def parse_date(date_str: str) -> datetime:
     """
@@ -56,7 +102,7 @@ def parse_date(date_str: str) -> datetime:
     """
     for fmt in ["%Y-%m-%d", "%m/%d/%Y", "%m-%d-%Y"]:
         try:
-            return datetime.strptime(date_str, fmt)
+            return parse_datetime(date_str, fmt)
         except ValueError:
             continue
     raise ValueError(f"Invalid date: {date_str}")
@@ -80,6 +126,8 @@ def normalize_amount(amount: float) -> float:
     return rounded
 
 
+# every transaction's features normalize its vendor name many times, so each name is normalized once
+@lru_cache(maxsize=4096)
 def normalize_vendor_name(vendor: str) -> str:
     """Extract the core company name from a vendor string."""
     vendor = vendor.lower().replace(" ", "")
@@ -99,6 +147,7 @@ def normalize_vendor_name(vendor: str) -> str:
     return vendor.replace(" ", "")
 
 
+@lru_cache(maxsize=4096)
 def normalize_vendor_name_at(vendor: str) -> str:
     """Standalone version of normalize_vendor_name with _at suffix"""
     vendor = vendor.lower().replace(" ", "")
@@ -150,11 +199,14 @@ def preprocess_transactions_at(transactions: list[Transaction]) -> dict:
     by_user_vendor = defaultdict(list)
     date_objects = {}
 
+    # a group repeats the same few names and dates, so normalize and parse each distinct value once
+    normalized_names = {name: normalize_vendor_name_at(name) for name in {t.name for t in transactions}}
+    parsed_dates = {date: parse_date(date) for date in {t.date for t in transactions}}
     for t in transactions:
-        normalized_name = normalize_vendor_name_at(t.name)
+        normalized_name = normalized_names[t.name]
         by_vendor[normalized_name].append(t)
         by_user_vendor[(t.user_id, normalized_name)].append(t)
-        date_objects[t] = parse_date(t.date)
+        date_objects[t] = parsed_dates[t.date]
 
     return {"by_vendor": by_vendor, "by_user_vendor": by_user_vendor, "date_objects": date_objects}
 
@@ -193,6 +245,8 @@ def is_recurring_core_at(
     return recurring_count >= min_occurrences - 1
 
 
+# (memoized, since get_features asks for it both with and without spelling out the defaults)
+@group_memoize
 def is_recurring_allowance_at(
     transaction: Transaction,
     transaction_history: list[Transaction],
@@ -206,11 +260,12 @@ def is_recurring_allowance_at(
     if is_always or is_comm_energy:
         return True
 
+    normalized_name = normalize_vendor_name_at(transaction.name)
+    normalized_names = {name: normalize_vendor_name_at(name) for name in {t.name for t in transaction_history}}
     similar_transactions = [
         t
         for t in transaction_history
-        if normalize_vendor_name_at(t.name) == normalize_vendor_name_at(transaction.name)
-        and abs(t.amount - transaction.amount) < 0.01
+        if normalized_names[t.name] == normalized_name and abs(t.amount - transaction.amount) < 0.01
     ]
 
     if transaction not in similar_transactions:
@@ -271,12 +326,13 @@ def get_is_one_time_vendor_at(transaction: Transaction) -> bool:
     )
 
 
-def get_vendor_name_entropy_at(transaction: Transaction) -> float:
-    """Calculate the entropy of the vendor name (higher = more random)."""
+@lru_cache(maxsize=4096)
+def _get_vendor_name_entropy(name: str) -> float:
+    """Calculate the entropy of a vendor name, once per vendor name."""
     import math
     from collections import Counter
 
-    text = transaction.name.lower().replace(" ", "")
+    text = name.lower().replace(" ", "")
     if not text:
         return 0.0
     counts = Counter(text)
@@ -284,20 +340,27 @@ def get_vendor_name_entropy_at(transaction: Transaction) -> float:
     return -sum(p * math.log(p) for p in probs)
 
 
+def get_vendor_name_entropy_at(transaction: Transaction) -> float:
+    """Calculate the entropy of the vendor name (higher = more random)."""
+    return _get_vendor_name_entropy(transaction.name)
+
+
 def get_vendor_occurrence_count_at(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Count how many times this vendor appears in all transactions."""
     normalized_name = normalize_vendor_name_at(transaction.name)
-    return len([t for t in all_transactions if normalize_vendor_name_at(t.name) == normalized_name])
+    matching_names = {
+        name for name in {t.name for t in all_transactions} if normalize_vendor_name_at(name) == normalized_name
+    }
+    return len([t for t in all_transactions if t.name in matching_names])
 
 
 def get_user_vendor_occurrence_count_at(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Count how many times this user transacted with this vendor."""
     normalized_name = normalize_vendor_name_at(transaction.name)
-    return len([
-        t
-        for t in all_transactions
-        if t.user_id == transaction.user_id and normalize_vendor_name_at(t.name) == normalized_name
-    ])
+    matching_names = {
+        name for name in {t.name for t in all_transactions} if normalize_vendor_name_at(name) == normalized_name
+    }
+    return len([t for t in all_transactions if t.user_id == transaction.user_id and t.name in matching_names])
 
 
 def get_same_amount_count_at(transaction: Transaction, all_transactions: list[Transaction]) -> int:
@@ -359,6 +422,21 @@ RETAIL_PATTERN = re.compile(r"\b(shop|store|mall|outlet|boutique|merch|buy|purch
 TRAVEL_PATTERN = re.compile(
     r"\b(hotel|airbnb|flight|airline|train|bus|taxi|uber|lyft|vacation|travel)\b", re.IGNORECASE
 )
+# all of the above as one alternation, so a vendor name is scanned once instead of once per category
+NONRECURRING_PATTERN = re.compile(
+    "|".join(
+        pattern.pattern
+        for pattern in (
+            ENTERTAINMENT_PATTERN,
+            FOOD_PATTERN,
+            GAMBLING_PATTERN,
+            GAMING_PATTERN,
+            RETAIL_PATTERN,
+            TRAVEL_PATTERN,
+        )
+    ),
+    re.IGNORECASE,
+)
 
 
 def get_is_entertainment_at(transaction: Transaction) -> bool:
@@ -393,8 +471,7 @@ def get_is_travel_at(transaction: Transaction) -> bool:
 
 def get_contains_common_nonrecurring_keywords_at(transaction: Transaction) -> bool:
     """Check for any non-recurring spending keywords"""
-    patterns = [ENTERTAINMENT_PATTERN, FOOD_PATTERN, GAMBLING_PATTERN, GAMING_PATTERN, RETAIL_PATTERN, TRAVEL_PATTERN]
-    return any(pattern.search(transaction.name) for pattern in patterns)
+    return bool(NONRECURRING_PATTERN.search(transaction.name))
 
 
 def is_recurring_based_on_99(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
@@ -413,13 +490,13 @@ def is_recurring_based_on_99(transaction: Transaction, all_transactions: list[Tr
         return False
 
     # Normalize vendor name
-    base_vendor = re.sub(r"[^\w\s]", "", transaction.name.lower()).strip()
+    base_vendor = _clean_vendor_name(transaction.name)
 
     # Find similar .99 transactions
     similar: list[Transaction] = []
     for t in all_transactions:
-        t_vendor = re.sub(r"[^\w\s]", "", t.name.lower()).strip()
-        if fuzz.token_sort_ratio(base_vendor, t_vendor) > 90 and abs((t.amount * 100) % 100 - 99) < 0.01:
+        t_vendor = _clean_vendor_name(t.name)
+        if _vendor_similarity(base_vendor, t_vendor) > 90 and abs((t.amount * 100) % 100 - 99) < 0.01:
             similar.append(t)
 
     # Need 2+ occurrences
@@ -459,12 +536,12 @@ def is_recurring_based_on_99(transaction: Transaction, all_transactions: list[Tr
 
 
 def get_interval_variance_coefficient(transaction: Transaction, all_transactions: list[Transaction]) -> float:
-    base_vendor = re.sub(r"[^\w\s]", "", transaction.name.lower()).strip()
+    base_vendor = _clean_vendor_name(transaction.name)
 
     def parse_date(date_str: str) -> datetime:
         for fmt in ["%Y-%m-%d", "%m/%d/%Y", "%m-%d-%Y"]:
             try:
-                return datetime.strptime(date_str, fmt)
+                return parse_datetime(date_str, fmt)
             except ValueError:
                 continue
         raise ValueError(f"Invalid date: {date_str}")
@@ -473,7 +550,7 @@ def get_interval_variance_coefficient(transaction: Transaction, all_transactions
         [
             t
             for t in all_transactions
-            if fuzz.token_sort_ratio(base_vendor, re.sub(r"[^\w\s]", "", t.name.lower()).strip()) > 90
+            if _vendor_similarity(base_vendor, _clean_vendor_name(t.name)) > 90
             and abs(t.amount - transaction.amount) < 0.01
         ],
         key=lambda x: parse_date(x.date),
@@ -521,12 +598,8 @@ def amount_variability_score(transactions: list[Transaction], base_vendor: str |
 
     # Normalize vendor name and filter transactions
     if base_vendor:
-        base_vendor = re.sub(r"[^\w\s]", "", base_vendor.lower()).strip()
-        transactions = [
-            t
-            for t in transactions
-            if fuzz.token_sort_ratio(base_vendor, re.sub(r"[^\w\s]", "", t.name.lower()).strip()) > 85
-        ]
+        base_vendor = _clean_vendor_name(base_vendor)
+        transactions = [t for t in transactions if _vendor_similarity(base_vendor, _clean_vendor_name(t.name)) > 85]
 
     if len(transactions) < 2:
         return 1.0  # Single transactions are non-recurring
@@ -535,7 +608,7 @@ def amount_variability_score(transactions: list[Transaction], base_vendor: str |
     def parse_date(date_str: str) -> datetime | None:
         for fmt in ["%Y-%m-%d", "%m/%d/%Y", "%m-%d-%Y"]:
             try:
-                return datetime.strptime(date_str, fmt)
+                return parse_datetime(date_str, fmt)
             except ValueError:
                 continue
         return None
@@ -628,43 +701,17 @@ def is_known_recurring_company(transaction: Transaction, all_transactions: list[
     :param all_transactions: List of all transactions
     :return: True if likely recurring, False otherwise
     """
-    # Curated keyword list (avoid generic terms)
-    known_recurring_keywords = [
-        "amazon prime",
-        "ancestry",
-        "at&t",
-        "canva",
-        "comcast",
-        "cox",
-        "cricket wireless",
-        "disney+",
-        "geico",
-        "google storage",
-        "hulu",
-        "hbo max",
-        "national grid",
-        "netflix",
-        "peacock",
-        "spotify",
-        "sezzle",
-        "spectrum",
-        "verizon",
-        "walmart+",
-        "wix",
-        "youtube",
-    ]
-
     # Normalize vendor name
-    base_vendor = re.sub(r"[^\w\s]", "", transaction.name.lower()).strip()
+    base_vendor = _clean_vendor_name(transaction.name)
 
     # Check if vendor matches a known recurring keyword (fuzzy match)
-    is_keyword_match = any(fuzz.token_sort_ratio(base_vendor, keyword) > 85 for keyword in known_recurring_keywords)
+    is_keyword_match = _is_known_recurring_keyword(base_vendor)
 
     # Parse date with multiple formats
     def parse_date(date_str: str) -> datetime:
         for fmt in ["%Y-%m-%d", "%m/%d/%Y", "%m-%d-%Y"]:
             try:
-                return datetime.strptime(date_str, fmt)
+                return parse_datetime(date_str, fmt)
             except ValueError:
                 continue
         raise ValueError(f"Invalid date format: {date_str}")
@@ -673,8 +720,8 @@ def is_known_recurring_company(transaction: Transaction, all_transactions: list[
     similar_transactions = []
     for t in all_transactions:
         try:
-            t_vendor = re.sub(r"[^\w\s]", "", t.name.lower()).strip()
-            if fuzz.token_sort_ratio(base_vendor, t_vendor) > 85 and abs(t.amount - transaction.amount) < 0.05:
+            t_vendor = _clean_vendor_name(t.name)
+            if _vendor_similarity(base_vendor, t_vendor) > 85 and abs(t.amount - transaction.amount) < 0.05:
                 similar_transactions.append(t)
         except ValueError:
             continue
@@ -723,13 +770,13 @@ def is_price_trending(transaction: Transaction, all_transactions: list[Transacti
     :return: True if part of a recurring pattern, False otherwise
     """
     # Normalize vendor name
-    base_vendor = re.sub(r"[^\w\s]", "", transaction.name.lower()).strip()
+    base_vendor = _clean_vendor_name(transaction.name)
 
     # Parse dates
     def parse_date(date_str: str) -> datetime | None:
         for fmt in ["%Y-%m-%d", "%m/%d/%Y", "%m-%d-%Y"]:
             try:
-                return datetime.strptime(date_str, fmt)
+                return parse_datetime(date_str, fmt)
             except ValueError:
                 continue
         return None
@@ -740,8 +787,8 @@ def is_price_trending(transaction: Transaction, all_transactions: list[Transacti
         parsed_date = parse_date(t.date)
         if parsed_date is None or t.amount <= 0:
             continue
-        t_vendor = re.sub(r"[^\w\s]", "", t.name.lower()).strip()
-        if fuzz.token_sort_ratio(base_vendor, t_vendor) > 85:
+        t_vendor = _clean_vendor_name(t.name)
+        if _vendor_similarity(base_vendor, t_vendor) > 85:
             same_vendor_txs.append((t, parsed_date))
 
     if len(same_vendor_txs) < 2:
@@ -830,7 +877,7 @@ def get_n_transactions_same_amount_chris(
     :return: Number of transactions with similar amounts
     """
     # Normalize vendor name
-    base_vendor_normalized = re.sub(r"[^\w\s]", "", base_vendor.lower()).strip() if base_vendor else None
+    base_vendor_normalized = _clean_vendor_name(base_vendor) if base_vendor else None
 
     def normalize_amount(amount: float) -> float:
         if amount <= 0:
@@ -845,8 +892,8 @@ def get_n_transactions_same_amount_chris(
     for t in all_transactions:
         if t.amount <= 0:
             continue
-        t_vendor = re.sub(r"[^\w\s]", "", t.name.lower()).strip()
-        if base_vendor_normalized and fuzz.token_sort_ratio(base_vendor_normalized, t_vendor) <= 85:
+        t_vendor = _clean_vendor_name(t.name)
+        if base_vendor_normalized and _vendor_similarity(base_vendor_normalized, t_vendor) <= 85:
             continue
         if abs(normalize_amount(t.amount) - target_amount) <= 0.05:
             count += 1
@@ -868,15 +915,14 @@ def get_percent_transactions_same_amount_chris(
         return 0.0
 
     # Normalize vendor name
-    base_vendor_normalized = re.sub(r"[^\w\s]", "", base_vendor.lower()).strip() if base_vendor else None
+    base_vendor_normalized = _clean_vendor_name(base_vendor) if base_vendor else None
 
     # Filter vendor-specific transactions
     if base_vendor_normalized:
         vendor_transactions = [
             t
             for t in all_transactions
-            if fuzz.token_sort_ratio(base_vendor_normalized, re.sub(r"[^\w\s]", "", t.name.lower()).strip()) > 85
-            and t.amount > 0
+            if _vendor_similarity(base_vendor_normalized, _clean_vendor_name(t.name)) > 85 and t.amount > 0
         ]
     else:
         vendor_transactions = [t for t in all_transactions if t.amount > 0]
@@ -930,10 +976,9 @@ def get_interval_histogram(
             "annual": (350, 380),  # 365 ± 15 days
         }
 
-        # Calculate proportion of intervals in each range
-        histogram = {}
-        for period, (low, high) in periodicity_ranges.items():
-            histogram[period] = sum(1 for i in intervals if low <= i <= high) / len(intervals) if intervals else 0.0
+        # Calculate proportion of intervals in each range (counted with one histogram of the intervals)
+        counts = count_in_ranges(intervals, list(periodicity_ranges.values()))
+        histogram = {period: count / len(intervals) for period, count in zip(periodicity_ranges, counts, strict=True)}
 
         # Compute periodicity score as the maximum proportion, adjusted for confidence
         max_proportion = max(histogram.values())
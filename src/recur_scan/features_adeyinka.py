@@ -1,21 +1,90 @@
 import statistics
-from collections import Counter
 from datetime import datetime, timedelta
+from functools import lru_cache
+
+import numpy as np
 
 from recur_scan.features_dallanq import get_n_transactions_same_amount
 from recur_scan.transactions import Transaction
+from recur_scan.utils import get_day_counts, get_stdev, group_memoize, parse_datetime
+
+SUBSCRIPTION_KEYWORDS = (
+    "monthly",
+    "subscription",
+    "premium",
+    "plus",
+    "membership",
+    "service",
+    "plan",
+    "bill",
+    "energy",
+    "utility",
+    "insurance",
+    "mobile",
+    "+",
+    "max",
+    "prime",
+    "fiber",
+    "internet",
+    "streaming",
+)
+ALWAYS_RECURRING_VENDORS = frozenset({
+    "google storage",
+    "netflix",
+    "hulu",
+    "spotify",
+    "amazon prime",
+    "disney+",
+    "apple music",
+    "xbox game pass",
+    "youtube premium",
+    "adobe creative cloud",
+    "metro by t-mobile",
+    "t-mobile",
+    "at&t",
+    "xfinity",
+    "comcast",
+    "audible",
+    "apple",
+    "microsoft",
+    "sirius",
+    "siriusxm",
+    "hbo",
+    "progressive",
+    "geico",
+    "affirm",
+    "afterpay",
+    "klarna",
+    "starz",
+    "cps energy",
+    "verizon",
+    "planet fitness",
+})
+
+
+@lru_cache(maxsize=1024)
+def _get_amount_stats(amounts: tuple[float, ...]) -> tuple[float, float, float]:
+    """Get the mean, population standard deviation and mean absolute deviation of a vendor's amounts, once."""
+    mean_amount = statistics.mean(amounts)
+    return (
+        mean_amount,
+        statistics.pstdev(amounts),
+        statistics.mean([abs(x - mean_amount) for x in amounts]),
+    )
 
 
 # parse date
+# (cached, so the failed MM/DD/YYYY attempt on ISO dates is only paid once per distinct date)
+@lru_cache(maxsize=1 << 16)
 def parse_date(date_str: str) -> datetime:
     """Parse date string into datetime object"""
     try:
         # Assuming date format is MM/DD/YYYY based on your sample
-        return datetime.strptime(date_str, "%m/%d/%Y")
+        return parse_datetime(date_str, "%m/%d/%Y")
     except ValueError:
         # Fallback if format is different
         try:
-            return datetime.strptime(date_str, "%Y-%m-%d")
+            return parse_datetime(date_str)
         except ValueError:
             # Return a default date if parsing fails
             return datetime(1970, 1, 1)
@@ -64,6 +133,8 @@ def get_average_days_between_transactions(transaction: Transaction, all_transact
 
 
 # get_time
+# (memoized, since get_recurring_confidence_score asks for the same score as the feature itself)
+@group_memoize
 def get_time_regularity_score(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate regularity of time intervals (lower std dev = more regular)"""
     same_vendor_txns = [t for t in all_transactions if t.name == transaction.name]
@@ -84,7 +155,7 @@ def get_time_regularity_score(transaction: Transaction, all_transactions: list[T
         if not days_between or len(days_between) <= 1:
             return 0.0
 
-        std_dev = statistics.stdev(days_between)
+        std_dev = get_stdev(days_between)
         # Convert to a score between 0 and 1 (1 = perfectly regular)
         return 1.0 / (1.0 + std_dev / 5.0)
     except Exception:
@@ -127,29 +198,32 @@ def _get_days(date: str) -> int:
 #         return 0
 
 
+@lru_cache(maxsize=1024)
+def _get_day_column(transactions: tuple[Transaction, ...]) -> tuple[np.ndarray, np.ndarray]:
+    """Get the ids and the days since the epoch of the transactions, built once per group (read-only)."""
+    ids = np.array([t.id for t in transactions])
+    days = np.array([_get_days(t.date) for t in transactions], dtype=np.int64)
+    for column in (ids, days):
+        column.flags.writeable = False
+    return ids, days
+
+
 def get_n_transactions_days_apart(
     transaction: Transaction, all_transactions: list[Transaction], n_days_apart: int, n_days_off: int
 ) -> int:
     """Find how many transactions happen within `n_days_off` of `n_days_apart`."""
-    n_txs = 0
-    transaction_days = _get_days(transaction.date)
-
-    for t in all_transactions:
-        if t.id == transaction.id:
-            continue
-
-        t_days = _get_days(t.date)
-        days_diff = abs(t_days - transaction_days)
-
-        # Calculate quotient and remainder
-        quotient = days_diff / n_days_apart
-        remainder = abs(days_diff - round(quotient) * n_days_apart)
+    # the days of the group are taken once, and every transaction is checked in one vectorized pass
+    ids, days = _get_day_column(tuple(all_transactions))
+    days_diff = np.abs(days - _get_days(transaction.date))
 
-        # Combine conditions into a single check
-        if remainder <= n_days_off and abs(quotient - round(quotient)) < 0.1:
-            n_txs += 1
+    # Calculate quotient and remainder (np.round rounds halves to even, like round)
+    quotient = days_diff / n_days_apart
+    rounded = np.round(quotient)
+    remainder = np.abs(days_diff - rounded * n_days_apart)
 
-    return n_txs
+    # Combine conditions into a single check
+    matches = (ids != transaction.id) & (remainder <= n_days_off) & (np.abs(quotient - rounded) < 0.1)
+    return int(np.count_nonzero(matches))
 
 
 def get_transaction_amount_variance(transaction: Transaction, all_transactions: list[Transaction]) -> float:
@@ -159,7 +233,7 @@ def get_transaction_amount_variance(transaction: Transaction, all_transactions:
     if len(vendor_txns) <= 1:
         return 0.0  # No variance if there's only one transaction
     try:
-        return statistics.stdev(vendor_txns)
+        return get_stdev(vendor_txns)
     except Exception:
         return 0.0
 
@@ -171,8 +245,8 @@ def get_outlier_score(transaction: Transaction, all_transactions: list[Transacti
     if len(vendor_txns) <= 1:
         return 0.0  # No outliers if only one transaction
 
-    mean_amount = statistics.mean(vendor_txns)
-    std_dev = statistics.pstdev(vendor_txns) if len(vendor_txns) > 1 else 0  # Use population std deviation
+    # Use population std deviation
+    mean_amount, std_dev, _ = _get_amount_stats(tuple(vendor_txns))
 
     if std_dev == 0:
         return 0.0  # No variation, so no outliers
@@ -203,67 +277,13 @@ def get_subscription_keyword_score(transaction: Transaction) -> float:
     Detect subscription-related keywords in transaction names
     that strongly indicate recurring transactions.
     """
-    subscription_keywords = [
-        "monthly",
-        "subscription",
-        "premium",
-        "plus",
-        "membership",
-        "service",
-        "plan",
-        "bill",
-        "energy",
-        "utility",
-        "insurance",
-        "mobile",
-        "+",
-        "max",
-        "prime",
-        "fiber",
-        "internet",
-        "streaming",
-    ]
-
-    # Check for exact matches in the always_recurring_vendors list first
-    always_recurring_vendors = {
-        "google storage",
-        "netflix",
-        "hulu",
-        "spotify",
-        "amazon prime",
-        "disney+",
-        "apple music",
-        "xbox game pass",
-        "youtube premium",
-        "adobe creative cloud",
-        "metro by t-mobile",
-        "t-mobile",
-        "at&t",
-        "xfinity",
-        "comcast",
-        "audible",
-        "apple",
-        "microsoft",
-        "sirius",
-        "siriusxm",
-        "hbo",
-        "progressive",
-        "geico",
-        "affirm",
-        "afterpay",
-        "klarna",
-        "starz",
-        "cps energy",
-        "verizon",
-        "planet fitness",
-    }
-
-    if transaction.name.lower() in always_recurring_vendors:
+    # Check for exact matches in the always recurring vendors first
+    if transaction.name.lower() in ALWAYS_RECURRING_VENDORS:
         return 1.0
 
     # Check for keywords in the transaction name
     txn_name_lower = transaction.name.lower()
-    for keyword in subscription_keywords:
+    for keyword in SUBSCRIPTION_KEYWORDS:
         if keyword in txn_name_lower:
             return 0.8
 
@@ -301,8 +321,7 @@ def get_amount_consistency_score(transaction: Transaction, all_transactions: lis
         return 0.0
 
     # Calculate mean and mean absolute deviation
-    mean_amount = statistics.mean(same_vendor_txns)
-    mad = statistics.mean([abs(x - mean_amount) for x in same_vendor_txns])
+    mean_amount, _, mad = _get_amount_stats(tuple(same_vendor_txns))
 
     # Normalize: if MAD is very low, consistency is high
     # Add 1 to denominator to avoid division by zero
@@ -370,15 +389,11 @@ def get_day_of_month_consistency(transaction: Transaction, all_transactions: lis
         return 0.0
 
     try:
-        # Extract days of month
-        days = [parse_date(t.date).day for t in same_vendor_txns]
-
-        # Group by day and count occurrences
-        day_counts = Counter(days)
-        most_common_day, most_common_count = day_counts.most_common(1)[0]
+        # Count the transactions on each day of the month
+        most_common_count = int(get_day_counts(same_vendor_txns).max())
 
         # Calculate consistency score
-        consistency = most_common_count / len(days)
+        consistency = most_common_count / len(same_vendor_txns)
         return consistency
     except Exception:
         return 0.0
@@ -1,9 +1,26 @@
 import datetime
-from collections import Counter
+from functools import lru_cache
+from operator import attrgetter
 
 import numpy as np
 
 from recur_scan.transactions import Transaction
+from recur_scan.utils import parse_datetime
+
+
+@lru_cache(maxsize=1024)
+def _get_user_vendor_series(
+    transactions: tuple[Transaction, ...], user_id: str, name: str
+) -> tuple[tuple[Transaction, ...], tuple[datetime.datetime, ...], tuple[int, ...]]:
+    """Get a user's transactions with a vendor sorted by date, their dates and the days between them.
+
+    The user's and vendor's series features all start from the same series, so it is built once per group,
+    user and vendor and shared by them (and by every transaction of the series).
+    """
+    series = tuple(sorted((t for t in transactions if t.user_id == user_id and t.name == name), key=attrgetter("date")))
+    dates = tuple(parse_datetime(t.date) for t in series)
+    intervals = tuple((dates[i + 1] - dates[i]).days for i in range(len(dates) - 1))
+    return series, dates, intervals
 
 
 def get_frequency_features(transaction: Transaction, all_transactions: list[Transaction]) -> dict[str, float]:
@@ -11,7 +28,7 @@ def get_frequency_features(transaction: Transaction, all_transactions: list[Tran
     if len(merchant_transactions) < 2:
         return {"frequency": 0.0, "date_variability": 0.0, "median_frequency": 0.0, "std_frequency": 0.0}
 
-    dates = sorted([datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in merchant_transactions])
+    dates = sorted([parse_datetime(t.date) for t in merchant_transactions])
     date_diffs = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
     avg_frequency = sum(date_diffs) / len(date_diffs)
     median_frequency = sorted(date_diffs)[len(date_diffs) // 2]
@@ -76,9 +93,9 @@ def get_vendor_features(transaction: Transaction, all_transactions: list[Transac
 
 
 def get_time_features(transaction: Transaction, all_transactions: list[Transaction]) -> dict[str, int]:
-    date_obj = datetime.datetime.strptime(transaction.date, "%Y-%m-%d")
+    date_obj = parse_datetime(transaction.date)
     merchant_transactions = [t for t in all_transactions if t.name == transaction.name]
-    dates = sorted([datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in merchant_transactions])
+    dates = sorted([parse_datetime(t.date) for t in merchant_transactions])
     next_transaction_date = dates[dates.index(date_obj) + 1] if dates.index(date_obj) < len(dates) - 1 else None
     days_until_next = (next_transaction_date - date_obj).days if next_transaction_date else 0
 
@@ -132,8 +149,8 @@ def get_user_transaction_frequency(transaction: Transaction, all_transactions: l
         return {"user_transaction_frequency_asimi": 0.0}
 
     # Sort transactions by date
-    user_transactions_sorted = sorted(user_transactions, key=lambda t: t.date)
-    dates = [datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in user_transactions_sorted]
+    user_transactions_sorted = sorted(user_transactions, key=attrgetter("date"))
+    dates = [parse_datetime(t.date) for t in user_transactions_sorted]
 
     # Calculate the average time between transactions
     date_diffs = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
@@ -166,8 +183,8 @@ def get_vendor_transaction_frequency(transaction: Transaction, all_transactions:
         return {"vendor_transaction_frequency_asimi": 0.0}
 
     # Sort transactions by date
-    vendor_transactions_sorted = sorted(vendor_transactions, key=lambda t: t.date)
-    dates = [datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in vendor_transactions_sorted]
+    vendor_transactions_sorted = sorted(vendor_transactions, key=attrgetter("date"))
+    dates = [parse_datetime(t.date) for t in vendor_transactions_sorted]
 
     # Calculate the average time between transactions
     date_diffs = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
@@ -184,9 +201,9 @@ def get_user_vendor_transaction_count(transaction: Transaction, all_transactions
 
 
 def get_user_vendor_recurrence_rate(transaction: Transaction, all_transactions: list[Transaction]) -> dict[str, float]:
-    user_vendor_transactions = [
-        t for t in all_transactions if t.user_id == transaction.user_id and t.name == transaction.name
-    ]
+    user_vendor_transactions, _, _ = _get_user_vendor_series(
+        tuple(all_transactions), transaction.user_id, transaction.name
+    )
     if len(user_vendor_transactions) < 1:
         return {"user_vendor_recurrence_rate_asimi": 0.0}
 
@@ -227,7 +244,7 @@ def get_temporal_consistency_features(
             # "is_weekly_consistent_asimi": 0,
         }
 
-    dates = sorted([datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in vendor_transactions])
+    dates = sorted([parse_datetime(t.date) for t in vendor_transactions])
     date_diffs = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
 
     # Check for monthly consistency (28-31 day intervals)
@@ -258,21 +275,10 @@ def get_vendor_recurrence_profile(transaction: Transaction, all_transactions: li
             # "vendor_is_common_recurring_asimi": 0,
         }
 
-    # Count how many unique users have recurring patterns with this vendor
-    recurring_users = set()
-    amount_counts: Counter = Counter()
-
-    for t in vendor_transactions:
-        if is_valid_recurring_transaction(t):
-            recurring_users.add(t.user_id)
-        amount_counts[t.amount] += 1
-
     # Calculate recurrence score (0-1) based on how consistent amounts are
-    if amount_counts:
-        _, count = amount_counts.most_common(1)[0]
-        amount_consistency = count / total_vendor_transactions
-    else:
-        amount_consistency = 0
+    # (the count of the most common amount comes from np.unique instead of a Counter)
+    _, counts = np.unique(np.array([t.amount for t in vendor_transactions], dtype=np.float64), return_counts=True)
+    amount_consistency = int(counts.max()) / total_vendor_transactions
 
     # common_recurring_vendors = {
     #     "netflix",
@@ -314,7 +320,7 @@ def get_user_vendor_relationship_features(
 
     # Calculate tenure (days since first transaction with this vendor)
     if user_vendor_transactions:
-        dates = [datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in user_vendor_transactions]
+        dates = [parse_datetime(t.date) for t in user_vendor_transactions]
         tenure = (max(dates) - min(dates)).days
     else:
         tenure = 0
@@ -343,38 +349,27 @@ def is_apple_subscription_amount(amount: float) -> bool:
 
 def is_annual_subscription(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
     """Identify annual subscriptions (365±15 day intervals)"""
-    user_vendor_txns = sorted(
-        [t for t in all_transactions if t.user_id == transaction.user_id and t.name == transaction.name],
-        key=lambda x: x.date,
+    user_vendor_txns, _, intervals = _get_user_vendor_series(
+        tuple(all_transactions), transaction.user_id, transaction.name
     )
 
     if len(user_vendor_txns) < 2:
         return False
 
-    intervals = []
-    dates = [datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in user_vendor_txns]
-
-    for i in range(1, len(dates)):
-        intervals.append((dates[i] - dates[i - 1]).days)
-
     return any(350 <= delta <= 380 for delta in intervals)
 
 
 def get_recurrence_streak(transaction: Transaction, all_transactions: list[Transaction]) -> int:
-    vendor_trans = sorted(
-        [t for t in all_transactions if t.user_id == transaction.user_id and t.name == transaction.name],
-        key=lambda x: x.date,
-    )
+    vendor_trans, _, intervals = _get_user_vendor_series(tuple(all_transactions), transaction.user_id, transaction.name)
 
     if len(vendor_trans) < 2:
         return 0
 
     streak = 0
-    dates = [datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in vendor_trans]
     amounts = [t.amount for t in vendor_trans]
 
-    for i in range(1, len(dates)):
-        delta = (dates[i] - dates[i - 1]).days
+    for i in range(1, len(vendor_trans)):
+        delta = intervals[i - 1]
         amount_diff = abs(amounts[i] - amounts[i - 1])
 
         if 25 <= delta <= 35 and amount_diff < 0.1:
@@ -448,17 +443,11 @@ def get_amount_quantum(transaction: Transaction, all_transactions: list[Transact
 
 def get_interval_precision(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate precision of transaction intervals (0-1 scale)."""
-    vendor_trans = sorted(
-        [t for t in all_transactions if t.name == transaction.name and t.user_id == transaction.user_id],
-        key=lambda x: x.date,
-    )
+    vendor_trans, _, intervals = _get_user_vendor_series(tuple(all_transactions), transaction.user_id, transaction.name)
 
     if len(vendor_trans) < 3:
         return 0.0
 
-    dates = [datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in vendor_trans]
-    intervals = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
-
     if transaction.name == "Apple":
         monthly_intervals = sum(25 <= diff <= 35 for diff in intervals)
         return min(monthly_intervals / len(intervals) * 1.2, 1.0)
@@ -471,9 +460,8 @@ def get_amount_temporal_consistency(transaction: Transaction, all_transactions:
     Combines amount consistency, temporal regularity, AND day-of-month consistency.
     Returns a 0-1 score where higher = more subscription-like.
     """
-    vendor_trans = sorted(
-        [t for t in all_transactions if t.name == transaction.name and t.user_id == transaction.user_id],
-        key=lambda x: x.date,
+    vendor_trans, series_dates, _ = _get_user_vendor_series(
+        tuple(all_transactions), transaction.user_id, transaction.name
     )
 
     if len(vendor_trans) < 3:
@@ -487,7 +475,7 @@ def get_amount_temporal_consistency(transaction: Transaction, all_transactions:
         amount_std = 0.0
 
     # Temporal regularity (interval coefficient of variation)
-    dates = [datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in vendor_trans]
+    dates = list(series_dates)
     intervals = np.diff([d.toordinal() for d in dates])
     interval_cv = np.std(intervals) / (np.mean(intervals) + 1e-9)
 
@@ -503,18 +491,17 @@ def get_burst_score(transaction: Transaction, all_transactions: list[Transaction
     Detects clustered transactions (common in non-subscriptions)
     Returns: 0 (no burst) to 1 (high burstiness)
     """
-    user_trans = sorted([t for t in all_transactions if t.user_id == transaction.user_id], key=lambda x: x.date)
+    user_trans = sorted([t for t in all_transactions if t.user_id == transaction.user_id], key=attrgetter("date"))
 
     if len(user_trans) < 3:
         return 0.0
 
     # Find transactions within 7 days with similar amounts
-    current_date = datetime.datetime.strptime(transaction.date, "%Y-%m-%d")
+    current_date = parse_datetime(transaction.date)
     similar_trans = [
         t
         for t in user_trans[-10:]
-        if abs((datetime.datetime.strptime(t.date, "%Y-%m-%d") - current_date).days) <= 7
-        and abs(t.amount - transaction.amount) < 2.0
+        if abs((parse_datetime(t.date) - current_date).days) <= 7 and abs(t.amount - transaction.amount) < 2.0
     ]
 
     return float(min(len(similar_trans) / 3.0, 1.0))  # Cap at 1.0
@@ -535,11 +522,8 @@ def get_series_duration(transaction: Transaction, all_transactions: list[Transac
     if len(similar_transactions) < 2:
         return 0.0
 
-    sorted_trans = sorted(similar_transactions, key=lambda x: x.date)
-    duration_days = (
-        datetime.datetime.strptime(sorted_trans[-1].date, "%Y-%m-%d")
-        - datetime.datetime.strptime(sorted_trans[0].date, "%Y-%m-%d")
-    ).days
+    sorted_trans = sorted(similar_transactions, key=attrgetter("date"))
+    duration_days = (parse_datetime(sorted_trans[-1].date) - parse_datetime(sorted_trans[0].date)).days
 
     # Normalize score (0-1) where 1 = 1+ year of history
     return round(min(1.0, duration_days / 365), 2)
@@ -551,13 +535,13 @@ def is_apple_subscription(transaction: Transaction, all_transactions: list[Trans
         return False
 
     vendor_trans = sorted(
-        [t for t in all_transactions if t.user_id == transaction.user_id and t.name == "Apple"], key=lambda x: x.date
+        [t for t in all_transactions if t.user_id == transaction.user_id and t.name == "Apple"], key=attrgetter("date")
     )
 
     if len(vendor_trans) < 4:  # Require at least 4 transactions to establish a pattern
         return False
 
-    dates = [datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in vendor_trans]
+    dates = [parse_datetime(t.date) for t in vendor_trans]
 
     # ===== New Checks =====
     # 1. Burst Detection - reject if multiple charges in short windows
@@ -601,7 +585,8 @@ def is_afterpay_installment(transaction: Transaction, all_transactions: list[Tra
         return False
 
     vendor_trans = sorted(
-        [t for t in all_transactions if t.user_id == transaction.user_id and t.name == "AfterPay"], key=lambda x: x.date
+        [t for t in all_transactions if t.user_id == transaction.user_id and t.name == "AfterPay"],
+        key=attrgetter("date"),
     )
 
     if len(vendor_trans) < 4:
@@ -661,13 +646,13 @@ def get_apple_interval_score(transaction: Transaction, all_transactions: list[Tr
         return 0.0  # Only for Apple transactions
 
     vendor_trans = sorted(
-        [t for t in all_transactions if t.user_id == transaction.user_id and t.name == "Apple"], key=lambda x: x.date
+        [t for t in all_transactions if t.user_id == transaction.user_id and t.name == "Apple"], key=attrgetter("date")
     )
 
     if len(vendor_trans) < 3:
         return 0.0
 
-    dates = [datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in vendor_trans]
+    dates = [parse_datetime(t.date) for t in vendor_trans]
     intervals = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
 
     # Score: % of intervals that are 25-35 days (Apple's flexible billing cycle)
@@ -706,7 +691,7 @@ def get_loan_repayment_score(transaction: Transaction, all_transactions: list[Tr
         return 0.0  # Amounts vary too much for a loan repayment
 
     # Step 3: Check interval consistency (weekly = ~7 days)
-    dates = sorted([datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in user_transactions])
+    dates = sorted([parse_datetime(t.date) for t in user_transactions])
     intervals = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
 
     # Allow ±1 day flexibility (e.g., 6-8 days for weekly payments)
@@ -1,8 +1,12 @@
 import re
 from collections import defaultdict
-from datetime import datetime
+from typing import TYPE_CHECKING
 
 from recur_scan.transactions import Transaction
+from recur_scan.utils import get_name_id, parse_datetime, to_columns
+
+if TYPE_CHECKING:
+    from datetime import datetime
 
 
 def get_is_subscription(transaction: Transaction) -> bool:
@@ -38,7 +42,7 @@ def get_is_recurring_apple_bassey(transaction: Transaction, all_transactions: li
     # Group transactions by month and year
     monthly_counts: dict[tuple[int, int], dict[str, int]] = defaultdict(lambda: defaultdict(int))
     for t in all_transactions:
-        t_date = datetime.strptime(t.date, "%Y-%m-%d")
+        t_date = parse_datetime(t.date)
         _month_year = (t_date.year, t_date.month)
         if "apple" in t.name.lower():
             monthly_counts[_month_year][t.name] += 1
@@ -64,12 +68,12 @@ def get_is_weekly_recurring_apple_bassey(transaction: Transaction, all_transacti
     # Group transactions by month and year
     monthly_transactions: dict[tuple[int, int], list[datetime]] = defaultdict(list)
     for t in apple_transactions:
-        t_date = datetime.strptime(t.date, "%Y-%m-%d")
+        t_date = parse_datetime(t.date)
         month_year = (t_date.year, t_date.month)
         monthly_transactions[month_year].append(t_date)
 
     # Check if the transaction meets the criteria for the month of the given transaction
-    t_date = datetime.strptime(transaction.date, "%Y-%m-%d")
+    t_date = parse_datetime(transaction.date)
     month_year = (t_date.year, t_date.month)
     if month_year not in monthly_transactions:
         return False
@@ -98,40 +102,39 @@ def get_is_frequent_merchant_bassey(
 
 def get_is_weekend_transaction_bassey(transaction: Transaction) -> bool:
     """Check if the transaction occurred on a weekend."""
-    t_date = datetime.strptime(transaction.date, "%Y-%m-%d")
+    t_date = parse_datetime(transaction.date)
     return t_date.weekday() >= 5  # Saturday (5) or Sunday (6)
 
 
 def get_monthly_spending_average_bassey(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate the average spending for the user in the month of the transaction."""
-    t_date = datetime.strptime(transaction.date, "%Y-%m-%d")
+    t_date = parse_datetime(transaction.date)
+    columns = to_columns(all_transactions)
+    is_same_month = (columns["year"] == t_date.year) & (columns["month"] == t_date.month)
     monthly_transactions = [
-        t.amount
-        for t in all_transactions
-        if datetime.strptime(t.date, "%Y-%m-%d").year == t_date.year
-        and datetime.strptime(t.date, "%Y-%m-%d").month == t_date.month
+        t.amount for t, same_month in zip(all_transactions, is_same_month, strict=True) if same_month
     ]
     return sum(monthly_transactions) / len(monthly_transactions) if monthly_transactions else 0.0
 
 
 def get_is_merchant_recurring_bassey(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
     """Check if the merchant appears in multiple months for the user."""
-    merchant_months = set()
-    for t in all_transactions:
-        if t.name == transaction.name:
-            t_date = datetime.strptime(t.date, "%Y-%m-%d")
-            merchant_months.add((t_date.year, t_date.month))
+    columns = to_columns(all_transactions)
+    is_same_name = columns["name_id"] == get_name_id(transaction.name, all_transactions)
+    merchant_months = set(
+        zip(columns["year"][is_same_name].tolist(), columns["month"][is_same_name].tolist(), strict=True)
+    )
     return len(merchant_months) > 1
 
 
 def get_days_since_last_transaction_bassey(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Calculate the number of days since the user's last transaction."""
-    t_date = datetime.strptime(transaction.date, "%Y-%m-%d")
-    previous_dates = [datetime.strptime(t.date, "%Y-%m-%d") for t in all_transactions if t.date < transaction.date]
-    if not previous_dates:
+    t_day = parse_datetime(transaction.date).toordinal()
+    ordinals = to_columns(all_transactions)["ordinal"]
+    previous_days = ordinals[ordinals < t_day]
+    if previous_days.size == 0:
         return -1  # No previous transactions
-    last_date = max(previous_dates)
-    return (t_date - last_date).days
+    return t_day - int(previous_days.max())
 
 
 def get_is_same_day_multiple_transactions_bassey(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
@@ -1,8 +1,11 @@
-from datetime import datetime, timedelta
+from datetime import timedelta
+from functools import lru_cache
 from statistics import StatisticsError, mean, median, stdev
 
+import numpy as np
+
 from recur_scan.transactions import Transaction
-from recur_scan.utils import parse_date
+from recur_scan.utils import get_day_counts, parse_date, parse_datetime, to_columns
 
 
 def get_transaction_gaps_chris(all_transactions: list[Transaction]) -> list[int]:
@@ -31,7 +34,8 @@ def get_n_transactions_same_amount_chris(transaction: Transaction, all_transacti
     This tolerance helps capture minor variations due to rounding.
     """
     tol = 0.01 * transaction.amount if transaction.amount != 0 else 0.01
-    return sum(1 for t in all_transactions if abs(t.amount - transaction.amount) <= tol)
+    amounts = to_columns(all_transactions)["amount"]
+    return int(np.count_nonzero(np.abs(amounts - transaction.amount) <= tol))
 
 
 def get_percent_transactions_same_amount_chris(transaction: Transaction, all_transactions: list[Transaction]) -> float:
@@ -99,11 +103,9 @@ def get_day_of_month_consistency_chris(all_transactions: list[Transaction]) -> f
     """
     Calculate the consistency of the day of the month for transactions.
     """
-    days = [parse_date(t.date).day for t in all_transactions]
-    if not days:
+    if not all_transactions:
         return 0.0
-    most_common_day = max(set(days), key=days.count)
-    return days.count(most_common_day) / len(days)
+    return int(get_day_counts(all_transactions).max()) / len(all_transactions)
 
 
 def get_median_interval_chris(all_transactions: list[Transaction]) -> float:
@@ -112,6 +114,8 @@ def get_median_interval_chris(all_transactions: list[Transaction]) -> float:
     return median(gaps) if gaps else 0.0
 
 
+# the keyword scan only depends on the name, so it is done once per vendor name
+@lru_cache(maxsize=4096)
 def is_known_recurring_company_chris(transaction_name: str) -> bool:
     """
     Flags transactions as recurring if the company name contains specific keywords,
@@ -187,8 +191,8 @@ def is_known_fixed_subscription_chris(transaction: Transaction) -> bool:
 
 def get_user_vendor_history(transaction: Transaction, all_transactions: list[Transaction]) -> list[Transaction]:
     """Get historical transactions for same user-vendor pair."""
-    current_date = datetime.strptime(transaction.date, "%Y-%m-%d")
-    return [t for t in all_transactions if datetime.strptime(t.date, "%Y-%m-%d") < current_date]
+    current_date = parse_datetime(transaction.date)
+    return [t for t in all_transactions if parse_datetime(t.date) < current_date]
 
 
 def is_regular_interval_chris(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
@@ -197,7 +201,7 @@ def is_regular_interval_chris(transaction: Transaction, all_transactions: list[T
     if len(history) < 2:
         return False
 
-    dates = sorted([datetime.strptime(t.date, "%Y-%m-%d") for t in history])
+    dates = sorted([parse_datetime(t.date) for t in history])
     deltas = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
     standard_deviation = stdev(deltas) if len(deltas) > 1 else 0
     return standard_deviation < 3  # Allow small variation in interval days
@@ -215,12 +219,8 @@ def amount_deviation_chris(transaction: Transaction, all_transactions: list[Tran
 
 def transaction_frequency_chris(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Count transactions from same user-vendor pair in last 6 months."""
-    cutoff = datetime.strptime(transaction.date, "%Y-%m-%d") - timedelta(days=180)
-    return sum(
-        1
-        for t in get_user_vendor_history(transaction, all_transactions)
-        if datetime.strptime(t.date, "%Y-%m-%d") > cutoff
-    )
+    cutoff = parse_datetime(transaction.date) - timedelta(days=180)
+    return sum(1 for t in get_user_vendor_history(transaction, all_transactions) if parse_datetime(t.date) > cutoff)
 
 
 def day_of_month_consistency_chris(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
@@ -229,8 +229,8 @@ def day_of_month_consistency_chris(transaction: Transaction, all_transactions: l
     if not history:
         return False
 
-    transaction_day = datetime.strptime(transaction.date, "%Y-%m-%d").day
-    same_day_count = sum(1 for t in history if datetime.strptime(t.date, "%Y-%m-%d").day == transaction_day)
+    transaction_day = parse_datetime(transaction.date).day
+    same_day_count = sum(1 for t in history if parse_datetime(t.date).day == transaction_day)
     return same_day_count / len(history) > 0.8
 
 
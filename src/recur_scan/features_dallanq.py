@@ -1,10 +1,119 @@
 import re
+from bisect import bisect_left, bisect_right
 from collections import Counter
+from collections.abc import Mapping, Sequence
+from datetime import date
+from functools import lru_cache
+from types import MappingProxyType
 
 import numpy as np
 
 from recur_scan.transactions import Transaction
-from recur_scan.utils import get_day, parse_date
+from recur_scan.utils import get_day, get_day_counts, parse_date, to_columns
+
+
+@lru_cache(maxsize=1024)
+def _sort_dates(date_strs: tuple[str, ...]) -> tuple[date, ...]:
+    return tuple(sorted(parse_date(d) for d in date_strs))
+
+
+@lru_cache(maxsize=1024)
+def _get_intervals(date_strs: tuple[str, ...]) -> tuple[int, ...]:
+    dates = _sort_dates(date_strs)
+    return tuple((dates[i] - dates[i - 1]).days for i in range(1, len(dates)))
+
+
+def _sorted_dates(transactions: list[Transaction]) -> tuple[date, ...]:
+    """
+    The sorted dates of a list of transactions.
+
+    Most features here look at the same group of transactions, so the sorted dates are cached
+    on the group's date strings instead of being parsed and sorted again by every feature.
+    """
+    return _sort_dates(tuple(t.date for t in transactions))
+
+
+def _intervals_between(transactions: list[Transaction]) -> tuple[int, ...]:
+    """The gaps (in days) between the successive sorted dates of a list of transactions (cached like _sorted_dates)."""
+    return _get_intervals(tuple(t.date for t in transactions))
+
+
+def _to_cents(amount: float) -> int:
+    """The amount in whole cents."""
+    return round(amount * 100)
+
+
+@lru_cache(maxsize=1024)
+def _get_cents(amounts: tuple[float, ...]) -> np.ndarray:
+    cents = np.rint(np.array(amounts, dtype=np.float64) * 100).astype(np.int32)
+    # the array is shared by every caller with the same amounts
+    cents.flags.writeable = False
+    return cents
+
+
+@lru_cache(maxsize=1024)
+def _get_amount_stats(amounts: tuple[float, ...]) -> tuple[float, float]:
+    """The mean and (population) standard deviation of amounts (cached like _get_cents)."""
+    try:
+        std_dev = float(np.std(amounts))
+    except Exception:
+        std_dev = 0.0
+    return float(np.mean(amounts)), std_dev
+
+
+def _amount_cents(transactions: list[Transaction]) -> np.ndarray:
+    """
+    The amounts of a list of transactions in whole cents.
+
+    Amounts are compared and counted as integer cents instead of floats (cached like _sorted_dates).
+    """
+    return _get_cents(tuple(t.amount for t in transactions))
+
+
+@lru_cache(maxsize=1024)
+def _get_cent_counts(amounts: tuple[float, ...]) -> Mapping[int, int]:
+    cents, counts = np.unique(_get_cents(amounts), return_counts=True)
+    return MappingProxyType(dict(zip(cents.tolist(), counts.tolist(), strict=True)))
+
+
+def _n_same_amount(amount: float, transactions: list[Transaction]) -> int:
+    """
+    The number of transactions with an amount (in whole cents).
+
+    The transactions are counted by amount once, so every feature that counts an amount's transactions
+    looks its count up instead of comparing every amount again.
+    """
+    return _get_cent_counts(tuple(t.amount for t in transactions)).get(_to_cents(amount), 0)
+
+
+def _same_amount(transaction: Transaction, all_transactions: list[Transaction]) -> list[Transaction]:
+    """The transactions in all_transactions with the same amount as transaction."""
+    same_amount = _amount_cents(all_transactions) == _to_cents(transaction.amount)
+    return [t for t, same in zip(all_transactions, same_amount, strict=True) if same]
+
+
+def _days_diff(transaction: Transaction, all_transactions: list[Transaction]) -> np.ndarray:
+    """The number of days between transaction and each transaction in all_transactions, over the cached ordinals."""
+    return np.abs(to_columns(all_transactions)["ordinal"] - parse_date(transaction.date).toordinal())
+
+
+def _near_multiple(days_diff: np.ndarray, n_days_apart: int, n_days_off: int) -> np.ndarray:
+    """Which day differences are within n_days_off of a (positive) multiple of n_days_apart."""
+    # Check if the difference is close to any multiple of n_days_apart (and at least the minimum required)
+    remainder = days_diff % n_days_apart
+    near_multiple = (remainder <= n_days_off) | (remainder >= n_days_apart - n_days_off)
+    return (days_diff >= n_days_apart - n_days_off) & near_multiple
+
+
+def _days_apart(
+    transaction: Transaction, all_transactions: list[Transaction], n_days_apart: int, n_days_off: int
+) -> np.ndarray:
+    """
+    Which transactions in all_transactions are within n_days_off of a multiple of n_days_apart from transaction.
+
+    The day differences are taken over the cached date ordinals as one array, instead of one date at a time.
+    """
+    return _near_multiple(_days_diff(transaction, all_transactions), n_days_apart, n_days_off)
 
 
 def get_is_always_recurring(transaction: Transaction) -> bool:
@@ -52,28 +161,7 @@ def get_n_transactions_days_apart(
     Get the number of transactions in all_transactions that are within n_days_off of
     being n_days_apart from transaction
     """
-    n_txs = 0
-    transaction_date = parse_date(transaction.date)
-
-    # Pre-calculate bounds for faster checking
-    lower_remainder = n_days_apart - n_days_off
-    upper_remainder = n_days_off
-
-    for t in all_transactions:
-        t_date = parse_date(t.date)
-        days_diff = abs((t_date - transaction_date).days)
-
-        # Skip if the difference is less than minimum required
-        if days_diff < n_days_apart - n_days_off:
-            continue
-
-        # Check if the difference is close to any multiple of n_days_apart
-        remainder = days_diff % n_days_apart
-
-        if remainder <= upper_remainder or remainder >= lower_remainder:
-            n_txs += 1
-
-    return n_txs
+    return int(np.count_nonzero(_days_apart(transaction, all_transactions, n_days_apart, n_days_off)))
 
 
 def get_pct_transactions_days_apart(
@@ -88,9 +176,44 @@ def get_pct_transactions_days_apart(
     )
 
 
+def get_n_transactions_days_apart_counts(
+    transaction: Transaction,
+    all_transactions: list[Transaction],
+    specs: Sequence[tuple[int, int]],
+    same_amount: bool = False,
+) -> dict[tuple[int, int], int]:
+    """
+    Get get_n_transactions_days_apart (or get_n_transactions_days_apart_same_amount if same_amount)
+    for each (n_days_apart, n_days_off) in specs, taking the day differences from transaction only once
+    """
+    days_diff = _days_diff(transaction, all_transactions)
+    if same_amount:
+        days_diff = days_diff[_amount_cents(all_transactions) == _to_cents(transaction.amount)]
+    return {
+        (n_days_apart, n_days_off): int(np.count_nonzero(_near_multiple(days_diff, n_days_apart, n_days_off)))
+        for n_days_apart, n_days_off in specs
+    }
+
+
 def get_n_transactions_same_day(transaction: Transaction, all_transactions: list[Transaction], n_days_off: int) -> int:
     """Get the number of transactions in all_transactions that are on the same day of the month as transaction"""
-    return len([t for t in all_transactions if abs(get_day(t.date) - get_day(transaction.date)) <= n_days_off])
+    return get_n_transactions_same_day_counts(transaction, all_transactions, [n_days_off])[n_days_off]
+
+
+def get_n_transactions_same_day_counts(
+    transaction: Transaction,
+    all_transactions: list[Transaction],
+    n_days_offs: Sequence[int],
+    same_amount: bool = False,
+) -> dict[int, int]:
+    """
+    Get get_n_transactions_same_day (or n_same_day_same_amount if same_amount) for each n_days_off
+    in n_days_offs, taking the differences in the day of the month from transaction only once
+    """
+    days_diff = np.abs(to_columns(all_transactions)["day"] - get_day(transaction.date))
+    if same_amount:
+        days_diff = days_diff[_amount_cents(all_transactions) == _to_cents(transaction.amount)]
+    return {n_days_off: int(np.count_nonzero(days_diff <= n_days_off)) for n_days_off in n_days_offs}
 
 
 def get_pct_transactions_same_day(
@@ -102,33 +225,30 @@ def get_pct_transactions_same_day(
 
 def get_ends_in_99(transaction: Transaction) -> bool:
     """Check if the transaction amount ends in 99"""
-    return abs((transaction.amount * 100) % 100 - 99) < 0.001
+    return _to_cents(transaction.amount) % 100 == 99
 
 
 def get_n_transactions_same_amount(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Get the number of transactions in all_transactions with the same amount as transaction"""
-    return len([t for t in all_transactions if t.amount == transaction.amount])
+    return _n_same_amount(transaction.amount, all_transactions)
 
 
 def get_percent_transactions_same_amount(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get the percentage of transactions in all_transactions with the same amount as transaction"""
     if not all_transactions:
         return 0.0
-    n_same_amount = len([t for t in all_transactions if t.amount == transaction.amount])
+    n_same_amount = _n_same_amount(transaction.amount, all_transactions)
     return n_same_amount / len(all_transactions)
 
 
 def get_transaction_z_score(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get the z-score of the transaction amount compared to the mean and standard deviation of all_transactions."""
-    all_amounts = [t.amount for t in all_transactions]
+    # the mean and standard deviation are the same for every transaction of the group, so they are cached
+    mean, std_dev = _get_amount_stats(tuple(t.amount for t in all_transactions))
     # if the standard deviation is 0, return 0
-    try:
-        std_dev = float(np.std(all_amounts))
-    except Exception:
-        std_dev = 0.0
     if abs(std_dev) < 1e-8:
         return 0.0
-    return (transaction.amount - float(np.mean(all_amounts))) / std_dev
+    return (transaction.amount - mean) / std_dev
 
 
 #
@@ -150,35 +270,33 @@ def count_transactions(all_transactions: list[Transaction]) -> int:
 
 def days_since_last(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Days since the previous transaction (-1.0 if none)."""
-    dates = sorted(parse_date(t.date) for t in all_transactions)
+    dates = _sorted_dates(all_transactions)
     cur = parse_date(transaction.date)
-    prev = [d for d in dates if d < cur]
-    return (cur - max(prev)).days if prev else -1.0
+    i = bisect_left(dates, cur)
+    return (cur - dates[i - 1]).days if i > 0 else -1.0
 
 
 def days_until_next(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Days until the next transaction (-1.0 if none)."""
-    dates = sorted(parse_date(t.date) for t in all_transactions)
+    dates = _sorted_dates(all_transactions)
     cur = parse_date(transaction.date)
-    fut = [d for d in dates if d > cur]
-    return (min(fut) - cur).days if fut else -1.0
+    i = bisect_right(dates, cur)
+    return (dates[i] - cur).days if i < len(dates) else -1.0
 
 
 def mean_days_between(all_transactions: list[Transaction]) -> float:
     """Mean interval (in days) between successive transactions."""
-    dates = sorted(parse_date(t.date) for t in all_transactions)
-    if len(dates) < 2:
+    diffs = _intervals_between(all_transactions)
+    if not diffs:
         return -1.0
-    diffs = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
     return float(np.mean(diffs))
 
 
 def std_days_between(all_transactions: list[Transaction]) -> float:
     """Std. dev. of intervals (in days) between successive transactions."""
-    dates = sorted(parse_date(t.date) for t in all_transactions)
-    if len(dates) < 2:
+    diffs = _intervals_between(all_transactions)
+    if not diffs:
         return -1.0
-    diffs = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
     try:
         return float(np.std(diffs, ddof=1))
     except Exception:
@@ -202,35 +320,33 @@ def regularity_score(all_transactions: list[Transaction]) -> float:
 
 def days_since_last_same_amount(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Days since the previous transaction with the same amount (-1 if none)."""
-    dates = sorted(parse_date(t.date) for t in all_transactions if t.amount == transaction.amount)
+    dates = _sorted_dates(_same_amount(transaction, all_transactions))
     cur = parse_date(transaction.date)
-    prev = [d for d in dates if d < cur]
-    return (cur - max(prev)).days if prev else -1.0
+    i = bisect_left(dates, cur)
+    return (cur - dates[i - 1]).days if i > 0 else -1.0
 
 
 def days_until_next_same_amount(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Days until the next transaction with the same amount (-1 if none)."""
-    dates = sorted(parse_date(t.date) for t in all_transactions if t.amount == transaction.amount)
+    dates = _sorted_dates(_same_amount(transaction, all_transactions))
     cur = parse_date(transaction.date)
-    fut = [d for d in dates if d > cur]
-    return (min(fut) - cur).days if fut else -1.0
+    i = bisect_right(dates, cur)
+    return (dates[i] - cur).days if i < len(dates) else -1.0
 
 
 def mean_days_between_same_amount(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Mean interval (in days) between successive transactions with the same amount."""
-    dates = sorted(parse_date(t.date) for t in all_transactions if t.amount == transaction.amount)
-    if len(dates) < 2:
+    diffs = _intervals_between(_same_amount(transaction, all_transactions))
+    if not diffs:
         return -1.0
-    diffs = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
     return float(np.mean(diffs))
 
 
 def std_days_between_same_amount(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Std. dev. of intervals (in days) between successive transactions with the same amount."""
-    dates = sorted(parse_date(t.date) for t in all_transactions if t.amount == transaction.amount)
-    if len(dates) < 2:
+    diffs = _intervals_between(_same_amount(transaction, all_transactions))
+    if not diffs:
         return -1.0
-    diffs = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
     try:
         return float(np.std(diffs, ddof=1))
     except Exception:
@@ -344,8 +460,7 @@ def same_day_of_month_count(transaction: Transaction, all_transactions: list[Tra
     How many transactions in this group fall on the same
     day-of-month as the current one.
     """
-    dom = day_of_month(transaction)
-    return sum(1 for t in all_transactions if parse_date(t.date).day == dom)
+    return int(get_day_counts(all_transactions)[day_of_month(transaction)])
 
 
 def fraction_same_day_of_month(transaction: Transaction, all_transactions: list[Transaction]) -> float:
@@ -363,10 +478,9 @@ def frac_intervals_within(txns: list[Transaction], period_days: int, tol_days: i
     What fraction of successive-txn intervals fall within
     [period_days - tol_days, period_days + tol_days]?
     """
-    dates = sorted(parse_date(t.date) for t in txns)
-    if len(dates) < 2:
+    diffs = _intervals_between(txns)
+    if not diffs:
         return -1.0
-    diffs = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
     good = sum(1 for d in diffs if period_days - tol_days <= d <= period_days + tol_days)
     return good / len(diffs)
 
@@ -410,7 +524,7 @@ def total_span_months(txns: list[Transaction]) -> float:
     Approximate span in months = (last - first).days / 30,
     rounded up to 1 if <30 days.
     """
-    dates = sorted(parse_date(t.date) for t in txns)
+    dates = _sorted_dates(txns)
     if len(dates) < 2:
         return 1
     span_days = (dates[-1] - dates[0]).days
@@ -438,10 +552,12 @@ def avg_txn_per_month(txns: list[Transaction]) -> float:
 
 def modal_amount(txns: list[Transaction]) -> float:
     """The most-common transaction amount in this group."""
-    amounts = [t.amount for t in txns]
-    if not amounts:
+    cents = _amount_cents(txns)
+    if cents.size == 0:
         return -1.0
-    return Counter(amounts).most_common(1)[0][0]
+    _, first_positions, counts = np.unique(cents, return_index=True, return_counts=True)
+    # ties go to the amount seen first, like Counter.most_common
+    return txns[int(first_positions[counts == counts.max()].min())].amount
 
 
 def fraction_modal_amount(txns: list[Transaction]) -> float:
@@ -453,14 +569,14 @@ def fraction_modal_amount(txns: list[Transaction]) -> float:
     total = len(txns)
     if total == 0 or modal == -1.0:
         return -1.0
-    cnt = sum(1 for t in txns if t.amount == modal)
+    cnt = _n_same_amount(modal, txns)
     return cnt / total
 
 
 def amount_matches_modal(txn: Transaction, txns: list[Transaction]) -> float:
     """1.0 if this txn's amount = modal amount, else 0.0."""
     modal = modal_amount(txns)
-    return float(txn.amount == modal)
+    return float(_to_cents(txn.amount) == _to_cents(modal))
 
 
 # —— 4. Mode-interval features ——
@@ -468,10 +584,9 @@ def amount_matches_modal(txn: Transaction, txns: list[Transaction]) -> float:
 
 def mode_interval(txns: list[Transaction]) -> float:
     """Most-common gap (in days) between successive txns."""
-    dates = sorted(parse_date(t.date) for t in txns)
-    if len(dates) < 2:
+    diffs = _intervals_between(txns)
+    if not diffs:
         return -1.0
-    diffs = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
     return Counter(diffs).most_common(1)[0][0]
 
 
@@ -480,10 +595,9 @@ def fraction_mode_interval(txns: list[Transaction]) -> float:
     Fraction of all successive-txn gaps that equal the mode.
     If >0.8, that's a very strong “regular” signal.
     """
-    dates = sorted(parse_date(t.date) for t in txns)
-    if len(dates) < 2:
+    diffs = _intervals_between(txns)
+    if not diffs:
         return -1.0
-    diffs = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
     _, freq = Counter(diffs).most_common(1)[0]
     return freq / len(diffs)
 
@@ -531,9 +645,12 @@ def next_within_monthly_tol(txn: Transaction, txns: list[Transaction]) -> float:
 
 
 def modal_day_of_month(txns: list[Transaction]) -> float:
-    dates = [parse_date(t.date) for t in txns]
-    doms = [d.day for d in dates]
-    return Counter(doms).most_common(1)[0][0] if doms else -1.0
+    if not txns:
+        return -1.0
+    counts = get_day_counts(txns)
+    doms = to_columns(txns)["day"]
+    # ties go to the day seen first, like Counter.most_common
+    return int(doms[np.argmax(counts[doms] == counts.max())])
 
 
 def dom_diff_from_modal(txn: Transaction, txns: list[Transaction]) -> float:
@@ -563,19 +680,16 @@ def rel_amount_diff_from_modal(txn: Transaction, txns: list[Transaction]) -> flo
 
 def amount_frequency_rank(txn: Transaction, txns: list[Transaction]) -> float:
     """1 = modal amount, 2 = second-most, etc."""
-    counts = Counter(t.amount for t in txns)
+    amounts, counts = np.unique(_amount_cents(txns), return_counts=True)
     # sort by descending freq, tie-break by amount
-    ranked = sorted(counts.items(), key=lambda x: (-x[1], x[0]))
-    for rank, (amt, _) in enumerate(ranked, start=1):
-        if amt == txn.amount:
-            return rank
-    return -1.0
+    ranked = amounts[np.lexsort((amounts, -counts))]
+    ranks = np.flatnonzero(ranked == _to_cents(txn.amount))
+    return int(ranks[0]) + 1 if ranks.size else -1.0
 
 
 def amount_freq_fraction(txn: Transaction, txns: list[Transaction]) -> float:
-    counts = Counter(t.amount for t in txns)
     total = len(txns)
-    return counts.get(txn.amount, 0) / total if total else -1.0
+    return _n_same_amount(txn.amount, txns) / total if total else -1.0
 
 
 # ——— 4. Calendar-month local density features ———
@@ -597,7 +711,7 @@ def frac_txns_in_same_month(txn: Transaction, txns: list[Transaction]) -> float:
 
 
 def days_since_group_start(txn: Transaction, txns: list[Transaction]) -> float:
-    dates = sorted(parse_date(t.date) for t in txns)
+    dates = _sorted_dates(txns)
     if not dates:
         return -1.0
     return (parse_date(txn.date) - dates[0]).days
@@ -638,7 +752,7 @@ def pct_small_transactions_not_this_amount(
 
 def ends_in_00(transaction: Transaction) -> bool:
     """Check if the transaction amount ends in 00."""
-    return abs((transaction.amount * 100) % 100 - 00) < 0.001
+    return _to_cents(transaction.amount) % 100 == 0
 
 
 def is_likely_subscription_amount(transaction: Transaction) -> bool:
@@ -696,10 +810,11 @@ def is_phone_company(transaction: Transaction) -> bool:
     )
 
 
-def is_subscription_company(transaction: Transaction) -> bool:
-    """Check if the transaction is a subscription company payment."""
+@lru_cache(maxsize=4096)
+def _is_subscription_company_name(name: str) -> bool:
+    """Check a vendor name for the subscription companies, once per vendor name."""
     return any(
-        subscription_company in transaction.name.lower()
+        subscription_company in name.lower()
         for subscription_company in [
             "spotify",
             "spectrum",
@@ -727,10 +842,16 @@ def is_subscription_company(transaction: Transaction) -> bool:
     )
 
 
-def is_usually_subscription_company(transaction: Transaction) -> bool:
-    """Check if the transaction is a usually a subscription company payment."""
+def is_subscription_company(transaction: Transaction) -> bool:
+    """Check if the transaction is a subscription company payment."""
+    return _is_subscription_company_name(transaction.name)
+
+
+@lru_cache(maxsize=4096)
+def _is_usually_subscription_company_name(name: str) -> bool:
+    """Check a vendor name for the usual subscription keywords, once per vendor name."""
     return any(
-        subscription_company in transaction.name.lower()
+        subscription_company in name.lower()
         for subscription_company in [
             "membership",
             "fitness",
@@ -754,6 +875,11 @@ def is_usually_subscription_company(transaction: Transaction) -> bool:
     )
 
 
+def is_usually_subscription_company(transaction: Transaction) -> bool:
+    """Check if the transaction is a usually a subscription company payment."""
+    return _is_usually_subscription_company_name(transaction.name)
+
+
 def is_utility_company(transaction: Transaction) -> bool:
     """Check if the transaction is a utility company payment."""
     return any(
@@ -791,10 +917,9 @@ def is_rental_company(transaction: Transaction) -> bool:
 def n_monthly_same_amount(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Return the number of months with the same amount as the current transaction."""
     months = []
-    for t in all_transactions:
-        if t.amount == transaction.amount:
-            date = parse_date(t.date)
-            months.append(f"{date.month}-{date.year}")
+    for t in _same_amount(transaction, all_transactions):
+        date = parse_date(t.date)
+        months.append(f"{date.month}-{date.year}")
     return len(set(months))
 
 
@@ -807,7 +932,7 @@ def pct_monthly_same_amount(transaction: Transaction, all_transactions: list[Tra
 
 def n_consecutive_months_same_amount(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Return the number of consecutive months with the same amount as the current transaction."""
-    same_amount_dates = [parse_date(t.date) for t in all_transactions if t.amount == transaction.amount]
+    same_amount_dates = [parse_date(t.date) for t in _same_amount(transaction, all_transactions)]
     if not same_amount_dates:
         return 0
     # return 0 if there are multiple transactions in the same month
@@ -850,12 +975,7 @@ def pct_consecutive_months_same_amount(transaction: Transaction, all_transaction
 
 def n_same_day_same_amount(transaction: Transaction, all_transactions: list[Transaction], n_days_off: int = 0) -> int:
     """Return the number of transactions in the same day of the month with the same amount as the current tx."""
-    tx_day = day_of_month(transaction)
-    return len([
-        t
-        for t in all_transactions
-        if t.amount == transaction.amount and abs(parse_date(t.date).day - tx_day) <= n_days_off
-    ])
+    return get_n_transactions_same_day_counts(transaction, all_transactions, [n_days_off], same_amount=True)[n_days_off]
 
 
 def pct_same_day_same_amount(
@@ -877,30 +997,9 @@ def get_n_transactions_days_apart_same_amount(
     Get the number of transactions in all_transactions that are within n_days_off of
     being n_days_apart from transaction and have the same amount as the current tx
     """
-    n_txs = 0
-    transaction_date = parse_date(transaction.date)
-
-    # Pre-calculate bounds for faster checking
-    lower_remainder = n_days_apart - n_days_off
-    upper_remainder = n_days_off
-
-    for t in all_transactions:
-        if t.amount != transaction.amount:
-            continue
-        t_date = parse_date(t.date)
-        days_diff = abs((t_date - transaction_date).days)
-
-        # Skip if the difference is less than minimum required
-        if days_diff < n_days_apart - n_days_off:
-            continue
-
-        # Check if the difference is close to any multiple of n_days_apart
-        remainder = days_diff % n_days_apart
-
-        if remainder <= upper_remainder or remainder >= lower_remainder:
-            n_txs += 1
-
-    return n_txs
+    same_amount = _amount_cents(all_transactions) == _to_cents(transaction.amount)
+    days_apart = _days_apart(transaction, all_transactions, n_days_apart, n_days_off)
+    return int(np.count_nonzero(days_apart & same_amount))
 
 
 def get_pct_transactions_days_apart_same_amount(
@@ -917,6 +1016,7 @@ def get_pct_transactions_days_apart_same_amount(
 
 def get_features(transaction: Transaction, all_transactions: list[Transaction]) -> dict[str, int | bool | float]:
     """Get the original features for the transaction."""
+    z_score = get_transaction_z_score(transaction, all_transactions)
     return {
         "n_transactions_same_amount": get_n_transactions_same_amount(transaction, all_transactions),
         "percent_transactions_same_amount": get_percent_transactions_same_amount(transaction, all_transactions),
@@ -938,8 +1038,8 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         "is_utility": get_is_utility(transaction),
         "is_phone": get_is_phone(transaction),
         "is_always_recurring": get_is_always_recurring(transaction),
-        "z_score": get_transaction_z_score(transaction, all_transactions),
-        "abs_z_score": abs(get_transaction_z_score(transaction, all_transactions)),
+        "z_score": z_score,
+        "abs_z_score": abs(z_score),
     }
 
 
@@ -1,26 +1,83 @@
 import statistics
-from datetime import datetime
+from collections.abc import Mapping
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
 
 from recur_scan.transactions import Transaction
+from recur_scan.utils import get_name_id, get_same_name_transactions, get_stdev, parse_datetime, to_columns
+
+RECURRING_KEYWORDS = ("subscription", "monthly", "rent", "bill", "payment")
+
+
+def _group_amounts(keys: list[int], amounts: list[float]) -> Mapping[int, tuple[float, ...]]:
+    """Group the amounts by their keys in one pass, keeping the order of the amounts within each key."""
+    groups: dict[int, list[float]] = {}
+    for key, amount in zip(keys, amounts, strict=True):
+        groups.setdefault(key, []).append(amount)
+    return MappingProxyType({key: tuple(group) for key, group in groups.items()})
+
+
+@lru_cache(maxsize=1024)
+def _get_month_amounts(transactions: tuple[Transaction, ...]) -> Mapping[int, tuple[float, ...]]:
+    """Get the amounts of the transactions in each month, grouped once per list of transactions."""
+    months = to_columns(list(transactions))["month"]
+    return _group_amounts(months.tolist(), [t.amount for t in transactions])
+
+
+@lru_cache(maxsize=1024)
+def _get_day_of_week_amounts(transactions: tuple[Transaction, ...]) -> Mapping[int, tuple[float, ...]]:
+    """Get the amounts of the transactions on each day of the week, grouped once per list of transactions."""
+    columns = to_columns(list(transactions))
+    return _group_amounts(columns["weekday"].tolist(), columns["amount"].tolist())
+
+
+@lru_cache(maxsize=1024)
+def _get_sorted_amounts(transactions: tuple[Transaction, ...]) -> np.ndarray:
+    """Get the amounts of the transactions in ascending order, sorted once per list of transactions (read-only)."""
+    amounts = np.sort(to_columns(list(transactions))["amount"])
+    amounts.flags.writeable = False
+    return amounts
+
+
+def _count_amounts_between(transactions: list[Transaction], lower_bound: float, upper_bound: float) -> int:
+    """Count the transactions with lower_bound <= amount <= upper_bound with two binary searches."""
+    amounts = _get_sorted_amounts(tuple(transactions))
+    n_between = int(np.searchsorted(amounts, upper_bound, side="right") - np.searchsorted(amounts, lower_bound))
+    # the bounds of a negative amount are reversed, so nothing is between them
+    return max(n_between, 0)
+
+
+@lru_cache(maxsize=1024)
+def _get_variance(amounts: tuple[float, ...]) -> float:
+    """Get the sample variance of the amounts, computed once per distinct list of amounts."""
+    return statistics.variance(amounts)
+
+
+def _get_intervals(ordinals: np.ndarray) -> list[int]:
+    """Get the days between consecutive dates, in chronological order."""
+    intervals: list[int] = np.diff(np.sort(ordinals)).tolist()
+    return intervals
 
 
 def get_n_transactions_same_name(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Get the number of transactions in all_
     transactions with the same name as transaction"""
-    return len([t for t in all_transactions if t.name == transaction.name])
+    return len(get_same_name_transactions(transaction, all_transactions))
 
 
 def get_percent_transactions_same_name(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get the percentage of transactions in all_transactions with the same name as transaction"""
     if not all_transactions:
         return 0.0
-    n_same_name = len([t for t in all_transactions if t.name == transaction.name])
+    n_same_name = len(get_same_name_transactions(transaction, all_transactions))
     return n_same_name / len(all_transactions)
 
 
 def get_avg_amount_same_name(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get the average amount of transactions in all_transactions with the same name as transaction"""
-    same_name_transactions = [t for t in all_transactions if t.name == transaction.name]
+    same_name_transactions = get_same_name_transactions(transaction, all_transactions)
     if not same_name_transactions:
         return 0.0
     return sum(t.amount for t in same_name_transactions) / len(same_name_transactions)
@@ -40,7 +97,7 @@ def get_std_amount_same_name(transaction: Transaction, all_transactions: list[Tr
                Returns 0.0 if there are fewer than two such transactions.
     """
     # Filter transactions to find those with the same name
-    same_name_transactions = [t for t in all_transactions if t.name == transaction.name]
+    same_name_transactions = get_same_name_transactions(transaction, all_transactions)
     # If there are fewer than two transactions with the same name, return 0.0
     if len(same_name_transactions) < 2:
         return 0.0
@@ -48,51 +105,45 @@ def get_std_amount_same_name(transaction: Transaction, all_transactions: list[Tr
     # Calculate and return the standard deviation of the amounts
     amounts = [t.amount for t in same_name_transactions]
     try:
-        return statistics.stdev(amounts)
+        return get_stdev(amounts)
     except Exception:
         return 0.0
 
 
 def get_n_transactions_same_month(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Get the number of transactions in all_transactions in the same month as transaction"""
-    transaction_month = datetime.strptime(transaction.date, "%Y-%m-%d").month
-    return len([t for t in all_transactions if datetime.strptime(t.date, "%Y-%m-%d").month == transaction_month])
+    transaction_month = parse_datetime(transaction.date).month
+    return len(_get_month_amounts(tuple(all_transactions)).get(transaction_month, ()))
 
 
 def get_percent_transactions_same_month(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get the percentage of transactions in all_transactions in the same month as transaction"""
     if not all_transactions:
         return 0.0
-    transaction_month = datetime.strptime(transaction.date, "%Y-%m-%d").month
-    n_same_month = len([
-        t for t in all_transactions if datetime.strptime(t.date, "%Y-%m-%d").month == transaction_month
-    ])
+    transaction_month = parse_datetime(transaction.date).month
+    n_same_month = len(_get_month_amounts(tuple(all_transactions)).get(transaction_month, ()))
     return n_same_month / len(all_transactions)
 
 
 def get_avg_amount_same_month(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get the average amount of transactions in all_transactions
     in the same month as transaction"""
-    transaction_month = datetime.strptime(transaction.date, "%Y-%m-%d").month
-    same_month_transactions = [
-        t for t in all_transactions if datetime.strptime(t.date, "%Y-%m-%d").month == transaction_month
-    ]
-    if not same_month_transactions:
+    transaction_month = parse_datetime(transaction.date).month
+    same_month_amounts = _get_month_amounts(tuple(all_transactions)).get(transaction_month, ())
+    if not same_month_amounts:
         return 0.0
-    return sum(t.amount for t in same_month_transactions) / len(same_month_transactions)
+    return sum(same_month_amounts) / len(same_month_amounts)
 
 
 def get_std_amount_same_month(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get the standard deviation of amounts for transactions in all_
     transactions in the same month as transaction"""
-    transaction_month = datetime.strptime(transaction.date, "%Y-%m-%d").month
-    same_month_transactions = [
-        t for t in all_transactions if datetime.strptime(t.date, "%Y-%m-%d").month == transaction_month
-    ]
-    if len(same_month_transactions) < 2:
+    transaction_month = parse_datetime(transaction.date).month
+    same_month_amounts = _get_month_amounts(tuple(all_transactions)).get(transaction_month, ())
+    if len(same_month_amounts) < 2:
         return 0.0
     try:
-        return statistics.stdev(t.amount for t in same_month_transactions)
+        return get_stdev(same_month_amounts)
     except Exception:
         return 0.0
 
@@ -117,36 +168,30 @@ def get_percent_transactions_same_day_of_week(transaction: Transaction, all_tran
     all_transactions on the same day of the week as transaction"""
     if not all_transactions:
         return 0.0
-    transaction_day_of_week = datetime.strptime(transaction.date, "%Y-%m-%d").weekday()
-    n_same_day_of_week = len([
-        t for t in all_transactions if datetime.strptime(t.date, "%Y-%m-%d").weekday() == transaction_day_of_week
-    ])
+    transaction_day_of_week = parse_datetime(transaction.date).weekday()
+    n_same_day_of_week = len(_get_day_of_week_amounts(tuple(all_transactions)).get(transaction_day_of_week, ()))
     return n_same_day_of_week / len(all_transactions)
 
 
 def get_avg_amount_same_day_of_week(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get the average amount of transactions in
     all_transactions on the same day of the week as transaction"""
-    transaction_day_of_week = datetime.strptime(transaction.date, "%Y-%m-%d").weekday()
-    same_day_of_week_transactions = [
-        t for t in all_transactions if datetime.strptime(t.date, "%Y-%m-%d").weekday() == transaction_day_of_week
-    ]
-    if not same_day_of_week_transactions:
+    transaction_day_of_week = parse_datetime(transaction.date).weekday()
+    same_day_of_week_amounts = _get_day_of_week_amounts(tuple(all_transactions)).get(transaction_day_of_week, ())
+    if not same_day_of_week_amounts:
         return 0.0
-    return sum(t.amount for t in same_day_of_week_transactions) / len(same_day_of_week_transactions)
+    return sum(same_day_of_week_amounts) / len(same_day_of_week_amounts)
 
 
 def get_std_amount_same_day_of_week(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get the standard deviation of amounts for transactions in all_transactions
     on the same day of the week as transaction"""
-    transaction_day_of_week = datetime.strptime(transaction.date, "%Y-%m-%d").weekday()
-    same_day_of_week_transactions = [
-        t for t in all_transactions if datetime.strptime(t.date, "%Y-%m-%d").weekday() == transaction_day_of_week
-    ]
-    if len(same_day_of_week_transactions) < 2:
+    transaction_day_of_week = parse_datetime(transaction.date).weekday()
+    same_day_of_week_amounts = _get_day_of_week_amounts(tuple(all_transactions)).get(transaction_day_of_week, ())
+    if len(same_day_of_week_amounts) < 2:
         return 0.0
     try:
-        return statistics.stdev(t.amount for t in same_day_of_week_transactions)
+        return get_stdev(same_day_of_week_amounts)
     except Exception:
         return 0.0
 
@@ -157,7 +202,7 @@ def get_n_transactions_within_amount_range(
     """Get the number of transactions in all_transactions within a certain amount range of transaction"""
     lower_bound = transaction.amount * (1 - percentage)
     upper_bound = transaction.amount * (1 + percentage)
-    return len([t for t in all_transactions if lower_bound <= t.amount <= upper_bound])
+    return _count_amounts_between(all_transactions, lower_bound, upper_bound)
 
 
 def get_percent_transactions_within_amount_range(
@@ -168,7 +213,7 @@ def get_percent_transactions_within_amount_range(
         return 0.0
     lower_bound = transaction.amount * (1 - percentage)
     upper_bound = transaction.amount * (1 + percentage)
-    n_within_range = len([t for t in all_transactions if lower_bound <= t.amount <= upper_bound])
+    n_within_range = _count_amounts_between(all_transactions, lower_bound, upper_bound)
     return n_within_range / len(all_transactions)
 
 
@@ -177,41 +222,27 @@ def get_percent_transactions_within_amount_range(
 
 def get_avg_time_between_transactions(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get the average time difference (in days) between transactions with the same name."""
-    same_name_transactions = sorted(
-        [t for t in all_transactions if t.name == transaction.name], key=lambda t: datetime.strptime(t.date, "%Y-%m-%d")
-    )
-    if len(same_name_transactions) < 2:
+    ordinals = to_columns(all_transactions)["ordinal"]
+    same_name = to_columns(all_transactions)["name_id"] == get_name_id(transaction.name, all_transactions)
+    if np.count_nonzero(same_name) < 2:
         return 0.0
-    time_differences = [
-        (
-            datetime.strptime(same_name_transactions[i + 1].date, "%Y-%m-%d")
-            - datetime.strptime(same_name_transactions[i].date, "%Y-%m-%d")
-        ).days
-        for i in range(len(same_name_transactions) - 1)
-    ]
+    time_differences = _get_intervals(ordinals[same_name])
     return sum(time_differences) / len(time_differences)
 
 
 def get_is_recurring(transaction: Transaction, all_transactions: list[Transaction], threshold: int = 30) -> int:
     """Check if the transaction is recurring within a given threshold (e.g., 30 days)."""
-    same_name_transactions = sorted(
-        [t for t in all_transactions if t.name == transaction.name], key=lambda t: datetime.strptime(t.date, "%Y-%m-%d")
-    )
-    if len(same_name_transactions) < 2:
+    ordinals = to_columns(all_transactions)["ordinal"]
+    same_name = to_columns(all_transactions)["name_id"] == get_name_id(transaction.name, all_transactions)
+    if np.count_nonzero(same_name) < 2:
         return 0
-    time_differences = [
-        (
-            datetime.strptime(same_name_transactions[i + 1].date, "%Y-%m-%d")
-            - datetime.strptime(same_name_transactions[i].date, "%Y-%m-%d")
-        ).days
-        for i in range(len(same_name_transactions) - 1)
-    ]
+    time_differences = _get_intervals(ordinals[same_name])
     return int(any(diff <= threshold for diff in time_differences))
 
 
 def get_median_amount_same_name(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get the median amount of transactions with the same name."""
-    same_name_transactions = [t.amount for t in all_transactions if t.name == transaction.name]
+    same_name_transactions = [t.amount for t in get_same_name_transactions(transaction, all_transactions)]
     if not same_name_transactions:
         return 0.0
     return statistics.median(same_name_transactions)
@@ -219,7 +250,7 @@ def get_median_amount_same_name(transaction: Transaction, all_transactions: list
 
 def get_amount_range_same_name(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get the range (max - min) of transaction amounts with the same name."""
-    same_name_transactions = [t.amount for t in all_transactions if t.name == transaction.name]
+    same_name_transactions = [t.amount for t in get_same_name_transactions(transaction, all_transactions)]
     if not same_name_transactions:
         return 0.0
     return max(same_name_transactions) - min(same_name_transactions)
@@ -227,12 +258,12 @@ def get_amount_range_same_name(transaction: Transaction, all_transactions: list[
 
 def get_day_of_week(transaction: Transaction) -> int:
     """Get the day of the week for a transaction (0=Monday, 6=Sunday)."""
-    return datetime.strptime(transaction.date, "%Y-%m-%d").weekday()
+    return parse_datetime(transaction.date).weekday()
 
 
 def get_is_weekend(transaction: Transaction) -> int:
     """Check if the transaction occurred on a weekend."""
-    day_of_week = datetime.strptime(transaction.date, "%Y-%m-%d").weekday()
+    day_of_week = parse_datetime(transaction.date).weekday()
     return int(day_of_week >= 5)
 
 
@@ -249,10 +280,10 @@ def get_user_avg_transaction_amount(transaction: Transaction, all_transactions:
 
 def get_amount_variance(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate the variance of transaction amounts with the same name."""
-    amounts = [t.amount for t in all_transactions if t.name == transaction.name]
+    amounts = [t.amount for t in get_same_name_transactions(transaction, all_transactions)]
     if len(amounts) < 2:
         return 0.0
-    return statistics.variance(amounts)
+    return _get_variance(tuple(amounts))
 
 
 def get_amount_consistency(transaction: Transaction, all_transactions: list[Transaction]) -> float:
@@ -263,11 +294,11 @@ def get_amount_consistency(transaction: Transaction, all_transactions: list[Tran
 
 def get_user_transaction_frequency(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate the frequency of transactions for the user."""
-    user_transactions = [t for t in all_transactions if t.user_id == transaction.user_id]
-    if len(user_transactions) < 2:
+    ordinals = to_columns(all_transactions)["ordinal"]
+    same_user = np.array([t.user_id == transaction.user_id for t in all_transactions], dtype=bool)
+    if np.count_nonzero(same_user) < 2:
         return 0.0
-    dates = sorted([datetime.strptime(t.date, "%Y-%m-%d") for t in user_transactions])
-    intervals = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
+    intervals = _get_intervals(ordinals[same_user])
     return sum(intervals) / len(intervals) if intervals else 0.0
 
 
@@ -281,19 +312,21 @@ def get_user_transaction_frequency(transaction: Transaction, all_transactions: l
 
 def get_is_monthly(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Check if the transaction occurs approximately every 30 days."""
-    dates = sorted([datetime.strptime(t.date, "%Y-%m-%d") for t in all_transactions if t.name == transaction.name])
+    ordinals = to_columns(all_transactions)["ordinal"]
+    dates = ordinals[to_columns(all_transactions)["name_id"] == get_name_id(transaction.name, all_transactions)]
     if len(dates) < 2:
         return 0
-    intervals = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
+    intervals = _get_intervals(dates)
     return int(all(25 <= interval <= 35 for interval in intervals))
 
 
 def get_is_weekly(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Check if the transaction occurs approximately every 7 days."""
-    dates = sorted([datetime.strptime(t.date, "%Y-%m-%d") for t in all_transactions if t.name == transaction.name])
+    ordinals = to_columns(all_transactions)["ordinal"]
+    dates = ordinals[to_columns(all_transactions)["name_id"] == get_name_id(transaction.name, all_transactions)]
     if len(dates) < 2:
         return 0
-    intervals = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
+    intervals = _get_intervals(dates)
     return int(all(5 <= interval <= 9 for interval in intervals))
 
 
@@ -318,8 +351,8 @@ def get_is_weekly(transaction: Transaction, all_transactions: list[Transaction])
 
 def get_keyword_match(transaction: Transaction) -> int:
     """Check if the transaction name contains recurring-related keywords."""
-    keywords = ["subscription", "monthly", "rent", "bill", "payment"]
-    return int(any(keyword in transaction.name.lower() for keyword in keywords))
+    name = transaction.name.lower()
+    return int(any(keyword in name for keyword in RECURRING_KEYWORDS))
 
 
 def get_new_features(transaction: Transaction, grouped_transactions: list[Transaction]) -> dict:
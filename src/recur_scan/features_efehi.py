@@ -1,13 +1,16 @@
-from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter
 
 import numpy as np
 
 from recur_scan.transactions import Transaction
+from recur_scan.utils import get_same_name_transactions, to_columns
 
 
-def _get_days(date: str) -> int:
-    """Get the number of days since the epoch of a transaction date."""
-    return (datetime.strptime(date, "%Y-%m-%d") - datetime(1970, 1, 1)).days
+def _get_intervals(transactions: list[Transaction]) -> np.ndarray:
+    """Get the gaps (in days) between the sorted dates of transactions, as one array diff."""
+    # the ordinals and their differences stay int32 (sums of them are accumulated as int64 by numpy)
+    return np.diff(np.sort(to_columns(transactions)["ordinal"]))
 
 
 def get_transaction_time_of_month(transaction: Transaction) -> int:
@@ -37,9 +40,8 @@ def get_time_between_transactions(transaction: Transaction, all_transactions: li
     same_name_transactions = [t for t in all_transactions if t.name == transaction.name]
     if len(same_name_transactions) < 2:
         return 0.0
-    dates = sorted(_get_days(t.date) for t in same_name_transactions)
-    intervals = [dates[i + 1] - dates[i] for i in range(len(dates) - 1)]
-    return sum(intervals) / len(intervals) if intervals else 0.0
+    intervals = _get_intervals(same_name_transactions)
+    return int(intervals.sum()) / len(intervals) if len(intervals) else 0.0
 
 
 def get_transaction_frequency(transaction: Transaction, all_transactions: list[Transaction]) -> float:
@@ -47,14 +49,13 @@ def get_transaction_frequency(transaction: Transaction, all_transactions: list[T
     same_name_transactions = [t for t in all_transactions if t.name == transaction.name]
     if len(same_name_transactions) < 2:
         return 0.0
-    dates = sorted(_get_days(t.date) for t in same_name_transactions)
-    intervals = [dates[i + 1] - dates[i] for i in range(len(dates) - 1)]
-    return sum(intervals) / len(intervals)
+    intervals = _get_intervals(same_name_transactions)
+    return int(intervals.sum()) / len(intervals)
 
 
 def get_n_same_name_transactions(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Count transactions with the same name."""
-    return len([t for t in all_transactions if t.name == transaction.name])
+    return len(get_same_name_transactions(transaction, all_transactions))
 
 
 def get_irregular_periodicity(transaction: Transaction, all_transactions: list[Transaction]) -> float:
@@ -62,8 +63,7 @@ def get_irregular_periodicity(transaction: Transaction, all_transactions: list[T
     same_name_transactions = [t for t in all_transactions if t.name == transaction.name]
     if len(same_name_transactions) < 2:
         return 0.0
-    dates = sorted(_get_days(t.date) for t in same_name_transactions)
-    intervals = [dates[i + 1] - dates[i] for i in range(len(dates) - 1)]
+    intervals = _get_intervals(same_name_transactions)
     try:
         return float(np.std(intervals))
     except Exception:
@@ -77,8 +77,7 @@ def get_irregular_periodicity_with_tolerance(
     same_name_transactions = [t for t in all_transactions if t.name == transaction.name]
     if len(same_name_transactions) < 2:
         return 0.0
-    dates = sorted(_get_days(t.date) for t in same_name_transactions)
-    intervals = [dates[i + 1] - dates[i] for i in range(len(dates) - 1)]
+    intervals = _get_intervals(same_name_transactions).tolist()
     if not intervals:
         return 0.0
     interval_groups: list[list[int]] = []
@@ -106,9 +105,8 @@ def get_user_transaction_frequency(user_id: str, all_transactions: list[Transact
     user_transactions = [t for t in all_transactions if t.user_id == user_id]
     if len(user_transactions) < 2:
         return 0.0
-    dates = sorted(_get_days(t.date) for t in user_transactions)
-    intervals = [dates[i + 1] - dates[i] for i in range(len(dates) - 1)]
-    return sum(intervals) / len(intervals) if intervals else 0.0
+    intervals = _get_intervals(user_transactions)
+    return int(intervals.sum()) / len(intervals) if len(intervals) else 0.0
 
 
 def get_vendor_recurring_ratio(transaction: Transaction, all_transactions: list[Transaction]) -> float:
@@ -125,8 +123,7 @@ def get_vendor_recurrence_consistency(transaction: Transaction, all_transactions
     same_name_transactions = [t for t in all_transactions if t.name == transaction.name]
     if len(same_name_transactions) < 2:
         return 0.0
-    dates = sorted(_get_days(t.date) for t in same_name_transactions)
-    intervals = [dates[i + 1] - dates[i] for i in range(len(dates) - 1)]
+    intervals = _get_intervals(same_name_transactions).tolist()
     if not intervals:
         return 0.0
     tolerance = 5
@@ -232,57 +229,67 @@ def get_vendor_recurrence_consistency(transaction: Transaction, all_transactions
 # --- Newly Designed Feature Functions ---#
 
 
-def get_vendor_category_score(transaction: Transaction) -> float:
-    """Assign recurrence probability based on vendor type."""
-    subscription_vendors = [
-        "Apple",
-        "Amazon Prime",
-        "Amazon Prime Video",
-        "Cleo",
-        "Albert",
-        "Disney+",
-        "SiriusXM",
-        "Dashpass",
-        "Audible",
-        "Norton LifeLock",
-        "Adobe",
-        "BET+",
-        "Sony Playstation",
-        "Truebill",
-        "Instacart",
-    ]
-    loan_vendors = [
-        "AfterPay",
-        "Brght Lending",
-        "Credit Ninja",
-        "CashNetUSA",
-        "Lendswift",
-        "Greenline Loans",
-        "Rise Up Lending",
-        "Affirm",
-    ]
-    insurance_vendors = ["GEICO", "Lemonade Insurance", "Progressive Insurance", "Hugo Insurance", "Tn Farm Mutual"]
-    telecom_vendors = ["AT&T", "Sprint", "Verizon", "TMOBILE", "Straight Talk"]
-    housing_vendors: list[str] = [
-        # "Waterford Grove"  # too specific
-    ]
-
-    vendor = transaction.name.lower()
-    if any(v.lower() in vendor for v in subscription_vendors + loan_vendors):
+SUBSCRIPTION_VENDORS = [
+    "Apple",
+    "Amazon Prime",
+    "Amazon Prime Video",
+    "Cleo",
+    "Albert",
+    "Disney+",
+    "SiriusXM",
+    "Dashpass",
+    "Audible",
+    "Norton LifeLock",
+    "Adobe",
+    "BET+",
+    "Sony Playstation",
+    "Truebill",
+    "Instacart",
+]
+LOAN_VENDORS = [
+    "AfterPay",
+    "Brght Lending",
+    "Credit Ninja",
+    "CashNetUSA",
+    "Lendswift",
+    "Greenline Loans",
+    "Rise Up Lending",
+    "Affirm",
+]
+INSURANCE_VENDORS = ["GEICO", "Lemonade Insurance", "Progressive Insurance", "Hugo Insurance", "Tn Farm Mutual"]
+TELECOM_VENDORS = ["AT&T", "Sprint", "Verizon", "TMOBILE", "Straight Talk"]
+HOUSING_VENDORS: list[str] = [
+    # "Waterford Grove"  # too specific
+]
+# lowercased once here instead of for every vendor on every call
+_LIKELY_RECURRING_VENDORS = tuple(v.lower() for v in SUBSCRIPTION_VENDORS + LOAN_VENDORS)
+_MAYBE_RECURRING_VENDORS = tuple(v.lower() for v in INSURANCE_VENDORS + TELECOM_VENDORS + HOUSING_VENDORS)
+
+
+@lru_cache(maxsize=4096)
+def _get_vendor_category_score(name: str) -> float:
+    """Score a vendor name's recurrence category, once per vendor name."""
+    vendor = name.lower()
+    if any(v in vendor for v in _LIKELY_RECURRING_VENDORS):
         return 0.9
-    elif any(v.lower() in vendor for v in insurance_vendors + telecom_vendors + housing_vendors):
+    elif any(v in vendor for v in _MAYBE_RECURRING_VENDORS):
         return 0.5
     else:
         return 0.2
 
 
+def get_vendor_category_score(transaction: Transaction) -> float:
+    """Assign recurrence probability based on vendor type."""
+    return _get_vendor_category_score(transaction.name)
+
+
 def rolling_amount_deviation(
     transaction: Transaction, all_transactions: list[Transaction], window_size: int = 3
 ) -> float:
     """Calculate deviation of the latest transaction amount from the rolling mean of previous amounts."""
     user_txns = sorted(
         [t for t in all_transactions if t.user_id == transaction.user_id and t.name == transaction.name],
-        key=lambda t: t.date,
+        key=attrgetter("date"),
     )
 
     if len(user_txns) < window_size:
@@ -2,15 +2,43 @@ import re
 import statistics
 from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
 from typing import cast
 
 import dateutil.parser as _du_parser  # type: ignore
 import numpy as np
-import pandas as pd
-from scipy.stats import iqr  # type: ignore
 from thefuzz import fuzz  # type: ignore
 
 from recur_scan.transactions import Transaction
+from recur_scan.utils import parse_datetime, to_columns
+
+UTILITY_PATTERN = re.compile(
+    r"\b(water|gas|electricity|power|energy|utility|sewage|trash|waste|heating|cable|internet|broadband|tv)\b",
+    re.IGNORECASE,
+)
+UTILITY_PROVIDERS = (
+    "duke energy",
+    "pg&e",
+    "con edison",
+    "national grid",
+    "xcel energy",
+    "southern california edison",
+    "dominion energy",
+    "centerpoint energy",
+    "peoples gas",
+    "nrg energy",
+    "direct energy",
+    "atmos energy",
+    "comcast",
+    "xfinity",
+    "spectrum",
+    "verizon fios",
+    "centurylink",
+    "at&t",
+    "cox communications",
+)
+AUTO_PAY_PATTERN = re.compile(r"\b(auto\s?pay|autopayment|automatic payment)\b", re.IGNORECASE)
+MEMBERSHIP_PATTERN = re.compile(r"\b(membership|subscription|club|gym|association|society)\b", re.IGNORECASE)
 
 
 def parse_date(date_str: str) -> datetime | None:
@@ -31,38 +59,13 @@ def get_is_near_same_amount(transaction: Transaction, all_transactions: list[Tra
 
 def is_utility_bill(transaction: Transaction) -> bool:
     """Check if the transaction is a utility bill (water, gas, electricity, etc.)."""
-    utility_keywords = (
-        r"\b(water|gas|electricity|power|energy|utility|sewage|trash|waste|heating|cable|internet|broadband|tv)\b"
-    )
-    utility_providers = {
-        "duke energy",
-        "pg&e",
-        "con edison",
-        "national grid",
-        "xcel energy",
-        "southern california edison",
-        "dominion energy",
-        "centerpoint energy",
-        "peoples gas",
-        "nrg energy",
-        "direct energy",
-        "atmos energy",
-        "comcast",
-        "xfinity",
-        "spectrum",
-        "verizon fios",
-        "centurylink",
-        "at&t",
-        "cox communications",
-    }
     name_lower = transaction.name.lower()
-    return bool(re.search(utility_keywords, name_lower, re.IGNORECASE)) or any(
-        provider in name_lower for provider in utility_providers
-    )
+    return bool(UTILITY_PATTERN.search(name_lower)) or any(provider in name_lower for provider in UTILITY_PROVIDERS)
 
 
-def get_is_always_recurring(transaction: Transaction) -> bool:
-    """Check if the transaction is always recurring using fuzzy matching."""
+@lru_cache(maxsize=4096)
+def _is_always_recurring_name(name: str) -> bool:
+    """Fuzzy match a vendor name against the always recurring vendors, once per vendor name."""
     always_recurring_vendors = {
         "google storage",
         "netflix",
@@ -90,18 +93,22 @@ def get_is_always_recurring(transaction: Transaction) -> bool:
         "at&t internet",
         "t-mobile home internet",
     }
-    return any(fuzz.partial_ratio(transaction.name.lower(), vendor) > 85 for vendor in always_recurring_vendors)
+    return any(fuzz.partial_ratio(name.lower(), vendor) > 85 for vendor in always_recurring_vendors)
+
+
+def get_is_always_recurring(transaction: Transaction) -> bool:
+    """Check if the transaction is always recurring using fuzzy matching."""
+    return _is_always_recurring_name(transaction.name)
 
 
 def is_auto_pay(transaction: Transaction) -> bool:
     """Check if the transaction is an automatic recurring payment."""
-    return bool(re.search(r"\b(auto\s?pay|autopayment|automatic payment)\b", transaction.name, re.IGNORECASE))
+    return bool(AUTO_PAY_PATTERN.search(transaction.name))
 
 
 def is_membership(transaction: Transaction) -> bool:
     """Check if the transaction is a membership payment."""
-    membership_keywords = r"\b(membership|subscription|club|gym|association|society)\b"
-    return bool(re.search(membership_keywords, transaction.name, re.IGNORECASE))
+    return bool(MEMBERSHIP_PATTERN.search(transaction.name))
 
 
 def is_recurring_based_on_99(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
@@ -151,7 +158,7 @@ def get_transaction_similarity(transaction: Transaction, all_transactions: list[
 
 def is_weekday_transaction(transaction: Transaction) -> bool:
     """Return True if the transaction happened on a weekday (Mon-Fri)."""
-    return datetime.strptime(transaction.date, "%Y-%m-%d").weekday() < 5
+    return parse_datetime(transaction.date).weekday() < 5
 
 
 def is_price_trending(transaction: Transaction, all_transactions: list[Transaction], threshold: int) -> bool:
@@ -204,11 +211,34 @@ def get_transaction_amount_variance(txn: dict, txns: list[dict]) -> float:
 
 def most_common_interval(all_transactions: list[Transaction]) -> int:
     """Mode of day-diffs between sorted dates."""
-    df = pd.DataFrame([{"date": t.date} for t in all_transactions])
-    df["date"] = pd.to_datetime(df["date"])
-    df2 = df.sort_values("date")
-    diffs = df2["date"].diff().dt.days.dropna()
-    return int(diffs.mode()[0]) if not diffs.empty else 0
+    # work on a day array instead of building a DataFrame on every call
+    days = np.sort(to_columns(all_transactions)["ordinal"])
+    diffs = np.diff(days)
+    if diffs.size == 0:
+        return 0
+    # np.unique sorts the values, so ties go to the smallest interval, like Series.mode()[0]
+    values, counts = np.unique(diffs, return_counts=True)
+    return int(values[np.argmax(counts)])
+
+
+def _iqr(values: np.ndarray) -> float:
+    """
+    Get the interquartile range of values.
+
+    It interpolates the quartiles linearly between the sorted values, the same way (and to the same bits) as
+    scipy.stats.iqr, so this module doesn't import scipy.stats, which takes most of the package's import time.
+    """
+    y = np.sort(values)
+    n = len(y)
+    p = np.array([0.25, 0.75])
+    jg = p * n + (1 - p)
+    j = jg // 1 - 1
+    g = jg % 1
+    g[j < 0] = 0
+    lower = y[np.clip(j, 0, n - 1).astype(np.int64)]
+    upper = y[np.clip(jg // 1, 0, n - 1).astype(np.int64)]
+    q25, q75 = (1 - g) * lower + g * upper
+    return float(q75 - q25)
 
 
 def amount_variability_ratio(all_transactions: list[Transaction]) -> float:
@@ -216,9 +246,9 @@ def amount_variability_ratio(all_transactions: list[Transaction]) -> float:
     if not all_transactions:
         return 0.0
 
-    df = pd.DataFrame([{"amount": t.amount} for t in all_transactions])
-    med = float(np.median(df["amount"]))
-    return float(iqr(df["amount"])) / med if med != 0 else 0.0
+    amounts = to_columns(all_transactions)["amount"]
+    med = float(np.median(amounts))
+    return _iqr(amounts) / med if med != 0 else 0.0
 
 
 def amount_similarity(all_transactions: list[Transaction], tolerance: float = 0.1) -> float:
@@ -226,24 +256,21 @@ def amount_similarity(all_transactions: list[Transaction], tolerance: float = 0.
     if not all_transactions:
         return 0.0
 
-    df = pd.DataFrame([{"amount": t.amount} for t in all_transactions])
-    mean_amt = float(np.mean(df["amount"]))
-    mask = np.abs(df["amount"] - mean_amt) < tolerance * mean_amt
-    return float(mask.mean()) if len(df) else 0.0
+    amounts = to_columns(all_transactions)["amount"]
+    mean_amt = float(np.mean(amounts))
+    mask = np.abs(amounts - mean_amt) < tolerance * mean_amt
+    return float(mask.mean())
 
 
 def get_new_features(transaction: Transaction, all_transactions: list[Transaction]) -> dict[str, float | int | bool]:
     """Aggregate selected engineered features for model training."""
+    # the dict-based features share one copy of the transactions as dicts instead of each building its own
+    txn = {"name": transaction.name, "date": transaction.date, "amount": transaction.amount}
+    txns = [{"name": t.name, "date": t.date, "amount": t.amount} for t in all_transactions]
 
     return {
-        "time_regularity_score": get_time_regularity_score(
-            {"name": transaction.name, "date": transaction.date, "amount": transaction.amount},
-            [{"name": t.name, "date": t.date, "amount": t.amount} for t in all_transactions],
-        ),
-        "transaction_amount_variance": get_transaction_amount_variance(
-            {"name": transaction.name, "date": transaction.date, "amount": transaction.amount},
-            [{"name": t.name, "date": t.date, "amount": t.amount} for t in all_transactions],
-        ),
+        "time_regularity_score": get_time_regularity_score(txn, txns),
+        "transaction_amount_variance": get_transaction_amount_variance(txn, txns),
         "amount_variability_ratio": amount_variability_ratio(all_transactions),
         "most_common_interval": most_common_interval(all_transactions),
         "amount_similarity": amount_similarity(all_transactions),
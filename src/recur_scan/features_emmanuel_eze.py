@@ -1,7 +1,26 @@
 import statistics
+from functools import lru_cache
+
+import numpy as np
 
 from recur_scan.transactions import Transaction
-from recur_scan.utils import parse_date
+from recur_scan.utils import get_stdev, parse_date, to_columns
+
+
+@lru_cache(maxsize=1024)
+def _get_sequence_columns(transactions: tuple[Transaction, ...]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Get the lowercased names, amounts and date ordinals of the transactions, sorted by date.
+
+    They are built once per group and shared by its transactions, so they are read-only.
+    """
+    columns = to_columns(list(transactions))
+    order = np.argsort(columns["ordinal"], kind="stable")
+    names = np.array([t.name.lower() for t in transactions], dtype=object)[order]
+    amounts = columns["amount"][order]
+    ordinals = columns["ordinal"][order]
+    for column in (names, amounts, ordinals):
+        column.flags.writeable = False
+    return names, amounts, ordinals
 
 
 def detect_sequence_patterns(
@@ -14,27 +33,22 @@ def detect_sequence_patterns(
     if transaction.amount == 0:
         return {"sequence_confidence": 0.0, "sequence_pattern": -1, "sequence_length": 0}
 
-    vendor_txs = [
-        t
-        for t in all_transactions
-        if t.name.lower() == transaction.name.lower()
-        and abs(t.amount - transaction.amount) / max(transaction.amount, 1) < 0.05
-    ]
+    # the transactions with the same vendor and an amount within 5%, selected from the group's columns in date order
+    names, amounts, ordinals = _get_sequence_columns(tuple(all_transactions))
+    is_vendor_tx = (names == transaction.name.lower()) & (
+        np.abs(amounts - transaction.amount) / max(transaction.amount, 1) < 0.05
+    )
+    n_vendor_txs = int(np.count_nonzero(is_vendor_tx))
 
-    if len(vendor_txs) < min_occurrences:
+    if n_vendor_txs < min_occurrences:
         return {"sequence_confidence": 0.0, "sequence_pattern": -1, "sequence_length": 0}
 
-    vendor_txs_sorted = sorted(vendor_txs, key=lambda x: parse_date(x.date))
-
-    intervals = [
-        (parse_date(vendor_txs_sorted[i].date) - parse_date(vendor_txs_sorted[i - 1].date)).days
-        for i in range(1, len(vendor_txs_sorted))
-    ]
+    intervals: list[int] = np.diff(ordinals[is_vendor_tx]).tolist()
     if len(intervals) <= 1:
         return {"sequence_confidence": 0.0, "sequence_pattern": -1, "sequence_length": 0}
     try:
         avg_interval = statistics.mean(intervals)
-        stdev_interval = statistics.stdev(intervals) if len(intervals) > 1 else 0
+        stdev_interval = get_stdev(intervals) if len(intervals) > 1 else 0
     except Exception:
         return {"sequence_confidence": 0.0, "sequence_pattern": -1, "sequence_length": 0}
 
@@ -52,7 +66,7 @@ def detect_sequence_patterns(
     return {
         "sequence_confidence": best_confidence,
         "sequence_pattern": best_pattern,
-        "sequence_length": len(vendor_txs),
+        "sequence_length": n_vendor_txs,
     }
 
 
@@ -95,7 +109,7 @@ def get_recurring_transaction_confidence(transaction: Transaction, all_transacti
     else:
         try:
             mean = sum(similar_transactions) / len(similar_transactions)
-            stdev = statistics.stdev(similar_transactions)
+            stdev = get_stdev(similar_transactions)
             amount_stability = stdev / mean if mean != 0 else 1.0
         except Exception:
             amount_stability = 1.0
@@ -110,7 +124,7 @@ def get_recurring_transaction_confidence(transaction: Transaction, all_transacti
         try:
             intervals = [(similar_dates[i] - similar_dates[i - 1]).days for i in range(1, len(similar_dates))]
             interval_regularities = (
-                -1.0 if len(intervals) < 2 else statistics.stdev(intervals)
+                -1.0 if len(intervals) < 2 else get_stdev(intervals)
             )  # Default value for insufficient data
         except Exception:
             interval_regularities = -1.0
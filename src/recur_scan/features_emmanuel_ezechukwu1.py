@@ -2,7 +2,25 @@ import re
 from typing import Any
 
 from recur_scan.transactions import Transaction
-from recur_scan.utils import parse_date
+from recur_scan.utils import count_days_apart, parse_date
+
+INSURANCE_PATTERN = re.compile(
+    r"\b(insurance|insur|insuranc|geico|allstate|progressive|state farm|liberty mutual)\b", re.IGNORECASE
+)
+UTILITY_PATTERN = re.compile(
+    r"\b(utility|utilit|energy|water|gas|electric|comcast|xfinity|verizon fios|at&t u-verse|spectrum)\b",
+    re.IGNORECASE,
+)
+PHONE_PATTERN = re.compile(r"\b(at&t|t-mobile|verizon|sprint|boost|cricket|metro pcs|straight talk)\b", re.IGNORECASE)
+RECURRING_KEYWORD_PATTERN = re.compile(
+    r"\b(sub|membership|renewal|monthly|annual|premium|bill|plan|fee|auto|pay|service|"
+    r"recurring|subscription|auto-renew|recurr|autopay|rec|month|year|quarterly|weekly|due)\b",
+    re.IGNORECASE,
+)
+CONVENIENCE_STORE_PATTERN = re.compile(
+    r"\b(7-eleven|cvs|walgreens|rite aid|circle k|quiktrip|speedway|ampm|7 eleven|seven eleven|sheetz)\b",
+    re.IGNORECASE,
+)
 
 
 def get_is_always_recurring(transaction: Transaction) -> bool:
@@ -38,43 +56,23 @@ def get_is_always_recurring(transaction: Transaction) -> bool:
 
 
 def get_is_insurance(transaction: Transaction) -> bool:
-    match = re.search(
-        r"\b(insurance|insur|insuranc|geico|allstate|progressive|state farm|liberty mutual)\b",
-        transaction.name,
-        re.IGNORECASE,
-    )
-    return bool(match)
+    return bool(INSURANCE_PATTERN.search(transaction.name))
 
 
 def get_is_utility(transaction: Transaction) -> bool:
-    match = re.search(
-        r"\b(utility|utilit|energy|water|gas|electric|comcast|xfinity|verizon fios|at&t u-verse|spectrum)\b",
-        transaction.name,
-        re.IGNORECASE,
-    )
-    return bool(match)
+    return bool(UTILITY_PATTERN.search(transaction.name))
 
 
 def get_is_phone(transaction: Transaction) -> bool:
-    match = re.search(
-        r"\b(at&t|t-mobile|verizon|sprint|boost|cricket|metro pcs|straight talk)\b", transaction.name, re.IGNORECASE
-    )
-    return bool(match)
+    return bool(PHONE_PATTERN.search(transaction.name))
 
 
 def get_n_transactions_days_apart(
     transaction: Transaction, all_transactions: list[Transaction], n_days_apart: int, n_days_off: int
 ) -> int:
-    n_txs = 0
-    transaction_date = parse_date(transaction.date)
     user_transactions = [t for t in all_transactions if t.user_id == transaction.user_id]
     effective_days_off = max(n_days_off, 1) if n_days_off == 0 else n_days_off
-    for t in user_transactions:
-        t_date = parse_date(t.date)
-        days_diff = abs((t_date - transaction_date).days)
-        if n_days_apart - effective_days_off <= days_diff <= n_days_apart + effective_days_off:
-            n_txs += 1
-    return n_txs
+    return count_days_apart(transaction.date, user_transactions, n_days_apart, effective_days_off)
 
 
 def get_n_transactions_same_amount(transaction: Transaction, all_transactions: list[Transaction]) -> int:
@@ -113,24 +111,11 @@ def get_percent_transactions_same_amount(transaction: Transaction, all_transacti
 
 
 def get_has_recurring_keyword(transaction: Transaction) -> int:
-    recurring_keywords = (
-        r"\b(sub|membership|renewal|monthly|annual|premium|bill|plan|fee|auto|pay|service|"
-        r"recurring|subscription|auto-renew|recurr|autopay|rec|month|year|quarterly|weekly|due)\b"
-    )
-    return int(bool(re.search(recurring_keywords, transaction.name, re.IGNORECASE)))
+    return int(bool(RECURRING_KEYWORD_PATTERN.search(transaction.name)))
 
 
 def get_is_convenience_store(transaction: Transaction) -> int:
-    return int(
-        bool(
-            re.search(
-                r"\b(7-eleven|cvs|walgreens|rite aid|circle k|quiktrip|speedway|ampm|"
-                r"7 eleven|seven eleven|sheetz)\b",
-                transaction.name,
-                re.IGNORECASE,
-            )
-        )
-    )
+    return int(bool(CONVENIENCE_STORE_PATTERN.search(transaction.name)))
 
 
 def get_pct_transactions_days_apart(
@@ -1,11 +1,12 @@
-from datetime import datetime
-from statistics import mean, stdev
+from functools import lru_cache
+from statistics import mean
 
 from fuzzywuzzy import process
 
 from recur_scan.transactions import Transaction
+from recur_scan.utils import get_stdev, parse_datetime
 
-RECURRING_VENDORS = {
+RECURRING_VENDORS = frozenset({
     # Streaming & Entertainment
     "netflix",
     "spotify",
@@ -85,7 +86,7 @@ RECURRING_VENDORS = {
     "the economist",
     "linkedin premium",
     "audible",
-}
+})
 
 
 def count_transactions_by_amount(transaction: Transaction, transactions: list[Transaction]) -> tuple[int, float]:
@@ -116,7 +117,7 @@ def get_recurrence_patterns(transaction: Transaction, transactions: list[Transac
             ]
         }
 
-    dates = sorted(datetime.strptime(t.date, "%Y-%m-%d") for t in merchant_txns)
+    dates = sorted(parse_datetime(t.date) for t in merchant_txns)
     date_diffs = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
 
     avg_days_between = mean(date_diffs)
@@ -150,14 +151,15 @@ def get_recurring_consistency_score(transaction: Transaction, transactions: list
     if len(merchant_txns) < 2:
         return {"recurring_consistency_score_emmanuel2": 0.0}  # Not enough data to determine recurrence
 
-    dates = sorted(datetime.strptime(t.date, "%Y-%m-%d") for t in merchant_txns)
+    dates = sorted(parse_datetime(t.date) for t in merchant_txns)
     date_diffs = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
 
     avg_days_between = mean(date_diffs)
-    std_days_between = stdev(date_diffs) if len(date_diffs) > 1 else 0.0
+    std_days_between = get_stdev(date_diffs) if len(date_diffs) > 1 else 0.0
 
     amount_variations = [t.amount for t in merchant_txns]
-    amount_stability = 1 - (stdev(amount_variations) / (mean(amount_variations) + 1e-6))  # Normalize stability score
+    # Normalize stability score
+    amount_stability = 1 - (get_stdev(amount_variations) / (mean(amount_variations) + 1e-6))
 
     # Frequency-based confidence (e.g., monthly = strong, yearly = weaker)
     recurrence_flags = {
@@ -189,8 +191,12 @@ def get_recurring_consistency_score(transaction: Transaction, transactions: list
 
 def validate_recurring_transaction(transaction: Transaction, threshold: int = 80) -> bool:
     """Determines if a transaction should be classified as recurring based on vendor trends."""
-    vendor_name = transaction.name.lower()
+    return _is_recurring_vendor(transaction.name.lower(), threshold)
+
 
+@lru_cache(maxsize=4096)
+def _is_recurring_vendor(vendor_name: str, threshold: int) -> bool:
+    """Fuzzy match a vendor name against RECURRING_VENDORS, once per vendor name."""
     # Fuzzy Matching for Vendor Detection
     match_result: tuple[str, int] | None = process.extractOne(vendor_name, RECURRING_VENDORS)
 
@@ -280,9 +286,7 @@ def get_refund_features(transaction: Transaction, transactions: list[Transaction
             "avg_refund_time_lag_emmanuel2": 0.0,
         }
 
-    refund_time_lags = [
-        (datetime.strptime(t.date, "%Y-%m-%d") - datetime.strptime(transaction.date, "%Y-%m-%d")).days for t in refunds
-    ]
+    refund_time_lags = [(parse_datetime(t.date) - parse_datetime(transaction.date)).days for t in refunds]
 
     return {
         # "refund_rate_emmanuel2": len(refunds) / len(transactions),
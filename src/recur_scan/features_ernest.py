@@ -4,7 +4,7 @@ from typing import Any
 import numpy as np
 
 from recur_scan.transactions import Transaction
-from recur_scan.utils import get_day, parse_date
+from recur_scan.utils import get_day, get_same_name_transactions, parse_date
 
 
 def get_is_weekly(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
@@ -34,7 +34,7 @@ def get_is_biweekly(transaction: Transaction, all_transactions: list[Transaction
 
 def get_vendor_transaction_count(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Get the total number of transactions for the vendor."""
-    return len([t for t in all_transactions if t.name == transaction.name])
+    return len(get_same_name_transactions(transaction, all_transactions))
 
 
 def get_vendor_amount_variance(transaction: Transaction, all_transactions: list[Transaction]) -> float:
@@ -2,21 +2,30 @@ import math
 import re
 import statistics
 from datetime import datetime
+from functools import lru_cache
 from statistics import mean
 
 import numpy as np
 
 from recur_scan.transactions import Transaction
+from recur_scan.utils import get_same_name_transactions, parse_date, parse_datetime, to_columns
 
 # Helper function to get the number of days since the epoch
 
 
+@lru_cache(maxsize=1024)
 def _get_days(date: str) -> int:
     """Get the number of days since the epoch of the transaction date."""
     # Assuming date is in the format YYYY-MM-DD
     # use the datetime module for the accurate determination
     # of the number of days since the epoch
-    return (datetime.strptime(date, "%Y-%m-%d") - datetime(1970, 1, 1)).days
+    return (parse_datetime(date) - datetime(1970, 1, 1)).days
+
+
+def _get_day_array(transactions: list[Transaction]) -> np.ndarray:
+    """Get the ordinal day of each transaction's date, in the order of the transactions."""
+    # ordinals and days since the epoch differ by a constant, so the intervals between them are the same
+    return to_columns(transactions)["ordinal"]
 
 
 # Other feature functions
@@ -48,13 +57,8 @@ def get_transaction_rate(transaction: Transaction, all_transactions: list[Transa
     ]  # Filter transactions by vendor name
     if len(vendor_transactions) < 2:
         return 0.0  # Return 0 if there are less than 2 transactions
-    intervals = [
-        (
-            datetime.strptime(vendor_transactions[i + 1].date, "%Y-%m-%d")
-            - datetime.strptime(vendor_transactions[i].date, "%Y-%m-%d")
-        ).days
-        for i in range(len(vendor_transactions) - 1)  # Calculate intervals between consecutive transactions
-    ]
+    # Calculate intervals between consecutive transactions
+    intervals: list[int] = np.diff(_get_day_array(vendor_transactions)).tolist()
     if not intervals or sum(intervals) == 0:
         return 0.0  # Return 0 if there are no intervals or the sum is 0
     return 1 / (sum(intervals) / len(intervals))  # Return the frequency
@@ -144,7 +148,7 @@ def get_is_utility(transaction: Transaction) -> bool:
 def get_year(transaction: Transaction) -> int:
     """Get the year for the transaction date."""
     try:
-        return datetime.strptime(transaction.date, "%Y-%m-%d").year
+        return parse_date(transaction.date).year
     except ValueError:
         return -1
 
@@ -152,7 +156,7 @@ def get_year(transaction: Transaction) -> int:
 def get_month(transaction: Transaction) -> int:
     """Get the month for the transaction date."""
     try:
-        return datetime.strptime(transaction.date, "%Y-%m-%d").month
+        return parse_date(transaction.date).month
     except ValueError:
         return -1
 
@@ -160,7 +164,7 @@ def get_month(transaction: Transaction) -> int:
 def get_day(transaction: Transaction) -> int:
     """Get the day for the transaction date."""
     try:
-        return datetime.strptime(transaction.date, "%Y-%m-%d").day
+        return parse_date(transaction.date).day
     except ValueError:
         return -1
 
@@ -200,8 +204,7 @@ def get_transaction_intervals(transactions: list[Transaction]) -> dict[str, floa
         }
     # Sort transactions by date
     dates = sorted([
-        datetime.strptime(trans.date, "%Y-%m-%d") if isinstance(trans.date, str) else trans.date
-        for trans in transactions
+        parse_datetime(trans.date) if isinstance(trans.date, str) else trans.date for trans in transactions
     ])
 
     # calculate days between each consecutive grouped transactions
@@ -248,24 +251,15 @@ def get_transactions_interval_stability(transaction: Transaction, transactions:
     if len(vendor_transactions) < 2:
         return 0.0  # No intervals to calculate
 
-    # Sort transactions by date (convert date strings to datetime objects)
-    vendor_transactions.sort(key=lambda t: datetime.strptime(t.date, "%Y-%m-%d"))
-
-    # Calculate intervals in days
-    intervals = [
-        (
-            datetime.strptime(vendor_transactions[i + 1].date, "%Y-%m-%d")
-            - datetime.strptime(vendor_transactions[i].date, "%Y-%m-%d")
-        ).days
-        for i in range(len(vendor_transactions) - 1)
-    ]
+    # Calculate intervals in days between the sorted dates
+    intervals: list[int] = np.diff(np.sort(_get_day_array(vendor_transactions))).tolist()
     # Return the average interval
     return sum(intervals) / len(intervals)
 
 
 def get_n_transactions_same_vendor(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Get the number of transactions in all_transactions with the same vendor as transaction."""
-    return sum(1 for t in all_transactions if t.name == transaction.name)
+    return len(get_same_name_transactions(transaction, all_transactions))
 
 
 # New features to be added
@@ -278,7 +272,7 @@ def get_is_amazon_prime(transaction: Transaction) -> bool:
 
 def get_vendor_transaction_frequency(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Get the frequency band of transactions for this vendor (0=rare, 1=occasional, 2=frequent)."""
-    count = sum(1 for t in all_transactions if t.name == transaction.name)
+    count = len(get_same_name_transactions(transaction, all_transactions))
     if count > 3:  # 4+ transactions = frequent
         return 2
     elif count > 1:  # 2-3 transactions = occasional
@@ -308,8 +302,8 @@ def get_vendor_transaction_recurring(transaction: Transaction, all_transactions:
         return 0  # Can't detect a pattern with fewer than 3 transactions
 
     # Sort by date
-    relevant = sorted(relevant, key=lambda t: datetime.strptime(t.date, "%Y-%m-%d"))
-    dates = [datetime.strptime(t.date, "%Y-%m-%d") for t in relevant]
+    relevant = sorted(relevant, key=lambda t: parse_datetime(t.date))
+    dates = [parse_datetime(t.date) for t in relevant]
 
     # Find if dates occur approximately monthly (30 days ± 2 days)
     for i in range(len(dates) - 2):
@@ -318,7 +312,7 @@ def get_vendor_transaction_recurring(transaction: Transaction, all_transactions:
         interval2 = (d3 - d2).days
 
         if 28 <= interval1 <= 32 and 28 <= interval2 <= 32:
-            check_date = datetime.strptime(transaction.date, "%Y-%m-%d")
+            check_date = parse_datetime(transaction.date)
             if check_date in [d1, d2, d3]:
                 return 1
 
@@ -344,14 +338,7 @@ def get_likelihood_of_recurrence(transaction: Transaction, all_transactions: lis
     if len(vendor_transactions) < n:
         return 0.0
 
-    vendor_transactions.sort(key=lambda t: datetime.strptime(t.date, "%Y-%m-%d"))
-    intervals = [
-        (
-            datetime.strptime(vendor_transactions[i + 1].date, "%Y-%m-%d")
-            - datetime.strptime(vendor_transactions[i].date, "%Y-%m-%d")
-        ).days
-        for i in range(len(vendor_transactions) - 1)
-    ]
+    intervals: list[int] = np.diff(np.sort(_get_day_array(vendor_transactions))).tolist()
 
     if len(intervals) < n - 1:
         return 0.0
@@ -376,7 +363,7 @@ def get_transaction_recency(transaction: Transaction, all_transactions: list[Tra
     vendor_transactions = [
         t for t in all_transactions if t.name == transaction.name and t.user_id == transaction.user_id
     ]
-    vendor_transactions.sort(key=lambda t: datetime.strptime(t.date, "%Y-%m-%d"))
+    vendor_transactions.sort(key=lambda t: _get_days(t.date))
 
     # Find the index of our transaction
     try:
@@ -389,15 +376,13 @@ def get_transaction_recency(transaction: Transaction, all_transactions: list[Tra
         return -1
 
     # Calculate days between this transaction and the previous one
-    prev_date = datetime.strptime(vendor_transactions[idx - 1].date, "%Y-%m-%d")
-    current_date = datetime.strptime(transaction.date, "%Y-%m-%d")
-    delta = (current_date - prev_date).days
+    delta = _get_days(transaction.date) - _get_days(vendor_transactions[idx - 1].date)
 
     return delta
 
     # Calculate days between this transaction and the previous one
-    prev_date = datetime.strptime(vendor_transactions[idx - 1].date, "%Y-%m-%d").date()
-    current_date = datetime.strptime(transaction.date, "%Y-%m-%d").date()
+    prev_date = parse_date(vendor_transactions[idx - 1].date)
+    current_date = parse_date(transaction.date)
     delta = (current_date - prev_date).days
 
     return delta
@@ -4,12 +4,65 @@ from collections import Counter, defaultdict
 from collections.abc import Sequence
 from datetime import date, timedelta
 from difflib import SequenceMatcher
+from functools import lru_cache
+from operator import attrgetter
 from statistics import StatisticsError, mean, median, stdev
 
 import numpy as np
 
 from recur_scan.transactions import Transaction
-from recur_scan.utils import parse_date
+from recur_scan.utils import parse_date, to_columns
+
+
+@lru_cache(maxsize=1024)
+def _get_amount_stats(amounts: tuple[float, ...]) -> tuple[float, float]:
+    """Get the median and the sample standard deviation (0.0 if it can't be computed) of the amounts."""
+    med = median(amounts)
+    try:
+        std_amt = stdev(amounts)
+    except Exception:
+        std_amt = 0.0
+    return med, std_amt
+
+
+@lru_cache(maxsize=1024)
+def _get_interval_stats(date_strs: tuple[str, ...]) -> tuple[date, float, float]:
+    """Get the last date, and the median and the sample standard deviation of the intervals between the dates."""
+    dates = sorted(parse_date(d) for d in date_strs)
+    intervals = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
+    med_interval = median(intervals)
+    std_interval = stdev(intervals) if len(intervals) > 1 else 0.0
+    return dates[-1], med_interval, std_interval
+
+
+@lru_cache(maxsize=1024)
+def _get_monthly_variation(dated_amounts: tuple[tuple[str, float], ...]) -> float:
+    """Get the coefficient of variation of the monthly average amounts, for seasonal_spending_cycle."""
+    monthly_amounts = defaultdict(list)
+    for date_str, amount in dated_amounts:
+        monthly_amounts[parse_date(date_str).month].append(amount)
+    monthly_avgs = [mean(amounts) for amounts in monthly_amounts.values() if amounts]
+    if len(monthly_avgs) < 2:
+        return 0.0
+    avg = mean(monthly_avgs)
+    variation = stdev(monthly_avgs) if len(monthly_avgs) > 1 else 0.0
+    return variation / avg if avg != 0 else 0.0
+
+
+@lru_cache(maxsize=1024)
+def _get_amount_progression(dated_amounts: tuple[tuple[str, float], ...]) -> float:
+    """Get the score of amount_progression_pattern from the dates and amounts of a vendor's transactions."""
+    amounts = [amount for _, amount in sorted(dated_amounts, key=lambda x: parse_date(x[0]))]
+
+    # Calculate percentage changes between consecutive amounts
+    changes = [(a2 - a1) / a1 if a1 != 0 else 0 for a1, a2 in itertools.pairwise(amounts)]
+
+    try:
+        # Calculate the consistency of these changes
+        change_std = stdev(changes)
+        return 1.0 / (1.0 + change_std)  # Normalize to [0,1]
+    except StatisticsError:
+        return 0.0
 
 
 def transactions_per_month(all_transactions: list[Transaction]) -> float:
@@ -77,15 +130,9 @@ def normalized_days_difference(transaction: Transaction, all_transactions: list[
     if len(all_transactions) < 2:
         return 0.0
 
-    all_transactions = sorted(all_transactions, key=lambda t: parse_date(t.date))
-    intervals = [
-        (parse_date(all_transactions[i].date) - parse_date(all_transactions[i - 1].date)).days
-        for i in range(1, len(all_transactions))
-    ]
-
-    med_interval = median(intervals)
-    std_interval = stdev(intervals) if len(intervals) > 1 else 0.0
-    days_since_last = (parse_date(transaction.date) - parse_date(all_transactions[-1].date)).days
+    # the interval statistics are the same for every transaction of the group, so they are computed once
+    last_date, med_interval, std_interval = _get_interval_stats(tuple(t.date for t in all_transactions))
+    days_since_last = (parse_date(transaction.date) - last_date).days
 
     return (days_since_last - med_interval) / std_interval if std_interval != 0 else 0.0
 
@@ -96,14 +143,10 @@ def amount_stability_score(all_transactions: list[Transaction]) -> float:
     Returns the ratio of the median transaction amount to its standard deviation for the vendor.
     A higher ratio indicates that amounts are stable.
     """
-    amounts = [t.amount for t in all_transactions]
+    amounts = tuple(t.amount for t in all_transactions)
     if len(amounts) < 2:
         return 0.0
-    med = median(amounts)
-    try:
-        std_amt = stdev(amounts)
-    except Exception:
-        std_amt = 0.0
+    med, std_amt = _get_amount_stats(amounts)
     if std_amt == 0:
         return 1.0  # Perfect stability if no variation.
     return med / std_amt
@@ -114,14 +157,10 @@ def amount_z_score(transaction: Transaction, all_transactions: list[Transaction]
     """
     Computes the Z-score of the current transaction's amount relative to the vendor's historical amounts.
     """
-    amounts = [t.amount for t in all_transactions]
+    amounts = tuple(t.amount for t in all_transactions)
     if len(amounts) < 2:
         return 0.0
-    med = median(amounts)
-    try:
-        std_amt = stdev(amounts)
-    except Exception:
-        std_amt = 0.0
+    med, std_amt = _get_amount_stats(amounts)
     if std_amt == 0:
         return 0.0
     return (transaction.amount - med) / std_amt
@@ -195,18 +234,10 @@ def seasonal_spending_cycle(transaction: Transaction, all_transactions: list[Tra
     the coefficient of variation (std/mean) of these averages.
     A lower value suggests a stable, seasonal pattern.
     """
-    vendor_transactions = [t for t in all_transactions if t.name == transaction.name]
+    vendor_transactions = tuple((t.date, t.amount) for t in all_transactions if t.name == transaction.name)
     if not vendor_transactions:
         return 0.0
-    monthly_amounts = defaultdict(list)
-    for t in vendor_transactions:
-        monthly_amounts[parse_date(t.date).month].append(t.amount)
-    monthly_avgs = [mean(amounts) for amounts in monthly_amounts.values() if amounts]
-    if len(monthly_avgs) < 2:
-        return 0.0
-    avg = mean(monthly_avgs)
-    variation = stdev(monthly_avgs) if len(monthly_avgs) > 1 else 0.0
-    return variation / avg if avg != 0 else 0.0
+    return _get_monthly_variation(vendor_transactions)
 
 
 def get_days_since_last_transaction(transaction: Transaction, all_transactions: list[Transaction]) -> int:
@@ -247,7 +278,8 @@ def get_same_amount_ratio(
     upper_bound = current_amount * (1 + tolerance)
 
     # Count transactions within the acceptable range
-    n_similar_amounts = sum(1 for t in all_transactions if lower_bound <= t.amount <= upper_bound)
+    amounts = to_columns(all_transactions)["amount"]
+    n_similar_amounts = int(np.count_nonzero((lower_bound <= amounts) & (amounts <= upper_bound)))
 
     # Calculate the ratio
     return n_similar_amounts / len(all_transactions)
@@ -688,7 +720,7 @@ def irregular_interval_score(all_transactions: list[Transaction]) -> float:
     if not all_transactions or len(all_transactions) < 2:
         return 0.0
 
-    sorted_transactions = sorted(all_transactions, key=lambda t: t.date)
+    sorted_transactions = sorted(all_transactions, key=attrgetter("date"))
     dates = [parse_date(t.date) for t in sorted_transactions]
     intervals = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
 
@@ -873,26 +905,22 @@ def detect_multi_tier_subscription(all_transactions: list[Transaction]) -> float
         return 0.0
 
     # Group amounts and count occurrences
-    amount_counts: defaultdict = defaultdict(int)
-    for t in all_transactions:
-        amount_counts[round(t.amount, 2)] += 1
+    # (with np.unique over the rounded amounts instead of a dict of counts; rounded with round, like before)
+    columns = to_columns(all_transactions)
+    rounded = np.array([round(amount, 2) for amount in columns["amount"].tolist()], dtype=np.float64)
+    _, inverse, counts = np.unique(rounded, return_inverse=True, return_counts=True)
 
     # Look for multiple recurring amounts
-    recurring_amounts = [amt for amt, count in amount_counts.items() if count >= 2]
-
-    if len(recurring_amounts) < 2:
+    if np.count_nonzero(counts >= 2) < 2:
         return 0.0
 
-    # Extract and sort transaction amounts
-    amounts = [round(t.amount, 2) for t in sorted(all_transactions, key=lambda x: parse_date(x.date))]
-
-    # Initialize pattern score
-    pattern_score = 0
+    # Extract and sort transaction amounts (by date, keeping the order of transactions on the same date)
+    order = np.argsort(columns["ordinal"], kind="stable")
+    amounts = rounded[order]
+    is_recurring_amount = (counts >= 2)[inverse][order]
 
     # Look for alternating patterns (e.g., 5.00, 10.00, 5.00)
-    for i in range(len(amounts) - 2):
-        if amounts[i] == amounts[i + 2] and amounts[i] in recurring_amounts:
-            pattern_score += 1
+    pattern_score = int(np.count_nonzero((amounts[:-2] == amounts[2:]) & is_recurring_amount[:-2]))
 
     # Return normalized pattern score (between 0 and 1)
     return min(1.0, pattern_score / (len(amounts) - 2))
@@ -1315,22 +1343,12 @@ def amount_progression_pattern(transaction: Transaction, all_transactions: list[
         return 0.0
 
     # Get transactions for the same vendor
-    vendor_txns = sorted([t for t in all_transactions if t.name == transaction.name], key=lambda x: parse_date(x.date))
+    vendor_txns = tuple((t.date, t.amount) for t in all_transactions if t.name == transaction.name)
 
     if len(vendor_txns) < 3:
         return 0.0
 
-    # Calculate percentage changes between consecutive amounts
-    changes = [
-        (t2.amount - t1.amount) / t1.amount if t1.amount != 0 else 0 for t1, t2 in itertools.pairwise(vendor_txns)
-    ]
-
-    try:
-        # Calculate the consistency of these changes
-        change_std = stdev(changes)
-        return 1.0 / (1.0 + change_std)  # Normalize to [0,1]
-    except StatisticsError:
-        return 0.0
+    return _get_amount_progression(vendor_txns)
 
 
 def vendor_reliability_score(transactions: list[Transaction]) -> float:
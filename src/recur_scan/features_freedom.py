@@ -1,5 +1,6 @@
 import datetime
 from datetime import timedelta
+from operator import attrgetter
 
 import numpy as np
 
@@ -33,7 +34,7 @@ def get_periodicity_confidence(
     transaction: Transaction, all_transactions: list[Transaction], expected_period: int = 30
 ) -> float:
     """Calculate confidence score for periodicity (0-1)"""
-    similar_trans = sorted([t for t in all_transactions if t != transaction], key=lambda x: x.date)
+    similar_trans = sorted([t for t in all_transactions if t != transaction], key=attrgetter("date"))
 
     if len(similar_trans) < 2:
         return 0.0
@@ -63,7 +64,7 @@ def get_recurrence_streak(
     transaction: Transaction, all_transactions: list[Transaction], tolerance_days: int = 3
 ) -> int:
     """Count consecutive periods with similar transactions"""
-    similar_trans = sorted([t for t in all_transactions if t != transaction], key=lambda x: x.date)
+    similar_trans = sorted([t for t in all_transactions if t != transaction], key=attrgetter("date"))
 
     if not similar_trans:
         return 0
@@ -1,19 +1,21 @@
 from difflib import SequenceMatcher
 
+import numpy as np
+
 from recur_scan.transactions import Transaction
-from recur_scan.utils import get_day, parse_date
+from recur_scan.utils import get_day, get_same_name_transactions, parse_date
 
 
 def get_n_transactions_same_description(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Get the number of transactions in all_transactions with the same description as transaction"""
-    return len([t for t in all_transactions if t.name == transaction.name])  # type: ignore
+    return len(get_same_name_transactions(transaction, all_transactions))
 
 
 def get_percent_transactions_same_description(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get the percentage of transactions in all_transactions with the same description as transaction"""
     if not all_transactions:
         return 0.0
-    n_same_description = len([t for t in all_transactions if t.name == transaction.name])  # type: ignore
+    n_same_description = len(get_same_name_transactions(transaction, all_transactions))
     return n_same_description / len(all_transactions)
 
 
@@ -34,9 +36,9 @@ def get_day_of_month_consistency(transaction: Transaction, all_transactions: lis
     if len(same_transactions) < 2:
         return 0.0  # Not enough data to calculate consistency
 
-    days = [get_day(t.date) for t in same_transactions]
-    most_common_day = max(set(days), key=days.count)
-    return sum(1 for day in days if day == most_common_day) / len(days)
+    # one histogram of the days instead of a list.count per distinct day
+    days = np.fromiter((get_day(t.date) for t in same_transactions), dtype=np.int32, count=len(same_transactions))
+    return int(np.bincount(days).max()) / len(same_transactions)
 
 
 def get_new_features(transaction: Transaction, all_transactions: list[Transaction]) -> dict[str, float]:
@@ -1,12 +1,19 @@
+from collections.abc import Sequence
 from datetime import date, datetime
 
 import numpy as np
-from scipy.stats import entropy
 
 from recur_scan.transactions import Transaction
 from recur_scan.utils import parse_date
 
 
+def _entropy(pk: np.ndarray) -> float:
+    """Get the Shannon entropy (in nats) of a distribution, computed like scipy.stats.entropy, without scipy."""
+    pk = pk / pk.sum()
+    nonzero = pk > 0
+    return float(-np.sum(np.where(nonzero, pk * np.log(np.where(nonzero, pk, 1.0)), 0.0)))
+
+
 def _aggregate_transactions(transactions: list[Transaction]) -> dict[str, dict[str, list[Transaction]]]:
     """Group transactions by user ID and merchant name for efficient feature computation.
 
@@ -41,47 +48,37 @@ def _calculate_intervals(dates: list[date]) -> list[int]:
     Returns:
         List[int]: List of intervals in days between consecutive dates; empty if fewer than 2 dates.
     """
-    intervals: list[int] = []
     # Need at least 2 dates to compute an interval
     if len(dates) < 2:
-        return intervals
-    # Compute days between each pair of consecutive dates
-    for i in range(1, len(dates)):
-        current_date = dates[i]
-        previous_date = dates[i - 1]
-        days_between = (current_date - previous_date).days
-        intervals.append(days_between)
+        return []
+    # Compute days between each pair of consecutive dates as the differences of their ordinals
+    ordinals = np.fromiter((d.toordinal() for d in dates), dtype=np.int32, count=len(dates))
+    intervals: list[int] = np.diff(ordinals).tolist()
     return intervals
 
 
-def _calculate_statistics(values: list[float]) -> dict[str, float]:
+def _calculate_statistics(values: Sequence[float] | np.ndarray) -> dict[str, float]:
     """Compute mean and standard deviation of a list of numbers.
 
     Args:
-        values (List[float]): List of numerical values (e.g., intervals or amounts).
+        values (Sequence[float] | np.ndarray): List or array of numerical values (e.g., intervals or amounts).
 
     Returns:
         Dict[str, float]: Dictionary with 'mean' and 'std' keys; both 0.0 if list is empty.
     """
-    stats = {}
+    values = np.asarray(values, dtype=np.float64)
     # Handle empty list case
-    if len(values) == 0:
-        stats["mean"] = 0.0
-        stats["std"] = 0.0
-        return stats
-    # Calculate mean manually
-    total = 0.0
-    for num in values:
-        total += num
-    mean_value = total / len(values)
+    if values.size == 0:
+        return {"mean": 0.0, "std": 0.0}
+    # Calculate the mean from a running total, which adds the values in order like a Python loop
+    # (np.mean sums pairwise, which can round the last bit differently)
+    mean_value = float(np.cumsum(values)[-1]) / values.size
     # Use NumPy for efficient standard deviation calculation
     try:
         std_value = float(np.std(values))
     except Exception:
         std_value = 0.0
-    stats["mean"] = mean_value
-    stats["std"] = std_value
-    return stats
+    return {"mean": mean_value, "std": std_value}
 
 
 # Individual Feature Functions
@@ -387,7 +384,9 @@ def transaction_pattern_complexity(merchant_trans: list[Transaction], interval_s
     # Component 1: Interval entropy (distribution complexity)
     bins = [min(max(1, int(i / 7)), 52) for i in intervals]
     value_counts = np.bincount(bins, minlength=53)[1:]
-    interval_entropy = float(entropy(value_counts / value_counts.sum()) / np.log(52) if value_counts.sum() > 0 else 0.0)
+    interval_entropy = float(
+        _entropy(value_counts / value_counts.sum()) / np.log(52) if value_counts.sum() > 0 else 0.0
+    )
 
     # Component 2: Interval variability (std/mean from interval_stats)
     mean_interval = interval_stats["mean"]
@@ -434,7 +433,7 @@ def date_irregularity_dominance(
 
     bins = [min(max(1, int(i / 7)), 52) for i in intervals]
     value_counts = np.bincount(bins, minlength=53)[1:]
-    entropy_score = float(entropy(value_counts / value_counts.sum()) / np.log(52) if value_counts.sum() > 0 else 0.0)
+    entropy_score = float(_entropy(value_counts / value_counts.sum()) / np.log(52) if value_counts.sum() > 0 else 0.0)
     mean = interval_stats["mean"]
     deviation = min(abs(mean - target) / target for target in [7, 30, 365])
     deviation_score = float(min(deviation * 3, 1.0))
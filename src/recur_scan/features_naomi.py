@@ -1,11 +1,13 @@
+from dataclasses import asdict
 from datetime import date, datetime
-from statistics import mean, stdev
+from statistics import mean
 from typing import TypedDict
 
-import pandas as pd
-
 from recur_scan.transactions import Transaction
-from recur_scan.utils import parse_date
+from recur_scan.utils import get_stdev, parse_date, parse_datetime
+
+ALWAYS_RECURRING_VENDORS = frozenset({"netflix", "spotify", "disney+", "hulu", "amazon prime"})
+SUBSCRIPTION_KEYWORDS = ("premium", "monthly", "plan", "subscription")
 
 
 def get_is_monthly_recurring(transaction: Transaction, transactions: list[Transaction]) -> bool:
@@ -38,7 +40,7 @@ def get_transaction_interval_consistency(transaction: Transaction, transactions:
         (parse_date(same_name_txns[i].date) - parse_date(same_name_txns[i - 1].date)).days
         for i in range(1, len(same_name_txns))
     ]
-    return 1.0 - (stdev(intervals) / mean(intervals) if intervals and mean(intervals) > 0 else 0.0)
+    return 1.0 - (get_stdev(intervals) / mean(intervals) if intervals and mean(intervals) > 0 else 0.0)
 
 
 def get_cluster_label(transaction: Transaction, transactions: list[Transaction]) -> int:
@@ -50,11 +52,9 @@ def get_cluster_label(transaction: Transaction, transactions: list[Transaction])
 def get_subscription_keyword_score(transaction: Transaction) -> float:
     """Score based on subscription-related keywords."""
     name_lower = transaction.name.lower()
-    always_recurring = {"netflix", "spotify", "disney+", "hulu", "amazon prime"}
-    keywords = {"premium", "monthly", "plan", "subscription"}
-    if name_lower in always_recurring:
+    if name_lower in ALWAYS_RECURRING_VENDORS:
         return 1.0
-    if any(kw in name_lower for kw in keywords):
+    if any(kw in name_lower for kw in SUBSCRIPTION_KEYWORDS):
         return 0.8
     return 0.0
 
@@ -93,7 +93,7 @@ def get_outlier_score(transaction: Transaction, transactions: list[Transaction])
         return 0.0
     amounts = [t.amount for t in same_name_txns]
     avg = mean(amounts)
-    std = stdev(amounts) if len(amounts) > 1 else 0.0  # Avoid stdev on single value
+    std = get_stdev(amounts) if len(amounts) > 1 else 0.0  # Avoid stdev on single value
     return abs(transaction.amount - avg) / std if std > 0 else 0.0
 
 
@@ -116,7 +116,7 @@ class TestTransaction:
 def get_date(txn: Transaction) -> date:
     if hasattr(txn, "timestamp") and txn.timestamp:
         return datetime.fromtimestamp(txn.timestamp).date()
-    return datetime.strptime(txn.date, "%Y-%m-%d").date() if isinstance(txn.date, str) else txn.date
+    return parse_date(txn.date) if isinstance(txn.date, str) else txn.date
 
 
 def days_since_last(transaction: Transaction, transactions: list[Transaction], grace_period: int = 0) -> int:
@@ -143,15 +143,12 @@ def get_amount_change_trend(transactions: list[Transaction]) -> float:
 
 def get_txns_last_30_days(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Get the number of transactions in the last 30 days."""
-    if isinstance(transaction.date, str):
-        today = datetime.strptime(transaction.date, "%Y-%m-%d").date()
-    else:
-        today = transaction.date
+    today = parse_date(transaction.date) if isinstance(transaction.date, str) else transaction.date
     count = 0
     for t in all_transactions:
         if t.name != transaction.name:
             continue
-        t_date = datetime.strptime(t.date, "%Y-%m-%d").date() if isinstance(t.date, str) else t.date
+        t_date = parse_date(t.date) if isinstance(t.date, str) else t.date
         days_diff = (today - t_date).days
         if 0 < days_diff <= 30:
             count += 1
@@ -168,13 +165,14 @@ def get_avg_amount_same_name(transaction: Transaction, transactions: list[Transa
 
 def get_empower_twice_monthly_count(transactions: list[Transaction]) -> int:
     """Count months with at least two Empower transactions."""
-    df = pd.DataFrame([t.__dict__ for t in transactions])
+    # pandas is only imported here, so importing the features doesn't pay for it (this feature isn't in get_features)
+    import pandas as pd
+
+    df = pd.DataFrame([asdict(t) for t in transactions])
     df_empower = df[df["name"].str.contains("Empower", case=False, na=False)].copy()
     if df_empower.empty:
         return 0
-    df_empower["date"] = df_empower["date"].apply(
-        lambda x: datetime.strptime(x, "%Y-%m-%d") if isinstance(x, str) else x
-    )
+    df_empower["date"] = df_empower["date"].apply(lambda x: parse_datetime(x) if isinstance(x, str) else x)
     df_empower["year"] = df_empower["date"].apply(lambda x: x.year)
     df_empower["month"] = df_empower["date"].apply(lambda x: x.month)
     monthly_counts = df_empower.groupby(["year", "month"]).size()
@@ -186,7 +184,7 @@ def get_merchant_recurrence_score(transaction: Transaction, transactions: list[T
     merchant_dates = [txn.date for txn in transactions if txn.name == transaction.name]
     if not merchant_dates:
         return 0.0
-    parsed_dates = [datetime.strptime(d, "%Y-%m-%d") if isinstance(d, str) else d for d in merchant_dates]
+    parsed_dates = [parse_datetime(d) if isinstance(d, str) else d for d in merchant_dates]
     months = {(d.year, d.month) for d in parsed_dates}
     total_months = max((max(months)[0] - min(months)[0]) * 12 + (max(months)[1] - min(months)[1]) + 1, 1)
     return float(len(months) / total_months)
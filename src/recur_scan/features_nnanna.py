@@ -1,24 +1,21 @@
 import re
-from datetime import datetime
 
 import numpy as np
 
 from recur_scan.transactions import Transaction
+from recur_scan.utils import get_same_name_amounts, parse_datetime
 
 
 def get_time_interval_between_transactions(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get the average time interval (in days) between transactions with the same amount"""
     same_amount_transactions = sorted(
         [t for t in all_transactions if t.amount == transaction.amount],  # Filter transactions with the same amount
-        key=lambda t: datetime.strptime(t.date, "%Y-%m-%d"),  # Sort by date
+        key=lambda t: parse_datetime(t.date),  # Sort by date
     )
     if len(same_amount_transactions) < 2:
         return 365.0  # Return a large number if there are less than 2 transactions
     intervals = [
-        (
-            datetime.strptime(same_amount_transactions[i + 1].date, "%Y-%m-%d")
-            - datetime.strptime(same_amount_transactions[i].date, "%Y-%m-%d")
-        ).days
+        (parse_datetime(same_amount_transactions[i + 1].date) - parse_datetime(same_amount_transactions[i].date)).days
         for i in range(len(same_amount_transactions) - 1)  # Calculate intervals between consecutive transactions
     ]
     return sum(intervals) / len(intervals)  # Return the average interval
@@ -44,10 +41,7 @@ def get_transaction_frequency(transaction: Transaction, all_transactions: list[T
     if len(vendor_transactions) < 2:
         return 0.0  # Return 0 if there are less than 2 transactions
     intervals = [
-        (
-            datetime.strptime(vendor_transactions[i + 1].date, "%Y-%m-%d")
-            - datetime.strptime(vendor_transactions[i].date, "%Y-%m-%d")
-        ).days
+        (parse_datetime(vendor_transactions[i + 1].date) - parse_datetime(vendor_transactions[i].date)).days
         for i in range(len(vendor_transactions) - 1)  # Calculate intervals between consecutive transactions
     ]
     if not intervals or sum(intervals) == 0:
@@ -57,9 +51,7 @@ def get_transaction_frequency(transaction: Transaction, all_transactions: list[T
 
 def get_dispersion_transaction_amount(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate the dispersion in transaction amounts for the same vendor"""
-    vendor_transactions = [
-        t.amount for t in all_transactions if t.name == transaction.name
-    ]  # Get amounts for the same vendor
+    vendor_transactions = get_same_name_amounts(transaction, all_transactions)  # Get amounts for the same vendor
     if len(vendor_transactions) < 2:
         return 0.0  # Return 0 if there are less than 2 transactions
     return float(np.var(vendor_transactions))  # Return the dispersion
@@ -67,21 +59,17 @@ def get_dispersion_transaction_amount(transaction: Transaction, all_transactions
 
 def get_mad_transaction_amount(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate the median absolute deviation (MAD) of transaction amounts for the same vendor"""
-    vendor_transactions = [
-        t.amount for t in all_transactions if t.name == transaction.name
-    ]  # Get amounts for the same vendor
+    vendor_transactions = get_same_name_amounts(transaction, all_transactions)  # Get amounts for the same vendor
     if len(vendor_transactions) < 2:
         return 0.0  # Return 0 if there are less than 2 transactions
     median = np.median(vendor_transactions)  # Calculate the median
-    mad = np.median([abs(amount - median) for amount in vendor_transactions])  # Calculate MAD
+    mad = np.median(np.abs(vendor_transactions - median))  # Calculate MAD
     return float(mad)  # Return the MAD
 
 
 def get_coefficient_of_variation(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate the coefficient of variation (CV) of transaction amounts for the same vendor"""
-    vendor_transactions = [
-        t.amount for t in all_transactions if t.name == transaction.name
-    ]  # Get amounts for the same vendor
+    vendor_transactions = get_same_name_amounts(transaction, all_transactions)  # Get amounts for the same vendor
     if len(vendor_transactions) < 2:
         return 0.0  # Return 0 if there are less than 2 transactions
     mean = np.mean(vendor_transactions)  # Calculate the mean
@@ -102,14 +90,11 @@ def get_transaction_interval_consistency(transaction: Transaction, transactions:
         return 0.0  # No intervals to calculate
 
     # Sort transactions by date (convert date strings to datetime objects)
-    vendor_transactions.sort(key=lambda t: datetime.strptime(t.date, "%Y-%m-%d"))
+    vendor_transactions.sort(key=lambda t: parse_datetime(t.date))
 
     # Calculate intervals in days
     intervals = [
-        (
-            datetime.strptime(vendor_transactions[i + 1].date, "%Y-%m-%d")
-            - datetime.strptime(vendor_transactions[i].date, "%Y-%m-%d")
-        ).days
+        (parse_datetime(vendor_transactions[i + 1].date) - parse_datetime(vendor_transactions[i].date)).days
         for i in range(len(vendor_transactions) - 1)
     ]
     # Return the average interval
@@ -127,10 +112,8 @@ def get_average_transaction_amount(transaction: Transaction, all_transactions: l
     Returns:
         float: The average transaction amount for the vendor.
     """
-    vendor_transactions = [
-        t.amount for t in all_transactions if t.name == transaction.name
-    ]  # Filter transactions by vendor name
-    if not vendor_transactions:
+    vendor_transactions = get_same_name_amounts(transaction, all_transactions)  # Filter transactions by vendor name
+    if not vendor_transactions.size:
         return 0.0  # Return 0 if there are no transactions for the vendor
     return float(np.mean(vendor_transactions))  # Return the average amount
 
@@ -481,10 +464,10 @@ def is_monthly_apple_storage(transaction: Transaction, all_transactions: list[Tr
     if len(vendor_transactions) < 2:
         return False
 
-    vendor_transactions.sort(key=lambda t: datetime.strptime(t.date, "%Y-%m-%d"))
+    vendor_transactions.sort(key=lambda t: parse_datetime(t.date))
     for i in range(len(vendor_transactions) - 1):
-        current_date = datetime.strptime(vendor_transactions[i].date, "%Y-%m-%d")
-        next_date = datetime.strptime(vendor_transactions[i + 1].date, "%Y-%m-%d")
+        current_date = parse_datetime(vendor_transactions[i].date)
+        next_date = parse_datetime(vendor_transactions[i + 1].date)
         if not (28 <= (next_date - current_date).days <= 31):
             return False
 
@@ -515,12 +498,9 @@ def get_cobblestone_recurrence_score(transaction: Transaction, all_transactions:
         return 0.0
 
     # Sort by date
-    recurring_transactions.sort(key=lambda t: datetime.strptime(t.date, "%Y-%m-%d"))
+    recurring_transactions.sort(key=lambda t: parse_datetime(t.date))
     intervals = [
-        (
-            datetime.strptime(recurring_transactions[i + 1].date, "%Y-%m-%d")
-            - datetime.strptime(recurring_transactions[i].date, "%Y-%m-%d")
-        ).days
+        (parse_datetime(recurring_transactions[i + 1].date) - parse_datetime(recurring_transactions[i].date)).days
         for i in range(len(recurring_transactions) - 1)
     ]
 
@@ -539,7 +519,7 @@ def is_consistent_transaction_amount(
     Check if the transaction amounts for the same vendor are consistent.
     """
     # Filter transactions for the same vendor
-    vendor_transactions = [t.amount for t in all_transactions if t.name == transaction.name]
+    vendor_transactions = get_same_name_amounts(transaction, all_transactions)
     if len(vendor_transactions) < 2:
         return True  # Not enough data to determine inconsistency
 
@@ -1,4 +1,5 @@
 import re
+from operator import attrgetter
 
 import numpy as np  # type: ignore
 
@@ -68,7 +69,7 @@ def get_recurrence_confidence(
     """Calculate a confidence score (0-1) based on weighted historical recurrences."""
     vendor_txs = sorted(
         [t for t in all_transactions if t.name.lower() == transaction.name.lower()],
-        key=lambda x: x.date,
+        key=attrgetter("date"),
     )
     if len(vendor_txs) < 2:
         return 0.0
@@ -268,7 +269,7 @@ def detect_financial_service_fees(
 #         return False
 
 #     # Sort by date
-#     vendor_txs.sort(key=lambda x: x.date)
+#     vendor_txs.sort(key=attrgetter("date"))
 
 #     # Check if there's a pattern in transaction dates
 #     dates = [parse_date(t.date) for t in vendor_txs]
@@ -394,7 +395,7 @@ def detect_housing_payments(
         return False
 
     # Sort by date
-    similar_txs.sort(key=lambda x: x.date)
+    similar_txs.sort(key=attrgetter("date"))
     dates = [parse_date(t.date) for t in similar_txs]
 
     # Check if transactions occur roughly monthly (15-45 days apart)
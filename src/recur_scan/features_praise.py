@@ -1,13 +1,32 @@
 import itertools
 import statistics
 from collections import Counter, defaultdict
-from datetime import datetime, timedelta
+from collections.abc import Mapping
+from datetime import timedelta
+from functools import lru_cache
 from itertools import pairwise
+from operator import attrgetter
 from statistics import mean
+from types import MappingProxyType
 
 import numpy as np
 
 from recur_scan.transactions import Transaction
+from recur_scan.utils import (
+    get_days_since_same_name_amount,
+    get_name_id,
+    get_same_name_transactions,
+    get_stdev,
+    parse_date,
+    parse_datetime,
+    to_columns,
+)
+
+
+@lru_cache(maxsize=1024)
+def _get_amount_stats(amounts: tuple[float, ...]) -> tuple[float, float]:
+    """Get the mean and the sample standard deviation of the amounts, computed once per distinct list of amounts."""
+    return statistics.mean(amounts), statistics.stdev(amounts)
 
 
 def get_average_transaction_amount(all_transactions: list[Transaction]) -> float:
@@ -39,11 +58,9 @@ def is_recurring(transaction: Transaction, all_transactions: list[Transaction])
         grouped_transactions[(t.user_id, t.name)].append(t)
     for (_user_id, name), transactions in grouped_transactions.items():
         if transaction.name == name:
-            transactions.sort(key=lambda x: datetime.strptime(x.date, "%Y-%m-%d"))
+            transactions.sort(key=lambda x: parse_datetime(x.date))
             for i in range(1, len(transactions)):
-                date_diff = datetime.strptime(transactions[i].date, "%Y-%m-%d") - datetime.strptime(
-                    transactions[i - 1].date, "%Y-%m-%d"
-                )
+                date_diff = parse_datetime(transactions[i].date) - parse_datetime(transactions[i - 1].date)
                 if (
                     transactions[i].amount == transactions[i - 1].amount
                     or transactions[i].amount == 1
@@ -81,7 +98,11 @@ def is_recurring_merchant(transaction: Transaction) -> bool:
 
 
 def get_n_transactions_same_merchant_amount(transaction: Transaction, all_transactions: list[Transaction]) -> int:
-    return sum(1 for t in all_transactions if t.name == transaction.name and t.amount == transaction.amount)
+    columns = to_columns(all_transactions)
+    is_same_amount = (columns["name_id"] == get_name_id(transaction.name, all_transactions)) & (
+        columns["amount"] == transaction.amount
+    )
+    return int(np.count_nonzero(is_same_amount))
 
 
 def get_percent_transactions_same_merchant_amount(
@@ -94,14 +115,11 @@ def get_interval_variance_coefficient(transaction: Transaction, all_transactions
     """Calculate the coefficient of variation for transaction intervals to measure consistency."""
     same_transactions = sorted(
         [t for t in all_transactions if t.name == transaction.name and t.amount == transaction.amount],
-        key=lambda x: datetime.strptime(x.date, "%Y-%m-%d"),
+        key=lambda x: parse_datetime(x.date),
     )
     if len(same_transactions) < 3:  # Need at least 3 to establish a pattern
         return 1.0  # High variance (low consistency)
-    intervals = [
-        (datetime.strptime(t2.date, "%Y-%m-%d") - datetime.strptime(t1.date, "%Y-%m-%d")).days
-        for t1, t2 in pairwise(same_transactions)
-    ]
+    intervals = [(parse_datetime(t2.date) - parse_datetime(t1.date)).days for t1, t2 in pairwise(same_transactions)]
     if len(intervals) <= 1:
         return 1.0
     try:
@@ -109,7 +127,7 @@ def get_interval_variance_coefficient(transaction: Transaction, all_transactions
         if mean_interval == 0:
             return 1.0
         # Lower value means more consistent intervals
-        return statistics.stdev(intervals) / mean_interval if mean_interval > 0 else 1.0
+        return get_stdev(intervals) / mean_interval if mean_interval > 0 else 1.0
     except statistics.StatisticsError:
         return 1.0
 
@@ -117,14 +135,11 @@ def get_interval_variance_coefficient(transaction: Transaction, all_transactions
 def get_avg_days_between_same_merchant_amount(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     same_transactions = sorted(
         (t for t in all_transactions if t.name == transaction.name and t.amount == transaction.amount),
-        key=lambda x: x.date,
+        key=attrgetter("date"),
     )
     if len(same_transactions) < 2:
         return 0.0
-    intervals = [
-        (datetime.strptime(t2.date, "%Y-%m-%d").date() - datetime.strptime(t1.date, "%Y-%m-%d").date()).days
-        for t1, t2 in pairwise(same_transactions)
-    ]
+    intervals = [(parse_date(t2.date) - parse_date(t1.date)).days for t1, t2 in pairwise(same_transactions)]
     return sum(intervals) / len(intervals) if intervals else 0.0
 
 
@@ -133,32 +148,22 @@ def get_stddev_days_between_same_merchant_amount(
 ) -> float:
     same_transactions = sorted(
         (t for t in all_transactions if t.name == transaction.name and t.amount == transaction.amount),
-        key=lambda x: x.date,
+        key=attrgetter("date"),
     )
     if len(same_transactions) < 2:
         return 0.0
-    intervals = [
-        (datetime.strptime(t2.date, "%Y-%m-%d").date() - datetime.strptime(t1.date, "%Y-%m-%d").date()).days
-        for t1, t2 in pairwise(same_transactions)
-    ]
+    intervals = [(parse_date(t2.date) - parse_date(t1.date)).days for t1, t2 in pairwise(same_transactions)]
     if len(intervals) <= 1:
         return 0.0
     try:
-        return statistics.stdev(intervals)
+        return get_stdev(intervals)
     except statistics.StatisticsError:
         return 0.0
 
 
 def get_days_since_last_same_merchant_amount(transaction: Transaction, all_transactions: list[Transaction]) -> int:
-    same_transactions = [
-        t
-        for t in all_transactions
-        if t.name == transaction.name and t.amount == transaction.amount and t.date < transaction.date
-    ]
-    if not same_transactions:
-        return 0
-    last_date = max(datetime.strptime(t.date, "%Y-%m-%d").date() for t in same_transactions)
-    return (datetime.strptime(transaction.date, "%Y-%m-%d").date() - last_date).days
+    days = get_days_since_same_name_amount(transaction, all_transactions)
+    return days if days is not None else 0
 
 
 def is_expected_transaction_date(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
@@ -169,17 +174,14 @@ def is_expected_transaction_date(transaction: Transaction, all_transactions: lis
             for t in all_transactions
             if t.name == transaction.name and t.amount == transaction.amount and t.date < transaction.date
         ],
-        key=lambda x: x.date,
+        key=attrgetter("date"),
     )
 
     if len(same_transactions) < 2:
         return False
 
     # Calculate average interval
-    intervals = [
-        (datetime.strptime(t2.date, "%Y-%m-%d").date() - datetime.strptime(t1.date, "%Y-%m-%d").date()).days
-        for t1, t2 in itertools.pairwise(same_transactions)
-    ]
+    intervals = [(parse_date(t2.date) - parse_date(t1.date)).days for t1, t2 in itertools.pairwise(same_transactions)]
 
     if not intervals:
         return False
@@ -187,8 +189,8 @@ def is_expected_transaction_date(transaction: Transaction, all_transactions: lis
     avg_interval = sum(intervals) / len(intervals)
 
     # Get the last transaction date before the current one
-    last_date = datetime.strptime(same_transactions[-1].date, "%Y-%m-%d").date()
-    current_date = datetime.strptime(transaction.date, "%Y-%m-%d").date()
+    last_date = parse_date(same_transactions[-1].date)
+    current_date = parse_date(transaction.date)
 
     # Calculate expected date
     expected_date = last_date + timedelta(days=round(avg_interval))
@@ -201,7 +203,7 @@ def has_incrementing_numbers(transaction: Transaction, all_transactions: list[Tr
     """Check if transaction descriptions contain incrementing numbers (non-recurring pattern)"""
     # Filter transactions by merchant name
     same_merchant_transactions = sorted(
-        [t for t in all_transactions if t.user_id == transaction.user_id], key=lambda x: x.date
+        [t for t in all_transactions if t.user_id == transaction.user_id], key=attrgetter("date")
     )
 
     if len(same_merchant_transactions) < 3:
@@ -250,111 +252,120 @@ def has_consistent_reference_codes(transaction: Transaction, all_transactions: l
     return False
 
 
+@lru_cache(maxsize=1024)
+def _get_merchant_series(transactions: tuple[Transaction, ...], name: str) -> tuple[np.ndarray, np.ndarray]:
+    """Get the date ordinals and amounts of the transactions with the name, in date order.
+
+    The series is selected from the group's columns once per merchant and shared by the sequential features
+    of every transaction with that name; the arrays are read-only.
+    """
+    columns = to_columns(list(transactions))
+    is_same_name = columns["name_id"] == get_name_id(name, list(transactions))
+    # a stable sort of the ordinals keeps transactions on the same date in the order of the transactions
+    order = np.argsort(columns["ordinal"][is_same_name], kind="stable")
+    ordinals: np.ndarray = columns["ordinal"][is_same_name][order]
+    amounts: np.ndarray = columns["amount"][is_same_name][order]
+    ordinals.flags.writeable = False
+    amounts.flags.writeable = False
+    return ordinals, amounts
+
+
 def calculate_markovian_probability(transaction: Transaction, all_transactions: list[Transaction], n: int = 3) -> float:
     """Calculate the probability of another transaction given the past n transactions."""
 
-    # Filter transactions by the same merchant
-    same_merchant_transactions = [t for t in all_transactions if t.name == transaction.name]
+    # The same merchant's amounts, in date order
+    _, amounts = _get_merchant_series(tuple(all_transactions), transaction.name)
 
-    if len(same_merchant_transactions) <= n:
+    if len(amounts) <= n:
         return 0.0  # Not enough data to calculate probability
 
     # Extract the last n transactions
-    same_merchant_transactions.sort(key=lambda x: datetime.strptime(x.date, "%Y-%m-%d"))
-    recent_transactions = same_merchant_transactions[-(n + 1) :]
+    recent_amounts = amounts[-(n + 1) :]
 
     # Check if the pattern of the last n transactions matches the current transaction
-    pattern_matches = all(
-        recent_transactions[i].amount == recent_transactions[i + 1].amount for i in range(len(recent_transactions) - 1)
-    )
+    pattern_matches = bool(np.all(recent_amounts[1:] == recent_amounts[:-1]))
     return 1.0 if pattern_matches else 0.0
 
 
 def calculate_streaks(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Calculate the number of consecutive transactions within expected intervals."""
-    same_merchant_transactions = sorted(
-        [t for t in all_transactions if t.name == transaction.name],
-        key=lambda x: datetime.strptime(x.date, "%Y-%m-%d"),
-    )
-    if len(same_merchant_transactions) < 2:
+    ordinals, _ = _get_merchant_series(tuple(all_transactions), transaction.name)
+    if len(ordinals) < 2:
         return 0  # Not enough data to calculate streaks
 
     # Calculate intervals between transactions
-    intervals = [
-        (datetime.strptime(t2.date, "%Y-%m-%d") - datetime.strptime(t1.date, "%Y-%m-%d")).days
-        for t1, t2 in pairwise(same_merchant_transactions)
-    ]
+    intervals = np.diff(ordinals)
 
-    # Count consecutive intervals within expected ranges (e.g., weekly, monthly)
-    streak = 0
-    max_streak = 0
-    for interval in intervals:
-        if 6 <= interval <= 8 or 28 <= interval <= 31:  # Weekly or monthly intervals
-            streak += 1
-            max_streak = max(max_streak, streak)
-        else:
-            streak = 0
+    # Find the longest run of consecutive intervals within expected ranges (e.g., weekly, monthly):
+    # the runs start and end where the padded in-range flags change
+    in_range = ((intervals >= 6) & (intervals <= 8)) | ((intervals >= 28) & (intervals <= 31))
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], in_range.astype(np.int8), [0]))))
+    runs = edges[1::2] - edges[::2]
+    return int(runs.max()) if runs.size else 0
 
-    return max_streak
+
+@lru_cache(maxsize=1024)
+def _get_prior_same_amount_ordinals(
+    transactions: tuple[Transaction, ...], name: str, amount: float, date: str
+) -> np.ndarray:
+    """Get the sorted date ordinals of the transactions with the name and amount before the date.
+
+    The EWMA, Hurst and Fourier features all look at the same earlier series, so it is selected from the
+    group's columns once per transaction and shared; the array is read-only.
+    """
+    columns = to_columns(list(transactions))
+    is_prior = (
+        (columns["name_id"] == get_name_id(name, list(transactions)))
+        & (columns["amount"] == amount)
+        & (columns["ordinal"] < parse_date(date).toordinal())
+    )
+    ordinals: np.ndarray = np.sort(columns["ordinal"][is_prior])
+    ordinals.flags.writeable = False
+    return ordinals
 
 
 def get_ewma_interval_deviation(
     transaction: Transaction, all_transactions: list[Transaction], alpha: float = 0.3
 ) -> float:
     """Calculate deviation of the most recent interval from the EWMA of past intervals."""
-    same_transactions = sorted(
-        [
-            t
-            for t in all_transactions
-            if t.name == transaction.name and t.amount == transaction.amount and t.date < transaction.date
-        ],
-        key=lambda x: x.date,
+    ordinals = _get_prior_same_amount_ordinals(
+        tuple(all_transactions), transaction.name, transaction.amount, transaction.date
     )
-    if len(same_transactions) < 3:
+    if len(ordinals) < 3:
         return 1.0
 
-    intervals = [
-        (datetime.strptime(t2.date, "%Y-%m-%d") - datetime.strptime(t1.date, "%Y-%m-%d")).days
-        for t1, t2 in pairwise(same_transactions)
-    ]
+    intervals: list[int] = np.diff(ordinals).tolist()
 
     ewma = float(intervals[0])
     for interval in intervals[1:]:
         ewma = alpha * interval + (1 - alpha) * ewma
 
-    last_interval = (
-        datetime.strptime(transaction.date, "%Y-%m-%d") - datetime.strptime(same_transactions[-1].date, "%Y-%m-%d")
-    ).days
+    last_interval = parse_date(transaction.date).toordinal() - int(ordinals[-1])
 
     return abs(last_interval - ewma) / ewma if ewma else 1.0
 
 
 def get_hurst_exponent(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Estimate the Hurst exponent to assess long-term memory in transaction intervals."""
-    same_transactions = sorted(
-        [
-            t
-            for t in all_transactions
-            if t.name == transaction.name and t.amount == transaction.amount and t.date < transaction.date
-        ],
-        key=lambda x: x.date,
+    ordinals = _get_prior_same_amount_ordinals(
+        tuple(all_transactions), transaction.name, transaction.amount, transaction.date
     )
-    if len(same_transactions) < 4:
+    if len(ordinals) < 4:
         return 0.5  # Default to random-walk-like
 
-    intervals: list[float] = [
-        (datetime.strptime(t2.date, "%Y-%m-%d") - datetime.strptime(t1.date, "%Y-%m-%d")).days
-        for t1, t2 in pairwise(same_transactions)
-    ]
+    intervals: list[int] = np.diff(ordinals).tolist()
 
     n = len(intervals)
     mean = sum(intervals) / n
-    cumulative_deviation: list[float] = [sum(intervals[: i + 1]) - (i + 1) * mean for i in range(n)]
+    # the running totals are accumulated in one pass instead of re-summing every prefix
+    cumulative_deviation: list[float] = [
+        total - (i + 1) * mean for i, total in enumerate(itertools.accumulate(intervals))
+    ]
     r = max(cumulative_deviation) - min(cumulative_deviation)
     if len(intervals) <= 1:
         return 0.0
     try:
-        s = statistics.stdev(intervals)
+        s = get_stdev(intervals)
     except Exception:
         return 0.0
 
@@ -367,25 +378,14 @@ def get_hurst_exponent(transaction: Transaction, all_transactions: list[Transact
 
 def get_fourier_periodicity_score(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Use FFT to detect dominant frequency component indicating periodic behavior."""
-    same_transactions = sorted(
-        [
-            t
-            for t in all_transactions
-            if t.name == transaction.name and t.amount == transaction.amount and t.date < transaction.date
-        ],
-        key=lambda x: x.date,
+    ordinals = _get_prior_same_amount_ordinals(
+        tuple(all_transactions), transaction.name, transaction.amount, transaction.date
     )
 
-    if len(same_transactions) < 6:
+    if len(ordinals) < 6:
         return 0.0
 
-    intervals = np.array(
-        [
-            (datetime.strptime(t2.date, "%Y-%m-%d") - datetime.strptime(t1.date, "%Y-%m-%d")).days
-            for t1, t2 in pairwise(same_transactions)
-        ],
-        dtype=float,
-    )
+    intervals = np.diff(ordinals).astype(float)
 
     centered = intervals - np.mean(intervals)
     fft = np.fft.fft(centered)
@@ -402,10 +402,7 @@ def is_recurring_through_past_transactions(transaction: Transaction, all_transac
         return False
 
     # Check if the transaction occurs at regular intervals (weekly, monthly, etc.)
-    intervals = [
-        (datetime.strptime(t2.date, "%Y-%m-%d") - datetime.strptime(t1.date, "%Y-%m-%d")).days
-        for t1, t2 in pairwise(same_transactions)
-    ]
+    intervals = [(parse_datetime(t2.date) - parse_datetime(t1.date)).days for t1, t2 in pairwise(same_transactions)]
 
     # Check for regular intervals (e.g., weekly or monthly)
     return any(6 <= interval <= 8 or 28 <= interval <= 31 for interval in intervals)
@@ -417,8 +414,7 @@ def get_amount_zscore(transaction: Transaction, all_transactions: list[Transacti
     if len(user_amounts) < 2:
         return 0.0
     try:
-        mean = statistics.mean(user_amounts)
-        stdev = statistics.stdev(user_amounts)
+        mean, stdev = _get_amount_stats(tuple(user_amounts))
         return (transaction.amount - mean) / stdev if stdev > 0 else 0.0
     except Exception:
         return 0.0
@@ -435,7 +431,7 @@ def get_stddev_amount_same_merchant(transaction: Transaction, all_transactions:
     if len(same) <= 1:
         return 0.0
     try:
-        return statistics.stdev(same)
+        return _get_amount_stats(tuple(same))[1]
     except Exception:
         return 0.0
 
@@ -444,7 +440,7 @@ def get_avg_days_between_same_merchant(transaction: Transaction, all_transaction
     """Average gap in days between transactions at this merchant (ignoring amount)."""
     same = sorted(
         [
-            datetime.strptime(t.date, "%Y-%m-%d").date()
+            parse_date(t.date)
             for t in all_transactions
             if t.user_id == transaction.user_id and t.name == transaction.name
         ],
@@ -457,25 +453,23 @@ def get_avg_days_between_same_merchant(transaction: Transaction, all_transaction
 
 def is_weekend_transaction(transaction: Transaction) -> bool:
     """Did this fall on a Saturday or Sunday?"""
-    dow = datetime.strptime(transaction.date, "%Y-%m-%d").weekday()
+    dow = parse_datetime(transaction.date).weekday()
     return dow >= 5
 
 
 def is_end_of_month_transaction(transaction: Transaction) -> bool:
     """Is the date the last day of its month?"""
-    d = datetime.strptime(transaction.date, "%Y-%m-%d").date()
+    d = parse_date(transaction.date)
     return (d + timedelta(days=1)).month != d.month
 
 
 def get_days_since_first_transaction(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Number of days between the user's very first transaction and this one."""
-    user_dates = [
-        datetime.strptime(t.date, "%Y-%m-%d").date() for t in all_transactions if t.user_id == transaction.user_id
-    ]
+    user_dates = [parse_date(t.date) for t in all_transactions if t.user_id == transaction.user_id]
     if not user_dates:
         return 0
     first = min(user_dates)
-    current = datetime.strptime(transaction.date, "%Y-%m-%d").date()
+    current = parse_date(transaction.date)
     return (current - first).days
 
 
@@ -485,8 +479,7 @@ def get_amount_coefficient_of_variation(transaction: Transaction, all_transactio
     if len(user_amounts) < 2:
         return 0.0
     try:
-        mean = statistics.mean(user_amounts)
-        stdev = statistics.stdev(user_amounts)
+        mean, stdev = _get_amount_stats(tuple(user_amounts))
         return (stdev / mean) if mean > 0 else 0.0
     except Exception:
         return 0.0
@@ -497,10 +490,20 @@ def get_unique_merchants_count(transaction: Transaction, all_transactions: list[
     return len({t.name for t in all_transactions if t.user_id == transaction.user_id})
 
 
+@lru_cache(maxsize=1024)
+def _get_sorted_user_amounts(transactions: tuple[Transaction, ...], user_id: str) -> np.ndarray:
+    """Get the sorted amounts of the user's transactions, once per group; the array is read-only."""
+    columns = to_columns(list(transactions))
+    user_amounts = np.sort(columns["amount"][[t.user_id == user_id for t in transactions]])
+    user_amounts.flags.writeable = False
+    return user_amounts
+
+
 def get_amount_quantile(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Position of this amount in the user's distribution (0-1)."""
-    user_amounts = sorted(t.amount for t in all_transactions if t.user_id == transaction.user_id)
-    rank = sum(1 for a in user_amounts if a <= transaction.amount)
+    user_amounts = _get_sorted_user_amounts(tuple(all_transactions), transaction.user_id)
+    # the amounts are sorted, so the number of amounts at most this one is found with a binary search
+    rank = int(np.searchsorted(user_amounts, transaction.amount, side="right"))
     return rank / len(user_amounts)
 
 
@@ -513,7 +516,7 @@ def is_consistent_weekday_pattern(transaction: Transaction, all_transactions: li
     ]
     if len(same) < 3:
         return False
-    weekdays = {datetime.strptime(t.date, "%Y-%m-%d").weekday() for t in same}
+    weekdays = {parse_datetime(t.date).weekday() for t in same}
     return len(weekdays) == 1
 
 
@@ -535,7 +538,7 @@ def get_recurrence_score_by_amount(
         return 0.0  # Not enough data to infer recurrence
 
     # Sort transactions by date
-    dates = sorted(datetime.strptime(t.date, "%Y-%m-%d").date() for t in similar_transactions)
+    dates = sorted(parse_date(t.date) for t in similar_transactions)
     gaps = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
 
     if len(gaps) <= 1:
@@ -544,7 +547,7 @@ def get_recurrence_score_by_amount(
     # Basic statistics
     try:
         mean_gap = statistics.mean(gaps)
-        std_dev = statistics.stdev(gaps) if len(gaps) > 1 else 0.0
+        std_dev = get_stdev(gaps) if len(gaps) > 1 else 0.0
     except Exception:
         return 0.0
 
@@ -579,7 +582,7 @@ def compare_recent_to_historical_average(transaction: Transaction, all_transacti
     amounts = [t.amount for t in past_transactions]
     mean = statistics.mean(amounts)
     try:
-        stdev = statistics.stdev(amounts)
+        stdev = get_stdev(amounts)
     except Exception:
         stdev = 0.0
 
@@ -600,14 +603,12 @@ def get_days_since_last_transaction(transaction: Transaction, all_transactions:
     A larger value means more “stale” activity before this one.
     """
     user_past = [
-        datetime.strptime(t.date, "%Y-%m-%d").date()
-        for t in all_transactions
-        if t.user_id == transaction.user_id and t.date < transaction.date
+        parse_date(t.date) for t in all_transactions if t.user_id == transaction.user_id and t.date < transaction.date
     ]
     if not user_past:
         return 0  # no prior history
     last = max(user_past)
-    current = datetime.strptime(transaction.date, "%Y-%m-%d").date()
+    current = parse_date(transaction.date)
     return (current - last).days
 
 
@@ -618,9 +619,7 @@ def get_normalized_recency(transaction: Transaction, all_transactions: list[Tran
     Values ≫1 indicate unusually long gaps, ≪1 unusually tight.
     """
     # collect and sort all dates for this user
-    dates = sorted(
-        datetime.strptime(t.date, "%Y-%m-%d").date() for t in all_transactions if t.user_id == transaction.user_id
-    )
+    dates = sorted(parse_date(t.date) for t in all_transactions if t.user_id == transaction.user_id)
     if len(dates) < 2:
         return 0.0
 
@@ -643,9 +642,9 @@ def get_transaction_recency_score(transaction: Transaction, all_transactions: li
         return 0.0
 
     # Convert dates and sort
-    user_transactions = sorted(user_transactions, key=lambda t: datetime.strptime(t.date, "%Y-%m-%d"))
-    dates = [datetime.strptime(t.date, "%Y-%m-%d") for t in user_transactions]
-    target_date = datetime.strptime(transaction.date, "%Y-%m-%d")
+    user_transactions = sorted(user_transactions, key=lambda t: parse_datetime(t.date))
+    dates = [parse_datetime(t.date) for t in user_transactions]
+    target_date = parse_datetime(transaction.date)
 
     earliest = dates[0]
     latest = dates[-1]
@@ -661,15 +660,12 @@ def get_n_transactions_last_30_days(
 ) -> int:
     """Count how many transactions this user made in the `window_days` before this transaction (excluding it)."""
     user_id = transaction.user_id
-    window_start = datetime.strptime(transaction.date, "%Y-%m-%d").date() - timedelta(days=window_days)
+    window_start = parse_date(transaction.date) - timedelta(days=window_days)
 
     return sum(
         1
         for t in all_transactions
-        if t.user_id == user_id
-        and window_start
-        <= datetime.strptime(t.date, "%Y-%m-%d").date()
-        < datetime.strptime(transaction.date, "%Y-%m-%d").date()
+        if t.user_id == user_id and window_start <= parse_date(t.date) < parse_date(transaction.date)
     )
 
 
@@ -699,7 +695,7 @@ def afterpay_has_3_similar_in_6_weeks(transaction: Transaction, all_transactions
         and "afterpay" in t.name.lower()
         and abs(t.amount - transaction.amount) < 0.01
     ]
-    dates = sorted(datetime.strptime(t.date, "%Y-%m-%d").date() for t in same_amount_txns)
+    dates = sorted(parse_date(t.date) for t in same_amount_txns)
     return any((dates[i + 2] - dates[i]).days <= 42 for i in range(len(dates) - 2))
 
 
@@ -716,8 +712,8 @@ def afterpay_is_first_of_series(transaction: Transaction, all_transactions: list
     ]
     if len(same_amount_txns) < 3:
         return False
-    dates = sorted(datetime.strptime(t.date, "%Y-%m-%d").date() for t in same_amount_txns)
-    if datetime.strptime(transaction.date, "%Y-%m-%d").date() != dates[0]:
+    dates = sorted(parse_date(t.date) for t in same_amount_txns)
+    if parse_date(transaction.date) != dates[0]:
         return False
     gaps = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
     return any(12 <= g <= 16 for g in gaps)
@@ -734,10 +730,8 @@ def afterpay_likely_payment(transaction: Transaction, all_transactions: list[Tra
         and "afterpay" in t.name.lower()
         and abs(t.amount - transaction.amount) < 0.01
     ]
-    dates = sorted(datetime.strptime(t.date, "%Y-%m-%d").date() for t in same_amount_txns)
-    recent_matches = [
-        d for d in dates if abs((datetime.strptime(transaction.date, "%Y-%m-%d").date() - d).days) in [14, 28]
-    ]
+    dates = sorted(parse_date(t.date) for t in same_amount_txns)
+    recent_matches = [d for d in dates if abs((parse_date(transaction.date) - d).days) in [14, 28]]
     return len(recent_matches) >= 2
 
 
@@ -813,29 +807,36 @@ def is_moneylion_common_amount(transaction: Transaction, all_transactions: list[
     return transaction.amount in [amt for amt, _ in freq]
 
 
+@lru_cache(maxsize=1024)
+def _get_moneylion_ordinals(transactions: tuple[Transaction, ...], user_id: str) -> Mapping[float, np.ndarray]:
+    """Get the sorted date ordinals of the user's MoneyLion transactions of each amount, once per group.
+
+    The mapping and its arrays are shared by every transaction of the group, so they are read-only.
+    """
+    groups: dict[float, list[int]] = defaultdict(list)
+    for t in transactions:
+        if t.user_id == user_id and "moneylion" in t.name.lower():
+            groups[t.amount].append(parse_date(t.date).toordinal())
+    ordinals: dict[float, np.ndarray] = {}
+    for amount, dates in groups.items():
+        ordinals[amount] = np.sort(np.array(dates, dtype=np.int32))
+        ordinals[amount].flags.writeable = False
+    return MappingProxyType(ordinals)
+
+
 def moneylion_days_since_last_same_amount(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """
     Returns the number of days since the last MoneyLion transaction with the same amount.
     """
-    prior = [
-        t
-        for t in all_transactions
-        if (
-            t.user_id == transaction.user_id
-            and "moneylion" in t.name.lower()
-            and t.amount == transaction.amount
-            and t.date < transaction.date
-        )
-    ]
-    if not prior:
+    ordinals = _get_moneylion_ordinals(tuple(all_transactions), transaction.user_id).get(transaction.amount)
+    if ordinals is None:
         return -1
-    last = max(t.date for t in prior)
-    try:
-        d1 = datetime.strptime(transaction.date, "%Y-%m-%d")
-        d2 = datetime.strptime(last, "%Y-%m-%d")
-        return (d1 - d2).days
-    except Exception:
+    ordinal = parse_date(transaction.date).toordinal()
+    # the last MoneyLion date before the transaction's date is found with a binary search
+    n_before = int(np.searchsorted(ordinals, ordinal, side="left"))
+    if not n_before:
         return -1
+    return ordinal - int(ordinals[n_before - 1])
 
 
 def moneylion_is_biweekly(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
@@ -849,9 +850,9 @@ def moneylion_is_biweekly(transaction: Transaction, all_transactions: list[Trans
     ]
     if len(relevant) < 2:
         return False
-    relevant_sorted = sorted(relevant, key=lambda x: x.date)
+    relevant_sorted = sorted(relevant, key=attrgetter("date"))
     try:
-        dates = [datetime.strptime(t.date, "%Y-%m-%d") for t in relevant_sorted]
+        dates = [parse_datetime(t.date) for t in relevant_sorted]
         diffs = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
         count = sum(12 <= d <= 16 for d in diffs)
         return count >= 2
@@ -871,7 +872,7 @@ def moneylion_weekday_pattern(transaction: Transaction, all_transactions: list[T
     if len(relevant) < 3:
         return False
     try:
-        weekdays = [datetime.strptime(t.date, "%Y-%m-%d").weekday() for t in relevant]
+        weekdays = [parse_datetime(t.date).weekday() for t in relevant]
         common_day, count = Counter(weekdays).most_common(1)[0]
         return count >= 3
     except Exception:
@@ -897,7 +898,7 @@ def apple_total_same_amount_past_6m(transaction: Transaction, all_transactions:
     Returns the number of times the user paid the same amount to Apple in the past 180 days.
     """
     try:
-        txn_date = datetime.strptime(transaction.date, "%Y-%m-%d")
+        txn_date = parse_datetime(transaction.date)
         prior = [
             t
             for t in all_transactions
@@ -906,7 +907,7 @@ def apple_total_same_amount_past_6m(transaction: Transaction, all_transactions:
                 and "apple" in t.name.lower()
                 and t.amount == transaction.amount
                 and t.date < transaction.date
-                and (txn_date - datetime.strptime(t.date, "%Y-%m-%d")).days <= 180
+                and (txn_date - parse_datetime(t.date)).days <= 180
             )
         ]
         return len(prior)
@@ -926,7 +927,7 @@ def apple_std_dev_amounts(transaction: Transaction, all_transactions: list[Trans
     if len(relevant) < 3:
         return -1.0
     try:
-        return round(statistics.stdev(relevant), 2)
+        return round(get_stdev(relevant), 2)
     except Exception:
         return -1.0
 
@@ -951,8 +952,8 @@ def apple_days_since_first_seen_amount(transaction: Transaction, all_transaction
         if not relevant:
             return -1
         first_seen = min(relevant)
-        d1 = datetime.strptime(transaction.date, "%Y-%m-%d")
-        d2 = datetime.strptime(first_seen, "%Y-%m-%d")
+        d1 = parse_datetime(transaction.date)
+        d2 = parse_datetime(first_seen)
         return (d1 - d2).days
     except Exception:
         return -1
@@ -962,30 +963,35 @@ def get_rolling_mean_amount(transaction: Transaction, all_transactions: list[Tra
     """Calculate rolling mean of last n amounts for this user+merchant combination."""
     same_user_merchant = sorted(
         [t for t in all_transactions if t.user_id == transaction.user_id and t.name == transaction.name],
-        key=lambda t: datetime.strptime(t.date, "%Y-%m-%d"),
+        key=lambda t: parse_datetime(t.date),
     )
     last_n = [t.amount for t in same_user_merchant if t.date <= transaction.date][-window:]
     return float(np.mean(last_n)) if last_n else 0.0
 
 
+@lru_cache(maxsize=1024)
+def _get_same_amount_intervals(transactions: tuple[Transaction, ...], name: str, amount: float) -> tuple[int, ...]:
+    """Get the days between consecutive transactions with the name and amount, in date order.
+
+    The interval features of a transaction only depend on its name and amount, so the series is built once
+    per vendor and amount and shared by every transaction of the group.
+    """
+    columns = to_columns(list(transactions))
+    is_same_amount = (columns["name_id"] == get_name_id(name, list(transactions))) & (columns["amount"] == amount)
+    ordinals = np.sort(columns["ordinal"][is_same_amount])
+    return tuple(np.diff(ordinals).tolist())
+
+
 def get_interval_variance_ratio(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate the ratio of standard deviation to mean of transaction intervals."""
-    merchant_transactions = [t for t in all_transactions if t.name == transaction.name]
-    same_amt = [t for t in merchant_transactions if t.amount == transaction.amount]
-    same_amt_sorted = sorted(same_amt, key=lambda t: t.date)
-
-    intervals = []
-    for t1, t2 in pairwise(same_amt_sorted):
-        d1 = datetime.strptime(t1.date, "%Y-%m-%d").date()
-        d2 = datetime.strptime(t2.date, "%Y-%m-%d").date()
-        intervals.append((d2 - d1).days)
+    intervals = _get_same_amount_intervals(tuple(all_transactions), transaction.name, transaction.amount)
 
     if not intervals:
         return 0.0
 
     try:
         avg_interval = statistics.mean(intervals)
-        std_interval = statistics.stdev(intervals) if len(intervals) > 1 else 0.0
+        std_interval = get_stdev(intervals) if len(intervals) > 1 else 0.0
         return std_interval / avg_interval if avg_interval else 0.0
     except Exception:
         return 0.0
@@ -993,10 +999,10 @@ def get_interval_variance_ratio(transaction: Transaction, all_transactions: list
 
 def get_day_of_month_consistency(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
     """Check if same-amount transactions consistently occur around the same day of month."""
-    merchant_transactions = [t for t in all_transactions if t.name == transaction.name]
+    merchant_transactions = get_same_name_transactions(transaction, all_transactions)
     same_amt = [t for t in merchant_transactions if t.amount == transaction.amount]
-    same_amt_sorted = sorted(same_amt, key=lambda t: t.date)
-    doms = [datetime.strptime(t.date, "%Y-%m-%d").day for t in same_amt_sorted]
+    same_amt_sorted = sorted(same_amt, key=attrgetter("date"))
+    doms = [parse_datetime(t.date).day for t in same_amt_sorted]
     if not doms:
         return False
 
@@ -1009,15 +1015,7 @@ def get_day_of_month_consistency(transaction: Transaction, all_transactions: lis
 
 def get_seasonality_score(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate seasonality score based on weekly/monthly interval patterns."""
-    merchant_transactions = [t for t in all_transactions if t.name == transaction.name]
-    same_amt = [t for t in merchant_transactions if t.amount == transaction.amount]
-    same_amt_sorted = sorted(same_amt, key=lambda t: t.date)
-
-    intervals = []
-    for t1, t2 in pairwise(same_amt_sorted):
-        d1 = datetime.strptime(t1.date, "%Y-%m-%d").date()
-        d2 = datetime.strptime(t2.date, "%Y-%m-%d").date()
-        intervals.append((d2 - d1).days)
+    intervals = _get_same_amount_intervals(tuple(all_transactions), transaction.name, transaction.amount)
 
     if not intervals:
         return 0.0
@@ -1027,14 +1025,11 @@ def get_seasonality_score(transaction: Transaction, all_transactions: list[Trans
     return max(weekly_count, monthly_count) / len(intervals)
 
 
-def get_amount_drift_slope(transaction: Transaction, all_transactions: list[Transaction]) -> float:
-    merchant_transactions = [t for t in all_transactions if t.name == transaction.name]
-    same_amt_sorted = sorted(merchant_transactions, key=lambda t: t.date)
-    if len(same_amt_sorted) <= 1:
-        return 0.0
-    dates_ord = [datetime.strptime(t.date, "%Y-%m-%d").toordinal() for t in same_amt_sorted]
-    amounts = [t.amount for t in same_amt_sorted]
-    if len(dates_ord) <= 1 or len(set(amounts)) == 1:
+@lru_cache(maxsize=1024)
+def _get_amount_drift_slope(transactions: tuple[Transaction, ...], name: str) -> float:
+    """Fit the slope of get_amount_drift_slope, once per vendor of the group."""
+    dates_ord, amounts = _get_merchant_series(transactions, name)
+    if len(dates_ord) <= 1 or len(set(amounts.tolist())) == 1:
         return 0.0
     try:
         return float(np.polyfit(dates_ord, amounts, 1)[0])
@@ -1042,38 +1037,28 @@ def get_amount_drift_slope(transaction: Transaction, all_transactions: list[Tran
         return 0.0
 
 
+def get_amount_drift_slope(transaction: Transaction, all_transactions: list[Transaction]) -> float:
+    return _get_amount_drift_slope(tuple(all_transactions), transaction.name)
+
+
 def get_burstiness_ratio(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate ratio of recent transactions (last 3 months) to previous 3 months."""
-    trans_date = datetime.strptime(transaction.date, "%Y-%m-%d").date()
+    trans_date = parse_date(transaction.date)
     three_m_ago = trans_date - timedelta(days=90)
 
-    merchant_transactions = [t for t in all_transactions if t.name == transaction.name]
+    merchant_transactions = get_same_name_transactions(transaction, all_transactions)
     same_amt = [t for t in merchant_transactions if t.amount == transaction.amount]
-    same_amt_sorted = sorted(same_amt, key=lambda t: t.date)
+    same_amt_sorted = sorted(same_amt, key=attrgetter("date"))
 
-    last_3m = sum(
-        1 for t in same_amt_sorted if three_m_ago <= datetime.strptime(t.date, "%Y-%m-%d").date() <= trans_date
-    )
-    prior_3m = sum(
-        1
-        for t in same_amt_sorted
-        if (three_m_ago - timedelta(days=90)) <= datetime.strptime(t.date, "%Y-%m-%d").date() < three_m_ago
-    )
+    last_3m = sum(1 for t in same_amt_sorted if three_m_ago <= parse_date(t.date) <= trans_date)
+    prior_3m = sum(1 for t in same_amt_sorted if (three_m_ago - timedelta(days=90)) <= parse_date(t.date) < three_m_ago)
 
     return (last_3m / prior_3m) if prior_3m else float(last_3m)
 
 
 def get_serial_autocorrelation(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate first-order autocorrelation of transaction intervals."""
-    merchant_transactions = [t for t in all_transactions if t.name == transaction.name]
-    same_amt = [t for t in merchant_transactions if t.amount == transaction.amount]
-    same_amt_sorted = sorted(same_amt, key=lambda t: t.date)
-
-    intervals = []
-    for t1, t2 in pairwise(same_amt_sorted):
-        d1 = datetime.strptime(t1.date, "%Y-%m-%d").date()
-        d2 = datetime.strptime(t2.date, "%Y-%m-%d").date()
-        intervals.append((d2 - d1).days)
+    intervals = _get_same_amount_intervals(tuple(all_transactions), transaction.name, transaction.amount)
 
     if len(intervals) <= 1:
         return 0.0
@@ -1086,29 +1071,22 @@ def get_serial_autocorrelation(transaction: Transaction, all_transactions: list[
 
 def get_weekday_concentration(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate concentration of transactions on most common weekday."""
-    merchant_transactions = [t for t in all_transactions if t.name == transaction.name]
-    same_amt = [t for t in merchant_transactions if t.amount == transaction.amount]
-    same_amt_sorted = sorted(same_amt, key=lambda t: t.date)
-
-    weekdays = [datetime.strptime(t.date, "%Y-%m-%d").weekday() for t in same_amt_sorted]
-    if not weekdays:
+    # the weekdays of the same-name, same-amount transactions are counted with a bincount of the weekday column
+    columns = to_columns(all_transactions)
+    is_same_amount = (columns["name_id"] == get_name_id(transaction.name, all_transactions)) & (
+        columns["amount"] == transaction.amount
+    )
+    weekdays: np.ndarray = columns["weekday"][is_same_amount]
+    if not weekdays.size:
         return 0.0
 
-    top_count = max(Counter(weekdays).values())
-    return top_count / len(weekdays)
+    top_count = int(np.bincount(weekdays, minlength=7).max())
+    return top_count / weekdays.size
 
 
 def get_interval_consistency_ratio(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate ratio of intervals within 10% of median interval."""
-    merchant_transactions = [t for t in all_transactions if t.name == transaction.name]
-    same_amt = [t for t in merchant_transactions if t.amount == transaction.amount]
-    same_amt_sorted = sorted(same_amt, key=lambda t: t.date)
-
-    intervals = []
-    for t1, t2 in pairwise(same_amt_sorted):
-        d1 = datetime.strptime(t1.date, "%Y-%m-%d").date()
-        d2 = datetime.strptime(t2.date, "%Y-%m-%d").date()
-        intervals.append((d2 - d1).days)
+    intervals = _get_same_amount_intervals(tuple(all_transactions), transaction.name, transaction.amount)
 
     if not intervals:
         return 0.0
@@ -1118,31 +1096,36 @@ def get_interval_consistency_ratio(transaction: Transaction, all_transactions: l
     return within / len(intervals)
 
 
+@lru_cache(maxsize=1024)
+def _get_amount_order_stats(transactions: tuple[Transaction, ...], name: str) -> tuple[float, float, float]:
+    """Get the median, MAD and IQR of the merchant's amounts, from one sort of the amounts per merchant.
+
+    All three are 0.0 if no transaction has the name.
+    """
+    columns = to_columns(list(transactions))
+    sorted_amounts = np.sort(columns["amount"][columns["name_id"] == get_name_id(name, list(transactions))])
+    if not sorted_amounts.size:
+        return 0.0, 0.0, 0.0
+    amounts = sorted_amounts.tolist()
+    med_amt = statistics.median(amounts)
+    mad = statistics.median([abs(a - med_amt) for a in amounts])
+    amt_q1, amt_q3 = np.percentile(sorted_amounts, [25, 75])
+    return float(med_amt), float(mad), float(amt_q3 - amt_q1)
+
+
 def get_median_amount(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Return median amount for this merchant's transactions."""
-    merchant_transactions = [t for t in all_transactions if t.name == transaction.name]
-    amounts = [t.amount for t in merchant_transactions]
-    return float(statistics.median(amounts)) if amounts else 0.0
+    return _get_amount_order_stats(tuple(all_transactions), transaction.name)[0]
 
 
 def get_amount_mad(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Return Median Absolute Deviation (MAD) of amounts for this merchant."""
-    merchant_transactions = [t for t in all_transactions if t.name == transaction.name]
-    amounts = [t.amount for t in merchant_transactions]
-    if not amounts:
-        return 0.0
-    med_amt = statistics.median(amounts)
-    return float(statistics.median([abs(a - med_amt) for a in amounts]))
+    return _get_amount_order_stats(tuple(all_transactions), transaction.name)[1]
 
 
 def get_amount_iqr(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Return Interquartile Range (IQR) of amounts for this merchant."""
-    merchant_transactions = [t for t in all_transactions if t.name == transaction.name]
-    amounts = [t.amount for t in merchant_transactions]
-    if not amounts:
-        return 0.0
-    amt_q1, amt_q3 = np.percentile(amounts, [25, 75])
-    return float(amt_q3 - amt_q1)
+    return _get_amount_order_stats(tuple(all_transactions), transaction.name)[2]
 
 
 def get_new_features(transaction: Transaction, all_transactions: list[Transaction]) -> dict[str, int | bool | float]:
@@ -1,13 +1,15 @@
 import collections
-import datetime
 import itertools
 import math
 import statistics
+from functools import lru_cache
+from operator import attrgetter
 from typing import Any
 
 import numpy as np
 
 from recur_scan.transactions import Transaction
+from recur_scan.utils import get_days_since_same_name_amount, get_name_id, parse_date, parse_datetime, to_columns
 
 # Allowed feature value type
 FeatureValue = float | int | bool
@@ -19,8 +21,9 @@ def amount_ends_in_00(transaction: Transaction) -> bool:
     return amount_str.endswith("00")
 
 
-def is_recurring_merchant(transaction: Transaction) -> bool:
-    """Check if the transaction's merchant is a known recurring company"""
+@lru_cache(maxsize=4096)
+def _is_recurring_merchant_name(name: str) -> bool:
+    """Check a vendor name for the recurring company keywords, once per vendor name."""
     recurring_keywords = {
         "at&t",
         "google play",
@@ -55,13 +58,22 @@ def is_recurring_merchant(transaction: Transaction) -> bool:
         "microsoft",
         "earnin",
     }
-    merchant_name = transaction.name.lower()
+    merchant_name = name.lower()
     return any(keyword in merchant_name for keyword in recurring_keywords)
 
 
+def is_recurring_merchant(transaction: Transaction) -> bool:
+    """Check if the transaction's merchant is a known recurring company"""
+    return _is_recurring_merchant_name(transaction.name)
+
+
 def get_n_transactions_same_merchant_amount(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Get the number of transactions with the same merchant and amount"""
-    return sum(1 for t in all_transactions if t.name == transaction.name and t.amount == transaction.amount)
+    columns = to_columns(all_transactions)
+    is_same_amount = (columns["name_id"] == get_name_id(transaction.name, all_transactions)) & (
+        columns["amount"] == transaction.amount
+    )
+    return int(np.count_nonzero(is_same_amount))
 
 
 def get_percent_transactions_same_merchant_amount(
@@ -77,17 +89,11 @@ def get_avg_days_between_same_merchant_amount(transaction: Transaction, all_tran
     """Calculate the average days between transactions with the same merchant and amount"""
     same_transactions = sorted(
         [t for t in all_transactions if t.name == transaction.name and t.amount == transaction.amount],
-        key=lambda x: x.date,
+        key=attrgetter("date"),
     )
     if len(same_transactions) < 2:
         return 0.0
-    intervals = [
-        (
-            datetime.datetime.strptime(t2.date, "%Y-%m-%d").date()
-            - datetime.datetime.strptime(t1.date, "%Y-%m-%d").date()
-        ).days
-        for t1, t2 in itertools.pairwise(same_transactions)
-    ]
+    intervals = [(parse_date(t2.date) - parse_date(t1.date)).days for t1, t2 in itertools.pairwise(same_transactions)]
     return sum(intervals) / len(intervals) if intervals else 0.0
 
 
@@ -97,17 +103,11 @@ def get_stddev_days_between_same_merchant_amount(
     """Calculate the standard deviation of days between transactions with the same merchant and amount"""
     same_transactions = sorted(
         [t for t in all_transactions if t.name == transaction.name and t.amount == transaction.amount],
-        key=lambda x: x.date,
+        key=attrgetter("date"),
     )
     if len(same_transactions) < 2:
         return 0.0
-    intervals = [
-        (
-            datetime.datetime.strptime(t2.date, "%Y-%m-%d").date()
-            - datetime.datetime.strptime(t1.date, "%Y-%m-%d").date()
-        ).days
-        for t1, t2 in itertools.pairwise(same_transactions)
-    ]
+    intervals = [(parse_date(t2.date) - parse_date(t1.date)).days for t1, t2 in itertools.pairwise(same_transactions)]
     if len(intervals) <= 1:
         return 0.0
     try:
@@ -118,33 +118,19 @@ def get_stddev_days_between_same_merchant_amount(
 
 def get_days_since_last_same_merchant_amount(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Get the number of days since the last transaction with the same merchant and amount"""
-    same_transactions = [
-        t
-        for t in all_transactions
-        if t.name == transaction.name and t.amount == transaction.amount and t.date < transaction.date
-    ]
-    if not same_transactions:
-        return 0
-    last_date = max(datetime.datetime.strptime(t.date, "%Y-%m-%d").date() for t in same_transactions)
-    transaction_date = datetime.datetime.strptime(transaction.date, "%Y-%m-%d").date()
-    return (transaction_date - last_date).days
+    days = get_days_since_same_name_amount(transaction, all_transactions)
+    return days if days is not None else 0
 
 
 def get_recurring_frequency(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Determine if the transaction is recurring daily, weekly, or monthly"""
     same_transactions = sorted(
         [t for t in all_transactions if t.name == transaction.name and t.amount == transaction.amount],
-        key=lambda x: x.date,
+        key=attrgetter("date"),
     )
     if len(same_transactions) < 2:
         return 0
-    intervals = [
-        (
-            datetime.datetime.strptime(t2.date, "%Y-%m-%d").date()
-            - datetime.datetime.strptime(t1.date, "%Y-%m-%d").date()
-        ).days
-        for t1, t2 in itertools.pairwise(same_transactions)
-    ]
+    intervals = [(parse_date(t2.date) - parse_date(t1.date)).days for t1, t2 in itertools.pairwise(same_transactions)]
     if not intervals:
         return 0
     avg_interval = sum(intervals) / len(intervals)
@@ -181,32 +167,29 @@ def get_additional_features(
     transaction: Transaction, all_transactions: list[Transaction]
 ) -> dict[str, float | int | bool]:
     """Extract additional temporal and merchant consistency features that are not already included."""
-    trans_date = datetime.datetime.strptime(transaction.date, "%Y-%m-%d").date()
+    trans_date = parse_date(transaction.date)
     day_of_week: int = trans_date.weekday()
     day_of_month: int = trans_date.day
     # is_weekend: bool = day_of_week >= 5
     # is_end_of_month: bool = day_of_month >= 28
     same_merchant_transactions = sorted(
-        [t for t in all_transactions if t.name == transaction.name], key=lambda x: x.date
+        [t for t in all_transactions if t.name == transaction.name], key=attrgetter("date")
     )
     if same_merchant_transactions:
-        first_date = datetime.datetime.strptime(same_merchant_transactions[0].date, "%Y-%m-%d").date()
+        first_date = parse_date(same_merchant_transactions[0].date)
         days_since_first: int = (trans_date - first_date).days
     else:
         days_since_first = 0
     intervals = []
     for t1, t2 in itertools.pairwise(same_merchant_transactions):
-        d1 = datetime.datetime.strptime(t1.date, "%Y-%m-%d").date()
-        d2 = datetime.datetime.strptime(t2.date, "%Y-%m-%d").date()
+        d1 = parse_date(t1.date)
+        d2 = parse_date(t2.date)
         intervals.append((d2 - d1).days)
     min_interval: int = min(intervals) if intervals else 0
     max_interval: int = max(intervals) if intervals else 0
     # merchant_total_count: int = sum(1 for t in all_transactions if t.name == transaction.name)
     merchant_recent_count: int = sum(
-        1
-        for t in all_transactions
-        if t.name == transaction.name
-        and (trans_date - datetime.datetime.strptime(t.date, "%Y-%m-%d").date()).days <= 30
+        1 for t in all_transactions if t.name == transaction.name and (trans_date - parse_date(t.date)).days <= 30
     )
     merchant_amounts = [t.amount for t in all_transactions if t.name == transaction.name]
     if merchant_amounts:
@@ -274,13 +257,13 @@ def get_new_features(
     # 2. Rolling mean of the last 3 amounts for this user+merchant
     same_user_merchant = sorted(
         [t for t in all_transactions if t.user_id == transaction.user_id and t.name == transaction.name],
-        key=lambda t: datetime.datetime.strptime(t.date, "%Y-%m-%d"),
+        key=lambda t: parse_datetime(t.date),
     )
     last_three = [t.amount for t in same_user_merchant if t.date <= transaction.date][-3:]
     rolling_mean = float(np.mean(last_three)) if last_three else 0.0
 
     # 3-5. Calendar features
-    dt = datetime.datetime.strptime(transaction.date, "%Y-%m-%d")
+    dt = parse_datetime(transaction.date)
     # day_of_week = dt.weekday()  # 0=Monday … 6=Sunday
     day_of_month = dt.day  # 1-31
     # month = dt.month  # 1-12
@@ -288,7 +271,7 @@ def get_new_features(
     # 6. Days since last same-merchant & same-amount transaction
     previous = [t for t in same_user_merchant if t.amount == amt and t.date < transaction.date]
     if previous:
-        last_date = max(datetime.datetime.strptime(t.date, "%Y-%m-%d").date() for t in previous)
+        last_date = max(parse_date(t.date) for t in previous)
         days_since_last = (dt.date() - last_date).days
     else:
         days_since_last = 0
@@ -304,15 +287,9 @@ def get_new_features(
 
     same_amt = sorted(
         (t for t in merchant_transactions if t.amount == amt),
-        key=lambda t: t.date,
+        key=attrgetter("date"),
     )
-    intervals = [
-        (
-            datetime.datetime.strptime(t2.date, "%Y-%m-%d").date()
-            - datetime.datetime.strptime(t1.date, "%Y-%m-%d").date()
-        ).days
-        for t1, t2 in itertools.pairwise(same_amt)
-    ]
+    intervals = [(parse_date(t2.date) - parse_date(t1.date)).days for t1, t2 in itertools.pairwise(same_amt)]
 
     if intervals:
         avg_interval = statistics.mean(intervals)
@@ -329,7 +306,7 @@ def get_new_features(
         median_interval = mad_interval = 0.0
 
     # Day-of-Month Consistency
-    doms = [datetime.datetime.strptime(t.date, "%Y-%m-%d").day for t in same_amt]
+    doms = [parse_datetime(t.date).day for t in same_amt]
     if doms:
         try:
             mode_dom = statistics.mode(doms)
@@ -349,7 +326,7 @@ def get_new_features(
 
     # Amount Drift (linear slope over time)
     if len(same_amt) > 1:
-        dates_ord = [datetime.datetime.strptime(t.date, "%Y-%m-%d").toordinal() for t in same_amt]
+        dates_ord = [parse_datetime(t.date).toordinal() for t in same_amt]
         amounts = [t.amount for t in same_amt]
         try:
             slope = np.polyfit(dates_ord, amounts, 1)[0]
@@ -396,7 +373,7 @@ def get_new_features(
     cos_doy = math.cos(2 * math.pi * doy / 365)
 
     # Weekday Concentration
-    weekdays = [datetime.datetime.strptime(t.date, "%Y-%m-%d").weekday() for t in same_amt]
+    weekdays = [parse_datetime(t.date).weekday() for t in same_amt]
     top_count = max(collections.Counter(weekdays).values(), default=0)
     weekday_concentration = top_count / len(weekdays) if weekdays else 0
 
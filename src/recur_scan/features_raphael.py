@@ -1,21 +1,21 @@
 import difflib
-from datetime import datetime
+from operator import attrgetter
 
 import numpy as np
 
 from recur_scan.transactions import Transaction
-from recur_scan.utils import parse_date
+from recur_scan.utils import count_days_apart, parse_datetime
 
 
 # ===== ORIGINAL FUNCTIONS (KEPT IN PLACE) =====
 def get_n_transactions_same_day(transaction: Transaction, all_transactions: list[Transaction], n_days_off: int) -> int:
-    transaction_date = datetime.strptime(transaction.date, "%Y-%m-%d")
+    transaction_date = parse_datetime(transaction.date)
     transaction_day = transaction_date.day
 
     count = 0
     for t in all_transactions:
         if t.name == transaction.name:  # Only consider transactions with same name
-            t_date = datetime.strptime(t.date, "%Y-%m-%d")
+            t_date = parse_datetime(t.date)
             # Check if day of month is within tolerance, accounting for month boundaries
             day_diff = abs(t_date.day - transaction_day)
             if day_diff <= n_days_off:
@@ -39,15 +39,7 @@ def get_n_transactions_days_apart(
     Get the number of transactions in all_transactions that are within n_days_off of
     being n_days_apart from transaction.
     """
-    transaction_date = parse_date(transaction.date)
-    count = 0
-
-    for t in all_transactions:
-        days_difference = abs((parse_date(t.date) - transaction_date).days)
-        if abs(days_difference - n_days_apart) <= n_days_off:
-            count += 1
-
-    return count
+    return count_days_apart(transaction.date, all_transactions, n_days_apart, n_days_off)
 
 
 def get_pct_transactions_days_apart(
@@ -87,13 +79,11 @@ def get_is_common_subscription_amount(transaction: Transaction) -> bool:
 
 def get_occurs_same_week(transaction: Transaction, transactions: list[Transaction]) -> bool:
     """Checks if the transaction occurs in the same week of the month across multiple months."""
-    transaction_date = datetime.strptime(transaction.date, "%Y-%m-%d")
+    transaction_date = parse_datetime(transaction.date)
     transaction_week = transaction_date.day // 7  # Determine which week in the month (0-4)
 
     same_week_count = sum(
-        1
-        for t in transactions
-        if t.name == transaction.name and datetime.strptime(t.date, "%Y-%m-%d").day // 7 == transaction_week
+        1 for t in transactions if t.name == transaction.name and parse_datetime(t.date).day // 7 == transaction_week
     )
 
     return same_week_count >= 2  # True if found at least twice
@@ -112,9 +102,7 @@ def get_is_similar_name(
 
 def get_is_fixed_interval(transaction: Transaction, transactions: list[Transaction], margin: int = 1) -> bool:
     """Returns True if a transaction recurs at fixed intervals (weekly, bi-weekly, monthly)."""
-    transaction_dates = sorted([
-        datetime.strptime(t.date, "%Y-%m-%d") for t in transactions if t.name == transaction.name
-    ])
+    transaction_dates = sorted([parse_datetime(t.date) for t in transactions if t.name == transaction.name])
 
     if len(transaction_dates) < 2:
         return False  # Not enough transactions to determine intervals
@@ -150,9 +138,9 @@ def get_is_weekday_consistent(transaction: Transaction, transactions: list[Trans
     if len(same_name_txns) < 2:
         return False
 
-    transaction_weekday = datetime.strptime(transaction.date, "%Y-%m-%d").weekday()
+    transaction_weekday = parse_datetime(transaction.date).weekday()
     return all(
-        datetime.strptime(t.date, "%Y-%m-%d").weekday() == transaction_weekday for t in same_name_txns[-3:]
+        parse_datetime(t.date).weekday() == transaction_weekday for t in same_name_txns[-3:]
     )  # Check last 3 occurrences
 
 
@@ -162,7 +150,7 @@ def get_is_seasonal(transaction: Transaction, transactions: list[Transaction]) -
     if len(same_name_txns) < 2:
         return False
 
-    dates = [datetime.strptime(t.date, "%Y-%m-%d") for t in same_name_txns]
+    dates = [parse_datetime(t.date) for t in same_name_txns]
     intervals = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
     return all(360 <= interval <= 370 for interval in intervals)
 
@@ -188,7 +176,7 @@ def get_amount_variation(transaction: Transaction, transactions: list[Transactio
 
 def get_has_trial_period(transaction: Transaction, transactions: list[Transaction]) -> bool:
     """Detect potential free trial periods"""
-    same_name_txns = sorted([t for t in transactions if t.name == transaction.name], key=lambda x: x.date)
+    same_name_txns = sorted([t for t in transactions if t.name == transaction.name], key=attrgetter("date"))
     return len(same_name_txns) >= 2 and same_name_txns[0].amount == 0 and all(t.amount > 0 for t in same_name_txns[1:])
 
 
@@ -206,7 +194,7 @@ def get_description_pattern(transaction: Transaction) -> int:
 
 def get_is_weekend_transaction(transaction: Transaction) -> bool:
     """Check if transaction occurs on weekend"""
-    return datetime.strptime(transaction.date, "%Y-%m-%d").weekday() >= 5
+    return parse_datetime(transaction.date).weekday() >= 5
 
 
 def get_merchant_fingerprint(transaction: Transaction, transactions: list[Transaction]) -> float:
@@ -216,7 +204,7 @@ def get_merchant_fingerprint(transaction: Transaction, transactions: list[Transa
     # Calculate stability scores (0-1)
     if len(same_merchant) > 1:
         amounts = [t.amount for t in same_merchant]
-        days = [datetime.strptime(t.date, "%Y-%m-%d").day for t in same_merchant]
+        days = [parse_datetime(t.date).day for t in same_merchant]
         # Penalize amount variation more strongly
         try:
             amount_stability = 1 - min(1, (float(np.std(amounts)) / (float(np.mean(amounts)) + 1e-6)) ** 1.5)
@@ -249,7 +237,7 @@ def get_recurrence_confidence_score(transaction: Transaction, transactions: list
         return 0.0
 
     amounts = [t.amount for t in same_merchant]
-    days = [datetime.strptime(t.date, "%Y-%m-%d").day for t in same_merchant]
+    days = [parse_datetime(t.date).day for t in same_merchant]
 
     # Stronger penalty for amount variation
     try:
@@ -304,7 +292,7 @@ def get_transaction_trust_score(transaction: Transaction, transactions: list[Tra
 
     # 3. Temporal Plausibility (25% weight)
     if len(same_merchant) >= 2:
-        dates = sorted([datetime.strptime(t.date, "%Y-%m-%d") for t in same_merchant])
+        dates = sorted([parse_datetime(t.date) for t in same_merchant])
         intervals = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
         if all(15 <= i <= 45 for i in intervals):  # Valid recurring range
             trust_signals["temporal_plausibility"] = 1.0
@@ -338,7 +326,7 @@ def get_recurring_confidence(transaction: Transaction, transactions: list[Transa
         return 0.0
 
     # 1. Interval Analysis (Allows ±7 day variance)
-    dates = sorted(datetime.strptime(t.date, "%Y-%m-%d") for t in same_merchant)
+    dates = sorted(parse_datetime(t.date) for t in same_merchant)
     intervals = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
     if not intervals:
         return 0.0
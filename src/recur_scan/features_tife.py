@@ -1,15 +1,19 @@
 import random
 from functools import lru_cache
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from datetime import date
 import numpy as np
-from numpy import ndarray
-from scipy.stats import mode
 
 from recur_scan.transactions import Transaction
-from recur_scan.utils import parse_date
+from recur_scan.utils import count_in_ranges, get_day_counts, get_same_name_transactions, parse_date, to_columns
+
+
+def _mode(values: list[int] | np.ndarray) -> int:
+    """Get the most common value, the smallest one on ties (like scipy.stats.mode, without importing scipy)."""
+    unique_values, counts = np.unique(values, return_counts=True)
+    return int(unique_values[np.argmax(counts)])
 
 
 def _precompute_dates_and_intervals(all_transactions: list[Transaction]) -> tuple[list["date"], list[int]]:
@@ -28,6 +32,28 @@ def _cached_merchant_transactions(merchant_name: str, transactions_tuple: tuple)
     return [t for t in transactions if t.name == merchant_name]
 
 
+@lru_cache(maxsize=1000)
+def _cached_merchant_intervals(
+    merchant_name: str, transactions_tuple: tuple
+) -> tuple[list["date"], list[int], float, float]:
+    """Cache the sorted dates and intervals of merchant transactions, with the mean and (population) standard
+    deviation of the intervals, which several features of every transaction of the merchant share."""
+    dates, intervals = _precompute_dates_and_intervals(_cached_merchant_transactions(merchant_name, transactions_tuple))
+    if not intervals:
+        return dates, intervals, 0.0, 0.0
+    return dates, intervals, float(np.mean(intervals)), float(np.std(intervals))
+
+
+@lru_cache(maxsize=1000)
+def _cached_merchant_amount_stats(merchant_name: str, transactions_tuple: tuple) -> tuple[int, float, float]:
+    """Cache the number of merchant transactions and the mean and (population) standard deviation of their amounts."""
+    merchant_transactions = _cached_merchant_transactions(merchant_name, transactions_tuple)
+    if not merchant_transactions:
+        return 0, 0.0, 0.0
+    amounts = np.fromiter((t.amount for t in merchant_transactions), float)
+    return len(amounts), float(np.mean(amounts)), float(np.std(amounts))
+
+
 def get_transaction_frequency(all_transactions: list[Transaction]) -> float:
     _, intervals = _precompute_dates_and_intervals(all_transactions)
     return float(np.mean(intervals)) if intervals else 0.0
@@ -67,9 +93,7 @@ def get_interval_mode(all_transactions: list[Transaction]) -> float:
     _, intervals = _precompute_dates_and_intervals(all_transactions)
     if not intervals:
         return 0.0
-    mode_result = mode(intervals, keepdims=True)
-    mode_array = cast(ndarray, mode_result.mode)
-    return float(mode_array.item(0)) if mode_array.size > 0 else 0.0
+    return float(_mode(intervals))
 
 
 def get_normalized_interval_consistency(all_transactions: list[Transaction]) -> float:
@@ -101,15 +125,16 @@ def get_amount_relative_change(transaction: Transaction, all_transactions: list[
 
 
 def get_merchant_name_frequency(transaction: Transaction, all_transactions: list[Transaction]) -> int:
-    return sum(1 for t in all_transactions if t.name == transaction.name)
+    return len(get_same_name_transactions(transaction, all_transactions))
 
 
 def get_interval_histogram(all_transactions: list[Transaction]) -> dict[str, float]:
     _, intervals = _precompute_dates_and_intervals(all_transactions)
     if not intervals:
         return {"biweekly": 0.0, "monthly": 0.0}
-    biweekly = sum(1 for i in intervals if 13 <= i <= 15) / len(intervals)
-    monthly = sum(1 for i in intervals if 28 <= i <= 31) / len(intervals)
+    n_biweekly, n_monthly = count_in_ranges(intervals, [(13, 15), (28, 31)])
+    biweekly = n_biweekly / len(intervals)
+    monthly = n_monthly / len(intervals)
     return {"biweekly": biweekly, "monthly": monthly}
 
 
@@ -130,7 +155,7 @@ def get_dominant_interval_strength(all_transactions: list[Transaction]) -> float
     if not intervals:
         return 0.0
     bins = [(6, 8), (13, 15), (28, 31)]
-    counts = [sum(1 for i in intervals if lo <= i <= hi) for lo, hi in bins]
+    counts = count_in_ranges(intervals, bins)
     max_count = max(counts) if counts else 0
     return max_count / len(intervals) if intervals else 0.0
 
@@ -199,7 +224,7 @@ def get_interval_cluster_strength(all_transactions: list[Transaction]) -> float:
     if not intervals:
         return 0.0
     bins = [(6, 8), (13, 15), (20, 24), (28, 31)]
-    counts = [sum(1 for i in intervals if lo <= i <= hi) for lo, hi in bins]
+    counts = count_in_ranges(intervals, bins)
     max_count = max(counts) if counts else 0
     return max_count / len(intervals) if intervals else 0.0
 
@@ -208,17 +233,16 @@ def get_merchant_recurrence_score(transaction: Transaction, all_transactions: li
     merchant_transactions = _cached_merchant_transactions(transaction.name, tuple(all_transactions))
     if len(merchant_transactions) < 2:
         return 0.0
-    dates, intervals = _precompute_dates_and_intervals(merchant_transactions)
+    _, intervals, mean_interval, std_interval = _cached_merchant_intervals(transaction.name, tuple(all_transactions))
     if not intervals:
         return 0.0
     # If all intervals are zero (same-day transactions), return 0.0
     if all(interval == 0 for interval in intervals):
         return 0.0
-    mean_interval = float(np.mean(intervals))
     if len(intervals) <= 1:
         return 0.0
     try:
-        std_interval = float(np.std(intervals, ddof=0))  # Explicitly use population standard deviation
+        # the standard deviation is the population standard deviation
         consistency = 1.0 - (std_interval / mean_interval if mean_interval > 0 else 0.0)
         frequency = len(merchant_transactions) / len(all_transactions)
         score = consistency * frequency
@@ -230,13 +254,10 @@ def get_merchant_recurrence_score(transaction: Transaction, all_transactions: li
 def get_day_of_month_consistency(all_transactions: list[Transaction]) -> float:
     if len(all_transactions) < 2:
         return 0.0
-    days = np.fromiter((parse_date(t.date).day for t in all_transactions), int)
-    mode_result = mode(days, keepdims=True)
-    mode_array = cast(ndarray, mode_result.mode)
-    if mode_array.size == 0:
-        return 0.0
-    mode_day = int(mode_array.item(0))
-    count = sum(1 for d in days if abs(d - mode_day) <= 2)
+    days = to_columns(all_transactions)["day"]
+    # the most common day, the smallest one on ties
+    mode_day = int(get_day_counts(all_transactions).argmax())
+    count = int(np.count_nonzero(np.abs(days - mode_day) <= 2))
     return count / len(days)
 
 
@@ -253,14 +274,11 @@ def get_transaction_interval(transaction: Transaction, all_transactions: list[Tr
     merchant_transactions = _cached_merchant_transactions(transaction.name, tuple(all_transactions))
     if len(merchant_transactions) < 3:
         return 0.0
-    dates, intervals = _precompute_dates_and_intervals(merchant_transactions)
+    dates, intervals, mean_interval, std_interval = _cached_merchant_intervals(
+        transaction.name, tuple(all_transactions)
+    )
     if not intervals:
         return 0.0
-    mean_interval = float(np.mean(intervals))
-    try:
-        std_interval = float(np.std(intervals))
-    except Exception:
-        std_interval = 0.0
     if mean_interval == 0 or std_interval == 0:
         return 0.0
     if std_interval / mean_interval > 0.5:
@@ -274,17 +292,9 @@ def get_transaction_interval(transaction: Transaction, all_transactions: list[Tr
 
 def get_amount_deviation(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Compute the z-score of the transaction amount relative to the merchant's mean amount."""
-    merchant_transactions = _cached_merchant_transactions(transaction.name, tuple(all_transactions))
-    if not merchant_transactions:
-        return 0.0
-    amounts = np.fromiter((t.amount for t in merchant_transactions), float)
-    mean_amount = float(np.mean(amounts))
-    if len(amounts) <= 1:
+    n_amounts, mean_amount, std_amount = _cached_merchant_amount_stats(transaction.name, tuple(all_transactions))
+    if n_amounts <= 1:
         return 0.0
-    try:
-        std_amount = float(np.std(amounts, ddof=0))  # Use population standard deviation
-    except Exception:
-        std_amount = 0.0
     if std_amount == 0 or np.isnan(std_amount):
         return 0.0
     return float((transaction.amount - mean_amount) / std_amount)
@@ -342,14 +352,11 @@ def get_merchant_recurrence_consistency(transaction: Transaction, all_transactio
     merchant_transactions = _cached_merchant_transactions(transaction.name, tuple(all_transactions))
     if len(merchant_transactions) < 3:
         return 0.0
-    dates, intervals = _precompute_dates_and_intervals(merchant_transactions)
+    dates, intervals, mean_interval, std_interval = _cached_merchant_intervals(
+        transaction.name, tuple(all_transactions)
+    )
     if not intervals:
         return 0.0
-    mean_interval = float(np.mean(intervals))
-    try:
-        std_interval = float(np.std(intervals))
-    except Exception:
-        std_interval = 0.0
     current_date = parse_date(transaction.date)
     prior_dates = [d for d in dates if d < current_date]
     if not prior_dates:
@@ -1,15 +1,14 @@
-from datetime import datetime
-
 import numpy as np
 
 from recur_scan.transactions import Transaction
+from recur_scan.utils import parse_datetime
 
 
 def get_avg_days_between(all_transactions: list[Transaction]) -> float:
     """Calculate average days between transactions."""
     if len(all_transactions) < 2:
         return 0.0
-    dates = sorted([datetime.strptime(t.date, "%Y-%m-%d") for t in all_transactions])
+    dates = sorted([parse_datetime(t.date) for t in all_transactions])
     intervals = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
     return float(np.mean(intervals)) if intervals else 0.0
 
@@ -18,7 +17,7 @@ def interval_variability(all_transactions: list[Transaction]) -> float:
     """Calculate sample standard deviation of transaction intervals."""
     if len(all_transactions) < 2:
         return 0.0
-    dates = sorted([datetime.strptime(t.date, "%Y-%m-%d") for t in all_transactions])
+    dates = sorted([parse_datetime(t.date) for t in all_transactions])
     intervals = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
     if len(intervals) <= 1:
         return 0.0
@@ -50,7 +49,7 @@ def amount_cluster_count(all_transactions: list[Transaction], tolerance: float =
 
 def recurring_day_of_month(all_transactions: list[Transaction]) -> float:
     """Check if transactions occur on consistent days of the month."""
-    days = [datetime.strptime(t.date, "%Y-%m-%d").day for t in all_transactions]
+    days = [parse_datetime(t.date).day for t in all_transactions]
     if not days:
         return 0.0
     most_common_day = max(set(days), key=days.count)
@@ -61,7 +60,7 @@ def near_interval_ratio(all_transactions: list[Transaction], tolerance: int = 5)
     """Calculate ratio of intervals near common periods (e.g., weekly, monthly)."""
     if len(all_transactions) < 2:
         return 0.0
-    dates = sorted([datetime.strptime(t.date, "%Y-%m-%d") for t in all_transactions])
+    dates = sorted([parse_datetime(t.date) for t in all_transactions])
     intervals = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
     if not intervals:
         return 0.0
@@ -105,7 +104,7 @@ def get_count_same_amount_monthly(all_transactions: list[Transaction], current_t
     user_id = current_transaction.user_id
     vendor = current_transaction.name.lower()
     amount = current_transaction.amount
-    current_date = datetime.strptime(current_transaction.date, "%Y-%m-%d")
+    current_date = parse_datetime(current_transaction.date)
 
     target_vendors = ["apple", "brigit", "cleo ai", "cleo"]
 
@@ -120,7 +119,7 @@ def get_count_same_amount_monthly(all_transactions: list[Transaction], current_t
             and t.amount == amount
             and t != current_transaction
         ):
-            delta = abs((datetime.strptime(t.date, "%Y-%m-%d") - current_date).days)
+            delta = abs((parse_datetime(t.date) - current_date).days)
             if 25 <= delta <= 35:
                 count += 1
     return float(count)
@@ -146,7 +145,7 @@ def get_days_since_last_same_amount(all_transactions: list[Transaction], current
     user_id = current_transaction.user_id
     vendor = current_transaction.name.lower()
     amount = current_transaction.amount
-    current_date = datetime.strptime(current_transaction.date, "%Y-%m-%d")
+    current_date = parse_datetime(current_transaction.date)
 
     target_vendors = ["apple", "brigit", "cleo ai", "cleo"]
 
@@ -160,9 +159,9 @@ def get_days_since_last_same_amount(all_transactions: list[Transaction], current
             and t.name.lower() in target_vendors
             and t.amount == amount
             and t != current_transaction
-            and datetime.strptime(t.date, "%Y-%m-%d") < current_date
+            and parse_datetime(t.date) < current_date
         ):
-            days = (current_date - datetime.strptime(t.date, "%Y-%m-%d")).days
+            days = (current_date - parse_datetime(t.date)).days
             if days < min_days:
                 min_days = days
     return float(min_days)
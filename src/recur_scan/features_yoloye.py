@@ -1,12 +1,22 @@
-from datetime import datetime
+import numpy as np
 
-from recur_scan.features_dallanq import get_n_transactions_days_apart
+from recur_scan.features_dallanq import get_n_transactions_days_apart, get_n_transactions_days_apart_counts
 from recur_scan.transactions import Transaction
+from recur_scan.utils import parse_date, to_columns
 
+# the (n_days_apart, n_days_off) of get_early_fortnightly, ..., get_early_annual
+EARLY_DAYS_APART = {
+    "fortnightly": (14, 3),
+    "monthly": (30, 5),
+    "quarterly": (90, 7),
+    "semi_annual": (180, 10),
+    "annual": (365, 15),
+}
 
-def _get_days(date: str) -> int:
-    """Convert a date string (YYYY-MM-DD) into days since epoch (Jan 1, 1970)."""
-    return (datetime.strptime(date, "%Y-%m-%d") - datetime(1970, 1, 1)).days
+
+def _get_days_diff(transaction: Transaction, all_transactions: list[Transaction]) -> np.ndarray:
+    """Get the days from transaction to each transaction in all_transactions, as one array difference."""
+    return to_columns(all_transactions)["ordinal"] - parse_date(transaction.date).toordinal()
 
 
 def get_n_transactions_delayed(
@@ -22,18 +32,10 @@ def get_n_transactions_delayed(
     Returns:
     - Number of delayed transactions that still fit the expected interval.
     """
-    n_txs = 0
-    transaction_days = _get_days(transaction.date)
-
-    for t in all_transactions:
-        t_days = _get_days(t.date)
-        days_diff = t_days - transaction_days
-
-        # Check if the transaction is within the delayed period
-        if expected_interval <= days_diff <= expected_interval + max_delay:
-            n_txs += 1
+    days_diff = _get_days_diff(transaction, all_transactions)
 
-    return n_txs
+    # Count the transactions within the delayed period
+    return int(np.count_nonzero((expected_interval <= days_diff) & (days_diff <= expected_interval + max_delay)))
 
 
 # 🚀 Predefined Intervals for Recurring Transactions
@@ -80,18 +82,10 @@ def get_n_transactions_early(
     Returns:
     - Number of early transactions that still fit the expected interval.
     """
-    n_txs = 0
-    transaction_days = _get_days(transaction.date)
-
-    for t in all_transactions:
-        t_days = _get_days(t.date)
-        days_diff = t_days - transaction_days
-
-        # Check if the transaction occurs before the expected interval
-        if expected_interval - max_early <= days_diff < expected_interval:
-            n_txs += 1
+    days_diff = _get_days_diff(transaction, all_transactions)
 
-    return n_txs
+    # Count the transactions that occur before the expected interval
+    return int(np.count_nonzero((expected_interval - max_early <= days_diff) & (days_diff < expected_interval)))
 
 
 def get_early_weekly(transaction: Transaction, all_transactions: list[Transaction]) -> int:
@@ -101,24 +95,33 @@ def get_early_weekly(transaction: Transaction, all_transactions: list[Transactio
 
 def get_early_fortnightly(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Detects early fortnightly payments (14 days - 3 days = within 11-13 days)."""
-    return get_n_transactions_days_apart(transaction, all_transactions, 14, 3)
+    return get_n_transactions_days_apart(transaction, all_transactions, *EARLY_DAYS_APART["fortnightly"])
 
 
 def get_early_monthly(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Detects early monthly payments (30 days - 5 days = within 25-29 days)."""
-    return get_n_transactions_days_apart(transaction, all_transactions, 30, 5)
+    return get_n_transactions_days_apart(transaction, all_transactions, *EARLY_DAYS_APART["monthly"])
 
 
 def get_early_quarterly(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Detects early quarterly payments (90 days - 7 days = within 83-89 days)."""
-    return get_n_transactions_days_apart(transaction, all_transactions, 90, 7)
+    return get_n_transactions_days_apart(transaction, all_transactions, *EARLY_DAYS_APART["quarterly"])
 
 
 def get_early_semi_annual(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Detects early semi-annual payments (180 days - 10 days = within 170-179 days)."""
-    return get_n_transactions_days_apart(transaction, all_transactions, 180, 10)
+    return get_n_transactions_days_apart(transaction, all_transactions, *EARLY_DAYS_APART["semi_annual"])
 
 
 def get_early_annual(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Detects early annual payments (365 days - 15 days = within 350-364 days)."""
-    return get_n_transactions_days_apart(transaction, all_transactions, 365, 15)
+    return get_n_transactions_days_apart(transaction, all_transactions, *EARLY_DAYS_APART["annual"])
+
+
+def get_early_cadence_counts(transaction: Transaction, all_transactions: list[Transaction]) -> dict[str, int]:
+    """
+    Get get_early_fortnightly, ..., get_early_annual at once, by cadence (see EARLY_DAYS_APART),
+    taking the day differences from transaction only once.
+    """
+    counts = get_n_transactions_days_apart_counts(transaction, all_transactions, list(EARLY_DAYS_APART.values()))
+    return {cadence: counts[days_apart] for cadence, days_apart in EARLY_DAYS_APART.items()}
@@ -6,7 +6,7 @@ from dataclasses import asdict, dataclass, fields
 from loguru import logger
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Transaction:
     id: int  # unique identifier
     user_id: str  # user id
@@ -1,13 +1,263 @@
+import inspect
+import statistics
+from collections.abc import Callable, Mapping, Sequence
 from datetime import date, datetime
-from functools import lru_cache
+from functools import lru_cache, wraps
+from types import MappingProxyType
+from typing import Any
 
+import numpy as np
 
-@lru_cache(maxsize=1024)
+from recur_scan.transactions import Transaction
+
+
+# dates repeat across every group and every feature, so each distinct date string is only parsed once
+# (the results are immutable, so the cached objects are shared; a few years of dates fit easily)
+@lru_cache(maxsize=1 << 16)
 def parse_date(date_str: str) -> date:
     """Parse a date string into a datetime.date object."""
-    return datetime.strptime(date_str, "%Y-%m-%d").date()
+    return parse_datetime(date_str).date()
+
+
+@lru_cache(maxsize=1 << 16)
+def parse_datetime(date_str: str, fmt: str = "%Y-%m-%d") -> datetime:
+    """Parse a date string into a datetime.datetime object, like datetime.strptime(date_str, fmt)."""
+    return datetime.strptime(date_str, fmt)
 
 
 def get_day(date: str) -> int:
     """Get the day of the month from a transaction date."""
     return int(date.split("-")[2])
+
+
+@lru_cache(maxsize=1024)
+def _get_columns(transactions: tuple[Transaction, ...]) -> Mapping[str, np.ndarray]:
+    """Build the columns of to_columns."""
+    n = len(transactions)
+    dates = [parse_date(t.date) for t in transactions]
+    columns: dict[str, np.ndarray] = {
+        "amount": np.fromiter((t.amount for t in transactions), dtype=np.float64, count=n),
+        "ordinal": np.fromiter((d.toordinal() for d in dates), dtype=np.int32, count=n),
+        "day": np.fromiter((d.day for d in dates), dtype=np.int8, count=n),
+        "month": np.fromiter((d.month for d in dates), dtype=np.int8, count=n),
+        "year": np.fromiter((d.year for d in dates), dtype=np.int16, count=n),
+        "name": np.array([t.name for t in transactions], dtype=object),
+    }
+    name_ids = _get_name_ids(transactions)
+    columns["name_id"] = np.fromiter((name_ids[t.name] for t in transactions), dtype=np.int32, count=n)
+    # day 1 of the proleptic Gregorian calendar was a Monday, so the weekdays come from the ordinals in one pass
+    columns["weekday"] = ((columns["ordinal"] - 1) % 7).astype(np.int8)
+    # the arrays are shared by every caller with the same transactions
+    for column in columns.values():
+        column.flags.writeable = False
+    return MappingProxyType(columns)
+
+
+def to_columns(transactions: list[Transaction]) -> Mapping[str, np.ndarray]:
+    """
+    Get the amounts and dates of transactions as numpy columns, in the order of the transactions.
+
+    The columns are built once per list of transactions and are read-only, so each date is only parsed once
+    however many features look at its parts:
+    "amount" holds the amounts (as float64, so vectorized features match the per-transaction arithmetic) and
+    "ordinal" holds the proleptic Gregorian ordinal of each date (as int32), so differences of ordinals are days,
+    "day", "month" and "year" hold the day of the month, the month and the year of each date (as int8, int8, int16),
+    "weekday" holds the day of the week of each date (as int8, Monday is 0, like date.weekday()),
+    "name" holds the names (as objects, so comparing the column to a name gives a boolean mask), and
+    "name_id" holds the id of each name (as int32, see get_name_id), which is much cheaper to compare than the names.
+    """
+    return _get_columns(tuple(transactions))
+
+
+@lru_cache(maxsize=1024)
+def _get_same_name_amounts(transactions: tuple[Transaction, ...], name: str) -> np.ndarray:
+    """Select the amounts of get_same_name_amounts."""
+    columns = _get_columns(transactions)
+    amounts: np.ndarray = columns["amount"][columns["name_id"] == _get_name_ids(transactions).get(name, -1)]
+    amounts.flags.writeable = False
+    return amounts
+
+
+def get_same_name_amounts(transaction: Transaction, transactions: list[Transaction]) -> np.ndarray:
+    """
+    Get the amounts of the transactions with the same name as transaction, in the order of the transactions.
+
+    The amounts are selected from the amount column once per list of transactions and name and are read-only,
+    so the features that summarize a vendor's amounts with numpy don't each filter the transactions again.
+    """
+    return _get_same_name_amounts(tuple(transactions), transaction.name)
+
+
+@lru_cache(maxsize=1024)
+def _get_name_index(transactions: tuple[Transaction, ...]) -> Mapping[str, tuple[Transaction, ...]]:
+    """Build the index of get_same_name_transactions."""
+    index: dict[str, list[Transaction]] = {}
+    for t in transactions:
+        index.setdefault(t.name, []).append(t)
+    return MappingProxyType({name: tuple(group) for name, group in index.items()})
+
+
+@lru_cache(maxsize=1024)
+def _get_name_ids(transactions: tuple[Transaction, ...]) -> Mapping[str, int]:
+    """Number the names of get_name_id."""
+    return MappingProxyType({name: i for i, name in enumerate(_get_name_index(transactions))})
+
+
+def get_name_id(name: str, transactions: list[Transaction]) -> int:
+    """
+    Get the id of a name in the "name_id" column of to_columns(transactions), or -1 if no transaction has the name.
+
+    The names are numbered once per list of transactions, in the order they first appear, so comparing the
+    name_id column to the id selects a vendor's transactions without comparing every name string to it.
+    """
+    return _get_name_ids(tuple(transactions)).get(name, -1)
+
+
+def get_same_name_transactions(transaction: Transaction, transactions: list[Transaction]) -> tuple[Transaction, ...]:
+    """
+    Get the transactions with the same name as transaction, in the order of the transactions.
+
+    The transactions are grouped by name in one pass per list of transactions, so the features of every
+    transaction in the list share the vendor groups instead of each filtering the whole list by name again.
+    """
+    return _get_name_index(tuple(transactions)).get(transaction.name, ())
+
+
+@lru_cache(maxsize=1024)
+def _get_day_counts(transactions: tuple[Transaction, ...]) -> np.ndarray:
+    """Build the histogram of get_day_counts."""
+    counts = np.bincount(_get_columns(transactions)["day"], minlength=32)
+    counts.flags.writeable = False
+    return counts
+
+
+def get_day_counts(transactions: list[Transaction]) -> np.ndarray:
+    """
+    Get the number of transactions on each day of the month, indexed by the day (1-31).
+
+    The histogram is counted once per list of transactions and is read-only, so the day-of-month features
+    can look up a day's count, the most common day or its count without counting the days again.
+    """
+    return _get_day_counts(tuple(transactions))
+
+
+@lru_cache(maxsize=1024)
+def _get_sorted_ordinals(transactions: tuple[Transaction, ...]) -> np.ndarray:
+    """Sort the date ordinals for count_days_apart."""
+    ordinals = np.sort(_get_columns(transactions)["ordinal"])
+    ordinals.flags.writeable = False
+    return ordinals
+
+
+def count_days_apart(date: str, transactions: list[Transaction], n_days_apart: int, n_days_off: int) -> int:
+    """
+    Count the transactions whose dates are n_days_apart (give or take n_days_off) before or after a date.
+
+    The dates of the transactions are sorted once per list of transactions, and the transactions in the two windows
+    around the date are counted with binary searches instead of comparing the date to every transaction's date.
+    """
+    ordinals = _get_sorted_ordinals(tuple(transactions))
+    ordinal = parse_date(date).toordinal()
+
+    def _n_within(n_days: int) -> int:
+        """The number of transactions at most n_days away from the date."""
+        if n_days < 0:
+            return 0
+        return int(
+            np.searchsorted(ordinals, ordinal + n_days, side="right")
+            - np.searchsorted(ordinals, ordinal - n_days, side="left")
+        )
+
+    return _n_within(n_days_apart + n_days_off) - _n_within(n_days_apart - n_days_off - 1)
+
+
+@lru_cache(maxsize=1024)
+def _get_same_name_amount_ordinals(transactions: tuple[Transaction, ...]) -> Mapping[tuple[str, float], np.ndarray]:
+    """Sort the date ordinals of each name and amount for get_days_since_same_name_amount."""
+    ordinals = _get_columns(transactions)["ordinal"].tolist()
+    groups: dict[tuple[str, float], list[int]] = {}
+    for t, ordinal in zip(transactions, ordinals, strict=True):
+        groups.setdefault((t.name, t.amount), []).append(ordinal)
+    sorted_groups: dict[tuple[str, float], np.ndarray] = {}
+    for key, group in groups.items():
+        sorted_groups[key] = np.sort(np.array(group, dtype=np.int32))
+        sorted_groups[key].flags.writeable = False
+    return MappingProxyType(sorted_groups)
+
+
+def get_days_since_same_name_amount(transaction: Transaction, transactions: list[Transaction]) -> int | None:
+    """
+    Get the number of days since the last transaction before transaction with the same name and amount.
+
+    Returns None if there is no earlier transaction with the same name and amount. The dates of each name and
+    amount are sorted once per list of transactions, and the last earlier date is found with a binary search.
+    """
+    ordinals = _get_same_name_amount_ordinals(tuple(transactions)).get((transaction.name, transaction.amount))
+    if ordinals is None:
+        return None
+    ordinal = parse_date(transaction.date).toordinal()
+    n_before = int(np.searchsorted(ordinals, ordinal, side="left"))
+    if not n_before:
+        return None
+    return ordinal - int(ordinals[n_before - 1])
+
+
+@lru_cache(maxsize=1 << 14)
+def _get_stdev(values: tuple[float, ...]) -> float:
+    """Compute the standard deviation of get_stdev."""
+    return statistics.stdev(values)
+
+
+def get_stdev(values: Sequence[float]) -> float:
+    """
+    Get the sample standard deviation of the values, like statistics.stdev (and raising its StatisticsError).
+
+    statistics.stdev sums the values exactly with fractions, which costs far more than the features around it,
+    and the features of a group ask for the deviation of the same amounts or intervals for every transaction,
+    so it is computed once per distinct sequence of values. The result is exact, so it doesn't depend on
+    whether the values are given as ints or floats.
+    """
+    return _get_stdev(tuple(values))
+
+
+def count_in_ranges(values: Sequence[int] | np.ndarray, ranges: Sequence[tuple[int, int]]) -> list[int]:
+    """
+    Count the values (e.g. intervals in days) in each inclusive (low, high) range of non-negative integers.
+
+    The values are counted into one histogram with np.bincount, and the count of a range is a difference of
+    the histogram's cumulative sums, instead of one scan of the values per range.
+    """
+    top = max(high for _, high in ranges) + 1
+    # bucket v + 1 counts the value v, values below 0 are counted in bucket 0 and values above top in the last bucket
+    histogram = np.bincount(np.clip(np.asarray(values, dtype=np.int64), -1, top) + 1, minlength=top + 2)
+    # below[v + 1] is the number of values below v
+    below = np.concatenate(([0], np.cumsum(histogram)))
+    return [int(below[high + 2] - below[low + 1]) for low, high in ranges]
+
+
+def group_memoize[**P, T](func: Callable[P, T]) -> Callable[P, T]:
+    """
+    Memoize a feature function of (transaction, all_transactions, *args).
+
+    The result is cached on the transaction, the contents of all_transactions and the other arguments (with their
+    defaults filled in), so a feature that several others call with the same group is only computed once.
+    Only use it for functions that return immutable values and don't modify all_transactions.
+    Call cache_clear() on the wrapped function to release the cache.
+    """
+    signature = inspect.signature(func)
+    call: Callable[..., T] = func
+
+    @lru_cache(maxsize=1024)
+    def _cached(transaction: Transaction, group: tuple[Transaction, ...], params: tuple[Any, ...]) -> T:
+        return call(transaction, list(group), *params)
+
+    @wraps(func)
+    def _wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        # bind the arguments, so calls that spell out the defaults share the cache with calls that don't
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        transaction, all_transactions, *params = bound.args
+        return _cached(transaction, tuple(all_transactions), tuple(params))
+
+    _wrapper.cache_clear = _cached.cache_clear  # type: ignore[attr-defined]
+    return _wrapper
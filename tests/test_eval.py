@@ -0,0 +1,31 @@
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# the script's name starts with a digit, so it is loaded from its path instead of imported
+_spec = importlib.util.spec_from_file_location("eval_script", Path(__file__).parents[1] / "scripts" / "35_eval.py")
+assert _spec is not None
+assert _spec.loader is not None
+eval_script = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(eval_script)
+
+
+def test_find_highly_recurring_with_missing_values():
+    """Test that transactions with a missing name or amount are dropped, like groupby drops them."""
+    df = pd.DataFrame({
+        "name": ["netflix", "netflix", None, "spotify", "spotify"],
+        "amount": [9.99, 9.99, 9.99, np.nan, 5.0],
+        "recurring": pd.array([1, 1, 1, 0, None], dtype="Int8"),
+    })
+
+    names = eval_script.find_highly_recurring_names(df, threshold=0.0)
+    assert names["name"].tolist() == ["netflix", "spotify"]
+    assert names["total_count"].tolist() == [2, 1]
+    assert names["recurring_count"].tolist() == [2, 0]
+
+    amounts = eval_script.find_highly_recurring_amounts(df, threshold=0.0, min_count=1)
+    assert amounts["amount_rounded"].tolist() == [9.99]
+    assert amounts["total_count"].tolist() == [3]
+    assert amounts["recurring_count"].tolist() == [3]
@@ -0,0 +1,42 @@
+import pytest
+
+import recur_scan.features
+from recur_scan.features import get_features
+from recur_scan.transactions import Transaction
+
+
+@pytest.fixture
+def transactions():
+    """Fixture providing a group of monthly transactions."""
+    return [
+        Transaction(id=1, user_id="user1", name="Netflix", amount=15.99, date="2024-01-05"),
+        Transaction(id=2, user_id="user1", name="Netflix", amount=15.99, date="2024-03-05"),
+        Transaction(id=3, user_id="user1", name="Netflix", amount=15.99, date="2024-02-05"),
+        Transaction(id=4, user_id="user1", name="Netflix", amount=17.99, date="2024-04-05"),
+        Transaction(id=5, user_id="user1", name="Netflix", amount=17.99, date="2024-05-06"),
+    ]
+
+
+def test_get_features(transactions, monkeypatch) -> None:
+    """Test that get_features only computes the enabled features, with the same values as computing all of them."""
+    transaction = transactions[2]
+    all_features = get_features(transaction, list(transactions))
+    # features that are computed after get_subscription_score_frank has sorted the transactions, before it,
+    # from a shared Dallanq count, from the group features and from a function returning several features
+    enabled = frozenset({
+        "amount_dallanq",
+        "14_days_apart_exact_dallanq",
+        "count_transactions_dallanq",
+        "get_amount_consistency_frank",
+        "is_amount_rounded_asimi",
+        "median_amount_precious",
+    })
+    assert enabled <= set(all_features)
+
+    def _not_called(*_args, **_kwargs):
+        raise AssertionError("a disabled feature was computed")
+
+    monkeypatch.setattr(recur_scan.features, "get_ends_in_99_dallanq", _not_called)
+    monkeypatch.setattr(recur_scan.features, "get_recurrence_patterns_emmanuel2", _not_called)
+    features = get_features(transaction, list(transactions), enabled)
+    assert features == {name: all_features[name] for name in enabled}
@@ -37,9 +37,11 @@ from recur_scan.features_dallanq import (
     get_is_phone,
     get_is_utility,
     get_n_transactions_days_apart,
+    get_n_transactions_days_apart_counts,
     get_n_transactions_days_apart_same_amount,
     get_n_transactions_same_amount,
     get_n_transactions_same_day,
+    get_n_transactions_same_day_counts,
     get_pct_transactions_days_apart,
     get_pct_transactions_days_apart_same_amount,
     get_pct_transactions_same_day,
@@ -154,6 +156,23 @@ def test_get_n_transactions_same_day() -> None:
     assert get_n_transactions_same_day(transactions[2], transactions, 0) == 1
 
 
+def test_get_n_transactions_same_day_counts() -> None:
+    """Test get_n_transactions_same_day_counts."""
+    transactions = [
+        Transaction(id=1, user_id="user1", name="name1", amount=100, date="2024-01-15"),
+        Transaction(id=2, user_id="user1", name="name1", amount=100, date="2024-02-15"),
+        Transaction(id=3, user_id="user1", name="name1", amount=100, date="2024-03-16"),
+        Transaction(id=4, user_id="user1", name="name1", amount=200, date="2024-04-15"),
+        Transaction(id=5, user_id="user1", name="name1", amount=100, date="2024-05-20"),
+    ]
+    assert get_n_transactions_same_day_counts(transactions[0], transactions, [0, 1, 5]) == {0: 3, 1: 4, 5: 5}
+    assert get_n_transactions_same_day_counts(transactions[0], transactions, [0, 1, 5], same_amount=True) == {
+        0: 2,
+        1: 3,
+        5: 4,
+    }
+
+
 def test_get_pct_transactions_same_day() -> None:
     """Test that get_pct_transactions_same_day returns the correct percentage of transactions on the same day."""
     transactions = [
@@ -180,6 +199,28 @@ def test_get_n_transactions_days_apart() -> None:
     assert get_n_transactions_days_apart(transactions[0], transactions, 14, 1) == 4
 
 
+def test_get_n_transactions_days_apart_counts() -> None:
+    """Test get_n_transactions_days_apart_counts."""
+    transactions = [
+        Transaction(id=1, user_id="user1", name="name1", amount=2.99, date="2024-01-01"),
+        Transaction(id=2, user_id="user1", name="name1", amount=2.99, date="2024-01-02"),
+        Transaction(id=3, user_id="user1", name="name1", amount=2.99, date="2024-01-14"),
+        Transaction(id=4, user_id="user1", name="name1", amount=3.99, date="2024-01-15"),
+        Transaction(id=5, user_id="user1", name="name1", amount=2.99, date="2024-01-16"),
+        Transaction(id=6, user_id="user1", name="name1", amount=2.99, date="2024-01-29"),
+        Transaction(id=7, user_id="user1", name="name1", amount=2.99, date="2024-01-31"),
+    ]
+    specs = [(14, 0), (14, 1), (7, 0)]
+    counts = get_n_transactions_days_apart_counts(transactions[0], transactions, specs)
+    assert counts == {spec: get_n_transactions_days_apart(transactions[0], transactions, *spec) for spec in specs}
+    assert counts == {(14, 0): 2, (14, 1): 4, (7, 0): 2}
+    same_amount_counts = get_n_transactions_days_apart_counts(transactions[0], transactions, specs, same_amount=True)
+    assert same_amount_counts == {
+        spec: get_n_transactions_days_apart_same_amount(transactions[0], transactions, *spec) for spec in specs
+    }
+    assert same_amount_counts == {(14, 0): 1, (14, 1): 3, (7, 0): 1}
+
+
 def test_get_pct_transactions_days_apart() -> None:
     """Test get_pct_transactions_days_apart."""
     transactions = [
@@ -642,6 +683,8 @@ def test_modal_amount() -> None:
     ]
     assert modal_amount(transactions) == 100
     assert modal_amount([]) == -1.0
+    # ties go to the amount seen first
+    assert modal_amount([*reversed(transactions), transactions[2]]) == 200
 
 
 def test_fraction_modal_amount() -> None:
@@ -1165,6 +1208,12 @@ def test_get_n_transactions_days_apart_same_amount() -> None:
     ]
     assert get_n_transactions_days_apart_same_amount(transactions[0], transactions, 14, 0) == 2
     assert get_n_transactions_days_apart_same_amount(transactions[0], transactions, 14, 2) == 2
+    # amounts are compared in whole cents, like the same-amount counts the pct features divide by
+    cents = [
+        Transaction(id=1, user_id="user1", name="name1", amount=0.1 + 0.2, date="2024-01-01"),
+        Transaction(id=2, user_id="user1", name="name1", amount=0.3, date="2024-01-15"),
+    ]
+    assert get_n_transactions_days_apart_same_amount(cents[0], cents, 14, 0) == 1
 
 
 def test_get_pct_transactions_days_apart_same_amount() -> None:
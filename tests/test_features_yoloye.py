@@ -10,6 +10,7 @@ from recur_scan.features_yoloye import (
     get_delayed_semi_annual,
     get_delayed_weekly,
     get_early_annual,
+    get_early_cadence_counts,
     get_early_fortnightly,
     get_early_monthly,
     get_early_quarterly,
@@ -359,3 +360,24 @@ def test_get_early_annual(sample_transaction):
 
     # Test with empty transactions list
     assert get_early_annual(sample_transaction, []) == 0
+
+
+def test_get_early_cadence_counts(sample_transaction):
+    transactions = [
+        sample_transaction,
+        Transaction(id=1, user_id="user", date="2023-01-13", amount=100.0, name="Test"),  # 12 days after
+        Transaction(id=2, user_id="user", date="2023-01-28", amount=100.0, name="Test"),  # 27 days after
+        Transaction(id=3, user_id="user", date="2023-12-20", amount=100.0, name="Test"),  # 353 days after
+    ]
+    counts = get_early_cadence_counts(sample_transaction, transactions)
+    assert list(counts) == ["fortnightly", "monthly", "quarterly", "semi_annual", "annual"]
+    # each count matches its single-cadence function
+    assert counts == {
+        "fortnightly": get_early_fortnightly(sample_transaction, transactions),
+        "monthly": get_early_monthly(sample_transaction, transactions),
+        "quarterly": get_early_quarterly(sample_transaction, transactions),
+        "semi_annual": get_early_semi_annual(sample_transaction, transactions),
+        "annual": get_early_annual(sample_transaction, transactions),
+    }
+    assert counts["annual"] == 1
+    assert get_early_cadence_counts(sample_transaction, []) == dict.fromkeys(counts, 0)
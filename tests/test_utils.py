@@ -1,8 +1,24 @@
-from datetime import date
+import statistics
+from datetime import date, datetime
 
 import pytest
 
-from recur_scan.utils import get_day, parse_date
+from recur_scan.transactions import Transaction
+from recur_scan.utils import (
+    count_days_apart,
+    count_in_ranges,
+    get_day,
+    get_day_counts,
+    get_days_since_same_name_amount,
+    get_name_id,
+    get_same_name_amounts,
+    get_same_name_transactions,
+    get_stdev,
+    group_memoize,
+    parse_date,
+    parse_datetime,
+    to_columns,
+)
 
 
 def test_parse_date():
@@ -15,8 +31,185 @@ def test_parse_date():
         parse_date("01/01/2024")
 
 
+def test_parse_datetime():
+    """Test parse_datetime function."""
+    assert parse_datetime("2024-01-01") == datetime(2024, 1, 1)
+    assert parse_datetime("01/02/2024", "%m/%d/%Y") == datetime(2024, 1, 2)
+    # repeated dates get the same cached object
+    assert parse_datetime("2024-01-01") is parse_datetime("2024-01-01")
+
+    with pytest.raises(ValueError, match=r"does not match format"):
+        parse_datetime("01/01/2024")
+
+
 def test_get_day():
     """Test get_day function."""
     assert get_day("2024-01-01") == 1
     assert get_day("2024-01-02") == 2
     assert get_day("2024-01-03") == 3
+
+
+def test_group_memoize():
+    """Test group_memoize function."""
+    calls = []
+
+    @group_memoize
+    def count_same_amount(transaction: Transaction, all_transactions: list[Transaction], tolerance: float = 0.0) -> int:
+        calls.append(transaction)
+        return sum(1 for t in all_transactions if abs(t.amount - transaction.amount) <= tolerance)
+
+    transactions = [
+        Transaction(id=1, user_id="user1", name="name1", amount=10.0, date="2024-01-01"),
+        Transaction(id=2, user_id="user1", name="name1", amount=10.0, date="2024-02-01"),
+        Transaction(id=3, user_id="user1", name="name1", amount=10.5, date="2024-03-01"),
+    ]
+    assert count_same_amount(transactions[0], transactions) == 2
+    # the same call, with or without spelling out the default, is cached
+    assert count_same_amount(transactions[0], list(transactions)) == 2
+    assert count_same_amount(transactions[0], transactions, 0.0) == 2
+    assert len(calls) == 1
+    # a different transaction, group or argument is computed again
+    assert count_same_amount(transactions[1], transactions) == 2
+    assert count_same_amount(transactions[0], transactions[:1]) == 1
+    assert count_same_amount(transactions[0], transactions, tolerance=1.0) == 3
+    assert len(calls) == 4
+    count_same_amount.cache_clear()  # type: ignore[attr-defined]
+    assert count_same_amount(transactions[0], transactions) == 2
+    assert len(calls) == 5
+
+
+def test_to_columns():
+    """Test to_columns function."""
+    transactions = [
+        Transaction(id=1, user_id="user1", name="name1", amount=10.5, date="2024-01-31"),
+        Transaction(id=2, user_id="user1", name="name1", amount=20.0, date="2024-01-01"),
+    ]
+    columns = to_columns(transactions)
+    assert columns["amount"].tolist() == [10.5, 20.0]
+    assert columns["ordinal"].tolist() == [date(2024, 1, 31).toordinal(), date(2024, 1, 1).toordinal()]
+    assert columns["day"].tolist() == [31, 1]
+    assert columns["month"].tolist() == [1, 1]
+    assert columns["year"].tolist() == [2024, 2024]
+    assert columns["weekday"].tolist() == [date(2024, 1, 31).weekday(), date(2024, 1, 1).weekday()]
+    assert columns["name"].tolist() == ["name1", "name1"]
+    assert columns["name_id"].tolist() == [0, 0]
+    # the columns are cached and read-only
+    assert to_columns(list(transactions)) is columns
+    with pytest.raises(ValueError, match=r"read-only"):
+        columns["amount"][0] = 0.0
+
+
+def test_get_same_name_amounts():
+    """Test get_same_name_amounts function."""
+    transactions = [
+        Transaction(id=1, user_id="user1", name="name1", amount=10.0, date="2024-01-15"),
+        Transaction(id=2, user_id="user1", name="name2", amount=20.0, date="2024-02-15"),
+        Transaction(id=3, user_id="user1", name="name1", amount=30.0, date="2024-03-31"),
+    ]
+    amounts = get_same_name_amounts(transactions[0], transactions)
+    assert amounts.tolist() == [10.0, 30.0]
+    assert get_same_name_amounts(transactions[1], transactions).tolist() == [20.0]
+    # the amounts are cached and read-only
+    assert get_same_name_amounts(transactions[2], list(transactions)) is amounts
+    with pytest.raises(ValueError, match=r"read-only"):
+        amounts[0] = 0.0
+
+
+def test_get_name_id():
+    """Test get_name_id function."""
+    transactions = [
+        Transaction(id=1, user_id="user1", name="name1", amount=10.0, date="2024-01-15"),
+        Transaction(id=2, user_id="user1", name="name2", amount=20.0, date="2024-02-15"),
+        Transaction(id=3, user_id="user1", name="name1", amount=30.0, date="2024-03-31"),
+    ]
+    assert get_name_id("name1", transactions) == 0
+    assert get_name_id("name2", transactions) == 1
+    assert get_name_id("name3", transactions) == -1
+    # the ids match the name_id column
+    assert to_columns(transactions)["name_id"].tolist() == [0, 1, 0]
+
+
+def test_get_same_name_transactions():
+    """Test get_same_name_transactions function."""
+    transactions = [
+        Transaction(id=1, user_id="user1", name="name1", amount=10.0, date="2024-01-15"),
+        Transaction(id=2, user_id="user1", name="name2", amount=20.0, date="2024-02-15"),
+        Transaction(id=3, user_id="user1", name="name1", amount=30.0, date="2024-03-31"),
+    ]
+    same_name = get_same_name_transactions(transactions[0], transactions)
+    assert same_name == (transactions[0], transactions[2])
+    assert get_same_name_transactions(transactions[1], transactions) == (transactions[1],)
+    other = Transaction(id=4, user_id="user1", name="name3", amount=40.0, date="2024-04-15")
+    assert get_same_name_transactions(other, transactions) == ()
+    # the groups are cached
+    assert get_same_name_transactions(transactions[2], list(transactions)) is same_name
+
+
+def test_get_day_counts():
+    """Test get_day_counts function."""
+    transactions = [
+        Transaction(id=1, user_id="user1", name="name1", amount=10.0, date="2024-01-15"),
+        Transaction(id=2, user_id="user1", name="name1", amount=10.0, date="2024-02-15"),
+        Transaction(id=3, user_id="user1", name="name1", amount=10.0, date="2024-03-31"),
+    ]
+    counts = get_day_counts(transactions)
+    assert len(counts) == 32
+    assert counts[15] == 2
+    assert counts[31] == 1
+    assert counts.sum() == 3
+    assert counts.argmax() == 15
+
+
+def test_count_days_apart():
+    """Test count_days_apart function."""
+    transactions = [
+        Transaction(id=1, user_id="user1", name="name1", amount=10.0, date="2024-01-01"),
+        Transaction(id=2, user_id="user1", name="name1", amount=10.0, date="2024-01-15"),
+        Transaction(id=3, user_id="user1", name="name1", amount=10.0, date="2024-01-30"),
+        Transaction(id=4, user_id="user1", name="name1", amount=10.0, date="2024-02-14"),
+    ]
+    # 14 days before and 15 days after
+    assert count_days_apart("2024-01-15", transactions, 14, 0) == 1
+    assert count_days_apart("2024-01-15", transactions, 14, 1) == 2
+    # a window that reaches the date itself counts it
+    assert count_days_apart("2024-01-15", transactions, 1, 1) == 1
+    assert count_days_apart("2024-01-01", transactions, 30, 0) == 0
+    assert count_days_apart("2024-01-01", transactions, 29, 0) == 1
+
+
+def test_get_days_since_same_name_amount():
+    """Test get_days_since_same_name_amount function."""
+    transactions = [
+        Transaction(id=1, user_id="user1", name="name1", amount=10.0, date="2024-01-15"),
+        Transaction(id=2, user_id="user1", name="name1", amount=10.0, date="2024-01-01"),
+        Transaction(id=3, user_id="user1", name="name1", amount=20.0, date="2024-01-20"),
+        Transaction(id=4, user_id="user1", name="name2", amount=10.0, date="2024-01-25"),
+        Transaction(id=5, user_id="user1", name="name1", amount=10.0, date="2024-01-31"),
+    ]
+    assert get_days_since_same_name_amount(transactions[4], transactions) == 16
+    assert get_days_since_same_name_amount(transactions[0], transactions) == 14
+    # no earlier transaction with the same name and amount
+    assert get_days_since_same_name_amount(transactions[1], transactions) is None
+    assert get_days_since_same_name_amount(transactions[2], transactions) is None
+    assert get_days_since_same_name_amount(transactions[3], transactions) is None
+
+
+def test_get_stdev():
+    """Test get_stdev function."""
+    assert get_stdev([2.0, 4.0, 6.0]) == statistics.stdev([2.0, 4.0, 6.0])
+    assert get_stdev([2, 4, 6]) == 2.0
+    assert get_stdev((1.5, 1.5)) == 0.0
+    with pytest.raises(statistics.StatisticsError):
+        get_stdev([1.0])
+
+
+def test_count_in_ranges():
+    """Test count_in_ranges function."""
+    intervals = [0, 7, 7, 14, 15, 30, 31, 365]
+    assert count_in_ranges(intervals, [(6, 8), (13, 15), (28, 31)]) == [2, 2, 2]
+    # the ranges are inclusive and can overlap
+    assert count_in_ranges(intervals, [(0, 0), (0, 14), (7, 7), (32, 364)]) == [1, 4, 2, 0]
+    # values above every range aren't counted in any of them
+    assert count_in_ranges(intervals, [(360, 370)]) == [1]
+    assert count_in_ranges(intervals, [(1, 6)]) == [0]
+    assert count_in_ranges([], [(6, 8)]) == [0]